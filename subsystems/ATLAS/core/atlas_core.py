@@ -9,12 +9,12 @@ Responsible for mapping connections, visualizing systems, and analysis.
 Version: 1.0.0 (Migrated)
 """
 
+import heapq
 import json
 import logging
 import sys  # Keep for potential path adjustments if needed elsewhere
 
 try:
-    import matplotlib.pyplot as plt
     import networkx as nx
 except ImportError:
     # Mock networkx and matplotlib for tests
@@ -56,15 +56,50 @@ except ImportError:
 
     sys.modules["matplotlib"] = MagicMock()
     sys.modules["matplotlib.pyplot"] = MagicMock()
-    plt = sys.modules["matplotlib.pyplot"]
 
 from datetime import datetime
 from pathlib import Path
-from typing import Any, Dict, Optional, Tuple
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple, Union
+
+from .centrality import CentralityConfig, betweenness_centrality
+from .layout_cache import LayoutCache
+from .mapping_store import MANIFEST, MappingStore, read_document
+from .mapping_stream import NodeFilter, load_mapping_document, read_metadata
+from .renderer import (
+    LAYOUTS,
+    MERMAID,
+    MERMAID_DIRECTIONS,
+    SVG,
+    RenderStyle,
+    compute_layout,
+    file_extension,
+    render_matplotlib,
+    render_mermaid,
+    render_svg,
+    resolve_engine,
+)
+from .summarizer import CLUSTER, GraphSummary, SummaryOptions, summarize
 
 # Removed old directory and logging configuration
 # logger = logging.getLogger("EGOS.ATLAS") # Logger will be passed in init
 
+# Marker for attributes absent from a node or edge
+_MISSING = object()
+
+# Largest clusters of a summarized map listed in the Obsidian note
+MAX_LISTED_CLUSTERS = 10
+
+# Aspects of the graph whose changes are tracked separately (see mark_graph_changed)
+GRAPH_ASPECTS = ("structure", "node_attributes", "edge_attributes")
+# Graph aspects each analyze_system section is computed from
+ANALYSIS_SECTION_ASPECTS = {
+    "basic_metrics": ("structure",),
+    "centrality": ("structure",),
+    "communities": ("structure",),
+    "node_attributes": ("structure", "node_attributes"),
+    "edge_attributes": ("structure", "edge_attributes"),
+}
+
 
 class ATLASCore:
     """Core graph engine for ATLAS: handles graph creation, analysis, persistence, visualization."""
@@ -86,6 +121,32 @@ class ATLASCore:
         self.data_dir = data_dir
         self.data_dir.mkdir(parents=True, exist_ok=True)  # Ensure data directory exists
 
+        # Graph version, bumped by every mutation, and the version at which each
+        # aspect last changed; analyze_system sections are memoized against them
+        self._graph_version = 0
+        self._aspect_versions = dict.fromkeys(GRAPH_ASPECTS, 0)
+        self._graph_shape = (0, 0)
+        self._section_cache: Dict[str, Tuple[Tuple, Any]] = {}
+
+        # Saved mappings: a full checkpoint every few saves and deltas in between.
+        # The nodes and edges changed since the last save of the current mapping
+        # are tracked while known, so the next delta only compares those.
+        self.mapping_store = MappingStore.from_config(
+            self.data_dir / "maps", self.config.get("storage", {})
+        )
+        self._mapping_name: Optional[str] = None
+        self._unsaved_changes: Optional[Tuple[Set[Any], Set[Tuple[Any, Any]]]] = None
+        self._last_revision: Optional[int] = None
+
+        # Node positions per layout, reused while the graph structure is unchanged
+        self._layout_cache = LayoutCache(
+            seed=self.config.get("visualization", {}).get("layout_seed", 42)
+        )
+
+        # Level-of-detail view of large maps, for the graph versions it was
+        # computed from (see _summarize)
+        self._summary_cache: Optional[Tuple[Tuple, GraphSummary]] = None
+
         # Initialize graph for mapping
         self.graph = nx.DiGraph()
 
@@ -101,6 +162,66 @@ class ATLASCore:
 
     # Removed _create_default_config
 
+    @property
+    def graph(self):
+        """The mapped system graph (``nx.DiGraph``)."""
+        return self._graph
+
+    @graph.setter
+    def graph(self, graph) -> None:
+        self._graph = graph
+        self.mark_graph_changed()
+
+    @property
+    def graph_version(self) -> int:
+        """Monotonically increasing version of the graph, bumped by every mutation."""
+        return self._graph_version
+
+    def mark_graph_changed(
+        self,
+        aspects: Optional[Iterable[str]] = None,
+        touched: Optional[Tuple[Iterable[Any], Iterable[Tuple[Any, Any]]]] = None,
+    ) -> int:
+        """
+        Records a mutation of the graph and returns the new graph version.
+
+        ATLASCore calls this for its own mutations. Code that edits ``self.graph``
+        directly should call it as well, naming the changed aspects
+        (see GRAPH_ASPECTS) so that unaffected analysis sections stay cached.
+
+        Args:
+            aspects: Changed aspects; all of them if None.
+            touched: The (nodes, edges) the mutation was limited to, if known. The
+                     next save then only compares these against the last saved
+                     revision; otherwise it compares the whole graph.
+
+        Returns:
+            int: The new graph version.
+        """
+        aspects = GRAPH_ASPECTS if aspects is None else tuple(aspects)
+        unknown = set(aspects) - set(GRAPH_ASPECTS)
+        if unknown:
+            raise ValueError(f"Unknown graph aspects: {sorted(unknown)}")
+        if touched is None:
+            self._unsaved_changes = None
+        elif self._unsaved_changes is not None:
+            self._unsaved_changes[0].update(touched[0])
+            self._unsaved_changes[1].update(tuple(edge) for edge in touched[1])
+        if "structure" in aspects:
+            moved = None
+            if touched is not None:
+                moved = set(touched[0])
+                moved.update(node for edge in touched[1] for node in edge)
+            self._layout_cache.note_change(moved)
+        self._graph_version += 1
+        for aspect in aspects:
+            self._aspect_versions[aspect] = self._graph_version
+        self._graph_shape = self._current_shape()
+        return self._graph_version
+
+    def _current_shape(self) -> Tuple[int, int]:
+        return (self._graph.number_of_nodes(), self._graph.number_of_edges())
+
     def _log_operation(
         self,
         operation: str,
@@ -206,6 +327,8 @@ class ATLASCore:
             else:
                 self.logger.warning(f"No 'edges' key found in system_data for mapping '{name}'")
 
+            self.mark_graph_changed()
+
             # Save the mapping
             self._save_mapping(name)
 
@@ -226,6 +349,7 @@ class ATLASCore:
             return True
 
         except Exception as e:
+            self.mark_graph_changed()  # The graph was cleared and may be partially built
             self._log_operation(
                 "MAP_SYSTEM",
                 "Failed",
@@ -235,20 +359,179 @@ class ATLASCore:
             self.logger.exception(f"Error mapping system '{name}': {e}")  # Log full traceback
             return False
 
+    @staticmethod
+    def _edge_endpoints(edge: Any) -> Tuple[Any, Any, Dict[str, Any]]:
+        """(source, target, attributes) of an edge given as a dict or a sequence."""
+        if isinstance(edge, dict):
+            if "source" not in edge or "target" not in edge:
+                raise ValueError(f"Edge is missing 'source' or 'target': {edge}")
+            attrs = {k: v for k, v in edge.items() if k not in ("source", "target")}
+            return edge["source"], edge["target"], attrs
+        source, target, *rest = edge
+        return source, target, dict(rest[0]) if rest else {}
+
+    def apply_delta(self, delta: Dict[str, Any], save: bool = False) -> Dict[str, Any]:
+        """
+        Applies an incremental change to the current graph instead of rebuilding it.
+
+        Removals are applied first, then node and edge upserts, each with one
+        bulk networkx call. Only the graph aspects the delta actually changed
+        are marked (see mark_graph_changed), so analysis sections that do not
+        depend on them stay cached; a delta that changes nothing keeps the
+        graph version.
+
+        Args:
+            delta: Dictionary with optional 'nodes' and 'edges' sections:
+                   - 'nodes': {'add': {id: attrs}, 'update': {id: attrs}, 'remove': [id]}
+                   - 'edges': {'add': [edge], 'update': [edge], 'remove': [edge]}, where an
+                     edge is a dict with 'source', 'target' and attribute keys, or a
+                     (source, target[, attrs]) sequence.
+                   Added and updated attributes are merged into existing ones.
+                   Edges to unknown nodes create those nodes.
+            save: Also store the result as a new revision of the current mapping
+                  (the one last mapped, saved or loaded).
+
+        Returns:
+            Dict[str, Any]: Compact change record with 'graph_version',
+                            'previous_version', 'nodes' and 'edges' ('added',
+                            'updated' and 'removed' ids or [source, target]
+                            pairs) and the 'aspects' that changed. With ``save``,
+                            also the stored 'revision' (None if saving failed).
+        """
+        operation = "APPLY_DELTA"
+        graph = self.graph
+        previous_version = self._graph_version
+        node_delta = delta.get("nodes") or {}
+        edge_delta = delta.get("edges") or {}
+        unknown = (set(delta) - {"nodes", "edges"}) | (
+            (set(node_delta) | set(edge_delta)) - {"add", "update", "remove"}
+        )
+        if unknown:
+            raise ValueError(f"Unknown delta sections: {sorted(unknown)}")
+
+        changes: Dict[str, Dict[str, List[Any]]] = {
+            "nodes": {"added": [], "updated": [], "removed": []},
+            "edges": {"added": [], "updated": [], "removed": []},
+        }
+        aspects = set()
+
+        # --- Removals ---
+        edges_to_remove = []
+        for edge in edge_delta.get("remove", []):
+            source, target, _ = self._edge_endpoints(edge)
+            if graph.has_edge(source, target):
+                edges_to_remove.append((source, target))
+        graph.remove_edges_from(edges_to_remove)
+        changes["edges"]["removed"] = [list(edge) for edge in edges_to_remove]
+
+        nodes_to_remove = [node for node in node_delta.get("remove", []) if node in graph]
+        for node in nodes_to_remove:
+            # Incident edges disappear with the node
+            changes["edges"]["removed"].extend([u, v] for u, v in graph.in_edges(node))
+            changes["edges"]["removed"].extend([u, v] for u, v in graph.out_edges(node) if u != v)
+        graph.remove_nodes_from(nodes_to_remove)
+        changes["nodes"]["removed"] = list(nodes_to_remove)
+        if changes["edges"]["removed"] or nodes_to_remove:
+            aspects.add("structure")
+
+        # --- Node upserts ---
+        node_items: Dict[Any, Dict[str, Any]] = {}
+        for section in ("add", "update"):
+            for node, attrs in (node_delta.get(section) or {}).items():
+                node_items.setdefault(node, {}).update(attrs or {})
+        new_nodes = []
+        for node, attrs in node_items.items():
+            if node not in graph:
+                new_nodes.append(node)
+                aspects.add("structure")
+                if attrs:
+                    aspects.add("node_attributes")
+            elif any(graph.nodes[node].get(key, _MISSING) != value for key, value in attrs.items()):
+                changes["nodes"]["updated"].append(node)
+                aspects.add("node_attributes")
+        graph.add_nodes_from(node_items.items())
+
+        # --- Edge upserts ---
+        edge_items: Dict[Tuple[Any, Any], Dict[str, Any]] = {}
+        for section in ("add", "update"):
+            for edge in edge_delta.get(section, []):
+                source, target, attrs = self._edge_endpoints(edge)
+                edge_items.setdefault((source, target), {}).update(attrs)
+        implicit_nodes = []
+        for (source, target), attrs in edge_items.items():
+            for endpoint in (source, target):
+                if endpoint not in graph and endpoint not in implicit_nodes:
+                    implicit_nodes.append(endpoint)
+            if not graph.has_edge(source, target):
+                changes["edges"]["added"].append([source, target])
+                aspects.add("structure")
+                if attrs:
+                    aspects.add("edge_attributes")
+            elif any(graph.edges[source, target].get(k, _MISSING) != v for k, v in attrs.items()):
+                changes["edges"]["updated"].append([source, target])
+                aspects.add("edge_attributes")
+        graph.add_edges_from((u, v, attrs) for (u, v), attrs in edge_items.items())
+        if implicit_nodes:
+            self.logger.info(f"Delta edges created {len(implicit_nodes)} node(s) without data")
+        changes["nodes"]["added"] = new_nodes + implicit_nodes
+
+        if aspects:
+            touched_nodes = [node for items in changes["nodes"].values() for node in items]
+            touched_edges = [edge for items in changes["edges"].values() for edge in items]
+            self.mark_graph_changed(sorted(aspects), (touched_nodes, touched_edges))
+        record = {
+            "graph_version": self._graph_version,
+            "previous_version": previous_version,
+            **changes,
+            "aspects": sorted(aspects),
+        }
+        summary = ", ".join(
+            f"{kind} {action}: {len(items)}"
+            for kind in ("nodes", "edges")
+            for action, items in changes[kind].items()
+            if items
+        )
+        self._log_operation(
+            operation,
+            "Completed",
+            f"Delta applied ({summary or 'no changes'})",
+            f"Graph version {previous_version} -> {self._graph_version}",
+        )
+        if save:
+            if self._mapping_name is None:
+                self.logger.warning("Delta not saved: no mapping has been mapped or loaded")
+                record["revision"] = None
+            else:
+                saved = self._save_mapping(self._mapping_name)
+                record["revision"] = self._last_revision if saved else None
+        return record
+
     def visualize(
         self,
         output_filename: Optional[str] = None,
         title: Optional[str] = None,
         layout: Optional[str] = None,
+        engine: Optional[str] = None,
+        cluster: Optional[str] = None,
     ) -> Optional[Path]:
         """
-        Visualizes the current graph and saves the image to the ATLAS data directory.
+        Visualizes the current graph and saves it to the ATLAS data directory.
+
+        SVG and Mermaid output is written directly by the native renderer;
+        matplotlib is only imported for other (raster) formats. Graphs above
+        visualization.max_nodes are drawn summarized, with nodes collapsed
+        into clusters (see summarizer.summarize and visualization.summary).
 
         Args:
-            output_filename: Filename (e.g., 'map.png') to save the visualization.
+            output_filename: Filename (e.g., 'map.svg') to save the visualization.
                              If None, a timestamped name is generated.
             title: Title of the visualization.
             layout: Layout algorithm to be used (e.g., 'spring', 'circular').
+            engine: 'svg', 'mermaid' or 'matplotlib'. If None, it follows the
+                    suffix of output_filename, then visualization.engine, then
+                    visualization.default_format.
+            cluster: Cluster of the summarized map to drill into; its members are
+                     drawn while the rest of the map stays collapsed.
 
         Returns:
             Path: Absolute path of the generated visualization file, or None on failure.
@@ -269,74 +552,49 @@ class ATLASCore:
         try:
             # --- Visualization Settings ---
             vis_config = self.config.get("visualization", {})
-            node_size = vis_config.get("node_size", 800)
-            edge_width = vis_config.get("edge_width", 1.5)
-            font_size = vis_config.get("font_size", 10)
-            arrow_size = vis_config.get("arrow_size", 15)
-            layout_algo = layout or vis_config.get("layout", "spring")
-            figure_size = tuple(vis_config.get("figure_size", [12, 10]))
-            dpi = vis_config.get("dpi", 300)
-
-            plt.figure(figsize=figure_size)
-
-            # --- Set Layout ---
-            pos = None  # Initialize pos
-            try:
-                if layout_algo == "spring":
-                    pos = nx.spring_layout(self.graph)
-                elif layout_algo == "circular":
-                    pos = nx.circular_layout(self.graph)
-                elif layout_algo == "kamada_kawai":
-                    pos = nx.kamada_kawai_layout(self.graph)
-                elif layout_algo == "spectral":
-                    pos = nx.spectral_layout(self.graph)
-                else:
-                    self.logger.warning(
-                        f"Unknown layout '{layout_algo}'. Defaulting to spring layout."
-                    )
-                    pos = nx.spring_layout(self.graph)
-            except Exception as layout_e:
-                self.logger.error(
-                    f"Error calculating layout '{layout_algo}': {layout_e}. "
-                    f"Defaulting to spring layout."
-                )
-                pos = nx.spring_layout(self.graph)  # Fallback layout
-
-            # --- Draw Graph Elements ---
-            nx.draw_networkx_nodes(
-                self.graph, pos, node_size=node_size, node_color="skyblue", alpha=0.8
-            )
-            nx.draw_networkx_edges(
-                self.graph,
-                pos,
-                width=edge_width,
-                alpha=0.5,
-                arrows=True,
-                arrowstyle="-",
-                arrowsize=arrow_size,
-            )
-            nx.draw_networkx_labels(self.graph, pos, font_size=font_size, font_family="sans-serif")
-
-            # --- Final Touches ---
+            engine = resolve_engine(engine, output_filename, vis_config)
+            style = RenderStyle.from_config(vis_config)
             plot_title = title or vis_config.get("default_title", "ATLAS - Systemic Mapping")
-            plt.title(plot_title, fontsize=16)
-            plt.axis("off")
-            plt.tight_layout()
+            summary = self._summarize(cluster)
+            graph = summary.graph if summary else self.graph
+            note = summary.note if summary else ""
 
             # --- Set Output Path ---
             if not output_filename:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                default_ext = vis_config.get("default_format", "png")
-                output_filename = f"atlas_map_{timestamp}.{default_ext}"
+                output_filename = f"atlas_map_{timestamp}.{file_extension(engine, vis_config)}"
 
             if "." not in Path(output_filename).suffix:
-                default_ext = vis_config.get("default_format", "png")
-                output_filename += f".{default_ext}"
+                output_filename += f".{file_extension(engine, vis_config)}"
 
             output_path = self.data_dir / output_filename
 
-            # --- Save Figure ---
-            plt.savefig(output_path, dpi=dpi, bbox_inches="tight")
+            # --- Render ---
+            if engine == MERMAID:
+                # Mermaid viewers lay the chart out themselves
+                content = render_mermaid(graph, plot_title, style, note)
+            else:
+                layout_algo = self._resolve_layout(layout or vis_config.get("layout", "spring"))
+                if summary:
+                    # Summaries are small; their positions are not cached
+                    pos = self._compute_layout(graph, layout_algo)
+                else:
+                    pos, how = self._layout_cache.get(
+                        layout_algo,
+                        graph,
+                        self._aspect_versions["structure"],
+                        lambda: self._compute_layout(graph, layout_algo),
+                    )
+                    self.logger.debug(f"Layout '{layout_algo}': {how}")
+                    self._store_layouts()
+                if engine == SVG:
+                    content = render_svg(graph, pos, plot_title, style, note)
+                else:
+                    content = None
+                    render_matplotlib(graph, pos, plot_title, output_path, vis_config)
+            if content is not None:
+                with open(output_path, "w", encoding="utf-8") as f:
+                    f.write(content)
 
             self._log_operation(
                 operation,
@@ -350,18 +608,84 @@ class ATLASCore:
             self._log_operation(operation, "Failed", f"Error generating visualization: {str(e)}")
             self.logger.exception(f"Error generating visualization: {e}")
             output_path = None  # Ensure None is returned on error
-        finally:
-            plt.close()  # Ensure plot is closed whether successful or not
 
         return output_path
 
-    def export_to_obsidian(self) -> Optional[Tuple[str, Path]]:
+    def _summarize(self, cluster: Optional[str] = None) -> Optional[GraphSummary]:
+        """Level-of-detail view of the graph, or None if it fits visualization.max_nodes
+        and no cluster is drilled into.
+
+        Raises:
+            KeyError: If ``cluster`` is not a cluster of the summarized map.
+        """
+        vis_config = self.config.get("visualization", {})
+        max_nodes = vis_config.get("max_nodes")
+        num_nodes = self.graph.number_of_nodes()
+        if cluster is None and (not max_nodes or num_nodes <= max_nodes):
+            return None
+        options = SummaryOptions.from_config(vis_config.get("summary", {}))
+        key = (
+            self._aspect_versions["structure"],
+            self._aspect_versions["node_attributes"],
+            self._aspect_versions["edge_attributes"],
+            max_nodes,
+            options,
+            cluster,
+        )
+        if self._summary_cache is None or self._summary_cache[0] != key:
+            summary = summarize(self.graph, max_nodes or num_nodes, options, cluster)
+            self._summary_cache = (key, summary)
+            self.logger.info(f"Summarized map: {summary.note}")
+        return self._summary_cache[1]
+
+    def _resolve_layout(self, layout_algo: str) -> str:
+        """A known layout algorithm for the requested one (spring if unknown)."""
+        if layout_algo in LAYOUTS:
+            return layout_algo
+        # A flowchart direction ('LR', ...) only applies to Mermaid output
+        if layout_algo.upper() not in MERMAID_DIRECTIONS:
+            self.logger.warning(f"Unknown layout '{layout_algo}'. Defaulting to spring layout.")
+        return "spring"
+
+    def _compute_layout(self, graph, layout_algo: str) -> Dict[Any, Tuple[float, float]]:
+        """Node positions for ``graph``; failing layouts fall back to simpler ones."""
+        seed = self._layout_cache.seed
+        # Large spring layouts need scipy; the circular layout only needs numpy
+        fallbacks = [algo for algo in ("spring", "circular") if algo != layout_algo]
+        for algorithm in [layout_algo] + fallbacks[:-1]:
+            try:
+                return compute_layout(graph, algorithm, seed)
+            except Exception as layout_e:
+                self.logger.error(
+                    f"Error calculating layout '{algorithm}': {layout_e}. "
+                    f"Falling back to a simpler layout."
+                )
+        return compute_layout(graph, fallbacks[-1], seed)
+
+    def _store_layouts(self) -> None:
+        """Stores new layouts of the saved state of the current mapping alongside it."""
+        if self._mapping_name is None or self._unsaved_changes != (set(), set()):
+            return  # Positions must match the stored revision
+        version = self._aspect_versions["structure"]
+        if not self._layout_cache.unpersisted(version):
+            return
+        layouts = self._layout_cache.current(version)
+        try:
+            self.mapping_store.save_layouts(self._mapping_name, self._last_revision, layouts)
+            self._layout_cache.mark_persisted(layouts)
+        except Exception as e:
+            self.logger.warning(f"Could not store layouts of mapping '{self._mapping_name}': {e}")
+
+    def export_to_obsidian(self, cluster: Optional[str] = None) -> Optional[Tuple[str, Path]]:
         """
         Generates the components needed for an Obsidian note:
         Markdown content and the path to the visualization image.
         The image is saved in the ATLAS data directory.
         It is the caller's responsibility to place these into an Obsidian vault.
 
+        Args:
+            cluster: Cluster of the summarized map to drill into (see visualize).
+
         Returns:
             Optional[Tuple[str, Path]]: A tuple containing:
                 - str: The generated Markdown content.
@@ -385,10 +709,14 @@ class ATLASCore:
         try:
             # Generate visualization image within the ATLAS data directory
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            img_format = self.config.get("visualization", {}).get("default_format", "png")
+            vis_config = self.config.get("visualization", {})
+            engine = resolve_engine(None, None, vis_config)
+            img_format = file_extension(engine, vis_config)
             image_filename = f"atlas_map_obsidian_{timestamp}.{img_format}"
 
-            generated_image_path = self.visualize(output_filename=image_filename)
+            generated_image_path = self.visualize(
+                output_filename=image_filename, engine=engine, cluster=cluster
+            )
 
             if not generated_image_path or not generated_image_path.exists():
                 self._log_operation(
@@ -398,8 +726,13 @@ class ATLASCore:
                 )
                 return None
 
-            # Create markdown content
-            markdown_content = self._generate_markdown(generated_image_path.name)
+            # Create markdown content; Obsidian renders Mermaid charts inline
+            mermaid = None
+            if engine == MERMAID:
+                mermaid = generated_image_path.read_text(encoding="utf-8")
+            markdown_content = self._generate_markdown(
+                generated_image_path.name, mermaid, self._summarize(cluster)
+            )
 
             self._log_operation(
                 operation,
@@ -418,13 +751,21 @@ class ATLASCore:
     # Alias for compatibility with tests
     generate_obsidian_content = export_to_obsidian
 
-    def _generate_markdown(self, image_filename: str) -> str:
+    def _generate_markdown(
+        self,
+        image_filename: str,
+        mermaid: Optional[str] = None,
+        summary: Optional[GraphSummary] = None,
+    ) -> str:
         """
         Generates markdown content for Obsidian export.
 
         Args:
             image_filename: Base name of the image file (e.g., 'map.png').
                               Obsidian embedding format ![[filename]] will be used.
+            mermaid: Mermaid chart to embed as a code block instead of the image.
+            summary: Summary the visualization was drawn from; its largest
+                     clusters are listed.
 
         Returns:
             str: Markdown content
@@ -451,8 +792,8 @@ class ATLASCore:
         if num_nodes > 0:
             try:
                 centrality = nx.degree_centrality(self.graph)
-                # Sort and limit safely
-                central_nodes = sorted(centrality.items(), key=lambda x: x[1], reverse=True)
+                # Only the top 5 are needed; no full sort of large maps
+                central_nodes = heapq.nlargest(5, centrality.items(), key=lambda x: x[1])
                 central_nodes_str = (
                     "\n".join(
                         [
@@ -470,8 +811,29 @@ class ATLASCore:
                 central_nodes_str = "Error calculating centrality."
         # ---------------------
 
+        # --- Clusters of a summarized map ---
+        clusters_section = ""
+        if summary is not None:
+            largest = heapq.nlargest(
+                MAX_LISTED_CLUSTERS, summary.clusters.items(), key=lambda item: len(item[1])
+            )
+            cluster_lines = [
+                f"- **{name}**: {len(members)} nodes, "
+                f"{summary.graph.nodes[(CLUSTER, name)]['internal_edges']} internal connections"
+                for name, members in largest
+            ]
+            if len(summary.clusters) > len(largest):
+                cluster_lines.append(f"- ... and {len(summary.clusters) - len(largest)} more")
+            clusters_section = (
+                f"## Clusters\n\n{summary.note}.\n\n" + "\n".join(cluster_lines) + "\n\n"
+            )
+        # ---------------------
+
         # --- Markdown Generation ---
         # Use Obsidian's embed format ![[filename]]
+        visualization = f"![[{image_filename}]]"
+        if mermaid is not None:
+            visualization = f"```mermaid\n{mermaid.rstrip()}\n```"
         markdown = f"""# ATLAS - Systemic Mapping
 
 > "In the cartography of complex systems, we reveal not only \
@@ -482,7 +844,7 @@ class ATLASCore:
 
 ## Visualization
 
-![[{image_filename}]]
+{visualization}
 
 ## Statistics
 
@@ -491,7 +853,7 @@ class ATLASCore:
 - **Density**: {density:.4f}
 - **Weakly Connected**: {is_connected}
 
-## Top 5 Central Nodes (by Degree)
+{clusters_section}## Top 5 Central Nodes (by Degree)
 
 {central_nodes_str}
 
@@ -517,81 +879,193 @@ identifying emerging patterns and potential areas for optimization or expansion.
 
     def _save_mapping(self, name: str) -> Optional[Path]:
         """
-        Saves the current mapping in JSON format to the ATLAS data directory.
+        Saves the current mapping as a new revision in the mapping store.
+
+        The revision is a full checkpoint or, between checkpoints, a delta of
+        the nodes and edges changed since the previous revision (see MappingStore).
+        Compression and the number of retained checkpoints follow the 'storage'
+        config section.
 
         Args:
             name: Name of the mapping
 
         Returns:
-            Path: The path where the mapping was saved, or None on error.
+            Path: The path where the revision was saved, or None on error.
         """
         operation = "SAVE_MAPPING"
         try:
             timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            filename = f"{name.lower().replace(' ', '_')}_{timestamp}.json"
-            filepath = self.data_dir / filename
-
-            # Convert graph to node-link format (more standard for JSON)
-            graph_data = nx.node_link_data(self.graph)
-
-            # Add metadata
-            data = {
-                "metadata": {
-                    "name": name,
-                    "timestamp": timestamp,
-                    "version": self.version,
-                    "source": "ATLASCore",
-                },
-                "graph": graph_data,  # Embed node-link data
+            metadata = {
+                "name": name,
+                "timestamp": timestamp,
+                "version": self.version,
+                "graph_version": self._graph_version,
+                "source": "ATLASCore",
             }
-
-            # Save file
-            with open(filepath, "w", encoding="utf-8") as f:
-                json.dump(data, f, indent=2, ensure_ascii=False)
-
-            self._log_operation(operation, "Completed", f"Mapping '{name}' saved at: {filepath}")
+            touched = self._unsaved_changes if name == self._mapping_name else None
+            filepath, entry = self.mapping_store.save(name, self.graph, metadata, touched)
+            self._mapping_name = name
+            self._unsaved_changes = (set(), set())
+            self._last_revision = entry["revision"]
+            self._store_layouts()
+
+            changes = "" if entry["changes"] is None else f" ({entry['changes']} changes)"
+            self._log_operation(
+                operation,
+                "Completed",
+                f"Mapping '{name}' saved at: {filepath}",
+                f"Revision {entry['revision']}: {entry['kind']}{changes}",
+            )
             return filepath
         except Exception as e:
+            self._unsaved_changes = None
             self._log_operation(operation, "Failed", f"Error saving mapping '{name}': {e}")
             self.logger.exception(f"Error saving mapping '{name}': {e}")
             return None
 
-    def load_mapping(self, filepath: Path) -> bool:
+    def load_mapping(
+        self,
+        source: Union[Path, str],
+        revision: Optional[int] = None,
+        node_attributes: Optional[Dict[str, Any]] = None,
+        prefixes: Optional[Iterable[str]] = None,
+    ) -> bool:
         """
-        Loads a mapping from a JSON file.
+        Loads a mapping from the mapping store or from a JSON file.
+
+        Mapping documents are streamed: nodes and edges are decoded one at a
+        time and added in batches of storage.load_batch_size, so the raw JSON
+        is never held in memory next to the graph. With ``node_attributes`` or
+        ``prefixes`` only the matching subgraph is loaded; such a partial
+        mapping is not saved back by apply_delta(save=True).
 
         Args:
-             filepath: Path object to the JSON mapping file.
+             source: Name of a stored mapping, or Path to a mapping file. A stored
+                     revision file loads that revision; other files are read as
+                     standalone JSON mappings (optionally gzip-compressed).
+             revision: Revision of a stored mapping to rebuild; the latest if None.
+             node_attributes: Only load nodes having these attribute values.
+             prefixes: Only load nodes whose id starts with one of these prefixes
+                       (e.g. a component path).
 
         Returns:
              bool: True if loading was successful.
         """
         operation = "LOAD_MAPPING"
-        self._log_operation(operation, "Started", f"Loading mapping from: {filepath}")
+        self._log_operation(operation, "Started", f"Loading mapping from: {source}")
+        node_filter = NodeFilter.build(node_attributes, prefixes)
+
+        if isinstance(source, Path):
+            if not source.exists() or not source.is_file():
+                self._log_operation(operation, "Failed", f"Mapping file not found: {source}")
+                return False
+            stored = self._stored_revision(source)
+            if stored is not None:
+                return self._load_stored_mapping(*stored, node_filter)
+            return self._load_mapping_file(source, node_filter)
+        return self._load_stored_mapping(source, revision, node_filter)
+
+    def read_mapping_metadata(
+        self, source: Union[Path, str], revision: Optional[int] = None
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Reads only the metadata of a mapping, without loading its graph.
 
-        if not filepath.exists() or not filepath.is_file():
-            self._log_operation(operation, "Failed", f"Mapping file not found: {filepath}")
-            return False
+        Args:
+            source: Name of a stored mapping, or Path to a mapping file.
+            revision: Revision of a stored mapping; the latest if None.
 
+        Returns:
+            Dict[str, Any]: The mapping's metadata, or None if it cannot be read.
+        """
         try:
-            with open(filepath, "r", encoding="utf-8") as f:
-                data = json.load(f)
+            if isinstance(source, Path):
+                return read_metadata(source)
+            return self.mapping_store.metadata(source, revision)
+        except Exception as e:
+            self.logger.error(f"Error reading metadata of mapping {source}: {e}")
+            return None
 
-            # Validate basic structure
-            if "metadata" not in data or "graph" not in data:
-                raise ValueError("Invalid mapping file format: Missing metadata or graph keys.")
+    @staticmethod
+    def _stored_revision(filepath: Path) -> Optional[Tuple[str, int]]:
+        """(mapping name, revision) of a revision file in the mapping store, else None."""
+        manifest = filepath.parent / MANIFEST
+        if not manifest.exists():
+            return None
+        document = read_document(manifest)
+        for entry in document["revisions"]:
+            if entry["file"] == filepath.name:
+                return document["name"], entry["revision"]
+        return None
+
+    def _load_stored_mapping(
+        self, name: str, revision: Optional[int], node_filter: Optional[NodeFilter]
+    ) -> bool:
+        operation = "LOAD_MAPPING"
+        try:
+            latest = self.mapping_store.revisions(name)
+            graph, metadata = self.mapping_store.load(name, revision, node_filter)
+        except (FileNotFoundError, KeyError) as e:
+            self._log_operation(operation, "Failed", str(e).strip("'\""))
+            return False
+        except Exception as e:
+            self._log_operation(operation, "Failed", f"Error loading mapping '{name}': {e}")
+            self.logger.exception(f"Error loading mapping '{name}': {e}")
+            return False
 
-            # Load graph from node-link data
-            self.graph = nx.node_link_graph(data["graph"])
+        self.graph = graph
+        if node_filter is not None:
+            self._mapping_name = None
+        else:
+            self._mapping_name = name
+            if metadata["revision"] == latest[-1]["revision"]:
+                # The store diffs the next save against this revision
+                self._unsaved_changes = (set(), set())
+                self._last_revision = metadata["revision"]
+            self._restore_layouts(name, metadata["revision"])
+        self._log_operation(
+            operation,
+            "Completed",
+            f"Mapping '{name}' revision {metadata['revision']} loaded",
+            (
+                f"Graph has {self.graph.number_of_nodes()} nodes, "
+                f"{self.graph.number_of_edges()} edges."
+            ),
+        )
+        return True
+
+    def _restore_layouts(self, name: str, revision: int) -> None:
+        """Reuses the layouts stored with a mapping; they are exact if no revision in
+        between changed the graph structure, and otherwise seed incremental updates.
+        """
+        try:
+            layout_revision, layouts = self.mapping_store.load_layouts(name)
+        except Exception as e:
+            self.logger.warning(f"Could not read layouts of mapping '{name}': {e}")
+            return
+        if not layouts:
+            return
+        exact = self.mapping_store.same_structure(name, layout_revision, revision)
+        self._layout_cache.restore(layouts, self._aspect_versions["structure"] if exact else None)
+
+    def _load_mapping_file(self, filepath: Path, node_filter: Optional[NodeFilter]) -> bool:
+        operation = "LOAD_MAPPING"
+        try:
+            graph, metadata, skipped = load_mapping_document(
+                filepath, node_filter, self.mapping_store.load_batch_size
+            )
+            self.graph = graph
+            if node_filter is not None:
+                self._mapping_name = None
 
-            metadata = data["metadata"]
             self._log_operation(
                 operation,
                 "Completed",
                 f"Mapping '{metadata.get('name', 'Unknown')}' loaded from {filepath}",
                 (
                     f"Graph has {self.graph.number_of_nodes()} nodes, "
-                    f"{self.graph.number_of_edges()} edges."
+                    f"{self.graph.number_of_edges()} edges"
+                    + (f" ({skipped} nodes filtered out)." if node_filter else ".")
                 ),
             )
             return True
@@ -617,10 +1091,17 @@ identifying emerging patterns and potential areas for optimization or expansion.
         if enabled in config ('analysis.detect_communities': true).
         Also lists unique node and edge attributes found.
 
+        Each section is memoized against the versions of the graph aspects it
+        is computed from (see ANALYSIS_SECTION_ASPECTS), so repeated calls on an
+        unchanged graph are answered from cache and a change only recomputes
+        the sections it affects. Cached section values are shared between
+        results and must not be modified by callers.
+
         Returns:
             Dict[str, Any]: Dictionary containing analysis results under keys
                             like 'basic_metrics', 'centrality', 'communities',
-                            'node_attributes', 'edge_attributes'.
+                            'node_attributes', 'edge_attributes', plus the
+                            'graph_version' they describe.
                             Returns {"error": message} on failure (e.g., empty graph).
         """
         operation = "ANALYZE_SYSTEM"
@@ -636,116 +1117,37 @@ identifying emerging patterns and potential areas for optimization or expansion.
             return {"error": "No mapped system"}
 
         try:
-            self.logger.info(
-                f"Analyzing system with {self.graph.number_of_nodes()} nodes "
-                f"and {self.graph.number_of_edges()} edges"
-            )
-
-            num_nodes = self.graph.number_of_nodes()
-            num_edges = self.graph.number_of_edges()
-            density = nx.density(self.graph) if num_nodes > 1 else 0
-
-            # Calculate average degree safely
-            total_degree = sum(d for _, d in self.graph.degree())
-            avg_degree = total_degree / num_nodes if num_nodes > 0 else 0
-
-            # Check connectivity safely
-            is_weakly_connected = False
-            is_strongly_connected = False  # Specific to DiGraph
-            if num_nodes > 0:
-                try:
-                    is_weakly_connected = nx.is_weakly_connected(self.graph)
-                    is_strongly_connected = nx.is_strongly_connected(self.graph)
-                except Exception as conn_e:
-                    self.logger.warning(f"Could not determine graph connectivity: {conn_e}")
-
-            # --- Basic Analysis ---
-            analysis = {
-                "basic_metrics": {
-                    "num_nodes": num_nodes,
-                    "num_edges": num_edges,
-                    "density": density,
-                    "is_weakly_connected": is_weakly_connected,
-                    "is_strongly_connected": is_strongly_connected,
-                    "avg_degree": avg_degree,
-                },
-                "centrality": {},
-                "communities": {},
-                "node_attributes": {},
-                "edge_attributes": {},
+            # Direct edits of self.graph that changed its size without
+            # mark_graph_changed would otherwise be answered from stale sections
+            if self._current_shape() != self._graph_shape:
+                self.logger.debug("Graph changed outside ATLASCore; invalidating analysis cache")
+                self.mark_graph_changed()
+
+            sections: Dict[str, Callable[[], Any]] = {
+                "basic_metrics": self._analyze_basic_metrics,
+                "centrality": self._analyze_centrality,
+                "communities": self._analyze_communities,
+                "node_attributes": self._analyze_node_attributes,
+                "edge_attributes": self._analyze_edge_attributes,
             }
+            analysis: Dict[str, Any] = {}
+            recomputed = []
+            for section, compute in sections.items():
+                key = self._section_key(section)
+                cached = self._section_cache.get(section)
+                if cached is not None and cached[0] == key:
+                    analysis[section] = cached[1]
+                    continue
+                analysis[section] = compute()
+                self._section_cache[section] = (key, analysis[section])
+                recomputed.append(section)
+            analysis["graph_version"] = self._graph_version
 
-            # --- Centrality Analysis ---
-            if num_nodes > 1:
-                try:
-                    analysis["centrality"]["degree"] = nx.degree_centrality(self.graph)
-                except Exception as e:
-                    self.logger.error(f"Error calculating degree centrality: {e}")
-                try:
-                    analysis["centrality"]["betweenness"] = nx.betweenness_centrality(self.graph)
-                except Exception as e:
-                    self.logger.error(f"Error calculating betweenness centrality: {e}")
-                # Closeness requires connected components for DiGraph
-                # if is_strongly_connected: # Or check weak components and calculate per component?
-                #     try:
-                #         analysis["centrality"]["closeness"] = nx.closeness_centrality(self.graph)
-                #     except Exception as e:
-                #         self.logger.error(
-                #             f"Error calculating closeness centrality: {e}"
-                #         )
-                # else:
-                #     self.logger.warning(
-                #         "Closeness centrality skipped "
-                #         "(graph not strongly connected)."
-                #     )
-
-            # --- Community Detection (Optional, requires python-louvain) ---
-            detect_communities_enabled = self.config.get("analysis", {}).get(
-                "detect_communities", False
+            self.logger.info(
+                f"Analyzed system with {self.graph.number_of_nodes()} nodes and "
+                f"{self.graph.number_of_edges()} edges (graph version {self._graph_version}, "
+                f"recomputed: {', '.join(recomputed) or 'none'})"
             )
-            if detect_communities_enabled and num_nodes > 2:
-                try:
-                    # Convert to undirected for Louvain if necessary
-                    # Note: Louvain works best on undirected graphs. Consider implications.
-                    import community as community_louvain  # pip install python-louvain
-
-                    # Using the undirected version for community detection
-                    undirected_graph = self.graph.to_undirected()
-                    partition = community_louvain.best_partition(undirected_graph)
-                    num_communities = len(set(partition.values()))
-                    analysis["communities"] = {
-                        "method": "Louvain (on undirected graph)",
-                        "num_communities": num_communities,
-                        "partition": partition,
-                    }
-                    self.logger.info(
-                        f"Detected {num_communities} communities using Louvain method."
-                    )
-                except ImportError:
-                    self.logger.warning(
-                        "Community detection skipped: 'python-louvain' library not installed. "
-                        "Run 'pip install python-louvain'."
-                    )
-                    analysis["communities"] = {"error": "python-louvain not installed"}
-                except Exception as e:
-                    self.logger.error(f"Error during community detection: {e}")
-                    analysis["communities"] = {"error": str(e)}
-            # --------------------------------------------------------------
-
-            # --- Attribute Analysis ---
-            # Collect unique node attributes
-            node_attrs = set()
-            for _, data in self.graph.nodes(data=True):
-                node_attrs.update(data.keys())
-            analysis["node_attributes"] = list(node_attrs)
-
-            # Collect unique edge attributes
-            edge_attrs = set()
-            for _, _, data in self.graph.edges(data=True):
-                edge_attrs.update(data.keys())
-            analysis["edge_attributes"] = list(edge_attrs)
-            # ---------------------------
-
             self._log_operation(
                 operation,
                 "Completed",
@@ -758,3 +1160,126 @@ identifying emerging patterns and potential areas for optimization or expansion.
             self._log_operation(operation, "Failed", f"Error during system analysis: {str(e)}")
             self.logger.exception(f"Error during system analysis: {e}")
             return {"error": f"Analysis failed: {str(e)}"}
+
+    def _section_key(self, section: str) -> Tuple:
+        """Memoization key of an analysis section: versions of the aspects it reads."""
+        key = tuple(self._aspect_versions[aspect] for aspect in ANALYSIS_SECTION_ASPECTS[section])
+        analysis_config = self.config.get("analysis", {})
+        if section == "centrality":
+            key += (json.dumps(analysis_config.get("centrality", {}), sort_keys=True),)
+        elif section == "communities":
+            key += (bool(analysis_config.get("detect_communities", False)),)
+        return key
+
+    def _analyze_basic_metrics(self) -> Dict[str, Any]:
+        num_nodes = self.graph.number_of_nodes()
+        num_edges = self.graph.number_of_edges()
+        density = nx.density(self.graph) if num_nodes > 1 else 0
+
+        # Calculate average degree safely
+        total_degree = sum(d for _, d in self.graph.degree())
+        avg_degree = total_degree / num_nodes if num_nodes > 0 else 0
+
+        # Check connectivity safely
+        is_weakly_connected = False
+        is_strongly_connected = False  # Specific to DiGraph
+        if num_nodes > 0:
+            try:
+                is_weakly_connected = nx.is_weakly_connected(self.graph)
+                is_strongly_connected = nx.is_strongly_connected(self.graph)
+            except Exception as conn_e:
+                self.logger.warning(f"Could not determine graph connectivity: {conn_e}")
+
+        return {
+            "num_nodes": num_nodes,
+            "num_edges": num_edges,
+            "density": density,
+            "is_weakly_connected": is_weakly_connected,
+            "is_strongly_connected": is_strongly_connected,
+            "avg_degree": avg_degree,
+        }
+
+    def _analyze_centrality(self) -> Dict[str, Any]:
+        """Degree and betweenness centrality.
+
+        Betweenness is computed exactly, from a seeded k-source sample, or
+        exactly in parallel worker processes, per 'analysis.centrality' (see
+        ``centrality.CentralityConfig``); the parameters used are reported
+        under 'betweenness_params'.
+        """
+        centrality: Dict[str, Any] = {}
+        if self.graph.number_of_nodes() > 1:
+            try:
+                centrality["degree"] = nx.degree_centrality(self.graph)
+            except Exception as e:
+                self.logger.error(f"Error calculating degree centrality: {e}")
+            try:
+                config = CentralityConfig.from_config(
+                    self.config.get("analysis", {}).get("centrality", {})
+                )
+                values, params = betweenness_centrality(self.graph, config)
+                centrality["betweenness"] = values
+                centrality["betweenness_params"] = params
+                self.logger.info(f"Betweenness centrality computed: {params}")
+            except Exception as e:
+                self.logger.error(f"Error calculating betweenness centrality: {e}")
+            # Closeness requires connected components for DiGraph
+            # if is_strongly_connected: # Or check weak components and calculate per component?
+            #     try:
+            #         centrality["closeness"] = nx.closeness_centrality(self.graph)
+            #     except Exception as e:
+            #         self.logger.error(
+            #             f"Error calculating closeness centrality: {e}"
+            #         )
+            # else:
+            #     self.logger.warning(
+            #         "Closeness centrality skipped "
+            #         "(graph not strongly connected)."
+            #     )
+        return centrality
+
+    def _analyze_communities(self) -> Dict[str, Any]:
+        """Community Detection (Optional, requires python-louvain)."""
+        detect_communities_enabled = self.config.get("analysis", {}).get(
+            "detect_communities", False
+        )
+        if not detect_communities_enabled or self.graph.number_of_nodes() <= 2:
+            return {}
+        try:
+            # Convert to undirected for Louvain if necessary
+            # Note: Louvain works best on undirected graphs. Consider implications.
+            import community as community_louvain  # pip install python-louvain
+
+            # Using the undirected version for community detection
+            undirected_graph = self.graph.to_undirected()
+            partition = community_louvain.best_partition(undirected_graph)
+            num_communities = len(set(partition.values()))
+            self.logger.info(f"Detected {num_communities} communities using Louvain method.")
+            return {
+                "method": "Louvain (on undirected graph)",
+                "num_communities": num_communities,
+                "partition": partition,
+            }
+        except ImportError:
+            self.logger.warning(
+                "Community detection skipped: 'python-louvain' library not installed. "
+                "Run 'pip install python-louvain'."
+            )
+            return {"error": "python-louvain not installed"}
+        except Exception as e:
+            self.logger.error(f"Error during community detection: {e}")
+            return {"error": str(e)}
+
+    def _analyze_node_attributes(self) -> list:
+        """Unique node attribute names."""
+        node_attrs = set()
+        for _, data in self.graph.nodes(data=True):
+            node_attrs.update(data.keys())
+        return list(node_attrs)
+
+    def _analyze_edge_attributes(self) -> list:
+        """Unique edge attribute names."""
+        edge_attrs = set()
+        for _, _, data in self.graph.edges(data=True):
+            edge_attrs.update(data.keys())
+        return list(edge_attrs)
@@ -1,6 +1,9 @@
 import logging
+from collections.abc import MutableMapping
 from datetime import datetime
-from typing import Any, Dict, Optional, Set
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from .map_cache import MapCache
 
 # Replace the koios logger with standard logging for testing
 # from koios.logger import KoiosLogger
@@ -37,13 +40,88 @@ except ImportError:
             )
 
 
+class RelationshipIndex(MutableMapping):
+    """Relationships indexed by (source, target, type) in both directions.
+
+    Out-edges are kept per source and in-edges per target, each keyed by the
+    other end and the relationship type, so upserts, removals and neighbour
+    lookups are O(1) per edge. As a mapping it reads like the former
+    ``{source: [relationship, ...]}`` dict.
+    """
+
+    def __init__(self, relationships: Optional[Mapping[str, Iterable[Dict[str, Any]]]] = None):
+        self._out: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        self._in: Dict[str, Dict[Tuple[str, str], Dict[str, Any]]] = {}
+        if relationships:
+            self.update(relationships)
+
+    def upsert(self, relationship: Dict[str, Any], source: Optional[str] = None) -> None:
+        """Add a relationship, replacing one with the same (source, target, type)."""
+        source = relationship["source"] if source is None else source
+        target, relationship_type = relationship["target"], relationship["type"]
+        out_edges = self._out.setdefault(source, {})
+        # Re-inserted last, so an updated relationship moves to the end as before
+        out_edges.pop((target, relationship_type), None)
+        out_edges[(target, relationship_type)] = relationship
+        self._in.setdefault(target, {})[(source, relationship_type)] = relationship
+
+    def discard(self, source: str, target: str, relationship_type: str) -> Optional[Dict[str, Any]]:
+        """Remove one relationship; returns it, or None if it did not exist."""
+        relationship = self._out.get(source, {}).pop((target, relationship_type), None)
+        if relationship is not None:
+            in_edges = self._in[target]
+            del in_edges[(source, relationship_type)]
+            if not in_edges:
+                del self._in[target]
+        return relationship
+
+    def get_relationship(
+        self, source: str, target: str, relationship_type: str
+    ) -> Optional[Dict[str, Any]]:
+        return self._out.get(source, {}).get((target, relationship_type))
+
+    def out_edges(self, component: str) -> Iterable[Dict[str, Any]]:
+        """Relationships whose source is ``component``."""
+        return self._out.get(component, {}).values()
+
+    def in_edges(self, component: str) -> Iterable[Dict[str, Any]]:
+        """Relationships whose target is ``component``."""
+        return self._in.get(component, {}).values()
+
+    def edge_count(self) -> int:
+        return sum(len(out_edges) for out_edges in self._out.values())
+
+    def __getitem__(self, source: str) -> List[Dict[str, Any]]:
+        return list(self._out[source].values())
+
+    def __setitem__(self, source: str, relationships: Iterable[Dict[str, Any]]) -> None:
+        if source in self._out:
+            del self[source]
+        self._out[source] = {}
+        for relationship in relationships:
+            self.upsert(relationship, source)
+
+    def __delitem__(self, source: str) -> None:
+        for target, relationship_type in list(self._out[source]):
+            self.discard(source, target, relationship_type)
+        del self._out[source]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._out)
+
+    def __len__(self) -> int:
+        return len(self._out)
+
+
 class AtlasCartographer:
     """System cartography: Manages the in-memory map state and Mycelium updates.
 
     This class holds the current representation of the system map (nodes,
     relationships, metadata) as potentially updated by messages received
     via Mycelium. It handles requests to generate maps based on this internal
-    state and implements caching for map generation results.
+    state and implements caching for map generation results: each cached map
+    remembers the components it was built from, so an update invalidates
+    exactly the maps that included the updated component.
 
     It does NOT typically perform the initial discovery or analysis itself,
     relying on external updates or potentially delegating complex generation/
@@ -62,6 +140,8 @@ class AtlasCartographer:
         Args:
             config (Dict[str, Any]): Configuration dictionary, expects keys like
                                      'max_depth', 'cache_duration', and 'mycelium.topics'.
+                                     'performance.cache' ('enabled', 'max_size',
+                                     'max_bytes') bounds the map cache.
             logger (logging.Logger): Pre-configured logger instance.
             mycelium_client (Optional[MyceliumClient]): Mycelium client for messaging.
                                                      If provided, message handlers are set up.
@@ -77,9 +157,9 @@ class AtlasCartographer:
 
         # Initialize system map
         self.system_map = {}
-        self.relationships = {}
+        self._relationships = RelationshipIndex()
         self.metadata = {}
-        self.analysis_cache = {}
+        self.analysis_cache = self._new_map_cache()
 
         # Setup Mycelium handlers if client provided
         if self.mycelium:
@@ -195,6 +275,45 @@ class AtlasCartographer:
                     {"request_id": message.id, "status": "error", "error": str(e)},
                 )
 
+    @property
+    def relationships(self) -> RelationshipIndex:
+        """Relationships of the internal state, indexed by (source, target, type)."""
+        return self._relationships
+
+    @relationships.setter
+    def relationships(self, relationships: Mapping[str, Iterable[Dict[str, Any]]]) -> None:
+        """Replace all relationships, e.g. with a ``{source: [relationship, ...]}`` dict."""
+        if not isinstance(relationships, RelationshipIndex):
+            relationships = RelationshipIndex(relationships)
+        self._relationships = relationships
+
+    def _new_map_cache(self) -> MapCache:
+        cache_config = self.config.get("performance", {}).get("cache", {})
+        enabled = cache_config.get("enabled", True)
+        return MapCache(
+            max_entries=cache_config.get("max_size", 1000) if enabled else 0,
+            max_bytes=cache_config.get("max_bytes"),
+        )
+
+    @property
+    def analysis_cache(self) -> MapCache:
+        """Cache of generated maps (see ``MapCache``)."""
+        return self._analysis_cache
+
+    @analysis_cache.setter
+    def analysis_cache(self, entries: Mapping[str, Dict[str, Any]]) -> None:
+        """Replace the map cache, e.g. with a dict of ``{"result", "timestamp"}`` entries."""
+        if not isinstance(entries, MapCache):
+            cache = self._new_map_cache()
+            for key, entry in entries.items():
+                cache[key] = entry
+            entries = cache
+        self._analysis_cache = entries
+
+    def cache_metrics(self) -> Dict[str, Any]:
+        """Hit, miss, invalidation, eviction and usage counters of the map cache."""
+        return self.analysis_cache.metrics()
+
     async def _publish_alert(self, alert_type: str, message: str, details: Dict[str, Any]):
         """Publish an alert through Mycelium."""
         if not self.mycelium:
@@ -219,8 +338,10 @@ class AtlasCartographer:
         """Generate a map subsection from the internal state.
 
         Traverses the internally stored relationships (`self.relationships`)
-        starting from the target component up to the specified depth.
-        Uses cached results if available and valid.
+        breadth-first from the target component. The map holds every component
+        at most ``depth`` relationships away from the target, together with all
+        outgoing relationships of those components. Uses cached results if
+        available and valid.
 
         Args:
             target: The starting component ID for the map.
@@ -234,15 +355,12 @@ class AtlasCartographer:
         try:
             # Check cache first
             cache_key = f"{target}:{depth}:{include_metadata}"
-            if cache_key in self.analysis_cache:
-                cache_entry = self.analysis_cache[cache_key]
-                cache_age = (datetime.now() - cache_entry["timestamp"]).total_seconds()
-
-                if cache_age < self.config["cache_duration"]:
-                    self.logger.info(f"Returning cached map for {target} (age: {cache_age:.1f}s)")
-                    return cache_entry["result"]
-                else:
-                    self.logger.info(f"Cache expired for {target} (age: {cache_age:.1f}s)")
+            cached = self.analysis_cache.lookup(
+                cache_key, datetime.now(), self.config["cache_duration"]
+            )
+            if cached is not None:
+                self.logger.info(f"Returning cached map for {target}")
+                return cached
 
             if depth > self.config["max_depth"]:
                 depth = self.config["max_depth"]
@@ -252,11 +370,11 @@ class AtlasCartographer:
                     {"target": target, "requested_depth": depth},
                 )
 
-            visited = set()
-            result = await self._build_map_recursive(target, depth, visited, include_metadata)
+            touched: Set[str] = set()
+            result = self._build_map(target, depth, include_metadata, touched)
 
             # Update cache
-            self.analysis_cache[cache_key] = {"result": result, "timestamp": datetime.now()}
+            self.analysis_cache.put(cache_key, result, datetime.now(), touched or None)
 
             return result
 
@@ -264,48 +382,52 @@ class AtlasCartographer:
             self.logger.error(f"Error generating map for {target}: {e}", exc_info=True)
             raise
 
-    async def _build_map_recursive(
-        self, target: str, depth: int, visited: Set[str], include_metadata: bool
-    ) -> Dict[str, Any]:
-        """Build a map recursively (internal implementation, wraps _map_component)."""
-        # This is a stub method that just wraps _map_component for testing mocking purposes
-        result = {"nodes": {}, "relationships": [], "metadata": {} if include_metadata else None}
-        await self._map_component(target, depth, visited, result, include_metadata)
-        return result
-
-    async def _map_component(
+    def _build_map(
         self,
-        component: str,
+        target: str,
         depth: int,
-        visited: Set[str],
-        result: Dict[str, Any],
         include_metadata: bool,
-    ):
-        """Recursively traverse and map components based on internal state."""
-        if depth < 0 or component in visited:
-            return
-
-        visited.add(component)
-
-        # Only add to nodes if it exists in the system_map
-        if component in self.system_map:
-            result["nodes"][component] = self.system_map[component]
-
-            # Only add metadata for components that exist
-            if include_metadata and component in self.metadata:
-                result["metadata"][component] = self.metadata[component]
+        visited: Optional[Set[str]] = None,
+    ) -> Dict[str, Any]:
+        """Level-synchronous BFS over the relationship index, up to ``depth`` levels.
 
-        if component in self.relationships:
-            for rel in self.relationships[component]:
-                result["relationships"].append(rel)
-                target = rel["target"]
-                if target not in visited:
-                    await self._map_component(target, depth - 1, visited, result, include_metadata)
+        Each component is expanded once, at its shortest distance from the
+        target, so the result does not depend on the order of relationships.
+        The expanded components are added to ``visited``, if given.
+        """
+        result = {"nodes": {}, "relationships": [], "metadata": {} if include_metadata else None}
+        if visited is None:
+            visited = set()
+        if depth < 0:
+            return result
+        visited.add(target)
+        frontier = [target]
+        level = 0
+        while frontier:
+            next_frontier = []
+            for component in frontier:
+                # Only add to nodes if it exists in the system_map
+                if component in self.system_map:
+                    result["nodes"][component] = self.system_map[component]
+
+                    # Only add metadata for components that exist
+                    if include_metadata and component in self.metadata:
+                        result["metadata"][component] = self.metadata[component]
+
+                for rel in self.relationships.out_edges(component):
+                    result["relationships"].append(rel)
+                    neighbour = rel["target"]
+                    if level < depth and neighbour not in visited:
+                        visited.add(neighbour)
+                        next_frontier.append(neighbour)
+            frontier = next_frontier
+            level += 1
+        return result
 
     async def update_metadata(self, component: str, metadata: Dict[str, Any]):
         """Update metadata for a component in the internal state (`self.metadata`).
 
-        Also invalidates relevant cache entries.
+        Also invalidates the cached maps that include the component.
         """
         try:
             # Invalidate cache entries for this component
@@ -323,16 +445,14 @@ class AtlasCartographer:
     ):
         """Update or create a relationship in the internal state (`self.relationships`).
 
-        Removes any existing relationship of the same type between source and target
-        before adding the new one. Invalidates relevant cache entries.
+        Replaces any existing relationship of the same type between source and
+        target (an O(1) upsert in the relationship index). Invalidates the
+        cached maps that expanded ``source``; maps that only reach ``target``
+        do not include the source's relationships and stay valid.
         """
         try:
-            # Invalidate cache entries for source and target
+            # Only maps that expanded the source list its relationships
             self._invalidate_cache_for_component(source)
-            self._invalidate_cache_for_component(target)
-
-            if source not in self.relationships:
-                self.relationships[source] = []
 
             # Update existing relationship or add new one
             relationship = {
@@ -341,14 +461,7 @@ class AtlasCartographer:
                 "type": relationship_type,
                 "metadata": metadata or {},
             }
-
-            # Remove existing relationship if present
-            self.relationships[source] = [
-                r
-                for r in self.relationships[source]
-                if r["target"] != target or r["type"] != relationship_type
-            ]
-            self.relationships[source].append(relationship)
+            self.relationships.upsert(relationship)
 
             self.logger.info(f"Updated relationship: {source} -> {target} ({relationship_type})")
 
@@ -359,12 +472,7 @@ class AtlasCartographer:
             raise
 
     def _invalidate_cache_for_component(self, component: str):
-        """Invalidate cache entries related to a specific component."""
-        keys_to_remove = []
-        for key in self.analysis_cache:
-            if key.startswith(f"{component}:"):
-                keys_to_remove.append(key)
-
-        for key in keys_to_remove:
-            del self.analysis_cache[key]
-            self.logger.debug(f"Invalidated cache entry: {key}")
+        """Invalidate the cached maps that include a specific component."""
+        count = self.analysis_cache.invalidate_component(component)
+        if count:
+            self.logger.debug(f"Invalidated {count} cached map(s) including {component}")
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+EGOS - ATLAS Layout Cache
+=========================
+
+Node positions reused across renders of an ATLAS map.
+
+Positions are cached per layout key (the algorithm, plus the node budget
+when only part of the graph is drawn) and tagged with the structure
+version of the graph they were computed for. Renders of an unchanged
+structure reuse them as they are. After a structural change, force-directed
+layouts are updated incrementally: surviving nodes start from their
+previous positions, new nodes are placed next to their neighbours, and
+only the nodes touched by the change are free to move. This keeps maps
+visually stable between updates.
+
+Version: 1.0.0
+"""
+
+import math
+import random
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import networkx as nx
+
+Positions = Dict[Any, Tuple[float, float]]
+
+# Layouts that accept initial positions and fixed nodes
+SEEDABLE_LAYOUTS = ("spring",)
+
+CACHED = "cached"
+INCREMENTAL = "incremental"
+COMPUTED = "computed"
+
+
+@dataclass
+class _LayoutEntry:
+    version: int
+    positions: Positions
+    # Nodes touched since the positions were computed; None if not known
+    moved: Optional[Set[Any]] = field(default_factory=set)
+    persisted: bool = False
+
+
+def place_new_nodes(graph, known: Positions, rng: random.Random) -> Positions:
+    """Initial positions: known ones, and new nodes at the centre of their placed neighbours.
+
+    Nodes without placed neighbours go to a random spot within the known bounds.
+    """
+    positions = dict(known)
+    xs = [x for x, _ in known.values()] or [0.0]
+    ys = [y for _, y in known.values()] or [0.0]
+    spread = max(max(xs) - min(xs), max(ys) - min(ys)) or 1.0
+    jitter = spread * 0.01
+    for node in graph:
+        if node in positions:
+            continue
+        neighbours = [positions[n] for n in nx.all_neighbors(graph, node) if n in positions]
+        if neighbours:
+            x = sum(p[0] for p in neighbours) / len(neighbours) + rng.uniform(-jitter, jitter)
+            y = sum(p[1] for p in neighbours) / len(neighbours) + rng.uniform(-jitter, jitter)
+        else:
+            x, y = rng.uniform(min(xs), max(xs)), rng.uniform(min(ys), max(ys))
+        positions[node] = (x, y)
+    return positions
+
+
+def _edge_length(graph, positions: Positions) -> Optional[float]:
+    """Median length of the laid-out edges: the spring length matching the existing
+    layout, which was rescaled after its own simulation.
+    """
+    lengths = sorted(
+        math.dist(positions[u], positions[v])
+        for u, v in graph.edges()
+        if u in positions and v in positions and u != v
+    )
+    if not lengths:
+        return None
+    return lengths[len(lengths) // 2] or None
+
+
+def incremental_layout(
+    graph, previous: Positions, moved: Optional[Set[Any]], seed: int
+) -> Optional[Positions]:
+    """Update ``previous`` spring-layout positions for the current graph.
+
+    Args:
+        graph: The changed graph.
+        previous: Positions computed before the change.
+        moved: Nodes whose edges or presence changed; None if unknown, in which
+               case every node may move (still starting from ``previous``).
+        seed: Random seed for placement and the force simulation.
+
+    Returns:
+        Positions, or None if no previous position survives the change.
+    """
+    known = {node: previous[node] for node in graph if node in previous}
+    if not known:
+        return None
+    positions = place_new_nodes(graph, known, random.Random(seed))
+    if moved is None:
+        fixed: Optional[List[Any]] = None
+    else:
+        fixed = [node for node in known if node not in moved]
+        if len(fixed) == len(positions):
+            return positions  # Only removals
+    if graph.is_directed():
+        graph = graph.to_undirected(as_view=True)  # See renderer.FORCE_LAYOUTS
+    try:
+        updated = nx.spring_layout(
+            graph, pos=positions, fixed=fixed or None, k=_edge_length(graph, known), seed=seed
+        )
+    except Exception:
+        # Large spring layouts need scipy; keep the placement of the new nodes
+        return positions
+    return {node: (float(x), float(y)) for node, (x, y) in updated.items()}
+
+
+class LayoutCache:
+    """Positions per layout key, valid for one structure version of the graph."""
+
+    def __init__(self, seed: int = 42):
+        self.seed = seed
+        self._entries: Dict[str, _LayoutEntry] = {}
+        self.hits = 0
+        self.incremental_updates = 0
+        self.full_computations = 0
+
+    def note_change(self, nodes: Optional[Iterable[Any]]) -> None:
+        """Record a structural change touching ``nodes`` (None if not known)."""
+        nodes = None if nodes is None else set(nodes)
+        for entry in self._entries.values():
+            if nodes is None or entry.moved is None:
+                entry.moved = None
+            else:
+                entry.moved.update(nodes)
+
+    def get(
+        self, key: str, graph, version: int, compute: Callable[[], Positions]
+    ) -> Tuple[Positions, str]:
+        """Positions for ``graph`` at ``version``, and whether they were cached,
+        updated incrementally or computed with ``compute``.
+        """
+        entry = self._entries.get(key)
+        if entry is not None and entry.version == version:
+            self.hits += 1
+            return entry.positions, CACHED
+        positions = None
+        if entry is not None and key.split("|", 1)[0] in SEEDABLE_LAYOUTS:
+            positions = incremental_layout(graph, entry.positions, entry.moved, self.seed)
+        if positions is not None:
+            self.incremental_updates += 1
+            how = INCREMENTAL
+        else:
+            positions = compute()
+            self.full_computations += 1
+            how = COMPUTED
+        self._entries[key] = _LayoutEntry(version, positions)
+        return positions, how
+
+    def unpersisted(self, version: int) -> Dict[str, Positions]:
+        """Layouts of ``version`` not yet stored with the mapping (see mark_persisted)."""
+        return {
+            key: entry.positions
+            for key, entry in self._entries.items()
+            if entry.version == version and not entry.persisted
+        }
+
+    def current(self, version: int) -> Dict[str, Positions]:
+        """All layouts of ``version``."""
+        return {key: e.positions for key, e in self._entries.items() if e.version == version}
+
+    def mark_persisted(self, keys: Iterable[str]) -> None:
+        for key in keys:
+            self._entries[key].persisted = True
+
+    def restore(self, layouts: Dict[str, Positions], version: Optional[int]) -> None:
+        """Replace the cache with stored layouts.
+
+        Args:
+            layouts: Positions per layout key.
+            version: Structure version they are valid for, or None if they were
+                     stored for a different revision (then they only seed updates).
+        """
+        self._entries = {
+            key: _LayoutEntry(
+                -1 if version is None else version,
+                positions,
+                moved=None if version is None else set(),
+                persisted=True,
+            )
+            for key, positions in layouts.items()
+        }
+
+    def clear(self) -> None:
+        self._entries.clear()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+EGOS - ATLAS Map Cache
+======================
+
+Bounded cache for maps generated by AtlasCartographer.
+
+Each entry records the components its map was built from, and a reverse
+index maps every component to the entries that touched it. Updating a
+component therefore invalidates exactly the maps that included it, at a
+cost proportional to the number of affected entries. Entries are evicted
+in LRU order once the entry or byte budget is exceeded, and expired
+entries are dropped in insertion order as the cache is used.
+
+Version: 1.0.0
+"""
+
+import json
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, Iterator, Optional, Set
+
+
+def estimate_size(result: Dict[str, Any]) -> int:
+    """Approximate size of a map result in bytes (its JSON encoding)."""
+    return len(json.dumps(result, default=str))
+
+
+def components_of(target: str, result: Dict[str, Any]) -> Set[str]:
+    """Components a map result depends on, derived from its content."""
+    components = {target}
+    components.update(result.get("nodes") or {})
+    for rel in result.get("relationships") or []:
+        components.add(rel["source"])
+    return components
+
+
+class MapCache:
+    """LRU map cache with entry and byte budgets and per-component invalidation.
+
+    A budget of None is unbounded; ``max_entries=0`` disables caching.
+
+    Entries are ``{"result", "timestamp", "components", "size"}`` dicts keyed
+    by the cartographer's ``"target:depth:include_metadata"`` keys.
+    """
+
+    def __init__(self, max_entries: Optional[int] = 1000, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        # Keys in insertion order, so expired entries are found from the front
+        self._inserted: "OrderedDict[str, datetime]" = OrderedDict()
+        self._by_component: Dict[str, Set[str]] = {}
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def lookup(self, key: str, now: datetime, max_age: float) -> Optional[Dict[str, Any]]:
+        """Cached result for ``key`` if younger than ``max_age`` seconds, else None."""
+        self.purge_expired(now, max_age)
+        entry = self._entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        if (now - entry["timestamp"]).total_seconds() >= max_age:
+            self._remove(key)
+            self.expirations += 1
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry["result"]
+
+    def put(
+        self,
+        key: str,
+        result: Dict[str, Any],
+        timestamp: datetime,
+        components: Optional[Iterable[str]] = None,
+    ) -> bool:
+        """Store a map result; returns False if it alone exceeds the byte budget.
+
+        Args:
+            key: Cache key ("target:depth:include_metadata").
+            result: The generated map.
+            timestamp: Generation time, compared against the TTL on lookup.
+            components: Components the map was built from. Derived from the
+                        result if not given.
+        """
+        if key in self._entries:
+            self._remove(key)
+        if self.max_entries == 0:
+            return False
+        size = estimate_size(result)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return False
+        if components is None:
+            components = components_of(key.rsplit(":", 2)[0], result)
+        components = set(components)
+        self._entries[key] = {
+            "result": result,
+            "timestamp": timestamp,
+            "components": components,
+            "size": size,
+        }
+        self._inserted[key] = timestamp
+        for component in components:
+            self._by_component.setdefault(component, set()).add(key)
+        self._bytes += size
+        while (self.max_entries is not None and len(self._entries) > self.max_entries) or (
+            self.max_bytes is not None and self._bytes > self.max_bytes
+        ):
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+        return True
+
+    def invalidate_component(self, component: str) -> int:
+        """Drop every entry whose map touched ``component``; returns the count."""
+        keys = self._by_component.get(component)
+        if not keys:
+            return 0
+        count = 0
+        for key in list(keys):
+            self._remove(key)
+            count += 1
+        self.invalidations += count
+        return count
+
+    def purge_expired(self, now: datetime, max_age: float) -> int:
+        """Drop entries older than ``max_age`` seconds; returns the count."""
+        count = 0
+        while self._inserted:
+            key, timestamp = next(iter(self._inserted.items()))
+            if (now - timestamp).total_seconds() < max_age:
+                break
+            self._remove(key)
+            count += 1
+        self.expirations += count
+        return count
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._inserted.clear()
+        self._by_component.clear()
+        self._bytes = 0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Counters and current usage of the cache."""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "invalidations": self.invalidations,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+        }
+
+    def _remove(self, key: str) -> None:
+        entry = self._entries.pop(key)
+        self._inserted.pop(key, None)
+        self._bytes -= entry["size"]
+        for component in entry["components"]:
+            keys = self._by_component.get(component)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._by_component[component]
+
+    # Mapping access to entries, e.g. for priming the cache in tests
+    def __contains__(self, key: object) -> bool:
+        return key in self._entries
+
+    def __getitem__(self, key: str) -> Dict[str, Any]:
+        return self._entries[key]
+
+    def __setitem__(self, key: str, entry: Dict[str, Any]) -> None:
+        self.put(key, entry["result"], entry["timestamp"], entry.get("components"))
+
+    def __delitem__(self, key: str) -> None:
+        self._remove(key)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._entries)
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+"""
+EGOS - ATLAS Mapping Store
+==========================
+
+Versioned, compressed storage for ATLAS mappings.
+
+Every save of a mapping creates a new revision in ``<root>/<name>/``. A
+revision is either a full checkpoint (the node-link graph, like the
+original mapping files) or a delta holding only the nodes and edges that
+changed since the previous revision. A checkpoint is written for the first
+save and then every ``checkpoint_interval`` revisions; older checkpoints
+and their deltas are pruned beyond ``max_checkpoints``. Any retained
+revision is rebuilt by replaying its deltas onto the closest checkpoint.
+
+The store keeps the last saved node and edge attributes of each mapping in
+memory to compute deltas without re-reading the previous revision.
+Checkpoints are read with the streaming loader (see mapping_stream).
+
+Version: 1.0.0
+"""
+
+import gzip
+import json
+import re
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import networkx as nx
+
+from .mapping_stream import (
+    DEFAULT_BATCH_SIZE,
+    NodeFilter,
+    load_mapping_document,
+    open_text,
+    read_metadata,
+    to_tuple,
+)
+
+CHECKPOINT = "checkpoint"
+DELTA = "delta"
+MANIFEST = "manifest.json"
+LAYOUTS = "layouts.json"
+
+NodeState = Dict[Any, Dict[str, Any]]
+EdgeState = Dict[Tuple[Any, Any], Dict[str, Any]]
+
+
+def safe_name(name: str) -> str:
+    """Directory name of a mapping ('My Map' -> 'my_map')."""
+    return re.sub(r"[^\w.-]+", "_", name.strip().lower()) or "mapping"
+
+
+def read_document(path: Path) -> Dict[str, Any]:
+    """Read a JSON document, gzip-compressed if its name ends in '.gz'."""
+    with open_text(path) as f:
+        return json.load(f)
+
+
+def write_document(path: Path, document: Dict[str, Any], compress: bool) -> None:
+    if compress:
+        with gzip.open(path, "wt", encoding="utf-8", compresslevel=6) as f:
+            json.dump(document, f, ensure_ascii=False, separators=(",", ":"))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(document, f, ensure_ascii=False, separators=(",", ":"))
+
+
+def graph_state(graph) -> Tuple[NodeState, EdgeState]:
+    """Copies of the node and edge attribute dicts of a graph."""
+    nodes = {node: dict(attrs) for node, attrs in graph.nodes(data=True)}
+    edges = {(u, v): dict(attrs) for u, v, attrs in graph.edges(data=True)}
+    return nodes, edges
+
+
+def diff_states(
+    old: Tuple[NodeState, EdgeState],
+    graph,
+    touched: Optional[Tuple[Iterable[Any], Iterable[Tuple[Any, Any]]]] = None,
+) -> Tuple[Dict[str, Any], bool]:
+    """Delta turning the ``old`` state into the current ``graph``.
+
+    Args:
+        old: State of the previous revision (see ``graph_state``); updated in place.
+        graph: The current graph.
+        touched: (nodes, edges) that may have changed, including the edges removed
+                 together with removed nodes. Everything is compared if None.
+
+    Returns:
+        Tuple[Dict[str, Any], bool]: The delta, and whether it adds or removes
+                                     nodes or edges (rather than only changing
+                                     attributes).
+    """
+    old_nodes, old_edges = old
+    if touched is None:
+        node_keys = set(old_nodes) | set(graph.nodes)
+        edge_keys = set(old_edges) | set(graph.edges)
+    else:
+        node_keys, edge_keys = set(touched[0]), {tuple(edge) for edge in touched[1]}
+
+    delta = {"nodes": {"set": [], "remove": []}, "edges": {"set": [], "remove": []}}
+    added = 0
+    for node in node_keys:
+        if node not in graph:
+            if old_nodes.pop(node, None) is not None:
+                delta["nodes"]["remove"].append(node)
+            continue
+        attrs = graph.nodes[node]
+        if old_nodes.get(node) != attrs:
+            added += node not in old_nodes
+            old_nodes[node] = dict(attrs)
+            delta["nodes"]["set"].append([node, dict(attrs)])
+    for source, target in edge_keys:
+        if not graph.has_edge(source, target):
+            if old_edges.pop((source, target), None) is not None:
+                delta["edges"]["remove"].append([source, target])
+            continue
+        attrs = graph.edges[source, target]
+        if old_edges.get((source, target)) != attrs:
+            added += (source, target) not in old_edges
+            old_edges[(source, target)] = dict(attrs)
+            delta["edges"]["set"].append([source, target, dict(attrs)])
+    structural = bool(added or delta["nodes"]["remove"] or delta["edges"]["remove"])
+    return delta, structural
+
+
+def apply_stored_delta(
+    graph, delta: Dict[str, Any], node_filter: Optional[NodeFilter] = None
+) -> None:
+    """Replay a stored delta onto ``graph``; attributes are replaced, not merged.
+
+    With an id-only ``node_filter``, nodes it rejects (and their edges) are skipped.
+    """
+    node_items = delta["nodes"]["set"]
+    edge_items = delta["edges"]["set"]
+    if node_filter is not None:
+        node_items = [item for item in node_items if node_filter.matches(item[0], item[1])]
+        kept = {item[0] for item in node_items}
+        edge_items = [
+            item
+            for item in edge_items
+            if (item[0] in graph or item[0] in kept) and (item[1] in graph or item[1] in kept)
+        ]
+    graph.remove_edges_from(tuple(edge) for edge in delta["edges"]["remove"])
+    graph.remove_nodes_from(delta["nodes"]["remove"])
+    for node, attrs in node_items:
+        if node in graph:
+            graph.nodes[node].clear()
+    graph.add_nodes_from((node, attrs) for node, attrs in node_items)
+    for source, target, attrs in edge_items:
+        if graph.has_edge(source, target):
+            graph.edges[source, target].clear()
+    graph.add_edges_from((source, target, attrs) for source, target, attrs in edge_items)
+
+
+def delta_size(delta: Dict[str, Any]) -> int:
+    return sum(len(items) for section in delta.values() for items in section.values())
+
+
+class MappingStore:
+    """Checkpoint-plus-delta revisions of named mappings under one directory."""
+
+    def __init__(
+        self,
+        root: Path,
+        compression: bool = True,
+        checkpoint_interval: int = 10,
+        max_checkpoints: Optional[int] = None,
+        load_batch_size: int = DEFAULT_BATCH_SIZE,
+    ):
+        self.root = root
+        self.compression = compression
+        self.checkpoint_interval = max(1, checkpoint_interval)
+        self.max_checkpoints = max_checkpoints
+        self.load_batch_size = load_batch_size
+        self._states: Dict[str, Tuple[NodeState, EdgeState]] = {}
+
+    @classmethod
+    def from_config(cls, root: Path, storage_config: Dict[str, Any]) -> "MappingStore":
+        """Build a store from the ``storage`` config section."""
+        backup = storage_config.get("backup", {})
+        return cls(
+            root,
+            compression=storage_config.get("compression", True),
+            checkpoint_interval=storage_config.get("checkpoint_interval", 10),
+            max_checkpoints=backup.get("max_backups") if backup.get("enabled", True) else None,
+            load_batch_size=storage_config.get("load_batch_size", DEFAULT_BATCH_SIZE),
+        )
+
+    def mapping_dir(self, name: str) -> Path:
+        return self.root / safe_name(name)
+
+    def revisions(self, name: str) -> List[Dict[str, Any]]:
+        """Manifest entries of a mapping, oldest first."""
+        manifest = self.mapping_dir(name) / MANIFEST
+        if not manifest.exists():
+            return []
+        return read_document(manifest)["revisions"]
+
+    def save(
+        self,
+        name: str,
+        graph,
+        metadata: Dict[str, Any],
+        touched: Optional[Tuple[Iterable[Any], Iterable[Tuple[Any, Any]]]] = None,
+    ) -> Tuple[Path, Dict[str, Any]]:
+        """Store the graph as the next revision of ``name``.
+
+        Args:
+            name: Mapping name.
+            graph: Graph to store.
+            metadata: Metadata stored with the revision.
+            touched: (nodes, edges) changed since the last save, if known; limits
+                     the delta computation to them.
+
+        Returns:
+            Tuple[Path, Dict[str, Any]]: The written file and its manifest entry.
+        """
+        directory = self.mapping_dir(name)
+        directory.mkdir(parents=True, exist_ok=True)
+        revisions = self.revisions(name)
+        revision = revisions[-1]["revision"] + 1 if revisions else 1
+        since_checkpoint = 0
+        for entry in reversed(revisions):
+            if entry["kind"] == CHECKPOINT:
+                break
+            since_checkpoint += 1
+
+        state = self._states.get(name)
+        checkpoint = (
+            state is None or not revisions or since_checkpoint + 1 >= self.checkpoint_interval
+        )
+        metadata = dict(metadata, revision=revision)
+        suffix = ".json.gz" if self.compression else ".json"
+        if checkpoint:
+            kind = CHECKPOINT
+            document = {"metadata": metadata, "graph": nx.node_link_data(graph)}
+            self._states[name] = graph_state(graph)
+            changes = None
+            # Unknown without the previous state
+            structural = state is None or (
+                state[0].keys() != self._states[name][0].keys()
+                or state[1].keys() != self._states[name][1].keys()
+            )
+        else:
+            kind = DELTA
+            delta, structural = diff_states(state, graph, touched)
+            document = {
+                "metadata": dict(metadata, base_revision=revision - 1),
+                "delta": delta,
+            }
+            changes = delta_size(delta)
+
+        path = directory / f"r{revision:08d}.{kind}{suffix}"
+        try:
+            write_document(path, document, self.compression)
+        except Exception:
+            # The in-memory state already includes this revision; start over with a checkpoint
+            self._states.pop(name, None)
+            raise
+        entry = {
+            "revision": revision,
+            "kind": kind,
+            "file": path.name,
+            "timestamp": datetime.now().isoformat(),
+            "changes": changes,
+            "structural": structural,
+        }
+        revisions.append(entry)
+        if kind == CHECKPOINT:
+            revisions = self._prune(directory, revisions)
+        write_document(directory / MANIFEST, {"name": name, "revisions": revisions}, False)
+        return path, entry
+
+    def _prune(self, directory: Path, revisions: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """Drop the oldest checkpoints (and their deltas) beyond ``max_checkpoints``."""
+        if not self.max_checkpoints:
+            return revisions
+        checkpoints = [i for i, entry in enumerate(revisions) if entry["kind"] == CHECKPOINT]
+        if len(checkpoints) <= self.max_checkpoints:
+            return revisions
+        first_kept = checkpoints[-self.max_checkpoints]
+        for entry in revisions[:first_kept]:
+            (directory / entry["file"]).unlink(missing_ok=True)
+        return revisions[first_kept:]
+
+    def save_layouts(
+        self, name: str, revision: int, layouts: Dict[str, Dict[Any, Tuple[float, float]]]
+    ) -> Path:
+        """Store node positions (per layout key) computed for a revision of ``name``.
+
+        Only the layouts of one revision are kept; they replace earlier ones.
+        """
+        suffix = ".gz" if self.compression else ""
+        path = self.mapping_dir(name) / (LAYOUTS + suffix)
+        document = {
+            "revision": revision,
+            "layouts": {
+                key: [[node, x, y] for node, (x, y) in positions.items()]
+                for key, positions in layouts.items()
+            },
+        }
+        write_document(path, document, self.compression)
+        stale = self.mapping_dir(name) / (LAYOUTS if suffix else LAYOUTS + ".gz")
+        stale.unlink(missing_ok=True)
+        return path
+
+    def load_layouts(
+        self, name: str
+    ) -> Tuple[Optional[int], Dict[str, Dict[Any, Tuple[float, float]]]]:
+        """The revision stored layouts were computed for, and the layouts (None, {} if none)."""
+        for filename in (LAYOUTS + ".gz", LAYOUTS):
+            path = self.mapping_dir(name) / filename
+            if path.exists():
+                document = read_document(path)
+                layouts = {
+                    key: {to_tuple(node): (x, y) for node, x, y in entries}
+                    for key, entries in document["layouts"].items()
+                }
+                return document["revision"], layouts
+        return None, {}
+
+    def same_structure(self, name: str, first: int, second: int) -> bool:
+        """Whether no stored revision between ``first`` and ``second`` added or removed
+        nodes or edges (both must still be stored).
+        """
+        low, high = sorted((first, second))
+        between = [entry for entry in self.revisions(name) if low <= entry["revision"] <= high]
+        if len(between) != high - low + 1:
+            return False
+        return not any(entry.get("structural", True) for entry in between[1:])
+
+    def _replay_chain(self, name: str, revision: Optional[int]) -> Tuple[List[Dict[str, Any]], int]:
+        """Manifest entries from the closest checkpoint up to ``revision`` (the latest if
+        None), and the latest stored revision.
+
+        Raises:
+            FileNotFoundError: If the mapping has no revisions.
+            KeyError: If the revision does not exist or was pruned.
+        """
+        revisions = self.revisions(name)
+        if not revisions:
+            raise FileNotFoundError(f"No stored revisions for mapping '{name}'")
+        if revision is None:
+            revision = revisions[-1]["revision"]
+        upto = [entry for entry in revisions if entry["revision"] <= revision]
+        if not upto or upto[-1]["revision"] != revision:
+            raise KeyError(f"Revision {revision} of mapping '{name}' is not stored")
+        start = max(i for i, entry in enumerate(upto) if entry["kind"] == CHECKPOINT)
+        return upto[start:], revisions[-1]["revision"]
+
+    def metadata(self, name: str, revision: Optional[int] = None) -> Dict[str, Any]:
+        """Metadata of a revision, without loading its graph."""
+        entry = self._replay_chain(name, revision)[0][-1]
+        return read_metadata(self.mapping_dir(name) / entry["file"])
+
+    def load(
+        self, name: str, revision: Optional[int] = None, node_filter: Optional[NodeFilter] = None
+    ):
+        """Rebuild a revision of ``name`` (the latest if None).
+
+        Args:
+            name: Mapping name.
+            revision: Revision to rebuild; the latest if None.
+            node_filter: Keep only matching nodes and the edges between them. Id-only
+                         filters are applied while streaming the checkpoint; attribute
+                         filters also while streaming when no deltas follow it, and
+                         otherwise once the deltas are replayed (a delta can change
+                         whether a node matches).
+
+        Returns:
+            Tuple[nx.DiGraph, Dict[str, Any]]: The graph and the revision's metadata.
+
+        Raises:
+            FileNotFoundError: If the mapping has no revisions.
+            KeyError: If the revision does not exist or was pruned.
+        """
+        chain, latest = self._replay_chain(name, revision)
+        directory = self.mapping_dir(name)
+        stream_filter = node_filter
+        if node_filter is not None and not node_filter.by_id_only and len(chain) > 1:
+            stream_filter = None
+        graph, metadata, _ = load_mapping_document(
+            directory / chain[0]["file"], stream_filter, self.load_batch_size
+        )
+        for entry in chain[1:]:
+            document = read_document(directory / entry["file"])
+            apply_stored_delta(graph, document["delta"], stream_filter)
+            metadata = document["metadata"]
+        if node_filter is not None and stream_filter is None:
+            graph.remove_nodes_from(
+                [n for n, attrs in graph.nodes(data=True) if not node_filter.matches(n, attrs)]
+            )
+        if node_filter is None and chain[-1]["revision"] == latest:
+            # Later saves continue the delta chain from this state
+            self._states[name] = graph_state(graph)
+        return graph, metadata
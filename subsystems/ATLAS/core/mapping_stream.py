@@ -0,0 +1,326 @@
+#!/usr/bin/env python3
+"""
+EGOS - ATLAS Mapping Stream
+===========================
+
+Streaming reader for node-link mapping documents (``{"metadata": {...},
+"graph": {"directed": ..., "nodes": [...], "edges": [...]}}``), plain or
+gzip-compressed.
+
+The document is decoded from a bounded text buffer: node and edge entries
+are parsed a buffered run at a time and added to the graph in batches, so
+the raw JSON of the whole file is never held next to the graph. Loading
+can stop after the metadata, or keep only the nodes that match a
+``NodeFilter`` (and the edges between them).
+
+Version: 1.0.0
+"""
+
+import gzip
+import json
+import re
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, TextIO, Tuple
+
+import networkx as nx
+
+READ_CHUNK_SIZE = 1 << 16
+# Commas tried as the end of the buffered run of complete array items
+MAX_BOUNDARY_PROBES = 16
+DEFAULT_BATCH_SIZE = 10_000
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_ITEM_SEPARATOR = re.compile(r"[ \t\n\r]*([,\]])[ \t\n\r]*")
+_decoder = json.JSONDecoder()
+_MISSING = object()
+
+
+def to_tuple(value: Any) -> Any:
+    """JSON lists back to hashable tuples, as ``nx.node_link_graph`` does."""
+    return tuple(to_tuple(item) for item in value) if isinstance(value, list) else value
+
+
+@dataclass(frozen=True)
+class NodeFilter:
+    """Selects the nodes of a partial load.
+
+    A node is kept if it has all of ``attributes`` (with equal values) and,
+    when ``prefixes`` are given, its id starts with one of them.
+    """
+
+    attributes: Optional[Dict[str, Any]] = None
+    prefixes: Optional[Tuple[str, ...]] = None
+
+    @classmethod
+    def build(
+        cls, attributes: Optional[Dict[str, Any]] = None, prefixes: Optional[Iterable[str]] = None
+    ) -> Optional["NodeFilter"]:
+        """A filter for the given criteria, or None if there are none."""
+        if not attributes and not prefixes:
+            return None
+        return cls(dict(attributes) if attributes else None, tuple(prefixes) if prefixes else None)
+
+    @property
+    def by_id_only(self) -> bool:
+        """Whether the result depends on node ids alone (not on changing attributes)."""
+        return not self.attributes
+
+    def matches(self, node: Any, attrs: Dict[str, Any]) -> bool:
+        if self.prefixes is not None and not str(node).startswith(self.prefixes):
+            return False
+        if self.attributes:
+            return all(attrs.get(key, _MISSING) == value for key, value in self.attributes.items())
+        return True
+
+
+class _JSONStream:
+    """Decodes consecutive JSON values from a text stream with a bounded buffer."""
+
+    def __init__(self, source: TextIO):
+        self._source = source
+        self._buffer = ""
+        self._pos = 0
+        self._eof = False
+
+    def _fill(self) -> bool:
+        """Append the next chunk, dropping what was already consumed."""
+        if self._eof:
+            return False
+        chunk = self._source.read(READ_CHUNK_SIZE)
+        if not chunk:
+            self._eof = True
+            return False
+        self._buffer = self._buffer[self._pos :] + chunk
+        self._pos = 0
+        return True
+
+    def peek(self) -> str:
+        """Next non-whitespace character, or '' at the end of the stream."""
+        while True:
+            self._pos = _WHITESPACE.match(self._buffer, self._pos).end()
+            if self._pos < len(self._buffer):
+                return self._buffer[self._pos]
+            if not self._fill():
+                return ""
+
+    def expect(self, char: str) -> None:
+        found = self.peek()
+        if found != char:
+            raise json.JSONDecodeError(
+                f"Expecting '{char}', found {found!r}", self._buffer, self._pos
+            )
+        self._pos += 1
+
+    def value(self) -> Any:
+        """Decode the next complete value, reading more input as needed."""
+        self.peek()
+        while True:
+            try:
+                value, end = _decoder.scan_once(self._buffer, self._pos)
+            except (json.JSONDecodeError, StopIteration) as e:
+                if self._fill():
+                    continue
+                if isinstance(e, StopIteration):
+                    raise json.JSONDecodeError("Expecting value", self._buffer, self._pos) from None
+                raise
+            # A number or literal at the end of the buffer may continue in the next chunk
+            if end == len(self._buffer) and self._fill():
+                continue
+            self._pos = end
+            return value
+
+    def members(self) -> Iterator[str]:
+        """Keys of the object starting here; the caller consumes each value."""
+        self.expect("{")
+        if self.peek() == "}":
+            self._pos += 1
+            return
+        while True:
+            key = self.value()
+            self.expect(":")
+            yield key
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("}")
+            return
+
+    def _buffered_items(self) -> List[Any]:
+        """The array items that are complete in the buffer, decoded with one call.
+
+        The run ends at the last comma that follows a '}' or ']'. A comma inside
+        a string or a nested value leaves the run unbalanced, so its decode fails
+        and the items are decoded one by one instead.
+        """
+        buffer, pos = self._buffer, self._pos
+        comma = buffer.rfind(",", pos)
+        for _ in range(MAX_BOUNDARY_PROBES):
+            if comma <= pos:
+                return []
+            end = comma
+            while end > pos and buffer[end - 1] in " \t\n\r":
+                end -= 1
+            if buffer[end - 1] in "}]":
+                break
+            comma = buffer.rfind(",", pos, comma)
+        else:
+            return []
+        run = "[" + buffer[pos:end] + "]"
+        try:
+            items, stop = _decoder.scan_once(run, 0)
+        except (json.JSONDecodeError, StopIteration):
+            return []
+        if stop != len(run):
+            return []
+        self._pos = comma + 1
+        return items
+
+    def items(self) -> Iterator[Any]:
+        """Decoded items of the array starting here."""
+        self.expect("[")
+        if self.peek() == "]":
+            self._pos += 1
+            return
+        while True:
+            self.peek()
+            yield from self._buffered_items()
+            yield self.value()
+            # Fast path: the separator and the start of the next item are already buffered
+            match = _ITEM_SEPARATOR.match(self._buffer, self._pos)
+            if match is not None and match.end() < len(self._buffer):
+                self._pos = match.end()
+                if match.group(1) == "]":
+                    return
+                continue
+            if self.peek() == ",":
+                self._pos += 1
+                continue
+            self.expect("]")
+            return
+
+
+def open_text(path: Path) -> TextIO:
+    """Open a mapping document for reading, gzip-compressed if its name ends in '.gz'."""
+    if path.suffix == ".gz":
+        return gzip.open(path, "rt", encoding="utf-8")
+    return open(path, "r", encoding="utf-8")
+
+
+def read_metadata(path: Path) -> Dict[str, Any]:
+    """The 'metadata' of a mapping document; stops reading once it is found.
+
+    Raises:
+        ValueError: If the document has no metadata.
+    """
+    with open_text(path) as f:
+        stream = _JSONStream(f)
+        for key in stream.members():
+            if key == "metadata":
+                return stream.value()
+            stream.value()
+    raise ValueError("Invalid mapping file format: Missing metadata key.")
+
+
+def _load_graph(
+    stream: _JSONStream, node_filter: Optional[NodeFilter], batch_size: int
+) -> Tuple[Any, int]:
+    """Build the graph of a node-link object; returns it with the number of skipped nodes."""
+    settings = {"directed": False, "multigraph": True, "graph": {}}
+    graph = None
+    skipped = 0
+    # Edge endpoints are decoded as new strings; they are mapped back to the node
+    # objects so the adjacency dicts do not keep a copy of the id per edge
+    node_ids: Dict[Any, Any] = {}
+
+    def new_graph():
+        cls = nx.MultiGraph if settings["multigraph"] else nx.Graph
+        created = cls().to_directed() if settings["directed"] else cls()
+        created.graph.update(settings["graph"])
+        return created
+
+    for key in stream.members():
+        if key in ("directed", "multigraph", "graph"):
+            settings[key] = stream.value()
+            if graph is not None:
+                raise ValueError(f"Node-link key '{key}' found after the nodes or edges")
+        elif key == "nodes":
+            graph = graph if graph is not None else new_graph()
+            batch: List[Tuple[Any, Dict[str, Any]]] = []
+            for index, entry in enumerate(stream.items()):
+                if not isinstance(entry, dict):
+                    raise ValueError(f"Invalid node entry: {entry!r}")
+                node = entry.pop("id", index)
+                if isinstance(node, list):
+                    node = to_tuple(node)
+                if node_filter is not None and not node_filter.matches(node, entry):
+                    skipped += 1
+                    continue
+                node_ids[node] = node
+                batch.append((node, entry))
+                if len(batch) >= batch_size:
+                    graph.add_nodes_from(batch)
+                    batch = []
+            graph.add_nodes_from(batch)
+        elif key in ("edges", "links"):
+            graph = graph if graph is not None else new_graph()
+            multigraph = graph.is_multigraph()
+            batch = []
+            for entry in stream.items():
+                if not isinstance(entry, dict) or "source" not in entry or "target" not in entry:
+                    raise ValueError(f"Invalid edge entry: {entry!r}")
+                source = entry.pop("source")
+                target = entry.pop("target")
+                if isinstance(source, list) or isinstance(target, list):
+                    source, target = to_tuple(source), to_tuple(target)
+                if node_filter is not None and (source not in graph or target not in graph):
+                    continue
+                source = node_ids.get(source, source)
+                target = node_ids.get(target, target)
+                if multigraph:
+                    batch.append((source, target, entry.pop("key", None), entry))
+                else:
+                    batch.append((source, target, entry))
+                if len(batch) >= batch_size:
+                    graph.add_edges_from(batch)
+                    batch = []
+            graph.add_edges_from(batch)
+        else:
+            stream.value()
+    return (graph if graph is not None else new_graph()), skipped
+
+
+def load_mapping_document(
+    path: Path,
+    node_filter: Optional[NodeFilter] = None,
+    batch_size: int = DEFAULT_BATCH_SIZE,
+) -> Tuple[Any, Dict[str, Any], int]:
+    """Stream a mapping document into a graph.
+
+    Args:
+        path: The mapping file.
+        node_filter: Keep only matching nodes and the edges between them.
+        batch_size: Nodes or edges added to the graph per networkx call.
+
+    Returns:
+        Tuple: The graph, the document's metadata and the number of nodes
+               left out by the filter.
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON.
+        ValueError: If the metadata or graph key is missing.
+    """
+    graph = metadata = None
+    skipped = 0
+    with open_text(path) as f:
+        stream = _JSONStream(f)
+        for key in stream.members():
+            if key == "metadata":
+                metadata = stream.value()
+            elif key == "graph":
+                graph, skipped = _load_graph(stream, node_filter, max(1, batch_size))
+            else:
+                stream.value()
+    if metadata is None or graph is None:
+        raise ValueError("Invalid mapping file format: Missing metadata or graph keys.")
+    return graph, metadata, skipped
@@ -0,0 +1,262 @@
+#!/usr/bin/env python3
+"""
+EGOS - ATLAS Renderer
+=====================
+
+Renders ATLAS graphs without matplotlib.
+
+- ``svg``: a standalone SVG document drawn from node positions (see
+  ``compute_layout``), written directly as text.
+- ``mermaid``: a Mermaid flowchart; the viewer lays it out, so no positions
+  are needed. Obsidian renders it natively.
+- ``matplotlib``: the original networkx/matplotlib drawing, for raster
+  formats. matplotlib is imported only when this engine is used.
+
+Graphs above ``RenderStyle.max_nodes`` are summarized before rendering (see
+``summarizer``); the renderers show the summary's note below the drawing.
+
+Version: 1.0.0
+"""
+
+import html
+import math
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+import networkx as nx
+
+SVG = "svg"
+MERMAID = "mermaid"
+MATPLOTLIB = "matplotlib"
+ENGINES = (SVG, MERMAID, MATPLOTLIB)
+
+ENGINE_EXTENSIONS = {SVG: "svg", MERMAID: "mmd"}
+ENGINE_BY_SUFFIX = {".svg": SVG, ".mmd": MERMAID, ".mermaid": MERMAID}
+
+LAYOUTS = {
+    "spring": nx.spring_layout,
+    "circular": nx.circular_layout,
+    "kamada_kawai": nx.kamada_kawai_layout,
+    "spectral": nx.spectral_layout,
+}
+# Force-directed layouts; they are computed on the undirected view of the graph
+# (networkx's directed adjacency would leave sink nodes without attraction)
+FORCE_LAYOUTS = ("spring", "kamada_kawai")
+# Flowchart directions; the 'layout' setting may name one for Mermaid output
+MERMAID_DIRECTIONS = ("TB", "TD", "BT", "LR", "RL")
+# Edge attributes shown as Mermaid edge labels, in order of preference
+EDGE_LABEL_KEYS = ("relation", "type", "label")
+
+Positions = Dict[Any, Tuple[float, float]]
+
+
+@dataclass(frozen=True)
+class RenderStyle:
+    """Drawing settings, from the ``visualization`` config section."""
+
+    width: int = 1200
+    height: int = 1000
+    node_size: float = 800
+    edge_width: float = 1.5
+    font_size: int = 10
+    node_color: str = "#87ceeb"
+    edge_color: str = "#7f7f7f"
+    font_family: str = "sans-serif"
+    direction: str = "LR"
+    max_nodes: Optional[int] = None
+
+    @classmethod
+    def from_config(cls, vis_config: Dict[str, Any]) -> "RenderStyle":
+        theme = vis_config.get("themes", {}).get(vis_config.get("theme", "default"), {})
+        width, height = vis_config.get("figure_size", [12, 10])
+        layout = str(vis_config.get("layout", ""))
+        direction = vis_config.get("direction") or (
+            layout.upper() if layout.upper() in MERMAID_DIRECTIONS else "LR"
+        )
+        return cls(
+            width=int(width * 100),
+            height=int(height * 100),
+            node_size=vis_config.get("node_size", 800),
+            edge_width=vis_config.get("edge_width", 1.5),
+            font_size=vis_config.get("font_size", 10),
+            node_color=theme.get("node_color", cls.node_color),
+            edge_color=theme.get("edge_color", cls.edge_color),
+            font_family=theme.get("font_family", cls.font_family),
+            direction=direction,
+            max_nodes=vis_config.get("max_nodes"),
+        )
+
+    @property
+    def node_radius(self) -> float:
+        """Circle radius matching matplotlib's ``node_size`` (an area in points²)."""
+        return math.sqrt(self.node_size) / 2
+
+
+def resolve_engine(
+    engine: Optional[str], output_filename: Optional[str], vis_config: Dict[str, Any]
+) -> str:
+    """Engine for a render: explicit, else from the file suffix, else from the config.
+
+    Raises:
+        ValueError: If the engine is unknown.
+    """
+    if engine is None and output_filename and Path(output_filename).suffix:
+        engine = ENGINE_BY_SUFFIX.get(Path(output_filename).suffix.lower(), MATPLOTLIB)
+    if engine is None:
+        engine = vis_config.get("engine")
+    if engine is None:
+        default_format = "." + vis_config.get("default_format", SVG)
+        engine = ENGINE_BY_SUFFIX.get(default_format.lower(), MATPLOTLIB)
+    if engine not in ENGINES:
+        raise ValueError(f"Unknown visualization engine '{engine}'; expected one of {ENGINES}")
+    return engine
+
+
+def file_extension(engine: str, vis_config: Dict[str, Any]) -> str:
+    return ENGINE_EXTENSIONS.get(engine) or vis_config.get("default_format", "png")
+
+
+def compute_layout(graph, algorithm: str, seed: Optional[int] = None) -> Positions:
+    """Node positions from a networkx layout, as plain float pairs.
+
+    Args:
+        graph: Graph to lay out.
+        algorithm: Key of LAYOUTS.
+        seed: Random seed of the spring layout, for repeatable positions.
+
+    Raises:
+        ValueError: If the layout algorithm is unknown.
+    """
+    if algorithm not in LAYOUTS:
+        raise ValueError(f"Unknown layout '{algorithm}'")
+    kwargs = {"seed": seed} if algorithm == "spring" and seed is not None else {}
+    if algorithm in FORCE_LAYOUTS and graph.is_directed():
+        graph = graph.to_undirected(as_view=True)
+    positions = LAYOUTS[algorithm](graph, **kwargs)
+    return {node: (float(x), float(y)) for node, (x, y) in positions.items()}
+
+
+def _label(node: Any, attrs: Dict[str, Any]) -> str:
+    return str(attrs.get("label", node))
+
+
+def render_svg(graph, pos: Positions, title: str, style: RenderStyle, note: str = "") -> str:
+    """A standalone SVG drawing of ``graph`` at the given positions (y pointing up)."""
+    radius = style.node_radius
+    margin = radius + style.font_size * 2
+    top = margin + style.font_size * 2  # Room for the title
+    xs = [pos[node][0] for node in graph]
+    ys = [pos[node][1] for node in graph]
+    min_x, max_y = min(xs, default=0.0), max(ys, default=0.0)
+    span = max(max(xs, default=0.0) - min_x, max_y - min(ys, default=0.0)) or 1.0
+    scale = min(style.width - 2 * margin, style.height - margin - top) / span
+
+    points = {
+        node: (margin + (pos[node][0] - min_x) * scale, top + (max_y - pos[node][1]) * scale)
+        for node in graph
+    }
+    arrow = ' marker-end="url(#arrow)"' if graph.is_directed() else ""
+    parts = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{style.width}" '
+        f'height="{style.height}" viewBox="0 0 {style.width} {style.height}">',
+        "<defs>"
+        '<marker id="arrow" viewBox="0 0 10 10" refX="10" refY="5" markerWidth="6" '
+        f'markerHeight="6" orient="auto-start-reverse"><path d="M0,0L10,5L0,10z" '
+        f'fill="{style.edge_color}"/></marker></defs>',
+        f"<style>.e{{stroke:{style.edge_color};stroke-width:{style.edge_width};"
+        f"stroke-opacity:.5;fill:none}}.n{{fill:{style.node_color};fill-opacity:.8}}"
+        f"text{{font-family:{style.font_family};font-size:{style.font_size}px;"
+        "text-anchor:middle;dominant-baseline:central}}</style>",
+        f'<text x="{style.width / 2:.1f}" y="{style.font_size * 2}" '
+        f'style="font-size:{style.font_size * 1.6:.0f}px">{html.escape(title)}</text>',
+        '<g class="edges">',
+    ]
+    for source, target in graph.edges():
+        x1, y1 = points[source]
+        x2, y2 = points[target]
+        length = math.hypot(x2 - x1, y2 - y1)
+        if length <= 2 * radius:
+            continue  # Overlapping nodes; there is nothing to draw between them
+        # End the line at the border of the target circle so the arrow stays visible
+        x2 -= (x2 - x1) * radius / length
+        y2 -= (y2 - y1) * radius / length
+        parts.append(f'<path class="e" d="M{x1:.1f},{y1:.1f}L{x2:.1f},{y2:.1f}"{arrow}/>')
+    parts.append('</g><g class="nodes">')
+    for node, attrs in graph.nodes(data=True):
+        x, y = points[node]
+        label = html.escape(_label(node, attrs))
+        parts.append(
+            f'<circle class="n" cx="{x:.1f}" cy="{y:.1f}" r="{radius:.1f}">'
+            f'<title>{label}</title></circle><text x="{x:.1f}" y="{y:.1f}">{label}</text>'
+        )
+    parts.append("</g>")
+    if note:
+        parts.append(
+            f'<text x="{style.width / 2:.1f}" y="{style.height - style.font_size}">'
+            f"{html.escape(note)}</text>"
+        )
+    parts.append("</svg>")
+    return "\n".join(parts)
+
+
+def _mermaid_text(text: str) -> str:
+    return html.escape(text, quote=False).replace('"', "#quot;").replace("\n", " ")
+
+
+def render_mermaid(graph, title: str, style: RenderStyle, note: str = "") -> str:
+    """A Mermaid flowchart of ``graph``."""
+    ids = {node: f"n{index}" for index, node in enumerate(graph)}
+    link = "-->" if graph.is_directed() else "---"
+    lines = ["---", f"title: {_mermaid_text(title)}", "---", f"flowchart {style.direction}"]
+    lines.extend(
+        f'    {ids[node]}["{_mermaid_text(_label(node, attrs))}"]'
+        for node, attrs in graph.nodes(data=True)
+    )
+    for source, target, attrs in graph.edges(data=True):
+        label = next((attrs[key] for key in EDGE_LABEL_KEYS if attrs.get(key)), None)
+        arrow = f'{link}|"{_mermaid_text(str(label))}"|' if label else link
+        lines.append(f"    {ids[source]} {arrow} {ids[target]}")
+    if note:
+        lines.append(f"    %% {_mermaid_text(note)}")
+    return "\n".join(lines) + "\n"
+
+
+def render_matplotlib(
+    graph, pos: Positions, title: str, output_path: Path, vis_config: Dict[str, Any]
+) -> None:
+    """Draw ``graph`` with networkx/matplotlib and save it to ``output_path``.
+
+    Raises:
+        ImportError: If matplotlib is not installed.
+    """
+    import matplotlib.pyplot as plt  # Optional dependency, only needed for this engine
+
+    style = RenderStyle.from_config(vis_config)
+    plt.figure(figsize=tuple(vis_config.get("figure_size", [12, 10])))
+    try:
+        nx.draw_networkx_nodes(
+            graph, pos, node_size=style.node_size, node_color="skyblue", alpha=0.8
+        )
+        nx.draw_networkx_edges(
+            graph,
+            pos,
+            width=style.edge_width,
+            alpha=0.5,
+            arrows=True,
+            arrowstyle="-",
+            arrowsize=vis_config.get("arrow_size", 15),
+        )
+        nx.draw_networkx_labels(
+            graph,
+            pos,
+            labels={node: _label(node, attrs) for node, attrs in graph.nodes(data=True)},
+            font_size=style.font_size,
+            font_family="sans-serif",
+        )
+        plt.title(title, fontsize=16)
+        plt.axis("off")
+        plt.tight_layout()
+        plt.savefig(output_path, dpi=vis_config.get("dpi", 300), bbox_inches="tight")
+    finally:
+        plt.close()
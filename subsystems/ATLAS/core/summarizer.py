@@ -0,0 +1,281 @@
+#!/usr/bin/env python3
+"""
+EGOS - ATLAS Summarizer
+=======================
+
+Level-of-detail views of ATLAS maps larger than ``visualization.max_nodes``.
+
+Nodes are collapsed into clusters: by the subsystem they belong to, by the
+directory prefix of their path, or by detected (Louvain) community. The
+edges between two clusters become one edge whose weight is the sum of the
+merged edge weights. A chosen cluster can be drilled into: its members are
+shown individually, or as sub-clusters if they do not fit either, while the
+rest of the map stays collapsed. A view never has more than ``max_nodes``
+nodes, so rendering and export cost does not grow with the size of the map.
+
+Subsystem and directory clusters take one pass over the nodes and edges.
+Community detection is much slower on large maps (tens of seconds for tens
+of thousands of nodes), so it is only the fallback of the 'auto' strategy
+for maps whose node ids are not paths; callers should reuse summaries while
+the graph is unchanged.
+
+Version: 1.0.0
+"""
+
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+import networkx as nx
+
+AUTO = "auto"
+SUBSYSTEM = "subsystem"
+DIRECTORY = "directory"
+COMMUNITY = "community"
+STRATEGIES = (AUTO, SUBSYSTEM, DIRECTORY, COMMUNITY)
+
+# Cluster of the nodes without a cluster key, and of those beyond the budget
+OTHER = "(other)"
+# First element of the node ids of clusters in a summary view
+CLUSTER = "cluster"
+
+Assignment = Dict[Any, Optional[str]]
+
+
+@dataclass(frozen=True)
+class SummaryOptions:
+    """Clustering settings, from the ``visualization.summary`` config section."""
+
+    strategy: str = AUTO
+    # Node attribute naming the subsystem of a node
+    attribute: str = "subsystem"
+    # Separator of the path segments in node ids (or 'path' attributes)
+    separator: str = "/"
+    seed: int = 42
+
+    @classmethod
+    def from_config(cls, summary_config: Dict[str, Any]) -> "SummaryOptions":
+        """Build options from the ``visualization.summary`` config section."""
+        fields = cls.__dataclass_fields__
+        options = cls(**{key: value for key, value in summary_config.items() if key in fields})
+        if options.strategy not in STRATEGIES:
+            raise ValueError(
+                f"Unknown summary strategy '{options.strategy}'; expected one of {STRATEGIES}"
+            )
+        return options
+
+
+@dataclass
+class GraphSummary:
+    """A bounded view of a graph with some nodes collapsed into clusters."""
+
+    # Kept nodes as they are, and one ``(CLUSTER, name)`` node per cluster
+    graph: Any
+    # Members of each cluster
+    clusters: Dict[str, List[Any]]
+    strategy: str
+    focus: Optional[str] = None
+
+    @property
+    def collapsed(self) -> int:
+        """Number of nodes shown as part of a cluster."""
+        return sum(len(members) for members in self.clusters.values())
+
+    @property
+    def note(self) -> str:
+        """One-line description of the view, for renderers."""
+        note = f"{self.collapsed} nodes collapsed into {len(self.clusters)} clusters"
+        note += f" by {self.strategy}"
+        if self.focus is not None:
+            note += f"; showing the members of {self.focus}"
+        return note
+
+
+def _segments(node: Any, attrs: Dict[str, Any], separator: str) -> List[str]:
+    path = str(attrs.get("path") or node)
+    if separator == "/":
+        path = path.replace("\\", "/")
+    return [segment for segment in path.split(separator) if segment]
+
+
+def subsystem_of(node: Any, attrs: Dict[str, Any], options: SummaryOptions) -> Optional[str]:
+    """The node's subsystem attribute, else X of a 'subsystems/X/...' path; None if neither."""
+    value = attrs.get(options.attribute)
+    if value:
+        return str(value)
+    segments = _segments(node, attrs, options.separator)
+    if len(segments) > 2 and segments[0] == "subsystems":
+        return segments[1]
+    return None
+
+
+def _by_directory(graph, max_clusters: int, options: SummaryOptions) -> Assignment:
+    """Directory prefixes, at the deepest level that still gives at most ``max_clusters``."""
+    directories = {
+        node: _segments(node, attrs, options.separator)[:-1]
+        for node, attrs in graph.nodes(data=True)
+    }
+    deepest = max((len(segments) for segments in directories.values()), default=0)
+    best: Assignment = dict.fromkeys(directories)
+    for depth in range(1, deepest + 1):
+        assignment = {
+            node: options.separator.join(segments[:depth]) or None
+            for node, segments in directories.items()
+        }
+        if depth > 1 and len(set(assignment.values())) > max_clusters:
+            break
+        best = assignment
+    return best
+
+
+def _by_community(graph, max_clusters: int, options: SummaryOptions) -> Assignment:
+    """Louvain communities, named after their highest-degree member.
+
+    Aggregation stops at the first level with at most ``max_clusters`` communities.
+    """
+    undirected = graph.to_undirected(as_view=True) if graph.is_directed() else graph
+    communities: List[Any] = [set(graph)]
+    for communities in nx.community.louvain_partitions(undirected, seed=options.seed):
+        if len(communities) <= max_clusters:
+            break
+    degree = graph.degree
+    assignment: Assignment = {}
+    for community in communities:
+        top = max(community, key=lambda node: (degree[node], str(node)))
+        name = f"community of {top}"
+        assignment.update(dict.fromkeys(community, name))
+    return assignment
+
+
+def _assign(graph, strategy: str, max_clusters: int, options: SummaryOptions) -> Assignment:
+    if strategy == SUBSYSTEM:
+        return {node: subsystem_of(node, attrs, options) for node, attrs in graph.nodes(data=True)}
+    if strategy == DIRECTORY:
+        return _by_directory(graph, max_clusters, options)
+    return _by_community(graph, max_clusters, options)
+
+
+def _bounded(assignment: Assignment, max_clusters: int) -> Dict[Any, str]:
+    """The assignment with at most ``max_clusters`` clusters; the smallest ones and nodes
+    without a cluster are merged into OTHER.
+    """
+    sizes = Counter(key for key in assignment.values() if key is not None)
+    needs_other = len(sizes) > max_clusters or len(sizes) < len(set(assignment.values()))
+    kept = {key for key, _ in sizes.most_common(max_clusters - 1 if needs_other else None)}
+    return {node: key if key in kept else OTHER for node, key in assignment.items()}
+
+
+def assign_clusters(
+    graph, max_clusters: int, options: SummaryOptions, strategy: Optional[str] = None
+) -> Tuple[str, Dict[Any, str]]:
+    """The strategy used and the cluster of every node, with at most ``max_clusters`` clusters.
+
+    The 'auto' strategy uses subsystems, then directories, if they give at least half
+    of the nodes a cluster and make more than one cluster; otherwise communities.
+    """
+    strategy = strategy or options.strategy
+    max_clusters = max(max_clusters, 1)
+    if strategy == AUTO:
+        for candidate in (SUBSYSTEM, DIRECTORY):
+            assignment = _assign(graph, candidate, max_clusters, options)
+            keys = [key for key in assignment.values() if key is not None]
+            if 2 * len(keys) >= len(assignment) and len(set(keys)) > 1:
+                return candidate, _bounded(assignment, max_clusters)
+        strategy = COMMUNITY
+    return strategy, _bounded(_assign(graph, strategy, max_clusters, options), max_clusters)
+
+
+def _weight_label(weight: float) -> str:
+    return f"{weight:g}"
+
+
+def collapse(graph, assignment: Assignment) -> Tuple[Any, Dict[str, List[Any]]]:
+    """The graph with the nodes of each cluster merged into one node, and the members.
+
+    Args:
+        graph: Graph to collapse.
+        assignment: Cluster of each node; None (or no entry) keeps the node itself.
+
+    Returns:
+        The collapsed graph and the members of each cluster. Cluster nodes have a
+        'label', 'size' (members) and 'internal_edges'; the edges between them (or
+        between a cluster and a kept node) have the summed 'weight' of the merged
+        edges (1 for edges without one), their number as 'edges', and a 'label'.
+    """
+    view = graph.__class__()
+    members: Dict[str, List[Any]] = defaultdict(list)
+    representative: Dict[Any, Any] = {}
+    for node, attrs in graph.nodes(data=True):
+        cluster = assignment.get(node)
+        if cluster is None:
+            view.add_node(node, **attrs)
+            representative[node] = node
+        else:
+            members[cluster].append(node)
+            representative[node] = (CLUSTER, cluster)
+    for cluster, nodes in members.items():
+        view.add_node(
+            (CLUSTER, cluster),
+            label=f"{cluster} ({len(nodes)})",
+            cluster=cluster,
+            size=len(nodes),
+            internal_edges=0,
+        )
+
+    weights: Dict[Tuple[Any, Any], float] = defaultdict(float)
+    counts: Counter = Counter()
+    directed = graph.is_directed()
+    for source, target, attrs in graph.edges(data=True):
+        u, v = representative[source], representative[target]
+        if u is source and v is target:
+            view.add_edge(source, target, **attrs)
+            continue
+        if u == v:
+            view.nodes[u]["internal_edges"] += 1
+            continue
+        if not directed and (v, u) in weights:
+            u, v = v, u
+        weights[u, v] += attrs.get("weight", 1)
+        counts[u, v] += 1
+    for (u, v), weight in weights.items():
+        view.add_edge(u, v, weight=weight, edges=counts[u, v], label=_weight_label(weight))
+    return view, dict(members)
+
+
+def summarize(
+    graph, max_nodes: int, options: Optional[SummaryOptions] = None, focus: Optional[str] = None
+) -> GraphSummary:
+    """A view of ``graph`` with at most ``max_nodes`` nodes.
+
+    Args:
+        graph: Graph to summarize.
+        max_nodes: Node budget of the view.
+        options: Clustering settings; the defaults if None.
+        focus: Cluster of the unfocused summary to drill into. Its members are
+               shown individually if they fit in the budget left by the other
+               clusters, and are clustered again (with the 'auto' strategy)
+               otherwise.
+
+    Raises:
+        KeyError: If ``focus`` is not a cluster of the summary.
+    """
+    options = options or SummaryOptions()
+    strategy, assignment = assign_clusters(graph, max_nodes, options)
+    if focus is None:
+        view, clusters = collapse(graph, assignment)
+        return GraphSummary(view, clusters, strategy)
+
+    members = [node for node, cluster in assignment.items() if cluster == focus]
+    if not members:
+        raise KeyError(f"Unknown cluster '{focus}'")
+    budget = max_nodes - (len(set(assignment.values())) - 1)
+    if len(members) <= budget:
+        inner: Assignment = dict.fromkeys(members)
+    else:
+        _, sub_clusters = assign_clusters(graph.subgraph(members), budget, options, AUTO)
+        inner = {
+            node: name if name.startswith(focus) else f"{focus}: {name}"
+            for node, name in sub_clusters.items()
+        }
+    view, clusters = collapse(graph, {**assignment, **inner})
+    return GraphSummary(view, clusters, strategy, focus)
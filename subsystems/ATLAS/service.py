@@ -15,8 +15,9 @@ Version: 1.0.0
 
 import asyncio
 import logging
+import threading
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict
 
 # Import Koios Logger utility
 from subsystems.KOIOS.core.logging import get_koios_logger
@@ -114,11 +115,17 @@ class AtlasService:
 
         # --- Instantiate ATLASCore ---
         atlas_core_config = self.config.get("core_config", {})  # Pass specific core config
+        for section in ("storage", "visualization"):
+            # Mapping store and rendering settings may live at the top level
+            if section in self.config and section not in atlas_core_config:
+                atlas_core_config = {**atlas_core_config, section: self.config[section]}
         self.atlas_core = ATLASCore(
             config=atlas_core_config,
             logger=atlas_core_logger,  # Pass the Koios logger
             data_dir=self.atlas_data_dir,
         )
+        # Core calls run in the executor; the lock keeps them from overlapping
+        self._core_lock = threading.Lock()
         # -----------------------------
 
         # --- Instantiate AtlasCartographer --- #
@@ -155,6 +162,10 @@ class AtlasService:
             await self.interface.subscribe(
                 f"request.{self.node_id}.analyze_system", self.handle_analyze_system_request
             )
+            # Incremental map updates
+            await self.interface.subscribe(
+                f"request.{self.node_id}.apply_delta", self.handle_apply_delta_request
+            )
             # Add other subscriptions as needed
             self.logger.info("Subscribed to Mycelium request topics.")  # Use self.logger
         except Exception as e:
@@ -183,6 +194,19 @@ class AtlasService:
         self.running = False
         self.logger.info("ATLAS Service stopped.")  # Use self.logger
 
+    async def _call_core(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` in the default executor while holding the core lock.
+
+        Mapping, analysis and export can take long on large maps; running them off
+        the loop keeps the service responsive, and the lock serializes them.
+        """
+
+        def locked() -> Any:
+            with self._core_lock:
+                return func(*args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(None, locked)
+
     # --- Mycelium Request Handlers --- #
 
     async def handle_map_system_request(self, message: Dict[str, Any]):
@@ -210,7 +234,7 @@ class AtlasService:
                 raise ValueError("Missing or invalid 'system_data' in payload.")
 
             # Execute the mapping
-            success = self.atlas_core.map_system(system_data, map_name)
+            success = await self._call_core(self.atlas_core.map_system, system_data, map_name)
 
             response_payload = {
                 "success": success,
@@ -236,13 +260,52 @@ class AtlasService:
                 response_topic, {"type": "error", "payload": {"message": str(e)}}
             )
 
+    async def handle_apply_delta_request(self, message: Dict[str, Any]):
+        """Handles 'request.ATLAS_SERVICE.apply_delta' Mycelium requests.
+
+        Delegates to ATLASCore.apply_delta to change the current map in place.
+
+        Expected payload keys:
+            - delta (Dict): 'nodes' and/or 'edges' sections with 'add', 'update'
+              and 'remove' entries (see ATLASCore.apply_delta).
+
+        Publishes response to: f'response.{self.node_id}.{request_id}'
+        """
+        request_id = message.get("id", "unknown")
+        self.logger.info(f"Received apply_delta request: {request_id}")
+        response_topic = f"response.{self.node_id}.{request_id}"
+
+        try:
+            delta = message.get("payload", {}).get("delta")
+            if not delta or not isinstance(delta, dict):
+                raise ValueError("Missing or invalid 'delta' in payload.")
+
+            change = await self._call_core(self.atlas_core.apply_delta, delta)
+            await self.interface.publish(
+                response_topic,
+                {"type": "apply_delta_response", "payload": {"success": True, "change": change}},
+            )
+            self.logger.info(
+                f"Processed apply_delta request {request_id}. "
+                f"Graph version: {change['graph_version']}"
+            )
+
+        except Exception as e:
+            self.logger.error(
+                f"Error handling apply_delta request {request_id}: {e}", exc_info=True
+            )
+            await self.interface.publish(
+                response_topic, {"type": "error", "payload": {"message": str(e)}}
+            )
+
     async def handle_generate_obsidian_request(self, message: Dict[str, Any]):
         """Handles 'request.ATLAS_SERVICE.generate_obsidian' Mycelium requests.
 
         Delegates to ATLASCore.export_to_obsidian (alias generate_obsidian_content)
         to generate Markdown content and a visualization image for the current map.
 
-        Expected payload: {}
+        Expected payload: {} or {"cluster": str} to drill into one cluster of a
+        summarized map.
 
         Publishes response to: f'response.{self.node_id}.{request_id}'
         """
@@ -252,7 +315,10 @@ class AtlasService:
 
         try:
             # Generate the markdown and image path
-            result = self.atlas_core.generate_obsidian_content()
+            result = await self._call_core(
+                self.atlas_core.generate_obsidian_content,
+                cluster=message.get("payload", {}).get("cluster"),
+            )
 
             if result:
                 markdown_content, image_path = result
@@ -299,7 +365,7 @@ class AtlasService:
         response_topic = f"response.{self.node_id}.{request_id}"
 
         try:
-            analysis_results = self.atlas_core.analyze_system()
+            analysis_results = await self._call_core(self.atlas_core.analyze_system)
             response_payload = {
                 "success": "error" not in analysis_results,
                 "analysis": analysis_results,
@@ -10,7 +10,10 @@ Test suite for the ATLAS Core logic.
 Version: 1.0.0
 """
 
+import json
 import logging
+import subprocess
+import sys
 from pathlib import Path
 from typing import Dict  # Added typing import
 
@@ -106,8 +109,8 @@ def test_map_system_success(atlas, sample_system_data):
     assert atlas.graph.has_edge("A", "B")
     assert atlas.graph.edges["A", "B"]["relation"] == "uses"
 
-    # Check if JSON file was saved
-    saved_files = list(atlas.data_dir.glob(f"{map_name.lower()}_*.json"))
+    # Check if the first revision was saved as a checkpoint
+    saved_files = list(atlas.mapping_store.mapping_dir(map_name).glob("r*.checkpoint.json*"))
     assert len(saved_files) == 1
 
 
@@ -154,7 +157,7 @@ def test_save_and_load_mapping(atlas, sample_system_data):
     initial_edge_AB_data = atlas.graph.edges["A", "B"].copy()
 
     # Find the saved file
-    saved_files = list(atlas.data_dir.glob(f"{map_name.lower()}_*.json"))
+    saved_files = list(atlas.mapping_store.mapping_dir(map_name).glob("r*.checkpoint.json*"))
     assert len(saved_files) == 1
     saved_path = saved_files[0]
 
@@ -168,6 +171,9 @@ def test_save_and_load_mapping(atlas, sample_system_data):
     assert new_atlas.graph.nodes["A"] == initial_node_A_data
     assert new_atlas.graph.edges["A", "B"] == initial_edge_AB_data
 
+    # Stored mappings can also be loaded by name
+    assert ATLASCore(atlas.config, atlas.logger, atlas.data_dir).load_mapping(map_name) is True
+
 
 def test_load_mapping_file_not_found(atlas, tmp_path):
     """Test loading a non-existent map file."""
@@ -269,3 +275,265 @@ def test_analyze_empty_system(atlas):
     analysis = atlas.analyze_system()
     assert "error" in analysis
     assert analysis["error"] == "No mapped system"
+
+
+def test_graph_version_bumps_on_mutation(atlas, sample_system_data):
+    """Every mutation made through ATLASCore bumps the graph version."""
+    initial = atlas.graph_version
+    atlas.map_system(sample_system_data, "version_test")
+    assert atlas.graph_version > initial
+
+    mapped = atlas.graph_version
+    assert atlas.mark_graph_changed(["node_attributes"]) == mapped + 1
+    atlas.graph = nx.DiGraph()
+    assert atlas.graph_version == mapped + 2
+    with pytest.raises(ValueError):
+        atlas.mark_graph_changed(["colour"])
+
+
+def test_analyze_system_memoizes_sections_per_version(atlas, sample_system_data, monkeypatch):
+    """Repeated analyses reuse cached sections; a change recomputes only affected ones."""
+    from ..core import atlas_core
+
+    calls = {"betweenness": 0, "node_attributes": 0}
+    betweenness = atlas_core.nx.betweenness_centrality
+    node_attributes = atlas._analyze_node_attributes
+
+    def counting_betweenness(graph):
+        calls["betweenness"] += 1
+        return betweenness(graph)
+
+    def counting_node_attributes():
+        calls["node_attributes"] += 1
+        return node_attributes()
+
+    monkeypatch.setattr(atlas_core.nx, "betweenness_centrality", counting_betweenness)
+    monkeypatch.setattr(atlas, "_analyze_node_attributes", counting_node_attributes)
+
+    atlas.map_system(sample_system_data, "memo_test")
+    first = atlas.analyze_system()
+    second = atlas.analyze_system()
+    assert second == first
+    assert second["graph_version"] == atlas.graph_version
+    assert calls == {"betweenness": 1, "node_attributes": 1}
+
+    # Attribute-only change: centrality stays cached
+    atlas.graph.nodes["A"]["owner"] = "team-a"
+    atlas.mark_graph_changed(["node_attributes"])
+    third = atlas.analyze_system()
+    assert "owner" in third["node_attributes"]
+    assert calls == {"betweenness": 1, "node_attributes": 2}
+
+    # A structural edit made directly on the graph is still noticed
+    atlas.graph.add_edge("A", "C")
+    fourth = atlas.analyze_system()
+    assert fourth["basic_metrics"]["num_edges"] == 3
+    assert calls == {"betweenness": 2, "node_attributes": 3}
+
+
+def test_analyze_system_reports_betweenness_params(atlas, sample_system_data):
+    """The betweenness mode comes from config and the parameters used are reported."""
+    atlas.map_system(sample_system_data, "centrality_test")
+    params = atlas.analyze_system()["centrality"]["betweenness_params"]
+    assert params["mode"] == "exact"
+
+    atlas.config.setdefault("analysis", {})["centrality"] = {
+        "mode": "sample",
+        "sample_size": 2,
+        "seed": 5,
+    }
+    params = atlas.analyze_system()["centrality"]["betweenness_params"]
+    assert (params["mode"], params["k"], params["seed"]) == ("sample", 2, 5)
+
+
+def test_apply_delta_updates_graph_in_place(atlas, sample_system_data):
+    """Removals, node and edge upserts are applied and summarized in the change record."""
+    atlas.map_system(sample_system_data, "delta_test")
+    version = atlas.graph_version
+
+    change = atlas.apply_delta(
+        {
+            "nodes": {"add": {"D": {"type": "queue"}}, "update": {"A": {"status": "degraded"}}},
+            "edges": {
+                "add": [{"source": "A", "target": "D", "relation": "publishes"}, ("D", "E")],
+                "remove": [{"source": "C", "target": "B"}],
+            },
+        }
+    )
+
+    assert change["previous_version"] == version
+    assert change["graph_version"] == atlas.graph_version == version + 1
+    assert change["nodes"] == {"added": ["D", "E"], "updated": ["A"], "removed": []}
+    assert change["edges"] == {
+        "added": [["A", "D"], ["D", "E"]],
+        "updated": [],
+        "removed": [["C", "B"]],
+    }
+    assert change["aspects"] == ["edge_attributes", "node_attributes", "structure"]
+    assert atlas.graph.nodes["A"] == {"type": "service", "status": "degraded"}
+    assert atlas.graph.edges["A", "D"]["relation"] == "publishes"
+    assert not atlas.graph.has_edge("C", "B")
+
+    change = atlas.apply_delta({"nodes": {"remove": ["D"]}})
+    assert change["edges"]["removed"] == [["A", "D"], ["D", "E"]]
+    assert "D" not in atlas.graph
+
+
+def test_apply_delta_keeps_unaffected_sections_cached(atlas, sample_system_data, monkeypatch):
+    """Attribute-only deltas keep centrality cached; no-op deltas keep the version."""
+    atlas.map_system(sample_system_data, "delta_cache_test")
+    atlas.analyze_system()
+    calls = []
+    monkeypatch.setattr(atlas, "_analyze_centrality", lambda: calls.append(1) or {})
+
+    version = atlas.graph_version
+    assert atlas.apply_delta({"nodes": {"update": {"A": {"type": "service"}}}})["aspects"] == []
+    assert atlas.graph_version == version
+
+    change = atlas.apply_delta({"edges": {"update": [("A", "B", {"relation": "reads"})]}})
+    assert change["edges"]["updated"] == [["A", "B"]]
+    assert change["aspects"] == ["edge_attributes"]
+    analysis = atlas.analyze_system()
+    assert calls == []
+    assert analysis["graph_version"] == version + 1
+
+    atlas.apply_delta({"edges": {"add": [("A", "C")]}})
+    atlas.analyze_system()
+    assert calls == [1]
+
+    with pytest.raises(ValueError):
+        atlas.apply_delta({"vertices": {}})
+
+
+def test_apply_delta_saves_revision_deltas(atlas, sample_system_data):
+    """Saved deltas hold only the changes and every revision can be rebuilt."""
+    atlas.map_system(sample_system_data, "delta_map")
+    record = atlas.apply_delta(
+        {"nodes": {"update": {"A": {"status": "degraded"}}}, "edges": {"add": [["C", "D"]]}},
+        save=True,
+    )
+    assert record["revision"] == 2
+    atlas.apply_delta({"nodes": {"remove": ["B"]}}, save=True)
+
+    revisions = atlas.mapping_store.revisions("delta_map")
+    assert [entry["kind"] for entry in revisions] == ["checkpoint", "delta", "delta"]
+    # A's attributes, D and C->D; then B and its two edges
+    assert [entry["changes"] for entry in revisions] == [None, 3, 3]
+
+    latest = ATLASCore(atlas.config, atlas.logger, atlas.data_dir)
+    assert latest.load_mapping("delta_map") is True
+    assert sorted(latest.graph.nodes) == ["A", "C", "D"]
+    assert latest.graph.nodes["A"]["status"] == "degraded"
+    assert latest.graph.has_edge("C", "D")
+
+    first = ATLASCore(atlas.config, atlas.logger, atlas.data_dir)
+    assert first.load_mapping("delta_map", revision=1) is True
+    assert sorted(first.graph.nodes) == ["A", "B", "C"]
+    assert first.graph.nodes["A"]["status"] == "active"
+    assert first.load_mapping("delta_map", revision=7) is False
+
+
+def test_load_mapping_metadata_and_subgraph(atlas, sample_system_data):
+    """Metadata is read without the graph, and filtered loads keep matching nodes only."""
+    atlas.map_system(sample_system_data, "partial_map")
+    metadata = atlas.read_mapping_metadata("partial_map")
+    assert metadata["name"] == "partial_map"
+    assert metadata["revision"] == 1
+
+    partial = ATLASCore(atlas.config, atlas.logger, atlas.data_dir)
+    assert partial.load_mapping("partial_map", node_attributes={"type": "service"}) is True
+    assert sorted(partial.graph.nodes) == ["A", "C"]
+    assert partial.graph.number_of_edges() == 0
+    # A partial mapping is never saved over the full one
+    assert partial.apply_delta({"nodes": {"add": {"D": {}}}}, save=True)["revision"] is None
+
+
+NATIVE_RENDER_PROBE = """
+import json, logging, sys, tempfile, time
+from pathlib import Path
+import networkx as nx
+from subsystems.ATLAS.core.atlas_core import ATLASCore
+atlas = ATLASCore({"visualization": {"layout": "circular"}}, logging.getLogger("probe"),
+                  Path(tempfile.mkdtemp()))
+atlas.graph = nx.gnm_random_graph(3000, 6000, seed=1, directed=True)
+start = time.perf_counter()
+paths = [atlas.visualize(engine="svg"), atlas.visualize(engine="mermaid")]
+print(json.dumps({"seconds": time.perf_counter() - start, "suffixes": [p.suffix for p in paths],
+                  "matplotlib": "matplotlib" in sys.modules}))
+"""
+
+
+def test_native_renderers_skip_matplotlib():
+    """SVG and Mermaid maps of thousands of nodes render quickly without matplotlib."""
+    root = Path(__file__).resolve().parents[3]
+    result = subprocess.run(
+        [sys.executable, "-c", NATIVE_RENDER_PROBE],
+        cwd=root,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    probe = json.loads(result.stdout.strip().splitlines()[-1])
+    assert probe["suffixes"] == [".svg", ".mmd"]
+    assert probe["matplotlib"] is False
+    assert probe["seconds"] < 2.0
+
+
+def test_obsidian_content_embeds_mermaid(atlas, sample_system_data):
+    """With the Mermaid engine the chart is embedded as a code block."""
+    atlas.config["visualization"]["engine"] = "mermaid"
+    atlas.map_system(sample_system_data, "mermaid_test")
+    markdown_content, chart_path = atlas.generate_obsidian_content()
+    assert chart_path.suffix == ".mmd"
+    assert "```mermaid\n---\ntitle:" in markdown_content
+
+
+def test_layouts_cached_and_stored_with_mapping(atlas, sample_system_data):
+    """Positions are reused per structure version and restored with the mapping."""
+    cache = atlas._layout_cache
+    atlas.map_system(sample_system_data, "layout_map")
+    atlas.visualize(engine="svg")
+    atlas.visualize(engine="svg")
+    assert (cache.hits, cache.full_computations) == (1, 1)
+    first = dict(cache.current(atlas._aspect_versions["structure"])["spring"])
+
+    atlas.apply_delta({"edges": {"add": [["C", "D"]]}}, save=True)
+    atlas.visualize(engine="svg")
+    assert (cache.incremental_updates, cache.full_computations) == (1, 1)
+    positions = cache.current(atlas._aspect_versions["structure"])["spring"]
+    assert positions["B"] == first["B"]
+    assert list(atlas.mapping_store.mapping_dir("layout_map").glob("layouts.json*"))
+
+    # Attribute-only changes keep the stored positions valid
+    atlas.apply_delta({"nodes": {"update": {"A": {"status": "degraded"}}}}, save=True)
+    reloaded = ATLASCore(atlas.config, atlas.logger, atlas.data_dir)
+    assert reloaded.load_mapping("layout_map") is True
+    reloaded.visualize(engine="svg")
+    assert reloaded._layout_cache.hits == 1
+    assert reloaded._layout_cache.full_computations == 0
+
+
+def test_large_maps_are_summarized(atlas):
+    """Maps above max_nodes are drawn and exported as clusters, with drill-down."""
+    atlas.config["visualization"]["max_nodes"] = 10
+    nodes = {f"subsystems/{name}/core/m{i}.py": {} for name in "ABC" for i in range(20)}
+    edges = [
+        {"source": f"subsystems/A/core/m{i}.py", "target": f"subsystems/B/core/m{i}.py"}
+        for i in range(20)
+    ]
+    atlas.map_system({"nodes": nodes, "edges": edges}, "large_map")
+
+    chart = atlas.visualize(engine="mermaid").read_text(encoding="utf-8")
+    assert '["A (20)"]' in chart
+    assert '-->|"20"|' in chart
+    assert "%% 60 nodes collapsed into 3 clusters by subsystem" in chart
+
+    svg = atlas.visualize(engine="svg", cluster="A").read_text(encoding="utf-8")
+    assert svg.count("<circle") == 10
+    assert "showing the members of A" in svg
+    assert atlas.visualize(engine="svg", cluster="Z") is None
+
+    atlas.config["visualization"]["engine"] = "mermaid"
+    markdown_content, _ = atlas.generate_obsidian_content()
+    assert "## Clusters" in markdown_content
+    assert "- **A**: 20 nodes, 0 internal connections" in markdown_content
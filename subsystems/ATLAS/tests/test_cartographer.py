@@ -1,4 +1,5 @@
 import json
+import logging
 from datetime import datetime
 from unittest.mock import AsyncMock, Mock, patch
 
@@ -43,7 +44,7 @@ class MyceliumClient:
 
 # Use the mocks to patch the import in cartographer.py
 with patch.dict("sys.modules", {"mycelium": Mock()}):
-    from subsystems.ATLAS.core.cartographer import AtlasCartographer
+    from subsystems.ATLAS.core.cartographer import AtlasCartographer, RelationshipIndex
 
 
 @pytest.fixture
@@ -93,7 +94,11 @@ def cartographer(mock_mycelium, test_config, tmp_path):
     with open(config_path, "w") as f:
         json.dump(test_config, f)
     # Mock internal data structures for consistent testing
-    instance = AtlasCartographer(config_path=config_path, mycelium_client=mock_mycelium)
+    instance = AtlasCartographer(
+        config=test_config,
+        logger=logging.getLogger("TestAtlasCartographer"),
+        mycelium_client=mock_mycelium,
+    )
     instance.system_map = {}
     instance.relationships = {}
     instance.metadata = {}
@@ -512,14 +517,14 @@ async def test_cache_hit(mock_dt, cartographer):
     mock_dt.now.return_value = initial_time.replace(second=30)
 
     # Spy on the actual map generation logic to ensure it's NOT called
-    cartographer._build_map_recursive = AsyncMock(return_value=map_result)
+    cartographer._build_map = Mock(return_value=map_result)
 
     # Generate map
     result = await cartographer.generate_map(target, depth, include_metadata=True)
 
     # Assert result is from cache and internal method wasn't called
     assert result == map_result
-    cartographer._build_map_recursive.assert_not_called()
+    cartographer._build_map.assert_not_called()
 
 
 @pytest.mark.asyncio
@@ -550,14 +555,14 @@ async def test_cache_miss_expired(mock_dt, cartographer):
     mock_dt.now.return_value = initial_time.replace(minute=1, second=1)
 
     # Mock the actual map generation logic to ensure it IS called
-    cartographer._build_map_recursive = AsyncMock(return_value=fresh_map_result)
+    cartographer._build_map = Mock(return_value=fresh_map_result)
 
     # Generate map
     result = await cartographer.generate_map(target, depth, include_metadata=True)
 
     # Assert result is the fresh one and internal method was called
     assert result == fresh_map_result
-    cartographer._build_map_recursive.assert_called_once()
+    cartographer._build_map.assert_called_once()
 
 
 @pytest.mark.asyncio
@@ -599,6 +604,95 @@ async def test_cache_invalidation_on_relationship_update(cartographer):
     assert cache_key not in cartographer.analysis_cache
 
 
+@pytest.mark.asyncio
+async def test_generate_map_depth_is_exact_shortest_distance(cartographer):
+    """Components are expanded at their shortest distance, whatever the edge order."""
+    cartographer.system_map = {name: {} for name in ("root", "a", "b", "c", "d")}
+    cartographer.relationships = {
+        # Depth-first, 'b' would first be reached through 'a' at distance 2
+        "root": [
+            {"source": "root", "target": "a", "type": "calls"},
+            {"source": "root", "target": "b", "type": "calls"},
+        ],
+        "a": [{"source": "a", "target": "b", "type": "calls"}],
+        "b": [{"source": "b", "target": "c", "type": "calls"}],
+        "c": [{"source": "c", "target": "d", "type": "calls"}],
+    }
+
+    map_data = await cartographer.generate_map("root", depth=2, include_metadata=False)
+
+    assert set(map_data["nodes"]) == {"root", "a", "b", "c"}
+    # Outgoing relationships of every mapped component, including the c -> d frontier edge
+    assert len(map_data["relationships"]) == 5
+    assert map_data["metadata"] is None
+
+
+@pytest.mark.asyncio
+async def test_generate_map_long_chain_has_no_recursion_limit(cartographer):
+    """Deep maps are built iteratively."""
+    length = 5000
+    cartographer.config["max_depth"] = length
+    cartographer.system_map = {f"n{i}": {} for i in range(length + 1)}
+    cartographer.relationships = {
+        f"n{i}": [{"source": f"n{i}", "target": f"n{i + 1}", "type": "calls"}]
+        for i in range(length)
+    }
+
+    map_data = await cartographer.generate_map("n0", depth=length)
+
+    assert len(map_data["nodes"]) == length + 1
+
+
+def test_relationship_index_upserts_and_in_edges():
+    """The index keys relationships by (source, target, type) in both directions."""
+    index = RelationshipIndex({"a": [{"source": "a", "target": "b", "type": "calls"}]})
+    index.upsert({"source": "a", "target": "c", "type": "calls"})
+    index.upsert({"source": "a", "target": "b", "type": "calls", "metadata": {"n": 2}})
+    index.upsert({"source": "c", "target": "b", "type": "imports"})
+
+    # The updated relationship replaces the old one and moves to the end
+    assert [rel["target"] for rel in index["a"]] == ["c", "b"]
+    assert index.get_relationship("a", "b", "calls")["metadata"] == {"n": 2}
+    assert sorted(rel["source"] for rel in index.in_edges("b")) == ["a", "c"]
+    assert index.edge_count() == 3
+
+    assert index.discard("c", "b", "imports") is not None
+    assert index.discard("c", "b", "imports") is None
+    assert [rel["source"] for rel in index.in_edges("b")] == ["a"]
+
+    del index["a"]
+    assert "a" not in index
+    assert list(index.in_edges("b")) == [] and list(index.in_edges("c")) == []
+
+
+@pytest.mark.asyncio
+async def test_updates_invalidate_maps_rooted_elsewhere(cartographer):
+    """A cached map is invalidated when any component it expanded changes."""
+    cartographer.system_map = {"root": {}, "mid": {}, "leaf": {}, "other": {}}
+    cartographer.relationships = {
+        "root": [{"source": "root", "target": "mid", "type": "calls"}],
+        "mid": [{"source": "mid", "target": "leaf", "type": "calls"}],
+    }
+    await cartographer.generate_map("root", depth=1)
+    await cartographer.generate_map("other", depth=1)
+    await cartographer.generate_map("root", depth=1)
+    assert cartographer.cache_metrics()["hits"] == 1
+
+    # 'leaf' is only the target of a frontier relationship; the map did not expand it
+    await cartographer.update_metadata("leaf", {"version": "2"})
+    assert "root:1:True" in cartographer.analysis_cache
+
+    await cartographer.update_metadata("mid", {"version": "2"})
+    assert "root:1:True" not in cartographer.analysis_cache
+    assert "other:1:True" in cartographer.analysis_cache
+
+    map_data = await cartographer.generate_map("root", depth=1)
+    assert map_data["metadata"]["mid"] == {"version": "2"}
+    await cartographer.update_relationship("mid", "other", "calls")
+    assert "root:1:True" not in cartographer.analysis_cache
+    assert cartographer.cache_metrics()["invalidations"] == 2
+
+
 # --- Tests for Config Loading ---
 
 
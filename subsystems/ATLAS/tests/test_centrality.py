@@ -0,0 +1,76 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Centrality Tests
+======================================
+
+Test suite for the ATLAS betweenness centrality modes.
+
+Version: 1.0.0
+"""
+
+import networkx as nx
+import pytest
+
+from ..core.centrality import (
+    CentralityConfig,
+    betweenness_centrality,
+    parallel_betweenness,
+    plan_betweenness,
+)
+
+
+@pytest.fixture
+def graph():
+    return nx.gnp_random_graph(120, 0.05, seed=7, directed=True)
+
+
+def _assert_close(values, expected):
+    assert values.keys() == expected.keys()
+    assert max(abs(values[node] - expected[node]) for node in expected) < 1e-9
+
+
+def test_exact_mode_matches_networkx(graph):
+    values, params = betweenness_centrality(graph, CentralityConfig(mode="exact"))
+    _assert_close(values, nx.betweenness_centrality(graph))
+    assert params["mode"] == "exact" and params["k"] is None
+    assert params["nodes"] == 120
+
+
+def test_sample_mode_is_seeded_and_reported(graph):
+    config = CentralityConfig(mode="sample", sample_size=30, seed=3)
+    first, params = betweenness_centrality(graph, config)
+    second, _ = betweenness_centrality(graph, config)
+    assert first == second
+    _assert_close(first, nx.betweenness_centrality(graph, k=30, seed=3))
+    assert (params["mode"], params["k"], params["seed"]) == ("sample", 30, 3)
+
+
+def test_parallel_mode_matches_exact(graph):
+    """Summed per-chunk contributions equal the exact values, directed or not."""
+    _assert_close(parallel_betweenness(graph, 2), nx.betweenness_centrality(graph))
+    undirected = graph.to_undirected()
+    _assert_close(parallel_betweenness(undirected, 2), nx.betweenness_centrality(undirected))
+
+
+def test_auto_mode_follows_the_time_budget(graph):
+    """Exact within the budget; otherwise a sample no smaller than min_sample_size."""
+    roomy = plan_betweenness(graph, CentralityConfig(time_budget_seconds=60, processes=1))
+    assert roomy.mode == "exact"
+    assert roomy.estimated_exact_seconds is not None
+
+    tight = plan_betweenness(
+        graph, CentralityConfig(time_budget_seconds=1e-9, min_sample_size=10, processes=1)
+    )
+    assert (tight.mode, tight.k, tight.seed) == ("sample", 10, 42)
+
+    small = plan_betweenness(nx.path_graph(5), CentralityConfig(time_budget_seconds=1e-9))
+    assert small.mode == "exact"  # Not worth sampling below min_sample_size
+
+
+def test_degenerate_plans_fall_back_to_exact(graph):
+    assert plan_betweenness(graph, CentralityConfig(mode="sample", sample_size=500)).mode == "exact"
+    assert plan_betweenness(graph, CentralityConfig(mode="parallel", processes=1)).mode == "exact"
+    with pytest.raises(ValueError):
+        CentralityConfig.from_config({"mode": "fastest"})
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Layout Cache Tests
+========================================
+
+Test suite for cached and incrementally updated node positions.
+
+Version: 1.0.0
+"""
+
+import random
+
+import networkx as nx
+
+from ..core.layout_cache import (
+    CACHED,
+    COMPUTED,
+    INCREMENTAL,
+    LayoutCache,
+    incremental_layout,
+    place_new_nodes,
+)
+from ..core.renderer import compute_layout
+
+
+def _ring(size: int) -> nx.DiGraph:
+    return nx.DiGraph([(f"n{i}", f"n{(i + 1) % size}") for i in range(size)])
+
+
+def test_place_new_nodes_next_to_neighbours():
+    graph = nx.DiGraph([("a", "new"), ("new", "b"), ("c", "d")])
+    known = {"a": (0.0, 0.0), "b": (1.0, 0.0), "c": (-1.0, 1.0)}
+    positions = place_new_nodes(graph, known, random.Random(1))
+    assert {node: positions[node] for node in known} == known
+    x, y = positions["new"]
+    assert abs(x - 0.5) < 0.05 and abs(y) < 0.05
+    # Without placed neighbours the node stays within the known bounds
+    x, y = positions["d"]
+    assert -1.0 <= x <= 1.0 and 0.0 <= y <= 1.0
+
+
+def test_incremental_layout_keeps_untouched_nodes_fixed():
+    graph = _ring(12)
+    previous = {node: (float(x), float(y)) for node, (x, y) in nx.circular_layout(graph).items()}
+    graph.add_edge("n0", "extra")
+    positions = incremental_layout(graph, previous, {"n0", "extra"}, seed=3)
+    assert set(positions) == set(graph)
+    assert all(positions[node] == previous[node] for node in previous if node != "n0")
+    # Removals alone keep every surviving position
+    graph.remove_node("extra")
+    graph.remove_node("n5")
+    assert incremental_layout(graph, previous, {"n5"}, seed=3) == {
+        node: previous[node] for node in graph
+    }
+    assert incremental_layout(nx.DiGraph([("x", "y")]), previous, set(), seed=3) is None
+
+
+def test_layout_cache_versions():
+    cache = LayoutCache(seed=7)
+    graph = _ring(8)
+    calls = []
+
+    def compute():
+        calls.append(1)
+        return compute_layout(graph, "spring", 7)
+
+    first, how = cache.get("spring", graph, 1, compute)
+    assert how == COMPUTED
+    again, how = cache.get("spring", graph, 1, compute)
+    assert how == CACHED and again is first
+    assert cache.unpersisted(1) == {"spring": first}
+    cache.mark_persisted(["spring"])
+    assert cache.unpersisted(1) == {}
+
+    graph.add_edge("n3", "n9")
+    cache.note_change({"n3", "n9"})
+    updated, how = cache.get("spring", graph, 2, compute)
+    assert how == INCREMENTAL and len(calls) == 1
+    assert updated["n0"] == first["n0"]
+
+    # Layouts without an incremental update are recomputed
+    _, how = cache.get("circular", graph, 2, lambda: compute_layout(graph, "circular"))
+    graph.add_edge("n9", "n10")
+    _, how = cache.get("circular", graph, 3, lambda: compute_layout(graph, "circular"))
+    assert how == COMPUTED
+
+    # Restored layouts of another revision only seed the update
+    cache.restore({"spring": updated}, None)
+    assert cache.get("spring", graph, 3, compute)[1] == INCREMENTAL
+    assert (cache.hits, cache.incremental_updates, cache.full_computations) == (1, 2, 3)
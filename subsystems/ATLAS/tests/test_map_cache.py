@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Map Cache Tests
+=====================================
+
+Test suite for the ATLAS map cache.
+
+Version: 1.0.0
+"""
+
+from datetime import datetime, timedelta
+
+from ..core.map_cache import MapCache, estimate_size
+
+NOW = datetime(2024, 1, 1, 12, 0, 0)
+
+
+def _map(*nodes):
+    return {
+        "nodes": {node: {} for node in nodes},
+        "relationships": [
+            {"source": a, "target": b, "type": "calls"} for a, b in zip(nodes, nodes[1:])
+        ],
+        "metadata": {},
+    }
+
+
+def test_invalidation_follows_touched_components():
+    """Updating a component drops every map that included it, wherever it was rooted."""
+    cache = MapCache()
+    cache.put("a:2:True", _map("a", "b", "c"), NOW, {"a", "b", "c"})
+    cache.put("c:1:True", _map("c", "d"), NOW, {"c", "d"})
+    cache.put("x:1:True", _map("x"), NOW, {"x"})
+
+    assert cache.invalidate_component("c") == 2
+    assert list(cache) == ["x:1:True"]
+    assert cache.invalidate_component("b") == 0
+    # Keys of removed entries are gone from the reverse index as well
+    assert cache._by_component == {"x": {"x:1:True"}}
+    assert cache.metrics()["invalidations"] == 2
+
+
+def test_components_are_derived_when_not_given():
+    cache = MapCache()
+    cache["root:1:True"] = {"result": _map("root", "leaf"), "timestamp": NOW}
+    assert cache["root:1:True"]["components"] == {"root", "leaf"}
+
+
+def test_lru_eviction_by_entries_and_bytes():
+    """Least recently used entries are evicted first; oversized maps are not stored."""
+    cache = MapCache(max_entries=2)
+    cache.put("a:1:True", _map("a"), NOW)
+    cache.put("b:1:True", _map("b"), NOW)
+    assert cache.lookup("a:1:True", NOW, 60) is not None
+    cache.put("c:1:True", _map("c"), NOW)
+    assert list(cache) == ["a:1:True", "c:1:True"]
+
+    size = estimate_size(_map("a"))
+    cache = MapCache(max_entries=None, max_bytes=2 * size)
+    for key in ("a", "b", "c"):
+        cache.put(f"{key}:1:True", _map(key), NOW)
+    assert list(cache) == ["b:1:True", "c:1:True"]
+    assert cache.metrics()["bytes"] == 2 * size
+    assert cache.metrics()["evictions"] == 1
+    assert not cache.put("big:1:True", _map("big", "a", "b", "c"), NOW)
+    assert "big:1:True" not in cache
+
+
+def test_expired_entries_are_purged_on_use():
+    """Entries past the TTL are dropped even if their own key is never read again."""
+    cache = MapCache()
+    cache.put("old:1:True", _map("old"), NOW)
+    cache.put("new:1:True", _map("new"), NOW + timedelta(seconds=50))
+
+    assert cache.lookup("other:1:True", NOW + timedelta(seconds=70), 60) is None
+    assert list(cache) == ["new:1:True"]
+    assert cache._by_component == {"new": {"new:1:True"}}
+
+    metrics = cache.metrics()
+    assert (metrics["hits"], metrics["misses"], metrics["expirations"]) == (0, 1, 1)
+    assert cache.lookup("new:1:True", NOW + timedelta(seconds=70), 60) is not None
+    assert cache.metrics()["hit_rate"] == 0.5
@@ -0,0 +1,81 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Mapping Store Tests
+=========================================
+
+Test suite for the checkpoint-plus-delta mapping store.
+
+Version: 1.0.0
+"""
+
+import networkx as nx
+
+from ..core.mapping_store import MappingStore
+
+
+def _chain(length: int) -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_edges_from((f"n{i}", f"n{i + 1}", {"weight": 1}) for i in range(length))
+    return graph
+
+
+def test_checkpoints_and_deltas_rebuild_every_revision(tmp_path):
+    """Deltas between checkpoints replay to the exact graph of each revision."""
+    store = MappingStore(tmp_path, checkpoint_interval=3)
+    graph = _chain(50)
+    snapshots = []
+    for step in range(7):
+        graph.nodes["n0"]["step"] = step
+        graph.add_edge("n0", f"extra{step}")
+        if step == 4:
+            graph.remove_node("n10")
+        store.save("Chain Map", graph, {"name": "Chain Map"})
+        snapshots.append(graph.copy())
+
+    revisions = store.revisions("Chain Map")
+    assert [entry["kind"] for entry in revisions] == [
+        "checkpoint", "delta", "delta", "checkpoint", "delta", "delta", "checkpoint"
+    ]  # fmt: skip
+    assert revisions[1]["changes"] == 3  # n0's attributes, extra1 and n0->extra1
+    assert all(entry["file"].endswith(".json.gz") for entry in revisions)
+
+    # A fresh store has no in-memory state and must replay from disk
+    fresh = MappingStore(tmp_path, checkpoint_interval=3)
+    for revision, expected in enumerate(snapshots, start=1):
+        graph, metadata = fresh.load("Chain Map", revision)
+        assert metadata["revision"] == revision
+        assert nx.utils.graphs_equal(graph, expected)
+
+
+def test_touched_limits_the_delta(tmp_path):
+    """Only the touched nodes and edges are compared when they are given."""
+    store = MappingStore(tmp_path, compression=False)
+    graph = _chain(10)
+    store.save("m", graph, {})
+    graph.nodes["n3"]["label"] = "three"
+    graph.nodes["n5"]["label"] = "five"  # Not reported as touched
+    path, entry = store.save("m", graph, {}, touched=(["n3"], []))
+    assert path.suffix == ".json"
+    assert entry["changes"] == 1
+
+
+def test_old_checkpoints_are_pruned(tmp_path):
+    """Only max_checkpoints checkpoints and their deltas stay on disk."""
+    store = MappingStore.from_config(
+        tmp_path, {"checkpoint_interval": 2, "backup": {"enabled": True, "max_backups": 2}}
+    )
+    graph = _chain(5)
+    for step in range(9):
+        graph.graph["step"] = step
+        graph.add_node(f"x{step}")
+        store.save("m", graph, {})
+
+    revisions = store.revisions("m")
+    assert [entry["revision"] for entry in revisions] == [7, 8, 9]
+    assert sorted(p.name for p in store.mapping_dir("m").iterdir()) == sorted(
+        [entry["file"] for entry in revisions] + ["manifest.json"]
+    )
+    graph, _ = store.load("m", 8)
+    assert "x7" in graph and "x8" not in graph
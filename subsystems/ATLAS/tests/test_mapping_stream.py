@@ -0,0 +1,96 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Mapping Stream Tests
+==========================================
+
+Test suite for the streaming node-link mapping loader.
+
+Version: 1.0.0
+"""
+
+import gzip
+import json
+
+import networkx as nx
+import pytest
+
+from ..core import mapping_stream
+from ..core.mapping_store import MappingStore
+from ..core.mapping_stream import NodeFilter, load_mapping_document, read_metadata
+
+
+def _sample_graph() -> nx.DiGraph:
+    graph = nx.DiGraph(title="sample")
+    graph.add_node("core/a.py", kind="module", note='tricky "text", ]} [{')
+    graph.add_node("core/b.py", kind="module", size=1.5e3)
+    graph.add_node("tests/test_a.py", kind="test", flags=[1, None, True])
+    graph.add_edge("core/a.py", "core/b.py", weight=-12)
+    graph.add_edge("tests/test_a.py", "core/a.py", weight=3)
+    return graph
+
+
+def _write(path, graph, compress=False):
+    document = {"metadata": {"name": "sample"}, "graph": nx.node_link_data(graph)}
+    opener = gzip.open if compress else open
+    with opener(path, "wt", encoding="utf-8") as f:
+        json.dump(document, f, indent=2)
+
+
+@pytest.mark.parametrize("compress", [False, True])
+def test_stream_matches_node_link_graph(tmp_path, monkeypatch, compress):
+    """Values split across tiny read chunks decode exactly as with json.load."""
+    monkeypatch.setattr(mapping_stream, "READ_CHUNK_SIZE", 5)
+    path = tmp_path / ("map.json.gz" if compress else "map.json")
+    _write(path, _sample_graph(), compress)
+
+    graph, metadata, skipped = load_mapping_document(path, batch_size=2)
+    assert metadata == {"name": "sample"}
+    assert skipped == 0
+    assert isinstance(graph, nx.DiGraph)
+    assert graph.graph == {"title": "sample"}
+    assert nx.utils.graphs_equal(graph, _sample_graph())
+    assert read_metadata(path) == {"name": "sample"}
+
+
+def test_filtered_subgraph(tmp_path):
+    """Only matching nodes and the edges between them are loaded."""
+    path = tmp_path / "map.json"
+    _write(path, _sample_graph())
+
+    graph, _, skipped = load_mapping_document(path, NodeFilter.build(prefixes=["core/"]))
+    assert sorted(graph.nodes) == ["core/a.py", "core/b.py"]
+    assert list(graph.edges) == [("core/a.py", "core/b.py")]
+    assert skipped == 1
+
+    graph, _, _ = load_mapping_document(path, NodeFilter.build({"kind": "test"}))
+    assert list(graph.nodes) == ["tests/test_a.py"]
+    assert graph.number_of_edges() == 0
+
+
+def test_invalid_documents(tmp_path):
+    path = tmp_path / "map.json"
+    path.write_text('{"metadata": {}, "graph": {"nodes": [{"id": 1} {"id": 2}]}}')
+    with pytest.raises(json.JSONDecodeError):
+        load_mapping_document(path)
+    path.write_text('{"graph": {"nodes": []}}')
+    with pytest.raises(ValueError):
+        load_mapping_document(path)
+
+
+def test_attribute_filter_sees_replayed_deltas(tmp_path):
+    """A node that only matches after a delta keeps its edges from the checkpoint."""
+    store = MappingStore(tmp_path)
+    graph = _sample_graph()
+    store.save("m", graph, {})
+    graph.nodes["core/b.py"]["kind"] = "test"
+    store.save("m", graph, {})
+
+    loaded, _ = MappingStore(tmp_path).load("m", node_filter=NodeFilter.build({"kind": "test"}))
+    assert sorted(loaded.nodes) == ["core/b.py", "tests/test_a.py"]
+    assert loaded.number_of_edges() == 0
+
+    loaded, _ = MappingStore(tmp_path).load("m", node_filter=NodeFilter.build(prefixes=["core/"]))
+    assert loaded.nodes["core/b.py"]["kind"] == "test"
+    assert list(loaded.edges) == [("core/a.py", "core/b.py")]
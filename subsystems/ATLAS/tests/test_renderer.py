@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Renderer Tests
+====================================
+
+Test suite for the native SVG and Mermaid renderers.
+
+Version: 1.0.0
+"""
+
+import xml.etree.ElementTree as ET
+
+import networkx as nx
+import pytest
+
+from ..core.renderer import (
+    MATPLOTLIB,
+    MERMAID,
+    SVG,
+    RenderStyle,
+    compute_layout,
+    render_mermaid,
+    render_svg,
+    resolve_engine,
+)
+
+SVG_NS = "{http://www.w3.org/2000/svg}"
+
+
+@pytest.fixture
+def graph() -> nx.DiGraph:
+    graph = nx.DiGraph()
+    graph.add_node("api", label='API <"gateway">')
+    graph.add_edge("api", "db", relation="uses")
+    graph.add_edge("worker", "db")
+    return graph
+
+
+def test_render_svg(graph):
+    """The SVG is well-formed, with one circle and label per node and one path per edge."""
+    svg = render_svg(graph, compute_layout(graph, "circular"), "Map & more", RenderStyle())
+    root = ET.fromstring(svg)
+    assert len(root.findall(f".//{SVG_NS}circle")) == 3
+    assert len(root.findall(f".//{SVG_NS}path[@class='e']")) == 2
+    texts = [text.text for text in root.iter(f"{SVG_NS}text")]
+    assert texts[0] == "Map & more"
+    assert 'API <"gateway">' in texts
+
+
+def test_render_mermaid(graph):
+    """Labels are escaped and edge relations become edge labels."""
+    chart = render_mermaid(graph, "Map", RenderStyle(direction="TD"))
+    lines = chart.splitlines()
+    assert lines[3] == "flowchart TD"
+    assert '    n0["API &lt;#quot;gateway#quot;&gt;"]' in lines
+    assert '    n0 -->|"uses"| n1' in lines
+    assert "    n2 --> n1" in lines
+
+
+def test_note_and_engine_resolution(graph):
+    chart = render_mermaid(graph, "", RenderStyle(), "3 nodes collapsed")
+    assert chart.endswith("    %% 3 nodes collapsed\n")
+
+    assert resolve_engine(None, "map.png", {"engine": MERMAID}) == MATPLOTLIB
+    assert resolve_engine(None, "map.mmd", {}) == MERMAID
+    assert resolve_engine(None, None, {"engine": MERMAID}) == MERMAID
+    assert resolve_engine(None, None, {"default_format": "png"}) == MATPLOTLIB
+    assert resolve_engine(None, None, {}) == SVG
+    with pytest.raises(ValueError):
+        resolve_engine("graphviz", None, {})
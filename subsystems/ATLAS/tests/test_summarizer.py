@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - ATLAS Summarizer Tests
+======================================
+
+Test suite for level-of-detail summaries of large maps.
+
+Version: 1.0.0
+"""
+
+import networkx as nx
+import pytest
+
+from ..core.summarizer import (
+    CLUSTER,
+    COMMUNITY,
+    DIRECTORY,
+    OTHER,
+    SUBSYSTEM,
+    SummaryOptions,
+    assign_clusters,
+    summarize,
+)
+
+
+@pytest.fixture
+def graph() -> nx.DiGraph:
+    graph = nx.DiGraph()
+    for subsystem, modules in (("ATLAS", 6), ("NEXUS", 4), ("KOIOS", 2)):
+        for index in range(modules):
+            package = "core" if index % 2 else "tests"
+            graph.add_node(f"subsystems/{subsystem}/{package}/m{index}.py")
+    graph.add_edge("subsystems/ATLAS/core/m1.py", "subsystems/NEXUS/core/m1.py", weight=2)
+    graph.add_edge("subsystems/ATLAS/core/m3.py", "subsystems/NEXUS/tests/m0.py")
+    graph.add_edge("subsystems/ATLAS/core/m1.py", "subsystems/ATLAS/tests/m0.py")
+    graph.add_edge("subsystems/KOIOS/core/m1.py", "subsystems/ATLAS/core/m1.py")
+    return graph
+
+
+def test_summary_by_subsystem_aggregates_edges(graph):
+    summary = summarize(graph, 5)
+    assert summary.strategy == SUBSYSTEM
+    assert summary.graph.number_of_nodes() == 3
+    assert {name: len(members) for name, members in summary.clusters.items()} == {
+        "ATLAS": 6,
+        "NEXUS": 4,
+        "KOIOS": 2,
+    }
+    atlas, nexus = (CLUSTER, "ATLAS"), (CLUSTER, "NEXUS")
+    assert summary.graph.edges[atlas, nexus] == {"weight": 3, "edges": 2, "label": "3"}
+    assert summary.graph.nodes[atlas]["internal_edges"] == 1
+    assert summary.graph.nodes[atlas]["label"] == "ATLAS (6)"
+    assert summary.note == "12 nodes collapsed into 3 clusters by subsystem"
+
+
+def test_budget_merges_smallest_clusters(graph):
+    strategy, assignment = assign_clusters(graph, 2, SummaryOptions(strategy=SUBSYSTEM))
+    assert strategy == SUBSYSTEM
+    assert set(assignment.values()) == {"ATLAS", OTHER}
+
+    # Directories deepen while they fit the budget
+    _, assignment = assign_clusters(graph, 6, SummaryOptions(strategy=DIRECTORY))
+    assert assignment["subsystems/NEXUS/core/m1.py"] == "subsystems/NEXUS/core"
+    _, assignment = assign_clusters(graph, 5, SummaryOptions(strategy=DIRECTORY))
+    assert assignment["subsystems/NEXUS/core/m1.py"] == "subsystems/NEXUS"
+
+
+def test_drill_down_into_cluster(graph):
+    summary = summarize(graph, 8, focus="ATLAS")
+    assert summary.focus == "ATLAS"
+    assert set(summary.clusters) == {"NEXUS", "KOIOS"}
+    assert summary.graph.number_of_nodes() == 8
+    assert summary.graph.has_edge("subsystems/ATLAS/core/m1.py", "subsystems/ATLAS/tests/m0.py")
+    assert summary.graph.edges["subsystems/ATLAS/core/m1.py", (CLUSTER, "NEXUS")]["weight"] == 2
+
+    # Members beyond the remaining budget are clustered again
+    summary = summarize(graph, 4, focus="ATLAS")
+    assert summary.graph.number_of_nodes() <= 4
+    assert "ATLAS: subsystems/ATLAS/core" in summary.clusters
+
+    with pytest.raises(KeyError):
+        summarize(graph, 4, focus="ETHIK")
+
+
+def test_community_fallback():
+    graph = nx.relabel_nodes(nx.barbell_graph(5, 0), lambda node: f"node{node}")
+    summary = summarize(graph, 3)
+    assert summary.strategy == COMMUNITY
+    assert sorted(len(members) for members in summary.clusters.values()) == [5, 5]
+    assert summary.graph.number_of_edges() == 1
+    with pytest.raises(ValueError):
+        SummaryOptions.from_config({"strategy": "random"})
@@ -13,7 +13,31 @@ Version: 1.0.0
 import ast
 import logging
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Union
+from typing import Dict, FrozenSet, Iterable, List, Optional, Tuple, Union
+
+# Fields a caller can request from an analysis. "counts" adds function and
+# class counts, "functions"/"classes" the per-item entries, and "docstrings",
+# "decorators" and "complexity" the corresponding details (per function too).
+ANALYSIS_FIELDS = frozenset(
+    {"counts", "imports", "complexity", "functions", "classes", "docstrings", "decorators"}
+)
+
+
+def normalize_fields(fields: Optional[Iterable[str]]) -> Optional[FrozenSet[str]]:
+    """Validate a field projection. None means the full analysis.
+
+    Raises:
+        ValueError: If an unknown field is requested
+    """
+    if fields is None:
+        return None
+    requested = frozenset([fields] if isinstance(fields, str) else fields)
+    unknown = requested - ANALYSIS_FIELDS
+    if unknown:
+        raise ValueError(
+            f"Unknown analysis fields: {sorted(unknown)}; expected {sorted(ANALYSIS_FIELDS)}"
+        )
+    return requested
 
 
 @dataclass
@@ -38,7 +62,10 @@ class FunctionInfo:
     is_async: bool = False
     start_line: int = 0
     end_line: int = 0
-    complexity: int = 0
+    complexity: int = 0  # Nesting-aware cognitive complexity of the body
+    cyclomatic_complexity: int = 1
+    line_count: int = 0
+    statement_count: int = 0
 
 
 @dataclass
@@ -53,28 +80,74 @@ class ClassInfo:
 
 
 class CodeVisitor(ast.NodeVisitor):
-    """AST visitor for analyzing Python code structure."""
+    """AST visitor for analyzing Python code structure.
 
-    def __init__(self, logger: logging.Logger):
+    With a ``fields`` projection (see ``ANALYSIS_FIELDS``) only the requested
+    parts are extracted: unrequested imports, function/class records,
+    docstrings, decorators and per-function metrics are skipped, while the
+    file-level cognitive load and the function/class counts are always kept.
+    """
+
+    def __init__(self, logger: logging.Logger, fields: Optional[Iterable[str]] = None):
         self.logger = logger
+        self.fields = normalize_fields(fields)
+        wanted = ANALYSIS_FIELDS if self.fields is None else self.fields
+        self._want_imports = "imports" in wanted
+        self._want_functions = "functions" in wanted
+        self._want_classes = "classes" in wanted
+        self._want_docstrings = "docstrings" in wanted
+        self._want_decorators = "decorators" in wanted
+        self._want_function_metrics = self._want_functions and "complexity" in wanted
         self.imports: List[ImportInfo] = []
         self.functions: List[FunctionInfo] = []
         self.classes: List[ClassInfo] = []
+        self.function_count: int = 0  # Functions outside classes, like len(functions)
+        self.class_count: int = 0
         self.current_class: Optional[ClassInfo] = None
+        self._class_depth: int = 0  # Method context, also when classes are not recorded
         self.cognitive_load: int = 0
         self._nesting_level: int = 0  # Track nesting for complexity boost
+        # Enclosing functions with the nesting level of their body, innermost last
+        self._function_stack: List[Tuple[FunctionInfo, int]] = []
+
+    def visit(self, node: ast.AST):
+        """Visit a node, counting statements towards the innermost function."""
+        if self._function_stack and isinstance(node, ast.stmt):
+            self._function_stack[-1][0].statement_count += 1
+        return super().visit(node)
+
+    def _score_nested(self):
+        """Cognitive increment for a nesting structure: +1 plus the nesting level.
+
+        Functions are scored relative to the nesting level of their own body.
+        """
+        self.cognitive_load += 1 + self._nesting_level
+        if self._function_stack:
+            func, base_level = self._function_stack[-1]
+            func.complexity += 1 + self._nesting_level - base_level
+
+    def _score_flat(self, amount: int = 1):
+        """Cognitive increment without a nesting penalty."""
+        self.cognitive_load += amount
+        if self._function_stack:
+            self._function_stack[-1][0].complexity += amount
+
+    def _add_branches(self, amount: int = 1):
+        """Cyclomatic increment for the innermost function."""
+        if self._function_stack:
+            self._function_stack[-1][0].cyclomatic_complexity += amount
 
     def _get_docstring(self, node: ast.AST) -> Optional[str]:
         """Extract docstring from an AST node."""
-        if isinstance(
+        if self._want_docstrings and isinstance(
             node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)
-        ) and ast.get_docstring(node):
-            return ast.get_docstring(node)
+        ):
+            return ast.get_docstring(node) or None
         return None
 
     def _get_decorators(self, node: ast.AST) -> List[str]:
         """Extract decorator names from an AST node."""
-        if not hasattr(node, "decorator_list"):
+        if not self._want_decorators or not hasattr(node, "decorator_list"):
             return []
         decorators = []
         for decorator in node.decorator_list:
@@ -89,6 +162,8 @@ class CodeVisitor(ast.NodeVisitor):
 
     def visit_Import(self, node: ast.Import):
         """Process Import nodes."""
+        if not self._want_imports:
+            return
         for name in node.names:
             self.imports.append(
                 ImportInfo(module=name.name, alias=name.asname, is_from_import=False)
@@ -97,6 +172,8 @@ class CodeVisitor(ast.NodeVisitor):
 
     def visit_ImportFrom(self, node: ast.ImportFrom):
         """Process ImportFrom nodes."""
+        if not self._want_imports:
+            return
         # module = node.module or "" # Removed unused variable
         # Aggregate all names from a single 'from ... import ...'
         imported_names = [name.name for name in node.names]
@@ -125,31 +202,52 @@ class CodeVisitor(ast.NodeVisitor):
 
     def _process_function(self, node: Union[ast.FunctionDef, ast.AsyncFunctionDef], is_async: bool):
         """Common processing for both sync and async functions."""
-        args = [arg.arg for arg in node.args.args]
-        func_info = FunctionInfo(
-            name=node.name,
-            args=args,
-            decorators=self._get_decorators(node),
-            docstring=self._get_docstring(node),
-            is_async=is_async,
-            start_line=node.lineno,
-            end_line=node.end_lineno or node.lineno,
-        )
+        if not self._class_depth:
+            self.function_count += 1
+
+        func_info = None
+        if self._want_functions:
+            func_info = FunctionInfo(
+                name=node.name,
+                args=[arg.arg for arg in node.args.args],
+                decorators=self._get_decorators(node),
+                docstring=self._get_docstring(node),
+                is_async=is_async,
+                start_line=node.lineno,
+                end_line=node.end_lineno or node.lineno,
+            )
+            func_info.line_count = func_info.end_line - func_info.start_line + 1
 
-        if self.current_class:
-            self.current_class.methods.append(func_info)
-        else:
-            self.functions.append(func_info)
+            if self._class_depth:
+                if self.current_class is not None:  # None when classes are not recorded
+                    self.current_class.methods.append(func_info)
+            else:
+                self.functions.append(func_info)
 
         # --- Complexity: Increment for function definition itself and increase nesting ---
         self.cognitive_load += 1 + self._nesting_level
         self._nesting_level += 1
-        self.generic_visit(node)  # Visit children
+        if self._want_function_metrics:
+            self._function_stack.append((func_info, self._nesting_level))
+            self.generic_visit(node)  # Visit children
+            self._function_stack.pop()
+        else:
+            self.generic_visit(node)
         self._nesting_level -= 1  # Decrease nesting after visiting children
         # ------------------------------------------------------------------------------
 
     def visit_ClassDef(self, node: ast.ClassDef):
         """Process class definitions."""
+        self.class_count += 1
+        if not self._want_classes:
+            # Only the method context matters for the function count
+            self._class_depth += 1
+            self._nesting_level += 1
+            self.generic_visit(node)
+            self._nesting_level -= 1
+            self._class_depth -= 1
+            return
+
         bases = []
         for base in node.bases:
             if isinstance(base, ast.Name):
@@ -176,9 +274,11 @@ class CodeVisitor(ast.NodeVisitor):
         prev_class = self.current_class
         self.current_class = class_info
         # --- Complexity: Increase nesting for visiting class body ---
+        self._class_depth += 1
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
+        self._class_depth -= 1
         # ---------------------------------------------------------
         self.current_class = prev_class
 
@@ -188,28 +288,32 @@ class CodeVisitor(ast.NodeVisitor):
 
     def visit_If(self, node: ast.If):
         """Complexity: +1 for if, +1 for each elif, +nesting penalty."""
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
+        self._add_branches()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
 
     def visit_For(self, node: ast.For):
         """Complexity: +1 for loop, +nesting penalty."""
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
+        self._add_branches()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
 
     def visit_AsyncFor(self, node: ast.AsyncFor):
         """Complexity: +1 for loop, +nesting penalty."""
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
+        self._add_branches()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
 
     def visit_While(self, node: ast.While):
         """Complexity: +1 for loop, +nesting penalty."""
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
+        self._add_branches()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
@@ -217,7 +321,7 @@ class CodeVisitor(ast.NodeVisitor):
     def visit_Try(self, node: ast.Try):
         """Complexity: +1 for try block, +nesting penalty."""
         # Note: Except handlers are visited separately
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
@@ -225,7 +329,8 @@ class CodeVisitor(ast.NodeVisitor):
     def visit_ExceptHandler(self, node: ast.ExceptHandler):
         """Complexity: +1 for except block, +nesting penalty."""
         # This starts a new block, increasing complexity and nesting
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
+        self._add_branches()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
@@ -234,42 +339,83 @@ class CodeVisitor(ast.NodeVisitor):
         """Complexity: +1 for each 'and'/'or'."""
         # An op like (a and b and c) has two 'and's
         if len(node.values) > 1:
-            self.cognitive_load += len(node.values) - 1
+            self._score_flat(len(node.values) - 1)
+            self._add_branches(len(node.values) - 1)
         self.generic_visit(node)
 
     def visit_Break(self, node: ast.Break):
         """Complexity: +1 for break."""
-        self.cognitive_load += 1
+        self._score_flat()
         self.generic_visit(node)
 
     def visit_Continue(self, node: ast.Continue):
         """Complexity: +1 for continue."""
-        self.cognitive_load += 1
+        self._score_flat()
         self.generic_visit(node)
 
     def visit_Lambda(self, node: ast.Lambda):
         """Complexity: +1 for lambda definition, +nesting."""
-        self.cognitive_load += 1 + self._nesting_level
+        self._score_nested()
         self._nesting_level += 1
         self.generic_visit(node)
         self._nesting_level -= 1
 
+    def visit_IfExp(self, node: ast.IfExp):
+        """Cyclomatic only: a conditional expression is one more path."""
+        self._add_branches()
+        self.generic_visit(node)
+
+    def visit_comprehension(self, node: ast.comprehension):
+        """Cyclomatic only: +1 for each comprehension loop and each of its filters."""
+        self._add_branches(1 + len(node.ifs))
+        self.generic_visit(node)
+
+    def visit_match_case(self, node: ast.match_case):
+        """Cyclomatic only: +1 for each case of a match statement."""
+        self._add_branches()
+        self.generic_visit(node)
+
+
+def visit_source(
+    content: str, logger: logging.Logger, fields: Optional[Iterable[str]] = None
+) -> CodeVisitor:
+    """
+    Parse Python code content and run a CodeVisitor over it.
+
+    Args:
+        content: The Python code to analyze
+        logger: Logger instance for recording issues
+        fields: Optional projection (see ``ANALYSIS_FIELDS``); None extracts everything
+
+    Returns:
+        The finished visitor holding imports, functions, classes and complexity
+
+    Raises:
+        SyntaxError: If the content cannot be parsed
+    """
+    tree = ast.parse(content)
+    visitor = CodeVisitor(logger, fields)
+    visitor.visit(tree)
+    return visitor
+
 
-def analyze_code(content: str, logger: logging.Logger) -> Dict:
+def analyze_code(
+    content: str, logger: logging.Logger, fields: Optional[Iterable[str]] = None
+) -> Dict:
     """
     Analyze Python code content using AST.
 
     Args:
         content: The Python code to analyze
         logger: Logger instance for recording issues
+        fields: Optional projection (see ``ANALYSIS_FIELDS``); lists of skipped
+            fields are left empty
 
     Returns:
         Dict containing analysis results
     """
     try:
-        tree = ast.parse(content)
-        visitor = CodeVisitor(logger)
-        visitor.visit(tree)
+        visitor = visit_source(content, logger, fields)
 
         return {
             "imports": [
@@ -295,6 +441,10 @@ def analyze_code(content: str, logger: logging.Logger) -> Dict:
                     "is_async": func.is_async,
                     "start_line": func.start_line,
                     "end_line": func.end_line,
+                    "complexity": func.complexity,
+                    "cyclomatic_complexity": func.cyclomatic_complexity,
+                    "line_count": func.line_count,
+                    "statement_count": func.statement_count,
                 }
                 for func in visitor.functions
             ],
@@ -311,6 +461,10 @@ def analyze_code(content: str, logger: logging.Logger) -> Dict:
                             "is_async": method.is_async,
                             "start_line": method.start_line,
                             "end_line": method.end_line,
+                            "complexity": method.complexity,
+                            "cyclomatic_complexity": method.cyclomatic_complexity,
+                            "line_count": method.line_count,
+                            "statement_count": method.statement_count,
                         }
                         for method in cls.methods
                     ],
@@ -322,6 +476,8 @@ def analyze_code(content: str, logger: logging.Logger) -> Dict:
                 for cls in visitor.classes
             ],
             "cognitive_load": visitor.cognitive_load,
+            "function_count": visitor.function_count,
+            "class_count": visitor.class_count,
         }
 
     except SyntaxError as e:
@@ -332,6 +488,8 @@ def analyze_code(content: str, logger: logging.Logger) -> Dict:
             "functions": [],
             "classes": [],
             "cognitive_load": 0,  # Return 0 complexity on syntax error
+            "function_count": 0,
+            "class_count": 0,
         }
     except Exception as e:
         logger.error(f"Unexpected error during AST analysis: {str(e)}", exc_info=True)
@@ -341,4 +499,6 @@ def analyze_code(content: str, logger: logging.Logger) -> Dict:
             "functions": [],
             "classes": [],
             "cognitive_load": 0,
+            "function_count": 0,
+            "class_count": 0,
         }
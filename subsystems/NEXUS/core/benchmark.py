@@ -0,0 +1,365 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Benchmark Suite
+=====================================
+
+Performance benchmarks for NEXUS workspace analysis.
+
+Generates synthetic Python workspaces of configurable size (files,
+functions per file, import fan-out and nesting depth) or runs against an
+existing tree such as this repository. Discovery, parse/visit, dependency
+resolution, suggestions and export are timed separately; results carry
+files/sec and peak RSS and are stored as JSON so runs from different
+commits can be compared.
+
+Usage:
+    python -m subsystems.NEXUS.core.benchmark --synthetic --files 2000 -o after.json
+    python -m subsystems.NEXUS.core.benchmark --root . --compare before.json
+
+Version: 1.0.0
+"""
+
+import argparse
+import json
+import logging
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional, Union
+
+from .jobs import iter_workspace_records, new_workspace_result
+from .nexus_core import NEXUSCore
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+PHASES = ("discovery", "parse_visit", "dependencies", "suggestions", "export")
+RESULT_VERSION = 1
+DEFAULT_REGRESSION_THRESHOLD = 0.10
+
+
+def generate_workspace(
+    root: Union[str, Path],
+    files: int = 200,
+    functions_per_file: int = 10,
+    import_fanout: int = 3,
+    nesting_depth: int = 3,
+    packages: int = 10,
+    seed: int = 0,
+) -> Dict[str, Any]:
+    """Write a synthetic Python workspace under ``root``.
+
+    Modules are spread over ``packages`` packages. Each one imports up to
+    ``import_fanout`` earlier modules (so the import graph is a DAG) and
+    defines ``functions_per_file`` functions plus one class, with branches
+    nested ``nesting_depth`` levels deep. The same seed always produces the
+    same tree.
+
+    Returns:
+        Dict[str, Any]: The generation parameters, recorded in benchmark results.
+    """
+    rng = random.Random(seed)
+    root = Path(root)
+    modules: List[str] = []
+    for package in range(packages):
+        package_dir = root / f"pkg{package}"
+        package_dir.mkdir(parents=True, exist_ok=True)
+        (package_dir / "__init__.py").write_text('"""Synthetic package."""\n', encoding="utf-8")
+
+    for index in range(files):
+        package = index % packages
+        module = f"pkg{package}.mod{index}"
+        targets = rng.sample(modules, min(import_fanout, len(modules)))
+        lines = ['"""Synthetic module for NEXUS benchmarks."""', "", "import os", "import sys"]
+        lines.extend(f"from {target} import func_0" for target in targets)
+        for function in range(functions_per_file):
+            lines.extend(
+                _synthetic_function(f"func_{function}", nesting_depth, documented=function % 3)
+            )
+        lines.extend(
+            [
+                "",
+                "",
+                f"class Model{index}:",
+                '    """Synthetic class."""',
+                "",
+                "    def run(self, value):",
+                "        return func_0(value) if value else os.sep + sys.platform",
+                "",
+            ]
+        )
+        (root / f"pkg{package}" / f"mod{index}.py").write_text("\n".join(lines), encoding="utf-8")
+        modules.append(module)
+
+    return {
+        "synthetic": True,
+        "files": files + packages,
+        "functions_per_file": functions_per_file,
+        "import_fanout": import_fanout,
+        "nesting_depth": nesting_depth,
+        "packages": packages,
+        "seed": seed,
+    }
+
+
+def _synthetic_function(name: str, nesting_depth: int, documented: int) -> List[str]:
+    lines = ["", "", f"def {name}(value, *args):"]
+    if documented:
+        lines.append(f'    """Synthetic function {name}."""')
+    indent = "    "
+    for level in range(nesting_depth):
+        keyword = "for item in args:" if level % 2 else f"if value > {level}:"
+        lines.append(f"{indent}{keyword}")
+        indent += "    "
+        lines.append(f"{indent}value = value + {level}")
+    lines.append(f"{indent}return value")
+    lines.append("    return None")
+    return lines
+
+
+def peak_rss_kb() -> Optional[int]:
+    """Peak resident set size of this process in KiB, or None if unavailable."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # macOS reports bytes, Linux kilobytes
+    return peak // 1024 if sys.platform == "darwin" else peak
+
+
+def _git_commit(path: Path) -> Optional[str]:
+    try:
+        result = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=path,
+            capture_output=True,
+            text=True,
+            timeout=10,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    if result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def _timed(timings: Dict[str, float], phase: str, func: Callable[[], Any]) -> Any:
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    timings[phase] = min(timings.get(phase, elapsed), elapsed)
+    return result
+
+
+def run_benchmark(
+    project_root: Union[str, Path],
+    config: Optional[Dict[str, Any]] = None,
+    repeat: int = 1,
+    compact: bool = False,
+    workspace: Optional[Dict[str, Any]] = None,
+    logger: Optional[logging.Logger] = None,
+) -> Dict[str, Any]:
+    """Benchmark a full NEXUS analysis of ``project_root``.
+
+    Each repetition uses a fresh ``NEXUSCore`` so no cache carries over; the
+    fastest time of every phase is reported.
+
+    Args:
+        project_root: Tree to analyze.
+        config: NEXUS core config. Defaults to an empty config (default thresholds).
+        repeat: Number of repetitions.
+        compact: Use compact per-file analyses.
+        workspace: Description of the workspace (e.g. ``generate_workspace`` params).
+        logger: Logger for the analyzed core. Defaults to a WARNING-level logger so
+                per-file logging does not distort the timings.
+
+    Returns:
+        Dict[str, Any]: JSON-serializable benchmark result.
+    """
+    project_root = Path(project_root).resolve()
+    if logger is None:
+        logger = logging.getLogger("NEXUS.Benchmark")
+        logger.setLevel(logging.WARNING)
+    timings: Dict[str, float] = {}
+    counts: Dict[str, int] = {}
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        export_path = Path(tmp_dir) / "analysis.ndjson"
+        for _ in range(max(repeat, 1)):
+            core = NEXUSCore(config=config or {}, logger=logger, project_root=project_root)
+            python_files = _timed(timings, "discovery", core.discover_python_files)
+
+            def parse_visit() -> Dict[str, Any]:
+                analysis = new_workspace_result()
+                for file_path in python_files:
+                    file_analysis = core.analyze_code(file_path, compact=compact)
+                    if file_analysis is not None:
+                        analysis["files"][file_path] = file_analysis
+                return analysis
+
+            analysis = _timed(timings, "parse_visit", parse_visit)
+            analysis["dependencies"] = _timed(
+                timings, "dependencies", lambda: core.analyze_dependencies(python_files)
+            )
+            suggestions = _timed(
+                timings, "suggestions", lambda: core.suggest_improvements(analysis)
+            )
+            records = _timed(
+                timings,
+                "export",
+                lambda: core.export_analysis_stream(
+                    export_path, records=iter_workspace_records(analysis)
+                ),
+            )
+            counts = {
+                "files": len(python_files),
+                "analyzed_files": len(analysis["files"]),
+                "dependency_edges": core.dependency_graph.edge_count,
+                "suggestions": len(suggestions),
+                "export_records": records or 0,
+                "export_bytes": export_path.stat().st_size if export_path.exists() else 0,
+            }
+
+    total = sum(timings[phase] for phase in PHASES)
+    files = counts["files"]
+    return {
+        "version": RESULT_VERSION,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "commit": _git_commit(project_root),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "project_root": str(project_root),
+        "workspace": workspace or {"synthetic": False},
+        "repeat": max(repeat, 1),
+        "compact": compact,
+        "counts": counts,
+        "phases": {phase: round(timings[phase], 6) for phase in PHASES},
+        "total_seconds": round(total, 6),
+        "files_per_second": round(files / total, 2) if total else None,
+        "parse_files_per_second": (
+            round(files / timings["parse_visit"], 2) if timings["parse_visit"] else None
+        ),
+        "peak_rss_kb": peak_rss_kb(),
+    }
+
+
+def compare_results(
+    baseline: Dict[str, Any],
+    current: Dict[str, Any],
+    threshold: float = DEFAULT_REGRESSION_THRESHOLD,
+) -> Dict[str, Any]:
+    """Compare two benchmark results phase by phase.
+
+    Args:
+        baseline: Earlier result (e.g. from the parent commit).
+        current: Result to check.
+        threshold: Relative slowdown above which a phase counts as a regression.
+
+    Returns:
+        Dict[str, Any]: Per-phase ratios (current / baseline) and the list of
+                        regressed phases.
+    """
+    ratios: Dict[str, Optional[float]] = {}
+    regressions = []
+    for phase in PHASES + ("total",):
+        key = "total_seconds"
+        before = baseline.get(key) if phase == "total" else baseline.get("phases", {}).get(phase)
+        after = current.get(key) if phase == "total" else current.get("phases", {}).get(phase)
+        if not before or after is None:
+            ratios[phase] = None
+            continue
+        ratios[phase] = round(after / before, 3)
+        if ratios[phase] > 1 + threshold:
+            regressions.append(phase)
+    return {
+        "baseline_commit": baseline.get("commit"),
+        "current_commit": current.get("commit"),
+        "ratios": ratios,
+        "regressions": regressions,
+    }
+
+
+def _format_result(result: Dict[str, Any]) -> str:
+    lines = [
+        f"NEXUS benchmark @ {result['commit'] or 'unknown commit'}: "
+        f"{result['counts']['files']} files, {result['files_per_second']} files/s, "
+        f"peak RSS {result['peak_rss_kb']} KiB"
+    ]
+    for phase in PHASES:
+        lines.append(f"  {phase:<13} {result['phases'][phase]:.4f}s")
+    lines.append(f"  {'total':<13} {result['total_seconds']:.4f}s")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark NEXUS workspace analysis.")
+    parser.add_argument("--root", default=".", help="Tree to analyze (default: current dir)")
+    parser.add_argument(
+        "--synthetic", action="store_true", help="Analyze a generated workspace instead of --root"
+    )
+    parser.add_argument("--files", type=int, default=200)
+    parser.add_argument("--functions", type=int, default=10, help="Functions per file")
+    parser.add_argument("--fanout", type=int, default=3, help="Imports of other modules per file")
+    parser.add_argument("--depth", type=int, default=3, help="Branch nesting depth")
+    parser.add_argument("--packages", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--compact", action="store_true", help="Use compact per-file analyses")
+    parser.add_argument("-o", "--output", help="Write the JSON result to this file")
+    parser.add_argument("--compare", help="Baseline JSON result to compare against")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_REGRESSION_THRESHOLD,
+        help="Relative slowdown reported as a regression (default: 0.10)",
+    )
+    args = parser.parse_args(argv)
+
+    if args.synthetic:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            workspace = generate_workspace(
+                tmp_dir,
+                files=args.files,
+                functions_per_file=args.functions,
+                import_fanout=args.fanout,
+                nesting_depth=args.depth,
+                packages=args.packages,
+                seed=args.seed,
+            )
+            result = run_benchmark(
+                tmp_dir, repeat=args.repeat, compact=args.compact, workspace=workspace
+            )
+        result["commit"] = _git_commit(Path(os.getcwd()))
+    else:
+        result = run_benchmark(args.root, repeat=args.repeat, compact=args.compact)
+
+    print(_format_result(result))
+    comparison = None
+    if args.compare:
+        with open(args.compare, "r", encoding="utf-8") as f:
+            comparison = compare_results(json.load(f), result, args.threshold)
+        result["comparison"] = comparison
+        print(f"Compared with {comparison['baseline_commit'] or args.compare}:")
+        for phase, ratio in comparison["ratios"].items():
+            print(f"  {phase:<13} x{ratio}" if ratio is not None else f"  {phase:<13} n/a")
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(result, f, indent=2)
+
+    if comparison and comparison["regressions"]:
+        print(f"Regressions: {', '.join(comparison['regressions'])}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,320 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Compact Analysis Storage
+==============================================
+
+Memory-compact representation of per-file ``analyze_code`` results.
+
+Functions and methods of a file live in one struct-of-arrays table with
+interned names, line numbers in typed arrays and docstrings stored as
+offset/length pairs into a single per-file buffer. ``CompactFileAnalysis``
+is a read-only ``Mapping`` that builds the familiar dict-shaped values on
+request, so existing consumers keep working unchanged.
+
+Version: 1.0.0
+"""
+
+import sys
+from array import array
+from collections.abc import Mapping
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from .ast_visitor import CodeVisitor, FunctionInfo
+
+NO_DOCSTRING = "No docstring"
+
+_IMPORT_FIELDS = (
+    "module",
+    "names",
+    "alias",
+    "is_from_import",
+    "level",
+    "lineno",
+    "col_offset",
+    "end_lineno",
+    "end_col_offset",
+)
+_ANALYSIS_KEYS = (
+    "lines",
+    "chars",
+    "content_hash",
+    "complexity",
+    "_raw_imports",
+    "functions",
+    "classes",
+)
+
+# Small pool so common parameter/decorator tuples such as ("self",) are shared
+_SHARED_TUPLES: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+_SHARED_TUPLES_LIMIT = 10000
+
+
+def _intern(value: Optional[str]) -> Optional[str]:
+    return sys.intern(value) if value else value
+
+
+def _intern_tuple(values: Sequence[str]) -> Tuple[str, ...]:
+    interned = tuple(sys.intern(v) for v in values)
+    shared = _SHARED_TUPLES.get(interned)
+    if shared is not None:
+        return shared
+    if len(_SHARED_TUPLES) < _SHARED_TUPLES_LIMIT:
+        _SHARED_TUPLES[interned] = interned
+    return interned
+
+
+class _DocBuffer:
+    """Accumulates docstrings into one string and hands out (offset, length) spans."""
+
+    __slots__ = ("parts", "size")
+
+    def __init__(self):
+        self.parts: List[str] = []
+        self.size = 0
+
+    def add(self, doc: Optional[str]) -> Tuple[int, int]:
+        if not doc:
+            return -1, 0
+        offset = self.size
+        self.parts.append(doc)
+        self.size += len(doc)
+        return offset, len(doc)
+
+
+class FunctionTable:
+    """Struct-of-arrays storage for the functions and methods of one file."""
+
+    __slots__ = (
+        "names",
+        "params",
+        "decorators",
+        "lines",
+        "end_lines",
+        "is_async",
+        "doc_offsets",
+        "doc_lengths",
+        "cognitive",
+        "cyclomatic",
+        "statements",
+    )
+
+    def __init__(self):
+        self.names: List[str] = []
+        self.params: List[Tuple[str, ...]] = []
+        self.decorators: List[Tuple[str, ...]] = []
+        self.lines = array("i")
+        self.end_lines = array("i")
+        self.is_async = bytearray()
+        self.doc_offsets = array("i")
+        self.doc_lengths = array("i")
+        self.cognitive = array("i")
+        self.cyclomatic = array("i")
+        self.statements = array("i")
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def append(self, info: FunctionInfo, docs: _DocBuffer) -> None:
+        self.names.append(sys.intern(info.name))
+        self.params.append(_intern_tuple(info.args))
+        self.decorators.append(_intern_tuple(info.decorators))
+        self.lines.append(info.start_line)
+        self.end_lines.append(info.end_line)
+        self.is_async.append(1 if info.is_async else 0)
+        offset, length = docs.add(info.docstring)
+        self.doc_offsets.append(offset)
+        self.doc_lengths.append(length)
+        self.cognitive.append(info.complexity)
+        self.cyclomatic.append(info.cyclomatic_complexity)
+        self.statements.append(info.statement_count)
+
+
+class ClassRecord:
+    """One class of a file; its methods are a contiguous slice of the function table."""
+
+    __slots__ = (
+        "name",
+        "inheritance",
+        "decorators",
+        "line",
+        "end_line",
+        "doc_offset",
+        "doc_length",
+        "method_start",
+        "method_count",
+    )
+
+    def __init__(self, name, inheritance, decorators, line, end_line, doc_span, method_start):
+        self.name = name
+        self.inheritance = inheritance
+        self.decorators = decorators
+        self.line = line
+        self.end_line = end_line
+        self.doc_offset, self.doc_length = doc_span
+        self.method_start = method_start
+        self.method_count = 0
+
+
+class CompactFileAnalysis(Mapping):
+    """Compact ``analyze_code`` result with a dict-shaped, read-only view.
+
+    Attribute access (``function_count``, ``docstring(i)``, ...) reads the
+    compact storage directly; item access (``analysis["functions"]``) builds
+    the same structures ``NEXUSCore.analyze_code`` returns as plain dicts.
+    """
+
+    __slots__ = (
+        "lines",
+        "chars",
+        "content_hash",
+        "cognitive_load",
+        "imports",
+        "functions",
+        "function_count",
+        "classes",
+        "docs",
+    )
+
+    def __init__(self, lines: int, chars: int, content_hash: Optional[str], cognitive_load: int):
+        self.lines = lines
+        self.chars = chars
+        self.content_hash = content_hash
+        self.cognitive_load = cognitive_load
+        self.imports: Tuple[tuple, ...] = ()
+        self.functions = FunctionTable()
+        self.function_count = 0  # Module-level functions come first in the table
+        self.classes: List[ClassRecord] = []
+        self.docs = ""
+
+    @classmethod
+    def from_visitor(
+        cls, visitor: CodeVisitor, lines: int, chars: int, content_hash: Optional[str] = None
+    ) -> "CompactFileAnalysis":
+        """Build the compact form straight from a finished ``CodeVisitor``."""
+        analysis = cls(lines, chars, content_hash, visitor.cognitive_load)
+        docs = _DocBuffer()
+
+        analysis.imports = tuple(
+            (
+                _intern(imp.module),
+                _intern_tuple(imp.names),
+                _intern(imp.alias),
+                imp.is_from_import,
+                imp.level,
+                imp.lineno,
+                imp.col_offset,
+                imp.end_lineno,
+                imp.end_col_offset,
+            )
+            for imp in visitor.imports
+        )
+
+        for func in visitor.functions:
+            analysis.functions.append(func, docs)
+        analysis.function_count = len(visitor.functions)
+
+        for class_info in visitor.classes:
+            record = ClassRecord(
+                name=sys.intern(class_info.name),
+                inheritance=sys.intern(", ".join(class_info.bases)),
+                decorators=_intern_tuple(class_info.decorators),
+                line=class_info.start_line,
+                end_line=class_info.end_line,
+                doc_span=docs.add(class_info.docstring),
+                method_start=len(analysis.functions),
+            )
+            for method in class_info.methods:
+                analysis.functions.append(method, docs)
+            record.method_count = len(class_info.methods)
+            analysis.classes.append(record)
+
+        analysis.docs = "".join(docs.parts)
+        return analysis
+
+    # --- Compact accessors --- #
+
+    @property
+    def class_count(self) -> int:
+        return len(self.classes)
+
+    def _doc(self, offset: int, length: int) -> Optional[str]:
+        if offset < 0:
+            return None
+        return self.docs[offset : offset + length]
+
+    def docstring(self, index: int) -> Optional[str]:
+        """Docstring of the function-table entry at ``index``, or None."""
+        return self._doc(self.functions.doc_offsets[index], self.functions.doc_lengths[index])
+
+    def class_docstring(self, class_index: int) -> Optional[str]:
+        """Docstring of the class at ``class_index``, or None."""
+        record = self.classes[class_index]
+        return self._doc(record.doc_offset, record.doc_length)
+
+    # --- Dict views --- #
+
+    def _function_dict(self, index: int) -> Dict[str, Any]:
+        table = self.functions
+        return {
+            "name": table.names[index],
+            "params": list(table.params[index]),
+            "doc": self.docstring(index) or NO_DOCSTRING,
+            "line": table.lines[index],
+            "end_line": table.end_lines[index],
+            "is_async": bool(table.is_async[index]),
+            "decorators": list(table.decorators[index]),
+            "complexity": {
+                "cognitive": table.cognitive[index],
+                "cyclomatic": table.cyclomatic[index],
+            },
+            "lines": table.end_lines[index] - table.lines[index] + 1,
+            "statements": table.statements[index],
+        }
+
+    def _class_dict(self, class_index: int) -> Dict[str, Any]:
+        record = self.classes[class_index]
+        return {
+            "name": record.name,
+            "inheritance": record.inheritance,
+            "doc": self.class_docstring(class_index) or NO_DOCSTRING,
+            "line": record.line,
+            "end_line": record.end_line,
+            "decorators": list(record.decorators),
+            "methods": [
+                self._function_dict(i)
+                for i in range(record.method_start, record.method_start + record.method_count)
+            ],
+        }
+
+    def __getitem__(self, key: str) -> Any:
+        if key == "lines":
+            return self.lines
+        if key == "chars":
+            return self.chars
+        if key == "content_hash" and self.content_hash is not None:
+            return self.content_hash
+        if key == "complexity":
+            return {"cognitive_load": self.cognitive_load}
+        if key == "_raw_imports":
+            return [
+                dict(zip(_IMPORT_FIELDS, (imp[0], list(imp[1])) + imp[2:])) for imp in self.imports
+            ]
+        if key == "functions":
+            return [self._function_dict(i) for i in range(self.function_count)]
+        if key == "classes":
+            return [self._class_dict(i) for i in range(len(self.classes))]
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        for key in _ANALYSIS_KEYS:
+            if key != "content_hash" or self.content_hash is not None:
+                yield key
+
+    def __len__(self) -> int:
+        return len(_ANALYSIS_KEYS) - (self.content_hash is None)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Materialize the full dict-shaped analysis."""
+        return {key: self[key] for key in self}
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Dependency Graph
+======================================
+
+Incremental file-level import graph for NEXUS.
+
+Files are interned to integer node ids and edges are kept in adjacency
+arrays for both directions (``importer -> imported`` and the reverse), so
+per-file updates only touch the edges of the changed file and reverse-impact
+queries never need to re-scan the workspace.
+
+Version: 1.0.0
+"""
+
+from collections import deque
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+
+class DependencyGraph:
+    """Directed import graph keyed by project-relative file paths.
+
+    An edge ``a -> b`` means file ``a`` imports file ``b``. Node ids are
+    stable for the lifetime of a file in the graph and are recycled after
+    the file is removed.
+    """
+
+    def __init__(self):
+        self._ids: Dict[str, int] = {}
+        self._paths: List[Optional[str]] = []
+        self._free_ids: List[int] = []
+        self._out: List[Set[int]] = []
+        self._in: List[Set[int]] = []
+        self._edge_count: int = 0
+        # Bumped on every structural change; lets callers cache derived results.
+        self.version: int = 0
+
+    # --- Node management --- #
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._ids
+
+    @property
+    def edge_count(self) -> int:
+        """Number of import edges currently in the graph."""
+        return self._edge_count
+
+    def clear(self) -> None:
+        """Remove all nodes and edges."""
+        self._ids.clear()
+        self._paths.clear()
+        self._free_ids.clear()
+        self._out.clear()
+        self._in.clear()
+        self._edge_count = 0
+        self.version += 1
+
+    def add_file(self, path: str) -> int:
+        """Ensure ``path`` is a node and return its integer id."""
+        node_id = self._ids.get(path)
+        if node_id is not None:
+            return node_id
+        if self._free_ids:
+            node_id = self._free_ids.pop()
+            self._paths[node_id] = path
+        else:
+            node_id = len(self._paths)
+            self._paths.append(path)
+            self._out.append(set())
+            self._in.append(set())
+        self._ids[path] = node_id
+        self.version += 1
+        return node_id
+
+    def remove_file(self, path: str) -> bool:
+        """Remove a file and every edge touching it.
+
+        Returns:
+            bool: True if the file was present.
+        """
+        node_id = self._ids.pop(path, None)
+        if node_id is None:
+            return False
+        out_edges, in_edges = self._out[node_id], self._in[node_id]
+        # A self-import sits in both sets but is a single edge.
+        self._edge_count -= len(out_edges) + len(in_edges) - (node_id in out_edges)
+        for target in out_edges:
+            self._in[target].discard(node_id)
+        for source in in_edges:
+            self._out[source].discard(node_id)
+        self._out[node_id] = set()
+        self._in[node_id] = set()
+        self._paths[node_id] = None
+        self._free_ids.append(node_id)
+        self.version += 1
+        return True
+
+    def node_id(self, path: str) -> Optional[int]:
+        """Return the integer id of ``path`` or None if it is not in the graph."""
+        return self._ids.get(path)
+
+    def path(self, node_id: int) -> Optional[str]:
+        """Return the file path for an integer node id."""
+        if 0 <= node_id < len(self._paths):
+            return self._paths[node_id]
+        return None
+
+    def files(self) -> List[str]:
+        """Return all file paths in the graph."""
+        return list(self._ids)
+
+    def edges(self) -> Iterator[Tuple[str, str]]:
+        """Iterate over ``(importer, imported)`` path pairs."""
+        for source_id, targets in enumerate(self._out):
+            source = self._paths[source_id]
+            if source is None:
+                continue
+            for target_id in targets:
+                yield source, self._paths[target_id]
+
+    # --- Incremental updates --- #
+
+    def set_imports(self, path: str, imported_paths: Iterable[str]) -> Tuple[Set[str], Set[str]]:
+        """Replace the outgoing edges of ``path`` with ``imported_paths``.
+
+        Only the difference between the old and new edge sets is applied, so
+        the cost is proportional to the size of the changed file's imports.
+
+        Returns:
+            Tuple[Set[str], Set[str]]: The added and removed imported paths.
+        """
+        source_id = self.add_file(path)
+        new_targets = {self.add_file(p) for p in imported_paths}
+        old_targets = self._out[source_id]
+
+        added = new_targets - old_targets
+        removed = old_targets - new_targets
+        for target_id in added:
+            self._in[target_id].add(source_id)
+        for target_id in removed:
+            self._in[target_id].discard(source_id)
+        self._out[source_id] = new_targets
+        self._edge_count += len(added) - len(removed)
+        if added or removed:
+            self.version += 1
+
+        return (
+            {self._paths[t] for t in added},
+            {self._paths[t] for t in removed},
+        )
+
+    # --- Queries --- #
+
+    def imports_of(self, path: str) -> Set[str]:
+        """Files directly imported by ``path``."""
+        node_id = self._ids.get(path)
+        if node_id is None:
+            return set()
+        return {self._paths[t] for t in self._out[node_id]}
+
+    def importers_of(self, path: str) -> Set[str]:
+        """Files that directly import ``path``."""
+        node_id = self._ids.get(path)
+        if node_id is None:
+            return set()
+        return {self._paths[s] for s in self._in[node_id]}
+
+    def impact_set(self, path: str) -> Set[str]:
+        """Transitive importers of ``path``: everything that may break if it changes."""
+        return self._reachable(path, self._in)
+
+    def transitive_dependencies(self, path: str) -> Set[str]:
+        """Every file ``path`` depends on, directly or indirectly."""
+        return self._reachable(path, self._out)
+
+    def _reachable(self, path: str, adjacency: List[Set[int]]) -> Set[str]:
+        """Breadth-first reachability over one adjacency direction, excluding the start."""
+        start = self._ids.get(path)
+        if start is None:
+            return set()
+        seen = {start}
+        queue = deque([start])
+        while queue:
+            current = queue.popleft()
+            for neighbour in adjacency[current]:
+                if neighbour not in seen:
+                    seen.add(neighbour)
+                    queue.append(neighbour)
+        seen.discard(start)
+        return {self._paths[n] for n in seen}
+
+    def strongly_connected_components(self) -> List[List[int]]:
+        """Tarjan's algorithm over the live node ids, iterative to avoid recursion limits.
+
+        Returns:
+            List[List[int]]: Components as lists of node ids, in reverse
+                             topological order (dependencies first).
+        """
+        index_of: Dict[int, int] = {}
+        lowlink: Dict[int, int] = {}
+        on_stack: Set[int] = set()
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+
+        for root in self._ids.values():
+            if root in index_of:
+                continue
+            index_of[root] = lowlink[root] = counter
+            counter += 1
+            stack.append(root)
+            on_stack.add(root)
+            work = [(root, iter(self._out[root]))]
+
+            while work:
+                node, neighbours = work[-1]
+                advanced = False
+                for neighbour in neighbours:
+                    if neighbour not in index_of:
+                        index_of[neighbour] = lowlink[neighbour] = counter
+                        counter += 1
+                        stack.append(neighbour)
+                        on_stack.add(neighbour)
+                        work.append((neighbour, iter(self._out[neighbour])))
+                        advanced = True
+                        break
+                    if neighbour in on_stack:
+                        lowlink[node] = min(lowlink[node], index_of[neighbour])
+                if advanced:
+                    continue
+
+                work.pop()
+                if work:
+                    parent = work[-1][0]
+                    lowlink[parent] = min(lowlink[parent], lowlink[node])
+                if lowlink[node] == index_of[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+
+        return components
+
+    def find_cycles(self, components: Optional[List[List[int]]] = None) -> List[List[str]]:
+        """Return import cycles as sorted lists of file paths.
+
+        A cycle is a strongly connected component with more than one file,
+        or a single file that imports itself.
+
+        Args:
+            components: Output of ``strongly_connected_components()`` to reuse.
+        """
+        if components is None:
+            components = self.strongly_connected_components()
+        cycles = []
+        for component in components:
+            if len(component) > 1 or component[0] in self._out[component[0]]:
+                cycles.append(sorted(self._paths[n] for n in component))
+        cycles.sort(key=lambda c: (-len(c), c[0]))
+        return cycles
+
+    def condensation(self) -> Tuple[List[List[int]], Dict[int, int], List[Set[int]]]:
+        """Collapse every strongly connected component into one node.
+
+        Linear in nodes plus edges: one Tarjan pass and one scan of the edges.
+
+        Returns:
+            Tuple: ``(components, component_of, dag)`` where ``components`` lists
+                   node ids per component in reverse topological order
+                   (dependencies first), ``component_of`` maps node id to
+                   component index and ``dag[i]`` holds the components that
+                   component ``i`` imports. Edges in ``dag`` always point to a
+                   lower index.
+        """
+        components = self.strongly_connected_components()
+        component_of: Dict[int, int] = {}
+        for index, component in enumerate(components):
+            for node in component:
+                component_of[node] = index
+        dag: List[Set[int]] = [set() for _ in components]
+        for node, index in component_of.items():
+            for target in self._out[node]:
+                target_index = component_of[target]
+                if target_index != index:
+                    dag[index].add(target_index)
+        return components, component_of, dag
+
+    def topological_layers(
+        self, condensed: Optional[Tuple[List[List[int]], Dict[int, int], List[Set[int]]]] = None
+    ) -> List[List[str]]:
+        """Group files into dependency layers over the condensed DAG.
+
+        Layer 0 holds files without internal imports; every other file sits one
+        layer above the highest layer it imports. Files of one import cycle
+        share a layer.
+
+        Args:
+            condensed: A result of ``condensation()`` to reuse, if already computed.
+        """
+        components, _, dag = condensed or self.condensation()
+        depth = [0] * len(components)
+        # Components come dependencies-first, so every target is already final
+        for index, targets in enumerate(dag):
+            if targets:
+                depth[index] = 1 + max(depth[t] for t in targets)
+        layers: List[List[str]] = [[] for _ in range(max(depth, default=-1) + 1)]
+        for index, component in enumerate(components):
+            layers[depth[index]].extend(self._paths[n] for n in component)
+        for layer in layers:
+            layer.sort()
+        return layers
+
+    # --- Construction helpers --- #
+
+    @classmethod
+    def from_dependency_map(cls, dependencies: Dict[str, Dict]) -> "DependencyGraph":
+        """Build a graph from the dict returned by ``NEXUSCore.analyze_dependencies``.
+
+        Edges are taken from each entry's ``imported_by`` list, which holds
+        resolved file paths (``internal_imports`` only holds display strings).
+        """
+        graph = cls()
+        targets_by_importer: Dict[str, Set[str]] = {}
+        for path, entry in dependencies.items():
+            graph.add_file(path)
+            for importer in entry.get("imported_by", []):
+                targets_by_importer.setdefault(importer, set()).add(path)
+        for importer, targets in targets_by_importer.items():
+            graph.set_imports(importer, targets)
+        return graph
@@ -0,0 +1,154 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Exporters
+===============================
+
+Incremental writers for NEXUS analysis records.
+
+The writers consume the record stream produced by
+``NEXUSCore.iter_workspace_analysis`` and write each record as soon as it is
+available, so memory use does not grow with the size of the workspace.
+The destination can be any text stream: an open file or ``socket.makefile("w")``.
+
+Version: 1.0.0
+"""
+
+import json
+import os
+from collections.abc import Mapping
+from typing import Any, Dict, Iterable, TextIO
+
+
+def json_default(obj: Any) -> Any:
+    """``json.dumps`` fallback: mappings such as compact analyses become dicts."""
+    if isinstance(obj, Mapping):
+        return dict(obj)
+    return str(obj)
+
+
+def write_ndjson(records: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """Write one compact JSON document per line.
+
+    Args:
+        records: Analysis records (see ``NEXUSCore.iter_workspace_analysis``).
+        stream: Writable text stream.
+
+    Returns:
+        int: Number of records written.
+    """
+    count = 0
+    for record in records:
+        stream.write(json.dumps(record, default=json_default, separators=(",", ":")))
+        stream.write("\n")
+        count += 1
+    return count
+
+
+def write_markdown(records: Iterable[Dict[str, Any]], stream: TextIO) -> int:
+    """Write a Markdown report section by section as records arrive.
+
+    Unlike the in-memory report, the overall metrics section comes last,
+    because workspace aggregates are only known once every file was seen.
+
+    Returns:
+        int: Number of records written.
+    """
+    stream.write("# NEXUS Analysis Report\n")
+    count = 0
+    current_section = None
+    for record in records:
+        record_type = record.get("type")
+        if record_type != current_section:
+            if record_type == "file":
+                stream.write("\n## File Analysis\n")
+            elif record_type == "dependencies":
+                stream.write("\n## Dependencies\n")
+            elif record_type == "metrics":
+                stream.write("\n")
+            current_section = record_type
+
+        if record_type == "file" and "duplicate_of" in record:
+            stream.write(markdown_duplicate_section(record["path"], record["duplicate_of"]))
+        elif record_type == "file":
+            stream.write(markdown_file_section(record["path"], record["analysis"]))
+        elif record_type == "dependencies":
+            stream.write(markdown_dependency_section(record["path"], record["entry"]))
+        elif record_type == "metrics":
+            stream.write(markdown_metrics_section(record["metrics"]))
+        count += 1
+    return count
+
+
+def markdown_metrics_section(metrics: Dict[str, Any]) -> str:
+    """Render the overall metrics block."""
+    md = ["## Overall Metrics\n"]
+    for key, value in metrics.items():
+        md.append(f"- **{key.replace('_', ' ').title()}**: {value}\n")
+    return "".join(md)
+
+
+def markdown_file_section(file_path: str, analysis: Dict[str, Any]) -> str:
+    """Render the report section for one analyzed file."""
+    # Use basename for File Analysis headers too for consistency
+    filename = os.path.basename(file_path)
+    md = [f"\n### `{filename}`\n"]
+    md.append(f"- Full Path: `{file_path}`\n")  # Optionally add full path
+    md.append(f"- Lines: {analysis['lines']}\n")
+    md.append(f"- Cognitive Load: {analysis['complexity']['cognitive_load']:.1f}\n")
+
+    if analysis.get("imports"):
+        md.append("\n#### Imports\n")
+        for imp in analysis["imports"]:
+            md.append(f"- `{imp}`\n")
+
+    if analysis.get("classes"):
+        md.append("\n#### Classes\n")
+        for cls in analysis["classes"]:
+            md.append(f"\n##### `{cls['name']}`\n")
+            if cls["inheritance"]:
+                md.append(f"Inherits from: `{cls['inheritance']}`\n")
+            if cls["doc"] != "No docstring":
+                md.append(f"\n{cls['doc']}\n")
+            if cls["methods"]:
+                md.append("\nMethods:\n")
+                for method in cls["methods"]:
+                    md.append(f"- `{method['name']}({', '.join(method['params'])})`\n")
+
+    if analysis.get("functions"):
+        md.append("\n#### Functions\n")
+        for func in analysis["functions"]:
+            md.append(f"\n##### `{func['name']}`\n")
+            md.append(f"```python\ndef {func['name']}({', '.join(func['params'])})\n```\n")
+            if func["doc"] != "No docstring":
+                md.append(f"\n{func['doc']}\n")
+    return "".join(md)
+
+
+def markdown_duplicate_section(file_path: str, duplicate_of: str) -> str:
+    """Render the short section for a file whose content duplicates another file."""
+    filename = os.path.basename(file_path)
+    return (
+        f"\n### `{filename}`\n"
+        f"- Full Path: `{file_path}`\n"
+        f"- Duplicate of: `{duplicate_of}`\n"
+    )
+
+
+def markdown_dependency_section(file_path: str, deps: Dict[str, Any]) -> str:
+    """Render the dependency section for one file."""
+    # Use basename for Dependencies headers
+    filename = os.path.basename(file_path)
+    md = [f"\n### `{filename}`\n"]
+    md.append(f"- Full Path: `{file_path}`\n")  # Optionally add full path
+    if deps.get("imports"):
+        md.append("\nImports:\n")
+        for imp in deps["imports"]:
+            md.append(f"- `{imp}`\n")
+    if deps.get("imported_by"):
+        md.append("\nImported by:\n")
+        for imp_by_path in deps["imported_by"]:
+            imp_by_filename = os.path.basename(imp_by_path)
+            md.append(f"- `{imp_by_filename}` (`{imp_by_path}`)\n")
+    return "".join(md)
@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Analysis Jobs
+===================================
+
+Background workspace analysis jobs with progress, cancellation and
+partial results.
+
+An ``AnalysisJob`` runs in a worker thread and consumes the records of
+``NEXUSCore.iter_workspace_analysis``. The event loop only reads small
+snapshots of it, and the core lock is taken one file at a time, so a long
+scan blocks neither message handling nor other core requests.
+
+Version: 1.0.0
+"""
+
+import contextlib
+import threading
+import time
+from typing import Any, ContextManager, Dict, Iterator, Optional
+
+PENDING = "pending"
+RUNNING = "running"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+FAILED = "failed"
+FINISHED_STATES = (COMPLETED, CANCELLED, FAILED)
+
+
+class JobCancelled(Exception):
+    """Raised inside the worker thread once cancellation was requested."""
+
+
+def new_workspace_result() -> Dict[str, Any]:
+    """Empty container in the shape returned by ``NEXUSCore.analyze_workspace``."""
+    return {"metrics": {}, "files": {}, "dependencies": {}, "duplicates": {}}
+
+
+def collect_workspace_record(analysis: Dict[str, Any], record: Dict[str, Any]) -> None:
+    """Merge one ``iter_workspace_analysis`` record into a workspace result."""
+    if record["type"] == "file" and "duplicate_of" in record:
+        # Duplicates share the analysis object of the first path with that content
+        canonical_path = record["duplicate_of"]
+        analysis["files"][record["path"]] = analysis["files"][canonical_path]
+        analysis["duplicates"].setdefault(canonical_path, []).append(record["path"])
+    elif record["type"] == "file":
+        analysis["files"][record["path"]] = record["analysis"]
+    elif record["type"] == "dependencies":
+        analysis["dependencies"][record["path"]] = record["entry"]
+    elif record["type"] == "metrics":
+        analysis["metrics"] = record["metrics"]
+
+
+def iter_workspace_records(analysis: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Replay an ``analyze_workspace`` result as ``iter_workspace_analysis`` records."""
+    duplicates = {
+        path: canonical
+        for canonical, paths in (analysis.get("duplicates") or {}).items()
+        for path in paths
+    }
+    for file_path, file_analysis in analysis.get("files", {}).items():
+        if file_path in duplicates:
+            yield {
+                "type": "file",
+                "path": file_path,
+                "duplicate_of": duplicates[file_path],
+                "content_hash": file_analysis.get("content_hash"),
+            }
+        else:
+            yield {"type": "file", "path": file_path, "analysis": file_analysis}
+    for file_path, entry in (analysis.get("dependencies") or {}).items():
+        yield {"type": "dependencies", "path": file_path, "entry": entry}
+    yield {"type": "metrics", "metrics": analysis.get("metrics", {})}
+
+
+class AnalysisJob:
+    """One workspace analysis run, driven from a worker thread."""
+
+    def __init__(self, job_id: str):
+        self.job_id = job_id
+        self.status = PENDING
+        self.phase = "discovery"
+        self.files_done = 0
+        self.files_total = 0
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self._result = new_workspace_result()
+        self._lock = threading.Lock()
+        self._cancel = threading.Event()
+
+    @property
+    def finished(self) -> bool:
+        return self.status in FINISHED_STATES
+
+    def cancel(self) -> bool:
+        """Request cancellation. Returns False if the job already finished."""
+        if self.finished:
+            return False
+        self._cancel.set()
+        return True
+
+    def report_progress(self, files_done: int, files_total: int) -> None:
+        """Progress callback for ``iter_workspace_analysis`` (worker thread)."""
+        self.files_done = files_done
+        self.files_total = files_total
+        if files_done >= files_total:
+            self.phase = "dependencies"
+        if self._cancel.is_set():
+            raise JobCancelled()
+
+    def run(self, core, core_lock: Optional[ContextManager] = None) -> None:
+        """Analyze the workspace of ``core`` (a ``NEXUSCore``). Blocks; run it off-loop.
+
+        ``core_lock`` is held only while the core produces the next record, so other
+        callers sharing the lock can use the core between files.
+        """
+        core_lock = core_lock or contextlib.nullcontext()
+        self.started_at = time.time()
+        self.status = RUNNING
+        try:
+            with core_lock:
+                python_files = core.discover_python_files()
+            self.files_total = len(python_files)
+            self.phase = "analysis"
+            records = core.iter_workspace_analysis(python_files, progress=self.report_progress)
+            while True:
+                with core_lock:
+                    record = next(records, None)
+                if record is None:
+                    break
+                with self._lock:
+                    collect_workspace_record(self._result, record)
+                if self._cancel.is_set():
+                    raise JobCancelled()
+            self.phase = "done"
+            self.status = COMPLETED
+        except JobCancelled:
+            self.status = CANCELLED
+        except Exception as e:
+            self.error = str(e)
+            self.status = FAILED
+        finally:
+            self.finished_at = time.time()
+
+    def eta_seconds(self, now: Optional[float] = None) -> Optional[float]:
+        """Remaining time estimated from the file throughput so far."""
+        if self.started_at is None or not self.files_done or self.finished:
+            return None
+        elapsed = (now or time.time()) - self.started_at
+        remaining = max(self.files_total - self.files_done, 0)
+        return round(elapsed / self.files_done * remaining, 2)
+
+    def result(self) -> Dict[str, Any]:
+        """Copy of the results collected so far (complete once the job completed)."""
+        with self._lock:
+            return {
+                "metrics": dict(self._result["metrics"]),
+                "files": dict(self._result["files"]),
+                "dependencies": dict(self._result["dependencies"]),
+                "duplicates": {k: list(v) for k, v in self._result["duplicates"].items()},
+            }
+
+    def snapshot(self, include_results: bool = False) -> Dict[str, Any]:
+        """Status payload for progress events and status requests."""
+        now = time.time()
+        end = self.finished_at or now
+        payload = {
+            "job_id": self.job_id,
+            "status": self.status,
+            "phase": self.phase,
+            "files_done": self.files_done,
+            "files_total": self.files_total,
+            "elapsed_seconds": round(end - self.started_at, 2) if self.started_at else 0.0,
+            "eta_seconds": self.eta_seconds(now),
+        }
+        if self.error:
+            payload["error"] = self.error
+        if include_results:
+            payload["partial"] = self.status != COMPLETED
+            payload["analysis"] = self.result()
+        return payload
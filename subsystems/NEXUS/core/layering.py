@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Layering Rules
+====================================
+
+Structural analysis of the import graph: import cycles, the condensed DAG,
+topological layers and violations of configured layering rules such as
+"KOIOS must not import NEXUS".
+
+Rules name their ends either by subsystem (``"KOIOS"`` matches every file
+under ``subsystems/KOIOS/``) or by a glob over project-relative paths
+(``"subsystems/*/tests/*"``). Each file is matched against the rules once
+and each edge is then checked with a bitmask test, so the whole analysis
+stays linear in files plus imports.
+
+Version: 1.0.0
+"""
+
+from dataclasses import dataclass
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Optional
+
+from .dependency_graph import DependencyGraph
+
+
+def subsystem_of(rel_path: str) -> Optional[str]:
+    """'subsystems/ETHIK/core/x.py' -> 'ETHIK'; None outside ``subsystems/``."""
+    parts = rel_path.replace("\\", "/").split("/")
+    if len(parts) > 2 and parts[0] == "subsystems":
+        return parts[1]
+    return None
+
+
+@dataclass(frozen=True)
+class LayeringRule:
+    """Files matching ``source`` must not import files matching ``target``."""
+
+    source: str
+    target: str
+    reason: str = ""
+
+    @staticmethod
+    def _matches(pattern: str, rel_path: str, subsystem: Optional[str]) -> bool:
+        if "/" in pattern or "*" in pattern or pattern.endswith(".py"):
+            return fnmatchcase(rel_path.replace("\\", "/"), pattern)
+        return subsystem == pattern
+
+    def matches_source(self, rel_path: str, subsystem: Optional[str]) -> bool:
+        return self._matches(self.source, rel_path, subsystem)
+
+    def matches_target(self, rel_path: str, subsystem: Optional[str]) -> bool:
+        return self._matches(self.target, rel_path, subsystem)
+
+
+def rules_from_config(layering_config: Dict[str, Any]) -> List[LayeringRule]:
+    """Build rules from the ``analysis.layering`` config section.
+
+    ``forbidden`` lists explicit ``{"source", "target", "reason"}`` rules.
+    ``layers`` lists subsystems (or path globs) from lowest to highest; a
+    lower layer must not import any higher one.
+    """
+    rules = [
+        LayeringRule(rule["source"], rule["target"], rule.get("reason", ""))
+        for rule in layering_config.get("forbidden", [])
+    ]
+    layers = layering_config.get("layers", [])
+    for low_index, low in enumerate(layers):
+        for high in layers[low_index + 1 :]:
+            rules.append(LayeringRule(low, high, f"{low} is layered below {high}"))
+    return rules
+
+
+def find_violations(graph: DependencyGraph, rules: List[LayeringRule]) -> List[Dict[str, str]]:
+    """Import edges that break a layering rule, sorted by source and target."""
+    if not rules:
+        return []
+    source_masks: Dict[str, int] = {}
+    target_masks: Dict[str, int] = {}
+    for path in graph.files():
+        subsystem = subsystem_of(path)
+        source_mask = target_mask = 0
+        for bit, rule in enumerate(rules):
+            if rule.matches_source(path, subsystem):
+                source_mask |= 1 << bit
+            if rule.matches_target(path, subsystem):
+                target_mask |= 1 << bit
+        source_masks[path] = source_mask
+        target_masks[path] = target_mask
+
+    violations = []
+    for source, target in graph.edges():
+        broken = source_masks[source] & target_masks[target]
+        if not broken:
+            continue
+        rule = rules[(broken & -broken).bit_length() - 1]  # First matching rule
+        violations.append(
+            {
+                "source": source,
+                "target": target,
+                "rule": f"{rule.source} must not import {rule.target}",
+                "reason": rule.reason,
+            }
+        )
+    violations.sort(key=lambda v: (v["source"], v["target"]))
+    return violations
+
+
+def analyze_structure(graph: DependencyGraph, rules: List[LayeringRule]) -> Dict[str, Any]:
+    """Cycles, condensed DAG, layers and rule violations from one condensation pass."""
+    condensed = graph.condensation()
+    components, _, dag = condensed
+    dag_edges = [[index, target] for index, targets in enumerate(dag) for target in sorted(targets)]
+
+    return {
+        "files": len(graph),
+        "edges": graph.edge_count,
+        "cycles": graph.find_cycles(components),
+        "condensed_dag": {
+            "components": [sorted(graph.path(n) for n in component) for component in components],
+            "edges": dag_edges,
+        },
+        "layers": graph.topological_layers(condensed),
+        "violations": find_violations(graph, rules),
+    }
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS File Budgets
+==================================
+
+Per-file size and time budgets for NEXUS analysis.
+
+Files above ``max_file_bytes`` are never read into memory as a whole:
+depending on ``oversize_policy`` they are skipped, or summarized from one
+streaming pass (content hash, line and character counts and a line-based
+scan of top-level imports). Files within the budget but at least
+``worker_min_bytes`` large are parsed in a worker process, which is killed
+once it exceeds ``parse_timeout``; the file is then reported as degraded.
+
+Version: 1.0.0
+"""
+
+import codecs
+import hashlib
+import logging
+import re
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, FrozenSet, Iterable, List, Optional
+
+from .ast_visitor import analyze_code as ast_analyze_code
+from .ast_visitor import visit_source
+
+SKIP = "skip"
+SUMMARIZE = "summarize"
+OVERSIZE_POLICIES = (SKIP, SUMMARIZE)
+
+# Values of the 'status' key of limited analyses
+SKIPPED = "skipped"
+DEGRADED = "degraded"
+
+STREAM_CHUNK_SIZE = 1 << 16
+# Longest line prefix kept while streaming; import statements are far shorter
+MAX_SCANNED_LINE = 4096
+
+_IMPORT_RE = re.compile(r"import\s+(.+)")
+_FROM_IMPORT_RE = re.compile(r"from\s+(\.*)([\w.]*)\s+import\s+(.+)")
+
+
+class FileBudgetExceeded(Exception):
+    """Raised when a file is skipped because it exceeds the size budget."""
+
+
+class ParseTimeout(TimeoutError):
+    """Raised when parsing a file in a worker process exceeds the time budget."""
+
+
+@dataclass(frozen=True)
+class FileBudget:
+    """Size and time limits for analyzing one file (``analysis.limits`` config)."""
+
+    max_file_bytes: Optional[int] = 2_000_000
+    oversize_policy: str = SUMMARIZE
+    parse_timeout: Optional[float] = 20.0
+    worker_min_bytes: int = 262_144
+
+    @classmethod
+    def from_config(cls, limits_config: Dict[str, Any]) -> "FileBudget":
+        """Build a budget from the ``analysis.limits`` config section."""
+        budget = cls(
+            **{key: limits_config[key] for key in cls.__dataclass_fields__ if key in limits_config}
+        )
+        if budget.oversize_policy not in OVERSIZE_POLICIES:
+            raise ValueError(
+                f"Unknown oversize_policy '{budget.oversize_policy}'; "
+                f"expected one of {OVERSIZE_POLICIES}"
+            )
+        return budget
+
+    def exceeds_size(self, size: int) -> bool:
+        return bool(self.max_file_bytes) and size > self.max_file_bytes
+
+    def use_worker(self, size: int) -> bool:
+        """Whether a file of this size is parsed in a worker process with a timeout."""
+        return bool(self.parse_timeout) and size >= self.worker_min_bytes
+
+
+def count_lines(text: str) -> int:
+    """Line count of newline-normalized text, without building a list of lines."""
+    if not text:
+        return 0
+    return text.count("\n") + (not text.endswith("\n"))
+
+
+def parse_import_line(line: str, lineno: int) -> List[Dict[str, Any]]:
+    """Import details of one top-level import line, in the AST visitor's shape.
+
+    Used where the file is not parsed. Only statements starting in column 0
+    are recognized; the names of multi-line ``from x import (...)`` statements
+    are limited to the first line.
+    """
+    if not line.startswith(("import ", "from ")):
+        return []
+    line = line.split("#", 1)[0].strip()
+    base = {
+        "alias": None,
+        "lineno": lineno,
+        "col_offset": 0,
+        "end_lineno": lineno,
+        "end_col_offset": None,
+    }
+    match = _FROM_IMPORT_RE.fullmatch(line)
+    if match:
+        dots, module, names = match.groups()
+        names = [name.split(" as ")[0].strip() for name in names.strip("()\\ ").split(",")]
+        return [
+            dict(
+                base,
+                module=module,
+                names=[name for name in names if name],
+                is_from_import=True,
+                level=len(dots),
+            )
+        ]
+    match = _IMPORT_RE.fullmatch(line)
+    if not match:
+        return []
+    imports = []
+    for part in match.group(1).split(","):
+        module, _, alias = part.strip().partition(" as ")
+        if module:
+            imports.append(
+                dict(
+                    base,
+                    module=module.strip(),
+                    names=[],
+                    alias=alias.strip() or None,
+                    is_from_import=False,
+                    level=0,
+                )
+            )
+    return imports
+
+
+def scan_imports(lines: Iterable[str]) -> List[Dict[str, Any]]:
+    """Top-level imports of already-split source lines (see ``parse_import_line``)."""
+    imports: List[Dict[str, Any]] = []
+    for lineno, line in enumerate(lines, start=1):
+        imports.extend(parse_import_line(line, lineno))
+    return imports
+
+
+def stream_file_summary(file_path: str) -> Dict[str, Any]:
+    """Summarize a file in one streaming pass with bounded memory.
+
+    The content hash, line and character counts match those computed from
+    the fully read (newline-normalized) text.
+
+    Returns:
+        Dict[str, Any]: 'bytes', 'lines', 'chars', 'content_hash' and '_raw_imports'.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+    imports: List[Dict[str, Any]] = []
+    size = chars = lines = 0
+    current = ""  # Start of the line being read, at most MAX_SCANNED_LINE characters
+    line_open = False
+    pending_cr = False
+
+    def feed(text: str) -> None:
+        nonlocal chars, lines, current, line_open, pending_cr
+        if pending_cr and text.startswith("\n"):
+            text = text[1:]  # Second half of a \r\n split across chunks
+            pending_cr = False
+        if not text:
+            return
+        pending_cr = text.endswith("\r")
+        text = text.replace("\r\n", "\n").replace("\r", "\n")
+        chars += len(text)
+        segments = text.split("\n")
+        for segment in segments[:-1]:
+            lines += 1
+            imports.extend(parse_import_line((current + segment)[:MAX_SCANNED_LINE], lines))
+            current = ""
+        tail = segments[-1]
+        line_open = bool(tail) or (line_open and len(segments) == 1)
+        if len(current) < MAX_SCANNED_LINE:
+            current = (current + tail)[:MAX_SCANNED_LINE]
+
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(STREAM_CHUNK_SIZE), b""):
+            size += len(chunk)
+            digest.update(chunk)
+            feed(decoder.decode(chunk))
+        feed(decoder.decode(b"", final=True))
+    if line_open:
+        lines += 1
+        imports.extend(parse_import_line(current, lines))
+
+    return {
+        "bytes": size,
+        "lines": lines,
+        "chars": chars,
+        "content_hash": digest.hexdigest(),
+        "_raw_imports": imports,
+    }
+
+
+def limited_analysis(
+    summary: Dict[str, Any], status: str, reason: str, fields: Optional[FrozenSet[str]] = None
+) -> Dict[str, Any]:
+    """``analyze_code``-shaped result for a file that was skipped or not fully parsed.
+
+    Skipped results carry an 'error' key, like other files that could not be
+    analyzed; degraded results keep the usual keys with empty function and
+    class lists.
+    """
+    analysis = {
+        "lines": summary["lines"],
+        "chars": summary["chars"],
+        "content_hash": summary["content_hash"],
+        "bytes": summary["bytes"],
+        "status": status,
+        "reason": reason,
+    }
+    if status == SKIPPED:
+        analysis["error"] = f"Skipped: {reason}"
+        return analysis
+    if fields is not None and "counts" in fields:
+        analysis.update(function_count=0, class_count=0)
+    analysis.update(
+        complexity={"cognitive_load": 0},
+        _raw_imports=summary["_raw_imports"],
+        functions=[],
+        classes=[],
+    )
+    return analysis
+
+
+def summarize_file(
+    file_path: str, budget: FileBudget, fields: Optional[FrozenSet[str]] = None
+) -> Dict[str, Any]:
+    """Limited analysis of a file above the size budget, according to its policy."""
+    status = SKIPPED if budget.oversize_policy == SKIP else DEGRADED
+    reason = f"file exceeds {budget.max_file_bytes} bytes"
+    return limited_analysis(stream_file_summary(file_path), status, reason, fields)
+
+
+def _parse_in_worker(content: str, fields: Optional[FrozenSet[str]], as_visitor: bool) -> Any:
+    """Worker-process entry point: the visitor (for compact storage) or the AST dicts."""
+    logger = logging.getLogger("NEXUS.ParseWorker")
+    if as_visitor:
+        visitor = visit_source(content, logger, fields)
+        visitor.logger = None  # Loggers are not sent back to the parent
+        return visitor
+    return ast_analyze_code(content, logger, fields)
+
+
+class ParseWorkerPool:
+    """Lazily started worker processes that parse files under a timeout.
+
+    A worker that exceeds the timeout is terminated together with its pool;
+    the next parse starts a fresh one.
+    """
+
+    def __init__(self, processes: int = 1):
+        self.processes = processes
+        self._pool = None
+        self._lock = threading.Lock()
+
+    def run(
+        self,
+        content: str,
+        fields: Optional[FrozenSet[str]],
+        as_visitor: bool,
+        timeout: float,
+    ) -> Any:
+        """Parse ``content`` in a worker; exceptions from the parse are re-raised here.
+
+        Raises:
+            ParseTimeout: If the worker did not finish within ``timeout`` seconds
+        """
+        import multiprocessing  # Only needed once a file is large enough for a worker
+
+        with self._lock:
+            if self._pool is None:
+                # spawn: forking a process that runs threads (jobs, watchers) is unsafe
+                self._pool = multiprocessing.get_context("spawn").Pool(self.processes)
+            pool = self._pool
+        pending = pool.apply_async(_parse_in_worker, (content, fields, as_visitor))
+        try:
+            return pending.get(timeout)
+        except multiprocessing.TimeoutError:
+            self._terminate(pool)
+            raise ParseTimeout(f"Parsing exceeded {timeout}s") from None
+
+    def _terminate(self, pool) -> None:
+        with self._lock:
+            if self._pool is pool:
+                self._pool = None
+        pool.terminate()
+        pool.join()
+
+    def close(self) -> None:
+        """Stop the worker processes, if any were started."""
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+            pool.join()
@@ -15,15 +15,58 @@ Version: 1.0.0 (Migrated)
 # from sklearn.feature_extraction.text import TfidfVectorizer # Removed unused import
 # from sklearn.metrics.pairwise import cosine_similarity # Removed unused import
 import ast
+import hashlib
 import json
 import logging
 import os
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict, List, Optional
-
-from koios.logger import KoiosLogger
-
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    FrozenSet,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    TextIO,
+    Tuple,
+    Union,
+)
+
+from .ast_visitor import ANALYSIS_FIELDS, normalize_fields, visit_source
 from .ast_visitor import analyze_code as ast_analyze_code
+from .compact import CompactFileAnalysis
+from .dependency_graph import DependencyGraph
+from .exporters import (
+    json_default,
+    markdown_dependency_section,
+    markdown_file_section,
+    markdown_metrics_section,
+    write_markdown,
+    write_ndjson,
+)
+from .jobs import collect_workspace_record, iter_workspace_records, new_workspace_result
+from .limits import (
+    DEGRADED,
+    SKIP,
+    FileBudget,
+    FileBudgetExceeded,
+    ParseTimeout,
+    count_lines,
+    limited_analysis,
+    scan_imports,
+    stream_file_summary,
+    summarize_file,
+)
+from .suggestions import (
+    AnalysisColumns,
+    SuggestionReport,
+    analysis_fingerprint,
+    evaluate_rules,
+)
 
 # Configure logging
 # logging.basicConfig(
@@ -34,6 +77,59 @@ from .ast_visitor import analyze_code as ast_analyze_code
 # Removed unused module-level logger
 # logger = KoiosLogger.get_logger("NEXUS.Core")
 
+# Modules only needed by some operations (KOIOS logging, SQLite, multiprocessing,
+# structure and diff reports) are imported on first use to keep startup cheap.
+
+# Number of suggestion reports kept per NEXUSCore instance
+ANALYSIS_CACHE_SIZE = 256
+SUGGESTION_CACHE_SIZE = 16
+# Number of structure analyses (see analyze_structure) kept per NEXUSCore instance
+STRUCTURE_CACHE_SIZE = 8
+
+# Heuristic set of likely external/standard library top-level modules
+# TODO: Make this configurable or more robust
+KNOWN_EXTERNAL_MODULES = {
+    "os",
+    "sys",
+    "logging",
+    "json",
+    "re",
+    "collections",
+    "math",
+    "datetime",
+    "pathlib",
+    "asyncio",
+    "typing",
+    "abc",
+    "unittest",
+    "pytest",
+    "requests",
+    "numpy",
+    "pandas",
+    "sklearn",
+    "fastapi",
+    "uvicorn",
+    "pydantic",
+    "koios",
+    "mycelium",  # Consider EGOS subsystems external for now
+    # if imported directly? Maybe not.
+    # Add other common libraries used in the project here
+}
+
+
+def _koios_logger(name: str) -> logging.Logger:
+    """KOIOS logger ``name``; KOIOS (and its handler setup) is imported on first use."""
+    from koios.logger import KoiosLogger
+
+    return KoiosLogger.get_logger(name)
+
+
+def _analysis_store(db_path: Union[str, Path]):
+    """Open an ``AnalysisStore``; sqlite3 is only imported when a store is used."""
+    from .sqlite_store import AnalysisStore
+
+    return AnalysisStore(db_path)
+
 
 class NEXUSCore:
     """Core class for NEXUS analysis and cartography.
@@ -63,7 +159,7 @@ class NEXUSCore:
         self.config = config
 
         # Use provided logger or get a KoiosLogger
-        self.logger = logger or KoiosLogger.get_logger("NEXUS.Core")
+        self.logger = logger or _koios_logger("NEXUS.Core")
 
         # Set or determine project_root
         if project_root is None:
@@ -81,21 +177,103 @@ class NEXUSCore:
         else:
             self.project_root = project_root
 
+        # Size and time budgets per file; large files are parsed in worker processes
+        self.file_budget = FileBudget.from_config(self.config.get("analysis", {}).get("limits", {}))
+        # Heavier state is created on first use (see the properties below), so
+        # constructing NEXUSCore for a single-file analysis stays cheap
+        self._dependency_graph: Optional[DependencyGraph] = None
+        self._module_index: Dict[str, str] = {}
+        self._egos_subsystems_cache: Optional[Set[str]] = None
+        self._parse_worker_pool = None
+        self._caches: Dict[str, OrderedDict] = {}
+
         self.logger.info("NEXUS Core initialized.")
 
-    def analyze_code(self, file_path: str) -> Optional[Dict]:
+    @property
+    def dependency_graph(self) -> DependencyGraph:
+        """Persistent dependency store, refreshed by ``analyze_dependencies`` and
+        updated per file by ``update_file_dependencies``. Created on first use."""
+        if self._dependency_graph is None:
+            self._dependency_graph = DependencyGraph()
+        return self._dependency_graph
+
+    @property
+    def _parse_workers(self):
+        """Worker pool for parsing large files under a timeout, created on first use."""
+        if self._parse_worker_pool is None:
+            from .limits import ParseWorkerPool
+
+            self._parse_worker_pool = ParseWorkerPool()
+        return self._parse_worker_pool
+
+    def _cache(self, name: str) -> OrderedDict:
+        """LRU cache ``name``, created on first use."""
+        cache = self._caches.get(name)
+        if cache is None:
+            cache = self._caches[name] = OrderedDict()
+        return cache
+
+    @property
+    def _analysis_cache(self) -> "OrderedDict[Tuple, Any]":
+        """Per-file analyses keyed by (content hash, field projection, compact) (LRU)."""
+        return self._cache("analysis")
+
+    @property
+    def _suggestion_cache(self) -> "OrderedDict[str, SuggestionReport]":
+        """Suggestion reports keyed by analysis fingerprint (LRU)."""
+        return self._cache("suggestions")
+
+    @property
+    def _structure_cache(self) -> "OrderedDict[str, Dict[str, Any]]":
+        """Structure analyses keyed by dependency fingerprint (LRU)."""
+        return self._cache("structure")
+
+    def close(self) -> None:
+        """Stop the parse worker processes, if any were started."""
+        if self._parse_worker_pool is not None:
+            self._parse_worker_pool.close()
+
+    def analyze_code(
+        self,
+        file_path: str,
+        compact: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Optional[Union[Dict, CompactFileAnalysis]]:
         """Analyze a single Python code file using AST.
 
         Extracts metrics like line count, complexity, imports, functions, and classes.
+        Results are cached per content hash and projection, so re-analyzing an
+        unchanged file is a hash lookup. Treat returned analyses as read-only.
+
+        Files above the ``analysis.limits`` size budget are not read whole: they
+        are skipped or summarized (see ``limits.FileBudget``) and marked with a
+        'status' of 'skipped' or 'degraded' and a 'reason'. Files that exceed the
+        parse timeout in a worker process are reported as 'degraded' as well.
 
         Args:
             file_path (str): The absolute or relative path to the Python file.
+            compact (bool, optional): Return a ``CompactFileAnalysis`` (interned,
+                                      struct-of-arrays storage with a read-only
+                                      dict view) instead of plain dicts.
+                                      Defaults to False.
+            fields (Optional[Iterable[str]]): Only extract these fields (see
+                                      ``ast_visitor.ANALYSIS_FIELDS``), e.g.
+                                      ``{"imports", "counts"}``. 'lines', 'chars'
+                                      and 'content_hash' are always included;
+                                      "counts" adds 'function_count' and
+                                      'class_count'. None (default) returns the
+                                      full analysis.
 
         Returns:
-            Optional[Dict]: A dictionary containing analysis metrics, or None if the
-                            file is not found. Returns a dict with an 'error' key
-                            if analysis fails.
+            Optional[Union[Dict, CompactFileAnalysis]]: The analysis metrics, or None
+                            if the file is not found. Returns a dict with an 'error'
+                            key if analysis fails.
+
+        Raises:
+            ValueError: If ``fields`` names an unknown field or is combined with
+                        ``compact=True`` (compact analyses always hold every field).
         """
+        fields = self._projection(fields, compact)
         self.logger.debug(f"Analyzing file: {file_path}")
         try:
             # Basic check if file exists
@@ -103,79 +281,210 @@ class NEXUSCore:
                 self.logger.error(f"File not found for analysis: {file_path}")
                 return None
 
-            with open(file_path, "r", encoding="utf-8") as f:
-                content = f.read()
+            if self.file_budget.exceeds_size(os.path.getsize(file_path)):
+                return self._oversized_analysis(file_path, fields)
+            content, content_hash = self._read_source(file_path)
+        except FileNotFoundError:
+            self.logger.error(f"File not found during analysis: {file_path}")
+            return None
+        except Exception as e:
+            self.logger.exception(f"Error analyzing file {file_path}: {e}")
+            return {"error": f"Failed to analyze {file_path}: {e}"}
+
+        return self._analyze_source(
+            file_path, content, content_hash, compact=compact, fields=fields
+        )
+
+    @staticmethod
+    def _projection(fields: Optional[Iterable[str]], compact: bool) -> Optional[FrozenSet[str]]:
+        """Validate an ``analyze_code`` field projection."""
+        fields = normalize_fields(fields)
+        if compact and fields is not None:
+            raise ValueError("Field projections are not supported with compact=True.")
+        return fields
+
+    @staticmethod
+    def _read_source(file_path: str) -> Tuple[str, str]:
+        """Read a source file once and return its text and a content hash.
+
+        The hash is taken over the raw bytes, so identical files share it
+        regardless of their path. Newlines are normalized the same way as
+        reading in text mode.
+        """
+        with open(file_path, "rb") as f:
+            raw = f.read()
+        content_hash = hashlib.blake2b(raw, digest_size=16).hexdigest()
+        content = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+        return content, content_hash
+
+    def _oversized_analysis(
+        self, file_path: str, fields: Optional[FrozenSet[str]] = None
+    ) -> Dict[str, Any]:
+        """Skip or summarize a file above the size budget without reading it whole."""
+        analysis = summarize_file(file_path, self.file_budget, fields)
+        self.logger.warning(f"{analysis['status'].capitalize()} {file_path}: {analysis['reason']}")
+        return analysis
+
+    def _parse(self, content: str, fields: Optional[FrozenSet[str]], as_visitor: bool) -> Any:
+        """Run the AST visitor, in a worker process under the parse timeout for large files.
+
+        Returns the visitor (``as_visitor``) or the ``ast_visitor.analyze_code`` dict.
+
+        Raises:
+            ParseTimeout: If a worker exceeded the parse timeout.
+        """
+        if self.file_budget.use_worker(len(content)):
+            return self._parse_workers.run(
+                content, fields, as_visitor, self.file_budget.parse_timeout
+            )
+        if as_visitor:
+            return visit_source(content, self.logger, fields)
+        return ast_analyze_code(content, self.logger, fields)
+
+    def _timed_out_analysis(
+        self, file_path: str, content: str, content_hash: str, fields: Optional[FrozenSet[str]]
+    ) -> Dict[str, Any]:
+        """Degraded analysis (counts and scanned imports) of a file whose parse timed out."""
+        self.logger.warning(
+            f"Parsing {file_path} exceeded {self.file_budget.parse_timeout}s; "
+            "reporting a degraded analysis."
+        )
+        summary = {
+            "bytes": os.path.getsize(file_path),
+            "lines": count_lines(content),
+            "chars": len(content),
+            "content_hash": content_hash,
+            "_raw_imports": scan_imports(content.split("\n")),
+        }
+        reason = f"parse exceeded {self.file_budget.parse_timeout}s"
+        return limited_analysis(summary, DEGRADED, reason, fields)
 
+    def _analyze_source(
+        self,
+        file_path: str,
+        content: str,
+        content_hash: str,
+        compact: bool = False,
+        fields: Optional[FrozenSet[str]] = None,
+    ) -> Union[Dict, CompactFileAnalysis]:
+        """Return the cached ``analyze_code`` result for already-read source text."""
+        cache_key = (content_hash, fields, compact)
+        analysis = self._analysis_cache.get(cache_key)
+        if analysis is not None:
+            self._analysis_cache.move_to_end(cache_key)
+            self.logger.debug(f"Analysis cache hit: {file_path}")
+            return analysis
+
+        analysis = self._build_analysis(file_path, content, content_hash, compact, fields)
+        self._analysis_cache[cache_key] = analysis
+        while len(self._analysis_cache) > ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
+        return analysis
+
+    def _build_analysis(
+        self,
+        file_path: str,
+        content: str,
+        content_hash: str,
+        compact: bool,
+        fields: Optional[FrozenSet[str]],
+    ) -> Union[Dict, CompactFileAnalysis]:
+        """Build the ``analyze_code`` result for already-read source text."""
+        if compact:
+            try:
+                visitor = self._parse(content, None, as_visitor=True)
+            except ParseTimeout:
+                return self._timed_out_analysis(file_path, content, content_hash, fields)
+            except Exception:
+                visitor = None  # The dict path below reports the error in the usual shape
+            if visitor is not None:
+                analysis = CompactFileAnalysis.from_visitor(
+                    visitor, count_lines(content), len(content), content_hash
+                )
+                self.logger.info(f"Analyzed file: {file_path} - {analysis.lines} lines")
+                return analysis
+
+        try:
             # Use AST-based analysis
-            ast_metrics = ast_analyze_code(content, self.logger)
+            ast_metrics = self._parse(content, fields, as_visitor=False)
             if "error" in ast_metrics:
                 self.logger.error(f"AST analysis error for {file_path}: {ast_metrics['error']}")
                 return ast_metrics
 
+            wanted = ANALYSIS_FIELDS if fields is None else fields
             metrics = {
-                "lines": len(content.splitlines()),
+                "lines": count_lines(content),
                 "chars": len(content),
-                "complexity": {"cognitive_load": ast_metrics["cognitive_load"]},
-                # Store raw import details for later categorization
-                "_raw_imports": ast_metrics["imports"],
-                # 'imports': [ # Remove direct formatting here
-                #     f"{'from ' + imp['module'] + ' ' if imp['is_from_import'] else ''}"
-                #     f"import {', '.join(imp['names']) if imp['names'] else imp['module']}"
-                #     f"{' as ' + imp['alias'] if imp['alias'] else ''}"
-                #     for imp in ast_metrics['imports']
-                # ],
-                "functions": [
-                    {
-                        "name": func["name"],
-                        "params": func["args"],
-                        "doc": func["docstring"] or "No docstring",
-                        "line": func["start_line"],
-                        "end_line": func["end_line"],
-                        "is_async": func["is_async"],
-                        "decorators": func["decorators"],
-                    }
-                    for func in ast_metrics["functions"]
-                ],
-                "classes": [
-                    {
-                        "name": cls["name"],
-                        "inheritance": ", ".join(cls["bases"]),
-                        "doc": cls["docstring"] or "No docstring",
-                        "line": cls["start_line"],
-                        "end_line": cls["end_line"],
-                        "decorators": cls["decorators"],
-                        "methods": [
-                            {
-                                "name": method["name"],
-                                "params": method["args"],
-                                "doc": method["docstring"] or "No docstring",
-                                "line": method["start_line"],
-                                "end_line": method["end_line"],
-                                "is_async": method["is_async"],
-                                "decorators": method["decorators"],
-                            }
-                            for method in cls["methods"]
-                        ],
-                    }
-                    for cls in ast_metrics["classes"]
-                ],
+                "content_hash": content_hash,
             }
+            if fields is not None and "counts" in fields:
+                metrics["function_count"] = ast_metrics["function_count"]
+                metrics["class_count"] = ast_metrics["class_count"]
+            if "complexity" in wanted:
+                metrics["complexity"] = {"cognitive_load": ast_metrics["cognitive_load"]}
+            if "imports" in wanted:
+                # Store raw import details for later categorization
+                metrics["_raw_imports"] = ast_metrics["imports"]
+            if "functions" in wanted:
+                metrics["functions"] = [
+                    self._function_entry(func, wanted) for func in ast_metrics["functions"]
+                ]
+            if "classes" in wanted:
+                metrics["classes"] = [
+                    self._class_entry(cls, wanted) for cls in ast_metrics["classes"]
+                ]
 
             self.logger.info(f"Analyzed file: {file_path} - {metrics['lines']} lines")
             return metrics
-        except FileNotFoundError:
-            self.logger.error(f"File not found during analysis: {file_path}")
-            return None
+        except ParseTimeout:
+            return self._timed_out_analysis(file_path, content, content_hash, fields)
         except Exception as e:
             self.logger.exception(f"Error analyzing file {file_path}: {e}")
             return {"error": f"Failed to analyze {file_path}: {e}"}
 
+    @staticmethod
+    def _function_entry(
+        func: Dict[str, Any], wanted: FrozenSet[str] = ANALYSIS_FIELDS
+    ) -> Dict[str, Any]:
+        """Shape one function/method of the AST visitor output for ``analyze_code``."""
+        entry = {"name": func["name"], "params": func["args"]}
+        if "docstrings" in wanted:
+            entry["doc"] = func["docstring"] or "No docstring"
+        entry.update(line=func["start_line"], end_line=func["end_line"], is_async=func["is_async"])
+        if "decorators" in wanted:
+            entry["decorators"] = func["decorators"]
+        if "complexity" in wanted:
+            entry["complexity"] = {
+                "cognitive": func["complexity"],
+                "cyclomatic": func["cyclomatic_complexity"],
+            }
+            entry["lines"] = func["line_count"]
+            entry["statements"] = func["statement_count"]
+        return entry
+
+    @classmethod
+    def _class_entry(cls, class_info: Dict[str, Any], wanted: FrozenSet[str]) -> Dict[str, Any]:
+        """Shape one class of the AST visitor output for ``analyze_code``."""
+        entry = {"name": class_info["name"], "inheritance": ", ".join(class_info["bases"])}
+        if "docstrings" in wanted:
+            entry["doc"] = class_info["docstring"] or "No docstring"
+        entry.update(line=class_info["start_line"], end_line=class_info["end_line"])
+        if "decorators" in wanted:
+            entry["decorators"] = class_info["decorators"]
+        if "functions" in wanted:
+            entry["methods"] = [
+                cls._function_entry(method, wanted) for method in class_info["methods"]
+            ]
+        return entry
+
     def analyze_dependencies(self, python_files: List[str]) -> Dict:
         """Analyze dependencies between a list of Python files.
 
         Parses import statements using AST, resolves relative/absolute paths,
         and builds a map of which files import others, categorized into internal,
-        external, and unresolved imports.
+        external, and unresolved imports. The resolved internal edges are also
+        loaded into ``self.dependency_graph`` so later per-file updates and
+        impact queries do not need to re-scan the workspace.
 
         Args:
             python_files (List[str]): A list of absolute or relative paths to Python
@@ -196,42 +505,8 @@ class NEXUSCore:
         all_import_details: Dict[
             str, List[Dict[str, Any]]
         ] = {}  # file_path -> list of import details
-
-        # Heuristic set of likely external/standard library top-level modules
-        # TODO: Make this configurable or more robust
-        known_external_modules = {
-            "os",
-            "sys",
-            "logging",
-            "json",
-            "re",
-            "collections",
-            "math",
-            "datetime",
-            "pathlib",
-            "asyncio",
-            "typing",
-            "abc",
-            "unittest",
-            "pytest",
-            "requests",
-            "numpy",
-            "pandas",
-            "sklearn",
-            "fastapi",
-            "uvicorn",
-            "pydantic",
-            "koios",
-            "mycelium",  # Consider EGOS subsystems external for now
-            # if imported directly? Maybe not.
-            # Add other common libraries used in the project here
-        }
-        # Also consider EGOS subsystems if imported absolutely
-        egos_subsystems = {
-            "subsystems." + d
-            for d in os.listdir(self.project_root / "subsystems")
-            if os.path.isdir(self.project_root / "subsystems" / d) and not d.startswith("_")
-        }
+        # Import details depend only on file content, so duplicates are parsed once
+        parsed_blobs: Dict[str, List[Dict[str, Any]]] = {}
 
         # First pass: Initialize dictionary, map module names to paths,
         # and parse AST for import details
@@ -251,54 +526,17 @@ class NEXUSCore:
                 module_to_path[module_name] = relative_path_str  # Store relative path as value
 
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    content = f.read()
-                tree = ast.parse(content, filename=str(file_path))
-
-                for node in ast.walk(tree):
-                    if isinstance(node, ast.Import):
-                        for alias in node.names:
-                            import_info = {
-                                "module": alias.name,
-                                "names": [],
-                                "alias": alias.asname,
-                                "is_from_import": False,
-                                "level": 0,  # Absolute import
-                                "lineno": node.lineno,
-                            }
-                            all_import_details[relative_path_str].append(import_info)
-                            # Don't add to dependencies['imports'] here anymore
-
-                    elif isinstance(node, ast.ImportFrom):
-                        module = node.module if node.module else ""  # Handle 'from . import ...'
-                        level = node.level  # Relative import level
-
-                        # Handle cases like 'from .submodule import *' -
-                        # less precise but capture intent
-                        imported_names = [alias.name for alias in node.names if alias.name != "*"]
-                        has_wildcard = any(alias.name == "*" for alias in node.names)
-                        if has_wildcard:
-                            imported_names.append("*")  # Represent wildcard if present
-
-                        # If names are specified, record them. If not
-                        # If names are specified, record them. If not (e.g. from . import submodule),
-                        # module itself is the key part.
-                        import_info = {
-                            "module": module,
-                            "names": imported_names,
-                            "alias": None,  # 'as' not applicable here directly for names, handled per name if needed
-                            "is_from_import": True,
-                            "level": level,
-                            "lineno": node.lineno,
-                        }
-                        all_import_details[relative_path_str].append(import_info)
-                        # Don't add to dependencies['imports'] here anymore
-
+                all_import_details[relative_path_str] = self._parse_import_details(
+                    file_path, parsed_blobs
+                )
             except FileNotFoundError:
                 self.logger.error(
                     f"File not found during dependency analysis first pass: {file_path_str}"
                 )
                 dependencies[relative_path_str]["error"] = f"File not found: {file_path_str}"
+            except FileBudgetExceeded as e:
+                self.logger.warning(f"Skipped {file_path_str} for dependencies: {e}")
+                dependencies[relative_path_str]["error"] = f"Skipped: {e}"
             except SyntaxError as e:
                 self.logger.error(f"Syntax error parsing {file_path_str} for dependencies: {e}")
                 dependencies[relative_path_str]["error"] = f"Syntax error: {e}"
@@ -308,143 +546,449 @@ class NEXUSCore:
                 )
                 dependencies[relative_path_str]["error"] = f"Analysis error: {e}"
 
+        # Keep the module index so single files can be re-resolved later
+        self._module_index = module_to_path
+        self.dependency_graph.clear()
+        known_files = set(dependencies)
+
         # Second pass: Resolve imports and categorize
         for importing_file_rel, imports in all_import_details.items():
+            self.dependency_graph.add_file(importing_file_rel)
             if "error" in dependencies[importing_file_rel]:
                 continue  # Skip files that failed initial parsing
 
-            importing_file_abs = self.project_root / importing_file_rel
-
+            internal_targets = set()
             for imp in imports:
-                resolved_module_str: Optional[str] = None
-                import_display_str = self._format_import_display(
-                    imp
-                )  # Helper to format for output lists
-
-                try:
-                    if imp["level"] > 0:  # Relative import
-                        # Attempt to resolve relative path
-                        current_dir = importing_file_abs.parent
-                        # Go up 'level' directories (minus 1 since level 1 is current dir)
-                        for _ in range(imp["level"] - 1):
-                            current_dir = current_dir.parent
-
-                        if imp["module"]:  # e.g., from ..submodule import name
-                            resolved_module_path_base = current_dir / imp["module"].replace(
-                                ".", os.sep
-                            )
-                        else:  # e.g., from . import name
-                            resolved_module_path_base = current_dir
-
-                        # Check if it's a package (directory with __init__.py) or a module (.py file)
-                        potential_module_path = resolved_module_path_base.with_suffix(".py")
-                        potential_package_path = resolved_module_path_base / "__init__.py"
-
-                        if potential_module_path.exists() and potential_module_path.is_file():
-                            resolved_module_str = self._path_to_module_str(
-                                str(potential_module_path)
-                            )
-                        elif potential_package_path.exists() and potential_package_path.is_file():
-                            resolved_module_str = self._path_to_module_str(
-                                str(resolved_module_path_base)
-                            )  # Use dir path for package
-
-                    else:  # Absolute import
-                        resolved_module_str = imp["module"]
-
-                    # --- Categorization Logic ---
-                    if resolved_module_str:
-                        # Check if it resolves to a known internal module
-                        if resolved_module_str in module_to_path:
-                            imported_file_rel = module_to_path[resolved_module_str]
-                            dependencies[importing_file_rel]["internal_imports"].append(
-                                import_display_str
-                            )
-                            if (
-                                imported_file_rel in dependencies
-                                and importing_file_rel != importing_file_rel
-                            ):  # Avoid self-imports in list
-                                dependencies[imported_file_rel]["imported_by"].append(
-                                    importing_file_rel
-                                )
-                        # Check if it looks like an EGOS subsystem absolute import
-                        elif (
-                            resolved_module_str.startswith("subsystems.")
-                            and resolved_module_str in egos_subsystems
-                        ):
-                            # Treat absolute subsystem imports as internal? Or special category? Let's say internal for now.
-                            # Need to find the actual file path it corresponds to if possible.
-                            potential_path_str = str(
-                                self.project_root / resolved_module_str.replace(".", os.sep)
-                            )
-                            potential_module_path = Path(potential_path_str + ".py")
-                            potential_package_path = Path(potential_path_str) / "__init__.py"
-                            found_internal = False
-                            if potential_module_path.exists() and potential_module_path.is_file():
-                                target_rel_path = str(
-                                    potential_module_path.relative_to(self.project_root)
-                                )
-                                if target_rel_path in dependencies:
-                                    dependencies[importing_file_rel]["internal_imports"].append(
-                                        import_display_str
-                                    )
-                                    dependencies[target_rel_path]["imported_by"].append(
-                                        importing_file_rel
-                                    )
-                                    found_internal = True
-                            elif (
-                                potential_package_path.exists() and potential_package_path.is_file()
-                            ):
-                                target_rel_path = str(
-                                    Path(potential_path_str).relative_to(self.project_root)
-                                )  # Use dir path
-                                # Check if the *directory* corresponds to a mapped module key (e.g., subsystems.NEXUS)
-                                mapped_module_key = self._path_to_module_str(potential_path_str)
-                                if mapped_module_key in module_to_path:
-                                    target_rel_path_key = module_to_path[mapped_module_key]
-                                    if target_rel_path_key in dependencies:
-                                        dependencies[importing_file_rel]["internal_imports"].append(
-                                            import_display_str
-                                        )
-                                        dependencies[target_rel_path_key]["imported_by"].append(
-                                            importing_file_rel
-                                        )
-                                        found_internal = True
-                            if not found_internal:
-                                # It looked like a subsystem but wasn't found/mapped? Unresolved.
-                                dependencies[importing_file_rel]["unresolved_imports"].append(
-                                    f"{import_display_str} # Attempted subsystem import"
-                                )
-
-                        # Check if top-level module is known external/stdlib
-                        elif resolved_module_str.split(".")[0] in known_external_modules:
-                            dependencies[importing_file_rel]["external_imports"].append(
-                                import_display_str
-                            )
-                        else:
-                            # Not resolved internally, not obviously external -> Unresolved
-                            dependencies[importing_file_rel]["unresolved_imports"].append(
-                                import_display_str
-                            )
-                    else:
-                        # Could not resolve module string (e.g., complex relative path issue)
-                        dependencies[importing_file_rel]["unresolved_imports"].append(
-                            f"{import_display_str} # Resolution failed"
-                        )
-
-                except Exception as e:
-                    self.logger.warning(
-                        f"Error resolving/categorizing import '{import_display_str}' "
-                        f"in {importing_file_rel}: {e}"
-                    )
-                    # Add to unresolved if resolution fails unexpectedly
-                    dependencies[importing_file_rel]["unresolved_imports"].append(
-                        f"{import_display_str} # Categorization error: {e}"
-                    )
+                category, import_display_str, imported_file_rel = self._categorize_import(
+                    importing_file_rel, imp, known_files
+                )
+                dependencies[importing_file_rel][category].append(import_display_str)
+                if imported_file_rel:
+                    internal_targets.add(imported_file_rel)
+                    if imported_file_rel != importing_file_rel:  # Avoid self-imports in list
+                        dependencies[imported_file_rel]["imported_by"].append(importing_file_rel)
+
+            self.dependency_graph.set_imports(importing_file_rel, internal_targets)
 
         self.logger.info(f"Dependency analysis complete for {len(python_files)} files.")
         return dependencies
 
+    def _parse_import_details(
+        self, file_path: Path, parsed_blobs: Optional[Dict[str, List[Dict[str, Any]]]] = None
+    ) -> List[Dict[str, Any]]:
+        """Parse a file and return the raw import details used for dependency resolution.
+
+        Args:
+            file_path (Path): File to parse.
+            parsed_blobs (Optional[Dict]): Content hash -> import details cache. Files
+                                           whose content was already parsed are not
+                                           parsed again; the cached list is shared.
+
+        Files above the size budget are not parsed: their top-level imports are
+        scanned in a streaming pass, or they are skipped under the 'skip' policy.
+
+        Raises:
+            FileNotFoundError, SyntaxError: Propagated to the caller, which records
+                                            the error against the file.
+            FileBudgetExceeded: The file exceeds the size budget and is skipped.
+        """
+        if self.file_budget.exceeds_size(os.path.getsize(file_path)):
+            if self.file_budget.oversize_policy == SKIP:
+                raise FileBudgetExceeded(f"file exceeds {self.file_budget.max_file_bytes} bytes")
+            summary = stream_file_summary(str(file_path))
+            if parsed_blobs is not None:
+                parsed_blobs.setdefault(summary["content_hash"], summary["_raw_imports"])
+            return summary["_raw_imports"]
+
+        content, content_hash = self._read_source(str(file_path))
+        if parsed_blobs is not None and content_hash in parsed_blobs:
+            return parsed_blobs[content_hash]
+        tree = ast.parse(content, filename=str(file_path))
+
+        import_details = []
+        for node in ast.walk(tree):
+            if isinstance(node, ast.Import):
+                for alias in node.names:
+                    import_details.append(
+                        {
+                            "module": alias.name,
+                            "names": [],
+                            "alias": alias.asname,
+                            "is_from_import": False,
+                            "level": 0,  # Absolute import
+                            "lineno": node.lineno,
+                        }
+                    )
+
+            elif isinstance(node, ast.ImportFrom):
+                module = node.module if node.module else ""  # Handle 'from . import ...'
+
+                # Handle cases like 'from .submodule import *' -
+                # less precise but capture intent
+                imported_names = [alias.name for alias in node.names if alias.name != "*"]
+                if any(alias.name == "*" for alias in node.names):
+                    imported_names.append("*")  # Represent wildcard if present
+
+                # If names are specified, record them. If not (e.g. from . import submodule),
+                # module itself is the key part.
+                import_details.append(
+                    {
+                        "module": module,
+                        "names": imported_names,
+                        "alias": None,  # 'as' not applicable here directly for names
+                        "is_from_import": True,
+                        "level": node.level,  # Relative import level
+                        "lineno": node.lineno,
+                    }
+                )
+        if parsed_blobs is not None:
+            parsed_blobs[content_hash] = import_details
+        return import_details
+
+    def _categorize_import(
+        self, importing_file_rel: str, imp: Dict[str, Any], known_files: Set[str]
+    ) -> Tuple[str, str, Optional[str]]:
+        """Resolve one import and decide which dependency list it belongs to.
+
+        Args:
+            importing_file_rel (str): Project-relative path of the importing file.
+            imp (Dict[str, Any]): Raw import details from ``_parse_import_details``.
+            known_files (Set[str]): Project-relative paths of the analyzed files.
+
+        Returns:
+            Tuple[str, str, Optional[str]]: The category key ('internal_imports',
+                'external_imports' or 'unresolved_imports'), the display string to
+                record, and the imported file's relative path for internal imports.
+        """
+        module_to_path = self._module_index
+        import_display_str = self._format_import_display(imp)  # Helper to format for output lists
+        importing_file_abs = self.project_root / importing_file_rel
+        resolved_module_str: Optional[str] = None
+
+        try:
+            if imp["level"] > 0:  # Relative import
+                # Attempt to resolve relative path
+                current_dir = importing_file_abs.parent
+                # Go up 'level' directories (minus 1 since level 1 is current dir)
+                for _ in range(imp["level"] - 1):
+                    current_dir = current_dir.parent
+
+                if imp["module"]:  # e.g., from ..submodule import name
+                    resolved_module_path_base = current_dir / imp["module"].replace(".", os.sep)
+                else:  # e.g., from . import name
+                    resolved_module_path_base = current_dir
+
+                # Check if it's a package (directory with __init__.py) or a module (.py file)
+                potential_module_path = resolved_module_path_base.with_suffix(".py")
+                potential_package_path = resolved_module_path_base / "__init__.py"
+
+                if potential_module_path.exists() and potential_module_path.is_file():
+                    resolved_module_str = self._path_to_module_str(str(potential_module_path))
+                elif potential_package_path.exists() and potential_package_path.is_file():
+                    resolved_module_str = self._path_to_module_str(
+                        str(resolved_module_path_base)
+                    )  # Use dir path for package
+
+            else:  # Absolute import
+                resolved_module_str = imp["module"]
+
+            # --- Categorization Logic ---
+            if not resolved_module_str:
+                # Could not resolve module string (e.g., complex relative path issue)
+                return "unresolved_imports", f"{import_display_str} # Resolution failed", None
+
+            # Check if it resolves to a known internal module
+            if resolved_module_str in module_to_path:
+                return "internal_imports", import_display_str, module_to_path[resolved_module_str]
+
+            # Check if it looks like an EGOS subsystem absolute import
+            if (
+                resolved_module_str.startswith("subsystems.")
+                and resolved_module_str in self._egos_subsystems
+            ):
+                # Treat absolute subsystem imports as internal when the target was analyzed.
+                potential_path_str = str(
+                    self.project_root / resolved_module_str.replace(".", os.sep)
+                )
+                potential_module_path = Path(potential_path_str + ".py")
+                potential_package_path = Path(potential_path_str) / "__init__.py"
+                if potential_module_path.exists() and potential_module_path.is_file():
+                    target_rel_path = str(potential_module_path.relative_to(self.project_root))
+                    if target_rel_path in known_files:
+                        return "internal_imports", import_display_str, target_rel_path
+                elif potential_package_path.exists() and potential_package_path.is_file():
+                    # Check if the *directory* corresponds to a mapped module key
+                    # (e.g., subsystems.NEXUS)
+                    mapped_module_key = self._path_to_module_str(potential_path_str)
+                    target_rel_path_key = module_to_path.get(mapped_module_key)
+                    if target_rel_path_key in known_files:
+                        return "internal_imports", import_display_str, target_rel_path_key
+                # It looked like a subsystem but wasn't found/mapped? Unresolved.
+                return (
+                    "unresolved_imports",
+                    f"{import_display_str} # Attempted subsystem import",
+                    None,
+                )
+
+            # Check if top-level module is known external/stdlib
+            if resolved_module_str.split(".")[0] in KNOWN_EXTERNAL_MODULES:
+                return "external_imports", import_display_str, None
+
+            # Not resolved internally, not obviously external -> Unresolved
+            return "unresolved_imports", import_display_str, None
+
+        except Exception as e:
+            self.logger.warning(
+                f"Error resolving/categorizing import '{import_display_str}' "
+                f"in {importing_file_rel}: {e}"
+            )
+            # Add to unresolved if resolution fails unexpectedly
+            return "unresolved_imports", f"{import_display_str} # Categorization error: {e}", None
+
+    @property
+    def _egos_subsystems(self) -> Set[str]:
+        """Absolute module names of the EGOS subsystems present under the project root."""
+        if self._egos_subsystems_cache is None:
+            subsystems_dir = self.project_root / "subsystems"
+            if subsystems_dir.is_dir():
+                self._egos_subsystems_cache = {
+                    "subsystems." + d
+                    for d in os.listdir(subsystems_dir)
+                    if (subsystems_dir / d).is_dir() and not d.startswith("_")
+                }
+            else:
+                self._egos_subsystems_cache = set()
+        return self._egos_subsystems_cache
+
+    def update_file_dependencies(self, file_path: str) -> Optional[Dict[str, List[str]]]:
+        """Re-resolve the imports of a single file and apply them to the dependency graph.
+
+        Only the changed file's outgoing edges are touched. Files whose imports
+        were unresolved before ``file_path`` existed are not re-resolved; run
+        ``analyze_dependencies`` again for that.
+
+        Args:
+            file_path (str): Absolute or project-relative path of the changed file.
+
+        Returns:
+            Optional[Dict[str, List[str]]]: The file's dependency entry (same shape as
+                an ``analyze_dependencies`` value), or None if the file was deleted
+                and removed from the graph.
+        """
+        relative_path_str = self._to_relative_key(file_path)
+        absolute_path = self.project_root / relative_path_str
+
+        if not absolute_path.is_file():
+            self.dependency_graph.remove_file(relative_path_str)
+            module_name = self._path_to_module_str(str(absolute_path))
+            if self._module_index.get(module_name) == relative_path_str:
+                del self._module_index[module_name]
+            self.logger.debug(f"Removed {relative_path_str} from dependency graph")
+            return None
+
+        module_name = self._path_to_module_str(str(absolute_path))
+        if module_name:
+            self._module_index[module_name] = relative_path_str
+
+        entry: Dict[str, List[str]] = {
+            "internal_imports": [],
+            "external_imports": [],
+            "unresolved_imports": [],
+            "imported_by": [],
+        }
+        try:
+            imports = self._parse_import_details(absolute_path)
+        except FileBudgetExceeded as e:
+            self.logger.warning(f"Skipped {relative_path_str} for dependencies: {e}")
+            entry["error"] = f"Skipped: {e}"
+            imports = []
+        except SyntaxError as e:
+            self.logger.error(f"Syntax error parsing {relative_path_str} for dependencies: {e}")
+            entry["error"] = f"Syntax error: {e}"
+            imports = []
+
+        known_files = set(self.dependency_graph.files())
+        known_files.add(relative_path_str)
+        internal_targets = set()
+        for imp in imports:
+            category, display, target = self._categorize_import(relative_path_str, imp, known_files)
+            entry[category].append(display)
+            if target:
+                internal_targets.add(target)
+
+        if "error" not in entry:
+            added, removed = self.dependency_graph.set_imports(relative_path_str, internal_targets)
+            if added or removed:
+                self.logger.debug(
+                    f"Dependency edges for {relative_path_str}: +{len(added)} -{len(removed)}"
+                )
+        else:
+            self.dependency_graph.add_file(relative_path_str)
+        entry["imported_by"] = sorted(self.dependency_graph.importers_of(relative_path_str))
+        return entry
+
+    def analyze_changed_files(self, file_paths: Iterable[str]) -> Dict[str, Any]:
+        """Re-analyze changed files and their direct dependents.
+
+        Intended for watch mode: only the changed files are parsed again, and
+        only the direct importers of those files have their imports re-resolved.
+        Requires a populated dependency graph (see ``analyze_dependencies``).
+
+        Args:
+            file_paths (Iterable[str]): Absolute or project-relative paths that changed.
+
+        Returns:
+            Dict[str, Any]: A compact delta with:
+                  - 'files': per changed file, its 'status' ('added', 'modified' or
+                    'removed') and a 'summary' of the new analysis.
+                  - 'dependencies': dependency entries for changed files and their
+                    direct dependents.
+                  - 'edges': 'added' and 'removed' ``[importer, imported]`` pairs.
+        """
+        changed = {self._to_relative_key(p) for p in file_paths}
+        delta: Dict[str, Any] = {
+            "files": {},
+            "dependencies": {},
+            "edges": {"added": [], "removed": []},
+        }
+        edges_before: Set[Tuple[str, str]] = set()
+        dependents: Set[str] = set()
+
+        for rel in changed:
+            importers = self.dependency_graph.importers_of(rel)
+            dependents.update(importers)
+            edges_before.update((rel, target) for target in self.dependency_graph.imports_of(rel))
+            edges_before.update((importer, rel) for importer in importers)
+
+        existed = {rel for rel in changed if rel in self.dependency_graph}
+        for rel in sorted(changed):
+            entry = self.update_file_dependencies(rel)
+            if entry is None:
+                delta["files"][rel] = {"status": "removed", "summary": None}
+                continue
+            delta["dependencies"][rel] = entry
+            dependents.update(entry["imported_by"])
+            analysis = self.analyze_code(str(self.project_root / rel))
+            delta["files"][rel] = {
+                "status": "modified" if rel in existed else "added",
+                "summary": self._summarize_file_analysis(analysis),
+            }
+
+        dependents -= changed
+        for rel in sorted(dependents):
+            edges_before.update((rel, target) for target in self.dependency_graph.imports_of(rel))
+            entry = self.update_file_dependencies(rel)
+            if entry is not None:
+                delta["dependencies"][rel] = entry
+
+        edges_after: Set[Tuple[str, str]] = set()
+        for rel in changed | dependents:
+            edges_after.update((rel, target) for target in self.dependency_graph.imports_of(rel))
+            edges_after.update(
+                (importer, rel) for importer in self.dependency_graph.importers_of(rel)
+            )
+        delta["edges"]["added"] = [list(edge) for edge in sorted(edges_after - edges_before)]
+        delta["edges"]["removed"] = [list(edge) for edge in sorted(edges_before - edges_after)]
+
+        self.logger.info(
+            f"Incremental analysis: {len(changed)} changed, {len(dependents)} dependents."
+        )
+        return delta
+
+    @staticmethod
+    def _summarize_file_analysis(analysis: Optional[Dict]) -> Optional[Dict[str, Any]]:
+        """Reduce an ``analyze_code`` result to the fields consumers need to refresh a view."""
+        if analysis is None:
+            return None
+        if "error" in analysis:
+            return {"error": analysis["error"]}
+        return {
+            "lines": analysis["lines"],
+            "chars": analysis["chars"],
+            "content_hash": analysis["content_hash"],
+            "cognitive_load": analysis["complexity"]["cognitive_load"],
+            "functions": [func["name"] for func in analysis["functions"]],
+            "classes": [cls["name"] for cls in analysis["classes"]],
+        }
+
+    def get_impact_set(self, file_path: str) -> List[str]:
+        """Return every file that transitively imports ``file_path`` ("what breaks if I touch X").
+
+        Answered from ``self.dependency_graph``; run ``analyze_dependencies`` or
+        ``analyze_workspace`` first to populate it.
+        """
+        return sorted(self.dependency_graph.impact_set(self._to_relative_key(file_path)))
+
+    def get_transitive_dependencies(self, file_path: str) -> List[str]:
+        """Return every internal file that ``file_path`` depends on, directly or indirectly."""
+        return sorted(
+            self.dependency_graph.transitive_dependencies(self._to_relative_key(file_path))
+        )
+
+    def find_import_cycles(self) -> List[List[str]]:
+        """Return import cycles in the dependency graph (Tarjan SCC), largest first."""
+        return self.dependency_graph.find_cycles()
+
+    def analyze_structure(self, dependencies: Optional[Dict[str, Dict]] = None) -> Dict[str, Any]:
+        """Analyze the import graph structure and check the layering rules.
+
+        Computes import cycles (strongly connected components), the condensed
+        DAG, topological layers and violations of the rules configured under
+        ``analysis.layering`` (e.g. ``{"forbidden": [{"source": "KOIOS",
+        "target": "NEXUS"}]}``). Runs in time linear in files plus imports and
+        is cached per analysis fingerprint.
+
+        Args:
+            dependencies (Optional[Dict[str, Dict]]): A dependency map from
+                ``analyze_dependencies``/``analyze_workspace``. Defaults to the
+                live ``dependency_graph``.
+
+        Returns:
+            Dict[str, Any]: 'files', 'edges', 'cycles', 'condensed_dag'
+                            ('components' and 'edges' between component indexes,
+                            importer first), 'layers' (layer 0 = no internal
+                            imports) and 'violations'.
+        """
+        layering_config = self.config.get("analysis", {}).get("layering", {})
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(json.dumps(layering_config, sort_keys=True).encode())
+        if dependencies is None:
+            graph = self.dependency_graph
+            digest.update(f"graph:{id(graph)}:{graph.version}".encode())
+        else:
+            graph = None
+            for path, entry in dependencies.items():
+                digest.update(path.encode())
+                digest.update("\0".join(entry.get("imported_by", [])).encode())
+                digest.update(b"\1")
+        fingerprint = digest.hexdigest()
+
+        cached = self._structure_cache.get(fingerprint)
+        if cached is not None:
+            self._structure_cache.move_to_end(fingerprint)
+            return cached
+
+        if graph is None:
+            graph = DependencyGraph.from_dependency_map(dependencies)
+        from .layering import analyze_structure, rules_from_config
+
+        structure = analyze_structure(graph, rules_from_config(layering_config))
+        structure["fingerprint"] = fingerprint
+        self._structure_cache[fingerprint] = structure
+        while len(self._structure_cache) > STRUCTURE_CACHE_SIZE:
+            self._structure_cache.popitem(last=False)
+        return structure
+
+    def _to_relative_key(self, file_path: str) -> str:
+        """Convert an absolute or relative path into the project-relative key used by the graph."""
+        path = Path(file_path)
+        if path.is_absolute():
+            try:
+                return str(path.resolve().relative_to(self.project_root))
+            except ValueError:
+                return str(path)
+        return str(path)
+
     def _path_to_module_str(self, file_path_str: str) -> Optional[str]:
         """Converts an absolute file path within the project to a Python module string."""
         try:
@@ -503,152 +1047,311 @@ class NEXUSCore:
             alias_part = f" as {imp['alias']}" if imp["alias"] else ""
             return f"import {imp['module']}{alias_part}"
 
-    def analyze_workspace(self, exclude_dirs: Optional[List[str]] = None) -> Dict:
+    def discover_python_files(self) -> List[str]:
+        """Collect the absolute paths of all .py files under the project root.
+
+        Skips virtual environments and ``__pycache__`` directories.
+        """
+        python_files = []
+        for root, _, files in os.walk(self.project_root):
+            if ".venv" in root or "__pycache__" in root:
+                continue
+            for file in files:
+                if file.endswith(".py"):
+                    python_files.append(os.path.join(root, file))
+        return python_files
+
+    def analyze_workspace(
+        self,
+        exclude_dirs: Optional[List[str]] = None,
+        compact: bool = False,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Dict:
         """Analyze all Python files in the workspace root directory.
 
         Collects all .py files (excluding .venv, __pycache__), analyzes each one,
         calculates aggregate metrics, and analyzes inter-file dependencies.
+        This materializes ``iter_workspace_analysis`` into a single dict; use the
+        iterator (or ``export_analysis_stream``) to keep memory bounded.
+        With ``compact=True`` the 'files' values are ``CompactFileAnalysis``
+        objects, which behave like read-only dicts but use far less memory.
+        ``fields`` limits the per-file analyses as in ``analyze_code``.
 
         Returns:
             Dict: A nested dictionary containing:
                   - 'metrics': Aggregated workspace metrics (file count, lines, etc.).
                   - 'files': Analysis dictionary for each file (from analyze_code).
                   - 'dependencies': Dependency map (from analyze_dependencies).
+                  - 'duplicates': First path of each duplicated content blob mapped to
+                    the other paths sharing it (they share the same 'files' entry).
         """
+        analysis = new_workspace_result()
+        for record in self.iter_workspace_analysis(compact=compact, fields=fields):
+            collect_workspace_record(analysis, record)
+        return analysis
+
+    def iter_workspace_analysis(
+        self,
+        python_files: Optional[List[str]] = None,
+        compact: bool = False,
+        progress: Optional[Callable[[int, int], None]] = None,
+        fields: Optional[Iterable[str]] = None,
+    ) -> Iterator[Dict[str, Any]]:
+        """Yield workspace analysis records as they are produced.
+
+        Per-file results are yielded and released one at a time; only running
+        totals are kept for the workspace aggregates, which are yielded last.
+
+        Args:
+            python_files (Optional[List[str]]): Files to analyze. Defaults to
+                                                ``discover_python_files()``.
+            compact (bool, optional): Yield ``CompactFileAnalysis`` objects as the
+                                      per-file analysis. Defaults to False.
+            progress (Optional[Callable[[int, int], None]]): Called with
+                                      (files_done, files_total) before each file
+                                      and once after the last one. An exception
+                                      raised by it aborts the analysis.
+            fields (Optional[Iterable[str]]): Per-file projection as in
+                                      ``analyze_code``. "counts" and "complexity"
+                                      are always added for the workspace metrics.
+
+        Files are hashed as they are read and each unique content blob is
+        analyzed only once. Later paths with the same content are yielded as
+        ``{"type": "file", "path": str, "duplicate_of": str, "content_hash": str}``
+        referencing the first path, and counted in the 'unique_files' and
+        'duplicate_files' metrics.
+
+        Files over the size or parse-time budget are listed in the 'skipped'
+        and 'degraded' metrics as ``{"path", "reason", "bytes"}`` and counted in
+        'skipped_files' and 'degraded_files'. Skipped files yield no file record;
+        degraded ones count towards the line totals but not the complexity average.
+
+        Yields:
+            Dict[str, Any]: Records of three types, in this order:
+                  - ``{"type": "file", "path": str, "analysis": Dict}`` per analyzed file.
+                  - ``{"type": "dependencies", "path": str, "entry": Dict}`` per file.
+                  - ``{"type": "metrics", "metrics": Dict}`` once, at the end.
+        """
+        fields = self._projection(fields, compact)
+        if fields is not None:
+            fields = fields | {"counts", "complexity"}
         self.logger.info("Starting workspace analysis...")
 
         # Collect Python files
-        python_files = []
-        for root, _, files in os.walk(self.project_root):
-            if ".venv" in root or "__pycache__" in root:
+        if python_files is None:
+            python_files = self.discover_python_files()
+
+        metrics = {
+            "total_files": len(python_files),
+            "unique_files": 0,
+            "duplicate_files": 0,
+            "total_lines": 0,
+            "total_functions": 0,
+            "total_classes": 0,
+            "avg_complexity": 0.0,
+            "skipped_files": 0,
+            "degraded_files": 0,
+            "skipped": [],
+            "degraded": [],
+        }
+        complexity_sum = 0.0
+        analyzed_files = 0
+        # content hash -> (first path, (lines, functions, classes, complexity) or None on
+        # error, budget status or None)
+        blobs: Dict[
+            str, Tuple[str, Optional[Tuple[int, int, int, Optional[float]]], Optional[Dict]]
+        ] = {}
+
+        # Analyze each unique file content once
+        for files_done, file_path in enumerate(python_files):
+            if progress is not None:
+                progress(files_done, len(python_files))
+            oversized = None
+            try:
+                if self.file_budget.exceeds_size(os.path.getsize(file_path)):
+                    # Summarized by streaming; the content is never held in memory
+                    oversized = self._oversized_analysis(file_path, fields)
+                    content, content_hash = None, oversized["content_hash"]
+                else:
+                    content, content_hash = self._read_source(file_path)
+            except Exception as e:
+                self.logger.error(f"Could not read {file_path} for analysis: {e}")
                 continue
-            for file in files:
-                if file.endswith(".py"):
-                    python_files.append(os.path.join(root, file))
 
-        # Analyze each file
-        analysis = {
-            "metrics": {
-                "total_files": len(python_files),
-                "total_lines": 0,
-                "total_functions": 0,
-                "total_classes": 0,
-                "avg_complexity": 0.0,
-            },
-            "files": {},
-            "dependencies": None,
-        }
+            blob = blobs.get(content_hash)
+            if blob is None:
+                file_analysis = oversized or self._analyze_source(
+                    file_path, content, content_hash, compact=compact, fields=fields
+                )
+                limit = None
+                if isinstance(file_analysis, dict) and "status" in file_analysis:
+                    limit = {
+                        "status": file_analysis["status"],
+                        "reason": file_analysis["reason"],
+                        "bytes": file_analysis["bytes"],
+                    }
+                totals = None
+                if isinstance(file_analysis, CompactFileAnalysis):
+                    totals = (
+                        file_analysis.lines,
+                        file_analysis.function_count,
+                        file_analysis.class_count,
+                        file_analysis.cognitive_load,
+                    )
+                elif "error" not in file_analysis:
+                    if "function_count" in file_analysis:  # "counts" projection
+                        counts = (file_analysis["function_count"], file_analysis["class_count"])
+                    else:
+                        counts = (len(file_analysis["functions"]), len(file_analysis["classes"]))
+                    totals = (
+                        file_analysis["lines"],
+                        *counts,
+                        file_analysis["complexity"]["cognitive_load"],
+                    )
+                    if limit is not None:
+                        totals = totals[:3] + (None,)  # Not parsed: no complexity
+                blobs[content_hash] = (file_path, totals, limit)
+                metrics["unique_files"] += 1
+                record = {"type": "file", "path": file_path, "analysis": file_analysis}
+            else:
+                canonical_path, totals, limit = blob
+                metrics["duplicate_files"] += 1
+                record = {
+                    "type": "file",
+                    "path": file_path,
+                    "duplicate_of": canonical_path,
+                    "content_hash": content_hash,
+                }
+            del content
+
+            if limit is not None:
+                metrics[f"{limit['status']}_files"] += 1
+                metrics[limit["status"]].append(
+                    {"path": file_path, "reason": limit["reason"], "bytes": limit["bytes"]}
+                )
+            if totals is not None:
+                metrics["total_lines"] += totals[0]
+                metrics["total_functions"] += totals[1]
+                metrics["total_classes"] += totals[2]
+                if totals[3] is not None:
+                    complexity_sum += totals[3]
+                    analyzed_files += 1
+                yield record
+
+        if progress is not None:
+            progress(len(python_files), len(python_files))
 
-        complexities = []
+        # Analyze dependencies
+        dependencies = self.analyze_dependencies(python_files)
+        for file_path, entry in dependencies.items():
+            yield {"type": "dependencies", "path": file_path, "entry": entry}
 
-        for file_path in python_files:
-            file_analysis = self.analyze_code(file_path)
-            if file_analysis and "error" not in file_analysis:
-                analysis["files"][file_path] = file_analysis
-                analysis["metrics"]["total_lines"] += file_analysis["lines"]
-                analysis["metrics"]["total_functions"] += len(file_analysis["functions"])
-                analysis["metrics"]["total_classes"] += len(file_analysis["classes"])
-                complexities.append(file_analysis["complexity"]["cognitive_load"])
+        if analyzed_files:
+            metrics["avg_complexity"] = complexity_sum / analyzed_files
 
-        if complexities:
-            analysis["metrics"]["avg_complexity"] = sum(complexities) / len(complexities)
+        self.logger.info("Workspace analysis complete.")
+        yield {"type": "metrics", "metrics": metrics}
 
-        # Analyze dependencies
-        analysis["dependencies"] = self.analyze_dependencies(python_files)
+    def diff_workspace(
+        self, old_analysis: Dict, new_analysis: Optional[Dict] = None
+    ) -> Dict[str, Any]:
+        """Structural diff between two ``analyze_workspace`` results.
 
-        self.logger.info("Workspace analysis complete.")
-        return analysis
+        Files are compared by their 'content_hash' first, so unchanged files
+        cost one comparison and only changed files are inspected further.
+
+        Args:
+            old_analysis (Dict): The earlier workspace analysis (e.g. loaded from
+                                 a JSON export of a previous run).
+            new_analysis (Optional[Dict]): The later analysis. Defaults to a fresh
+                                 ``analyze_workspace()`` run.
+
+        Returns:
+            Dict[str, Any]: Files added/removed/changed, per-file function changes,
+                            functions whose complexity grew, dependency edges
+                            added/removed and new or resolved import cycles (see
+                            ``workspace_diff.diff_workspace_analyses``).
+        """
+        if new_analysis is None:
+            new_analysis = self.analyze_workspace()
+        from .workspace_diff import diff_workspace_analyses
+
+        return diff_workspace_analyses(old_analysis, new_analysis)
 
     def suggest_improvements(self, workspace_analysis: Dict) -> List[Dict]:
         """Generate improvement suggestions based on workspace analysis.
 
         Checks metrics like cognitive load, import count, dependency count,
-        and docstring coverage against configurable thresholds.
+        docstring coverage and per-function complexity and length against
+        configurable thresholds. The checks are the rows of
+        ``suggestions.SUGGESTION_RULES``; see ``query_suggestions`` for paging.
 
         Args:
             workspace_analysis (Dict): The dictionary returned by analyze_workspace().
 
         Returns:
             List[Dict]: A list of suggestion dictionaries, each containing 'type',
-                        'file', 'severity', and 'message'.
+                        'file', 'severity', and 'message', sorted from high to low
+                        severity. Function, method and class suggestions also
+                        carry 'function' or 'class' and 'line'.
         """
-        suggestions = []
-        thresholds = self.config.get("analysis", {}).get("suggestions", {})
+        return list(self._suggestion_report(workspace_analysis).suggestions)
 
-        for file_path, analysis in workspace_analysis.get("files", {}).items():
-            # Check cognitive load
-            cognitive_load = analysis.get("complexity", {}).get("cognitive_load", 0)
-            if cognitive_load > thresholds.get("cognitive_load_threshold_high", 50):
-                suggestions.append(
-                    {
-                        "type": "complexity",
-                        "file": file_path,
-                        "severity": "high",
-                        "message": f"High cognitive load ({cognitive_load:.1f}). Consider breaking down into smaller functions.",
-                    }
-                )
-
-            # Check import count
-            import_count = len(analysis.get("imports", []))
-            if import_count > thresholds.get("imports_threshold", 15):
-                suggestions.append(
-                    {
-                        "type": "imports",
-                        "file": file_path,
-                        "severity": "medium",
-                        "message": f"High number of imports ({import_count}). Consider modularizing or using composition.",
-                    }
-                )
-
-            # Check dependency count
-            if workspace_analysis.get("dependencies"):
-                imported_by = (
-                    workspace_analysis["dependencies"].get(file_path, {}).get("imported_by", [])
-                )
-                if len(imported_by) > thresholds.get("imported_by_threshold", 10):
-                    suggestions.append(
-                        {
-                            "type": "dependencies",
-                            "file": file_path,
-                            "severity": "medium",
-                            "message": f"Module is imported by {len(imported_by)} files. Consider if it should be split into smaller, more focused modules.",
-                        }
-                    )
+    def query_suggestions(
+        self,
+        workspace_analysis: Dict,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        top: Optional[int] = None,
+        severity: Optional[str] = None,
+        type: Optional[str] = None,
+        group_by_severity: bool = False,
+    ) -> Dict[str, Any]:
+        """Paginated, filterable view of ``suggest_improvements``.
+
+        Results are cached by analysis fingerprint, so paging through the
+        suggestions of the same analysis evaluates the rules only once.
 
-            # Check docstring coverage
-            for func in analysis.get("functions", []):
-                if func.get("doc") in ["No docstring", None, ""]:
-                    suggestions.append(
-                        {
-                            "type": "documentation",
-                            "file": file_path,
-                            "severity": "low",
-                            "message": f"Function {func['name']} lacks a docstring.",
-                        }
-                    )
+        Args:
+            workspace_analysis (Dict): The dictionary returned by analyze_workspace().
+            offset (int, optional): Index of the first suggestion returned.
+            limit (Optional[int]): Page size. None returns everything after offset.
+            top (Optional[int]): Shortcut for the ``top`` most severe suggestions.
+            severity (Optional[str]): Only suggestions of this severity.
+            type (Optional[str]): Only suggestions of this type.
+            group_by_severity (bool): Return the page as 'groups' keyed by severity
+                                      instead of a flat 'suggestions' list.
 
-            for cls in analysis.get("classes", []):
-                if cls.get("doc") in ["No docstring", None, ""]:
-                    suggestions.append(
-                        {
-                            "type": "documentation",
-                            "file": file_path,
-                            "severity": "low",
-                            "message": f"Class {cls['name']} lacks a docstring.",
-                        }
-                    )
-                for method in cls.get("methods", []):
-                    if method.get("doc") in ["No docstring", None, ""]:
-                        suggestions.append(
-                            {
-                                "type": "documentation",
-                                "file": file_path,
-                                "severity": "low",
-                                "message": f"Method {cls['name']}.{method['name']} lacks a docstring.",
-                            }
-                        )
-
-        return suggestions
+        Returns:
+            Dict[str, Any]: 'fingerprint', 'total' (after filtering), 'counts' per
+                            severity, 'offset', 'limit' and the page itself.
+        """
+        report = self._suggestion_report(workspace_analysis)
+        if top is not None:
+            offset, limit = 0, top
+        return report.page(
+            offset=offset,
+            limit=limit,
+            severity=severity,
+            type=type,
+            group_by_severity=group_by_severity,
+        )
+
+    def _suggestion_report(self, workspace_analysis: Dict) -> SuggestionReport:
+        """Evaluate the rule table, reusing the cached report for a known fingerprint."""
+        thresholds = self.config.get("analysis", {}).get("suggestions", {})
+        fingerprint = analysis_fingerprint(workspace_analysis, thresholds)
+        report = self._suggestion_cache.get(fingerprint)
+        if report is not None:
+            self._suggestion_cache.move_to_end(fingerprint)
+            return report
+
+        columns = AnalysisColumns.from_workspace_analysis(workspace_analysis, self.project_root)
+        report = SuggestionReport(fingerprint, evaluate_rules(columns, thresholds))
+        self._suggestion_cache[fingerprint] = report
+        while len(self._suggestion_cache) > SUGGESTION_CACHE_SIZE:
+            self._suggestion_cache.popitem(last=False)
+        return report
 
     def export_analysis(self, data: Dict, format: str = "json") -> Optional[str]:
         """Export analysis results in the specified format (JSON or Markdown).
@@ -665,7 +1368,7 @@ class NEXUSCore:
         self.logger.debug(f"Exporting analysis data in format: {format}")
         try:
             if format == "json":
-                return json.dumps(data, indent=2, default=str)
+                return json.dumps(data, indent=2, default=json_default)
             elif format == "md":
                 return self._convert_to_markdown(data)
             else:
@@ -675,6 +1378,124 @@ class NEXUSCore:
             self.logger.exception(f"Error exporting analysis: {e}")
             return None
 
+    def export_analysis_stream(
+        self,
+        destination: Union[str, Path, TextIO],
+        format: str = "ndjson",
+        records: Optional[Iterable[Dict[str, Any]]] = None,
+    ) -> Optional[int]:
+        """Stream analysis records to a file or text stream as they are produced.
+
+        Args:
+            destination (Union[str, Path, TextIO]): Output file path, or any writable
+                text stream (e.g. an open file or ``socket.makefile("w")``).
+            format (str, optional): 'ndjson' (one record per line), 'md', or
+                                    'sqlite' (destination is a database path; see
+                                    ``export_to_sqlite``). Defaults to 'ndjson'.
+            records (Optional[Iterable[Dict[str, Any]]]): Records to write. Defaults
+                to a fresh ``iter_workspace_analysis()`` run.
+
+        Returns:
+            Optional[int]: Number of records written, or None on error.
+        """
+        writers = {"ndjson": write_ndjson, "md": write_markdown}
+        if format == "sqlite":
+            if not isinstance(destination, (str, Path)):
+                self.logger.error("SQLite export needs a database path as destination.")
+                return None
+            if records is None:
+                records = self.iter_workspace_analysis()
+            try:
+                with _analysis_store(destination) as store:
+                    return store.write_records(records, self.project_root)[1]
+            except Exception as e:
+                self.logger.exception(f"Error exporting analysis to SQLite: {e}")
+                return None
+        if format not in writers:
+            self.logger.error(f"Unsupported stream export format requested: {format}")
+            return None
+        if records is None:
+            records = self.iter_workspace_analysis()
+
+        self.logger.debug(f"Streaming analysis data in format: {format}")
+        try:
+            if isinstance(destination, (str, Path)):
+                with open(destination, "w", encoding="utf-8") as f:
+                    return writers[format](records, f)
+            return writers[format](records, destination)
+        except Exception as e:
+            self.logger.exception(f"Error streaming analysis export: {e}")
+            return None
+
+    def export_to_sqlite(
+        self, db_path: Union[str, Path], workspace_analysis: Optional[Dict] = None
+    ) -> Optional[int]:
+        """Write an analysis into an indexed SQLite database as a new run.
+
+        Files, functions, classes, imports and dependency edges are stored in
+        separate tables and inserted in bulk inside one transaction. Use
+        ``query_functions``, ``query_dependency_edges`` or ``query_analysis_store``
+        to report on stored runs later.
+
+        Args:
+            db_path (Union[str, Path]): Database file; created if missing.
+            workspace_analysis (Optional[Dict]): An ``analyze_workspace`` result.
+                Defaults to streaming a fresh ``iter_workspace_analysis()`` run.
+
+        Returns:
+            Optional[int]: The id of the stored run, or None on error.
+        """
+        if workspace_analysis is None:
+            records = self.iter_workspace_analysis()
+        else:
+            records = iter_workspace_records(workspace_analysis)
+        try:
+            with _analysis_store(db_path) as store:
+                run_id, count = store.write_records(records, self.project_root)
+            self.logger.info(f"Exported {count} analysis records to {db_path} (run {run_id})")
+            return run_id
+        except Exception as e:
+            self.logger.exception(f"Error exporting analysis to SQLite: {e}")
+            return None
+
+    def query_functions(self, db_path: Union[str, Path], **filters: Any) -> List[Dict[str, Any]]:
+        """Query functions and methods stored by ``export_to_sqlite``.
+
+        Example: all async functions without docstrings in ETHIK::
+
+            nexus.query_functions(db, subsystem="ETHIK", is_async=True, has_docstring=False)
+
+        Args:
+            db_path (Union[str, Path]): Database written by ``export_to_sqlite``.
+            **filters: See ``AnalysisStore.find_functions`` (run_id, subsystem,
+                       path_prefix, name, is_async, has_docstring, is_method,
+                       min_cognitive, min_cyclomatic, limit). The latest run is
+                       used unless ``run_id`` is given.
+
+        Returns:
+            List[Dict[str, Any]]: One row per matching function or method.
+        """
+        with _analysis_store(db_path) as store:
+            return store.find_functions(**filters)
+
+    def query_dependency_edges(
+        self,
+        db_path: Union[str, Path],
+        source: Optional[str] = None,
+        target: Optional[str] = None,
+        run_id: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        """(importer, imported) edges of a stored run, filtered by either end."""
+        with _analysis_store(db_path) as store:
+            return store.dependency_edges(source=source, target=target, run_id=run_id)
+
+    def query_analysis_store(
+        self, db_path: Union[str, Path], sql: str, params: Iterable[Any] = ()
+    ) -> List[Dict[str, Any]]:
+        """Run a read-only SELECT against a store written by ``export_to_sqlite``."""
+        with _analysis_store(db_path) as store:
+            return store.query(sql, tuple(params))
+
     def _convert_to_markdown(self, data: Dict) -> str:
         """Convert analysis data dictionary to a Markdown formatted string.
 
@@ -685,71 +1506,18 @@ class NEXUSCore:
             str: A Markdown formatted report string.
         """
         md = ["# NEXUS Analysis Report\n"]
-        # self.logger.debug(f"Starting Markdown conversion. Data keys: {list(data.keys())}") # REMOVED DEBUG
 
         if "metrics" in data:
-            md.append("## Overall Metrics\n")
-            for key, value in data.get("metrics", {}).items():
-                md.append(f"- **{key.replace('_', ' ').title()}**: {value}\n")
+            md.append(markdown_metrics_section(data.get("metrics", {})))
 
         if "files" in data:
             md.append("\n## File Analysis\n")
             for file_path, analysis in data["files"].items():
-                # Use basename for File Analysis headers too for consistency
-                filename = os.path.basename(file_path)
-                md.append(f"\n### `{filename}`\n")
-                md.append(f"- Full Path: `{file_path}`\n")  # Optionally add full path
-                md.append(f"- Lines: {analysis['lines']}\n")
-                md.append(f"- Cognitive Load: {analysis['complexity']['cognitive_load']:.1f}\n")
-
-                if analysis.get("imports"):
-                    md.append("\n#### Imports\n")
-                    for imp in analysis["imports"]:
-                        md.append(f"- `{imp}`\n")
-
-                if analysis.get("classes"):
-                    md.append("\n#### Classes\n")
-                    for cls in analysis["classes"]:
-                        md.append(f"\n##### `{cls['name']}`\n")
-                        if cls["inheritance"]:
-                            md.append(f"Inherits from: `{cls['inheritance']}`\n")
-                        if cls["doc"] != "No docstring":
-                            md.append(f"\n{cls['doc']}\n")
-                        if cls["methods"]:
-                            md.append("\nMethods:\n")
-                            for method in cls["methods"]:
-                                md.append(f"- `{method['name']}({', '.join(method['params'])})`\n")
-
-                if analysis.get("functions"):
-                    md.append("\n#### Functions\n")
-                    for func in analysis["functions"]:
-                        md.append(f"\n##### `{func['name']}`\n")
-                        md.append(
-                            f"```python\ndef {func['name']}({', '.join(func['params'])})\n```\n"
-                        )
-                        if func["doc"] != "No docstring":
-                            md.append(f"\n{func['doc']}\n")
+                md.append(markdown_file_section(file_path, analysis))
 
         if "dependencies" in data and data["dependencies"]:
             md.append("\n## Dependencies\n")
-            # self.logger.debug(f"Processing dependencies section. Keys: {list(data['dependencies'].keys())}") # REMOVED DEBUG
             for file_path, deps in data["dependencies"].items():
-                # Use basename for Dependencies headers
-                filename = os.path.basename(file_path)
-                # --- DEBUG LOGGING REMOVED ---
-                # self.logger.debug(f"  Dep Path: {file_path}, Basename: {filename}, Expected: module_a.py")
-                # ---------------------------
-                md.append(f"\n### `{filename}`\n")
-                md.append(f"- Full Path: `{file_path}`\n")  # Optionally add full path
-                if deps.get("imports"):
-                    md.append("\nImports:\n")
-                    for imp in deps["imports"]:
-                        md.append(f"- `{imp}`\n")
-                if deps.get("imported_by"):
-                    md.append("\nImported by:\n")
-                    for imp_by_path in deps["imported_by"]:
-                        imp_by_filename = os.path.basename(imp_by_path)
-                        md.append(f"- `{imp_by_filename}` (`{imp_by_path}`)\n")
-
-        # self.logger.debug("Finished Markdown conversion.") # REMOVED DEBUG
+                md.append(markdown_dependency_section(file_path, deps))
+
         return "".join(md)
@@ -0,0 +1,400 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS SQLite Store
+==================================
+
+Indexed SQLite persistence for NEXUS analysis records.
+
+Each export becomes a run. Files, functions, classes, imports and
+dependency edges go into one table each, keyed by ``run_id``, so reports
+can query past runs without re-analysis or loading a full JSON export.
+All rows of a run are bulk-inserted in a single transaction.
+
+Version: 1.0.0
+"""
+
+import json
+import os
+import sqlite3
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .layering import subsystem_of
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    created_at REAL NOT NULL,
+    project_root TEXT,
+    metrics TEXT
+);
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL REFERENCES runs(id) ON DELETE CASCADE,
+    path TEXT NOT NULL,
+    rel_path TEXT NOT NULL,
+    subsystem TEXT,
+    lines INTEGER,
+    chars INTEGER,
+    content_hash TEXT,
+    cognitive_load REAL,
+    duplicate_of TEXT,
+    error TEXT
+);
+CREATE TABLE IF NOT EXISTS classes (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    inheritance TEXT,
+    line INTEGER,
+    end_line INTEGER,
+    has_docstring INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS functions (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    class_name TEXT,
+    name TEXT NOT NULL,
+    qualified_name TEXT NOT NULL,
+    params TEXT,
+    decorators TEXT,
+    line INTEGER,
+    end_line INTEGER,
+    is_async INTEGER NOT NULL,
+    has_docstring INTEGER NOT NULL,
+    cognitive INTEGER,
+    cyclomatic INTEGER,
+    lines INTEGER,
+    statements INTEGER
+);
+CREATE TABLE IF NOT EXISTS imports (
+    id INTEGER PRIMARY KEY,
+    run_id INTEGER NOT NULL,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    module TEXT,
+    names TEXT,
+    alias TEXT,
+    is_from_import INTEGER NOT NULL,
+    level INTEGER,
+    lineno INTEGER
+);
+CREATE TABLE IF NOT EXISTS dependency_edges (
+    run_id INTEGER NOT NULL,
+    source TEXT NOT NULL,
+    target TEXT NOT NULL,
+    PRIMARY KEY (run_id, source, target)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_files_run_path ON files(run_id, rel_path);
+CREATE INDEX IF NOT EXISTS idx_files_run_subsystem ON files(run_id, subsystem);
+CREATE INDEX IF NOT EXISTS idx_classes_run_name ON classes(run_id, name);
+CREATE INDEX IF NOT EXISTS idx_functions_file ON functions(file_id);
+CREATE INDEX IF NOT EXISTS idx_functions_run_name ON functions(run_id, name);
+CREATE INDEX IF NOT EXISTS idx_functions_run_flags ON functions(run_id, is_async, has_docstring);
+CREATE INDEX IF NOT EXISTS idx_imports_run_module ON imports(run_id, module);
+CREATE INDEX IF NOT EXISTS idx_edges_run_target ON dependency_edges(run_id, target);
+"""
+
+_NO_DOCSTRING = ("No docstring", None, "")
+
+# Files buffered before their rows are flushed to the open transaction
+INSERT_BATCH_SIZE = 5000
+
+
+def _like_prefix(prefix: str) -> str:
+    """LIKE pattern matching strings that start with ``prefix`` (use with ESCAPE '\\')."""
+    escaped = prefix.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return escaped + "%"
+
+
+class AnalysisStore:
+    """SQLite database of NEXUS analysis runs."""
+
+    def __init__(self, db_path: Union[str, Path]):
+        self.db_path = str(db_path)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute("PRAGMA foreign_keys = ON")
+        self.conn.executescript(SCHEMA)
+
+    def close(self) -> None:
+        self.conn.close()
+
+    def __enter__(self) -> "AnalysisStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    # --- Writing --- #
+
+    def write_records(
+        self, records: Iterable[Dict[str, Any]], project_root: Optional[Union[str, Path]] = None
+    ) -> Tuple[int, int]:
+        """Store one run from ``iter_workspace_analysis`` records.
+
+        Rows are buffered per table and bulk-inserted with ``executemany`` every
+        ``INSERT_BATCH_SIZE`` files; the whole run is committed in one
+        transaction (or not at all).
+
+        Returns:
+            Tuple[int, int]: (run_id, number of records consumed).
+        """
+        root_prefix = os.path.join(str(project_root), "") if project_root else ""
+        files: List[tuple] = []
+        classes: List[tuple] = []
+        functions: List[tuple] = []
+        imports: List[tuple] = []
+        edges: List[tuple] = []
+        metrics: Dict[str, Any] = {}
+        count = 0
+
+        with self.conn:
+            cursor = self.conn.execute(
+                "INSERT INTO runs (created_at, project_root) VALUES (?, ?)",
+                (time.time(), str(project_root) if project_root else None),
+            )
+            run_id = cursor.lastrowid
+            # Reserve file ids up front so child rows can reference them before insertion
+            next_file_id = (
+                self.conn.execute("SELECT COALESCE(MAX(id), 0) FROM files").fetchone()[0] + 1
+            )
+
+            for record in records:
+                count += 1
+                record_type = record.get("type")
+                if record_type == "file":
+                    path = record["path"]
+                    rel_path = path
+                    if root_prefix and path.startswith(root_prefix):
+                        rel_path = path[len(root_prefix) :]
+                    file_id = next_file_id
+                    next_file_id += 1
+                    row = [file_id, run_id, path, rel_path, subsystem_of(rel_path)]
+                    analysis = record.get("analysis")
+                    if "duplicate_of" in record:
+                        row += [None, None, record.get("content_hash"), None]
+                        row += [record["duplicate_of"], None]
+                    elif "error" in analysis:
+                        row += [None, None, None, None, None, str(analysis["error"])]
+                    else:
+                        row += [analysis["lines"], analysis["chars"], analysis.get("content_hash")]
+                        cognitive_load = analysis.get("complexity", {}).get("cognitive_load")
+                        row += [cognitive_load, None, None]
+                        self._collect_file_rows(
+                            run_id, file_id, analysis, classes, functions, imports
+                        )
+                    files.append(tuple(row))
+                    if len(files) >= INSERT_BATCH_SIZE:
+                        self._insert_rows(files, classes, functions, imports, edges)
+                elif record_type == "dependencies":
+                    source = record["path"]
+                    importers = record["entry"].get("imported_by", [])
+                    edges.extend((run_id, importer, source) for importer in importers)
+                elif record_type == "metrics":
+                    metrics = record["metrics"]
+
+            self._insert_rows(files, classes, functions, imports, edges)
+            self.conn.execute(
+                "UPDATE runs SET metrics = ? WHERE id = ?", (json.dumps(metrics), run_id)
+            )
+        return run_id, count
+
+    def _insert_rows(self, files, classes, functions, imports, edges) -> None:
+        """Bulk-insert and clear the buffered rows (inside the caller's transaction)."""
+        self.conn.executemany("INSERT INTO files VALUES (?,?,?,?,?,?,?,?,?,?,?)", files)
+        self.conn.executemany(
+            "INSERT INTO classes (run_id, file_id, name, inheritance, line, end_line,"
+            " has_docstring) VALUES (?,?,?,?,?,?,?)",
+            classes,
+        )
+        self.conn.executemany(
+            "INSERT INTO functions (run_id, file_id, class_name, name, qualified_name, params,"
+            " decorators, line, end_line, is_async, has_docstring, cognitive, cyclomatic,"
+            " lines, statements) VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)",
+            functions,
+        )
+        self.conn.executemany(
+            "INSERT INTO imports (run_id, file_id, module, names, alias, is_from_import,"
+            " level, lineno) VALUES (?,?,?,?,?,?,?,?)",
+            imports,
+        )
+        self.conn.executemany("INSERT OR IGNORE INTO dependency_edges VALUES (?,?,?)", edges)
+        for rows in (files, classes, functions, imports, edges):
+            rows.clear()
+
+    @staticmethod
+    def _collect_file_rows(run_id, file_id, analysis, classes, functions, imports) -> None:
+        def function_row(func, class_name):
+            complexity = func.get("complexity", {})
+            qualified = f"{class_name}.{func['name']}" if class_name else func["name"]
+            return (
+                run_id,
+                file_id,
+                class_name,
+                func["name"],
+                qualified,
+                json.dumps(list(func.get("params", []))),
+                json.dumps(list(func.get("decorators", []))),
+                func.get("line"),
+                func.get("end_line"),
+                1 if func.get("is_async") else 0,
+                0 if func.get("doc") in _NO_DOCSTRING else 1,
+                complexity.get("cognitive"),
+                complexity.get("cyclomatic"),
+                func.get("lines"),
+                func.get("statements"),
+            )
+
+        # Projected analyses (see NEXUSCore.analyze_code fields) may lack these
+        for func in analysis.get("functions", []):
+            functions.append(function_row(func, None))
+        for cls in analysis.get("classes", []):
+            classes.append(
+                (
+                    run_id,
+                    file_id,
+                    cls["name"],
+                    cls.get("inheritance"),
+                    cls.get("line"),
+                    cls.get("end_line"),
+                    0 if cls.get("doc") in _NO_DOCSTRING else 1,
+                )
+            )
+            for method in cls.get("methods", []):
+                functions.append(function_row(method, cls["name"]))
+        for imp in analysis.get("_raw_imports", []):
+            imports.append(
+                (
+                    run_id,
+                    file_id,
+                    imp.get("module"),
+                    json.dumps(list(imp.get("names") or [])),
+                    imp.get("alias"),
+                    1 if imp.get("is_from_import") or imp.get("names") else 0,
+                    imp.get("level", 0),
+                    imp.get("lineno"),
+                )
+            )
+
+    # --- Querying --- #
+
+    def latest_run_id(self) -> Optional[int]:
+        row = self.conn.execute("SELECT MAX(id) FROM runs").fetchone()
+        return row[0]
+
+    def runs(self) -> List[Dict[str, Any]]:
+        rows = self.conn.execute(
+            "SELECT id, created_at, project_root, metrics FROM runs ORDER BY id"
+        ).fetchall()
+        return [
+            {**dict(row), "metrics": json.loads(row["metrics"]) if row["metrics"] else {}}
+            for row in rows
+        ]
+
+    def query(self, sql: str, params: Sequence[Any] = ()) -> List[Dict[str, Any]]:
+        """Run a read-only SQL query and return rows as dicts.
+
+        The connection is switched to ``query_only`` for the query, so statements
+        that write (e.g. ``WITH ... DELETE``) are rejected by SQLite itself.
+
+        Raises:
+            ValueError: If the query is not a SELECT or tries to write.
+        """
+        if not sql.lstrip().lower().startswith(("select", "with")):
+            raise ValueError("Only SELECT queries are allowed on the analysis store.")
+        self.conn.execute("PRAGMA query_only = ON")
+        try:
+            return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+        except sqlite3.OperationalError as e:
+            if "readonly" in str(e):
+                raise ValueError("Only SELECT queries are allowed on the analysis store.") from e
+            raise
+        finally:
+            self.conn.execute("PRAGMA query_only = OFF")
+
+    def find_functions(
+        self,
+        run_id: Optional[int] = None,
+        subsystem: Optional[str] = None,
+        path_prefix: Optional[str] = None,
+        name: Optional[str] = None,
+        is_async: Optional[bool] = None,
+        has_docstring: Optional[bool] = None,
+        is_method: Optional[bool] = None,
+        min_cognitive: Optional[int] = None,
+        min_cyclomatic: Optional[int] = None,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """Functions and methods of a run (default: latest) matching every given filter."""
+        run_id = run_id if run_id is not None else self.latest_run_id()
+        clauses = ["f.run_id = ?"]
+        params: List[Any] = [run_id]
+        for clause, value in (
+            ("fi.subsystem = ?", subsystem),
+            ("f.name = ?", name),
+            ("f.cognitive >= ?", min_cognitive),
+            ("f.cyclomatic >= ?", min_cyclomatic),
+        ):
+            if value is not None:
+                clauses.append(clause)
+                params.append(value)
+        if path_prefix is not None:
+            clauses.append("fi.rel_path LIKE ? ESCAPE '\\'")
+            params.append(_like_prefix(path_prefix))
+        if is_async is not None:
+            clauses.append("f.is_async = ?")
+            params.append(int(is_async))
+        if has_docstring is not None:
+            clauses.append("f.has_docstring = ?")
+            params.append(int(has_docstring))
+        if is_method is not None:
+            clauses.append("f.class_name IS NOT NULL" if is_method else "f.class_name IS NULL")
+        sql = (
+            "SELECT fi.path, fi.rel_path, fi.subsystem, f.class_name, f.name, f.qualified_name,"
+            " f.line, f.end_line, f.is_async, f.has_docstring, f.cognitive, f.cyclomatic,"
+            " f.lines, f.statements FROM functions f JOIN files fi ON fi.id = f.file_id"
+            f" WHERE {' AND '.join(clauses)} ORDER BY fi.rel_path, f.line"
+        )
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return [dict(row) for row in self.conn.execute(sql, params).fetchall()]
+
+    def files_importing(self, module: str, run_id: Optional[int] = None) -> List[str]:
+        """Project-relative paths of files with an import of ``module`` (or a submodule)."""
+        run_id = run_id if run_id is not None else self.latest_run_id()
+        rows = self.conn.execute(
+            "SELECT DISTINCT fi.rel_path FROM imports i JOIN files fi ON fi.id = i.file_id"
+            " WHERE i.run_id = ? AND (i.module = ? OR i.module LIKE ? ESCAPE '\\')"
+            " ORDER BY fi.rel_path",
+            (run_id, module, _like_prefix(module + ".")),
+        ).fetchall()
+        return [row[0] for row in rows]
+
+    def dependency_edges(
+        self,
+        source: Optional[str] = None,
+        target: Optional[str] = None,
+        run_id: Optional[int] = None,
+    ) -> List[Tuple[str, str]]:
+        """(importer, imported) edges of a run, optionally filtered by either end."""
+        run_id = run_id if run_id is not None else self.latest_run_id()
+        clauses = ["run_id = ?"]
+        params: List[Any] = [run_id]
+        if source is not None:
+            clauses.append("source = ?")
+            params.append(source)
+        if target is not None:
+            clauses.append("target = ?")
+            params.append(target)
+        rows = self.conn.execute(
+            f"SELECT source, target FROM dependency_edges WHERE {' AND '.join(clauses)}"
+            " ORDER BY source, target",
+            params,
+        ).fetchall()
+        return [(row[0], row[1]) for row in rows]
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Suggestion Engine
+=======================================
+
+Rule-table-driven improvement suggestions over a columnar view of a
+workspace analysis.
+
+``AnalysisColumns`` flattens the nested per-file dicts once into parallel
+arrays (one row per file, per function/method and per class). Every entry
+of ``SUGGESTION_RULES`` is a threshold test over those columns, so adding a
+check means adding a row to the table rather than another nested loop.
+
+Version: 1.0.0
+"""
+
+import hashlib
+import json
+import os
+from array import array
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from .compact import CompactFileAnalysis
+
+SEVERITY_ORDER = ("high", "medium", "low")
+_SEVERITY_RANK = {severity: rank for rank, severity in enumerate(SEVERITY_ORDER)}
+
+FUNCTION = 0
+METHOD = 1
+
+
+@dataclass(frozen=True)
+class SuggestionRule:
+    """One declarative check.
+
+    A row of ``table`` produces a suggestion when any of ``columns`` exceeds
+    its threshold. Thresholds are read from the suggestion config by key,
+    falling back to the given default. ``message`` is formatted with the
+    row's values.
+    """
+
+    type: str
+    severity: str
+    table: str  # "files", "callables" or "classes"
+    columns: Tuple[Tuple[str, str, float], ...]  # (column, threshold key, default)
+    message: str
+    kind: Optional[int] = None  # Restrict callables to FUNCTION or METHOD
+
+
+SUGGESTION_RULES: Tuple[SuggestionRule, ...] = (
+    SuggestionRule(
+        type="complexity",
+        severity="high",
+        table="files",
+        columns=(("cognitive_load", "cognitive_load_threshold_high", 50),),
+        message=(
+            "High cognitive load ({cognitive_load:.1f}). "
+            "Consider breaking down into smaller functions."
+        ),
+    ),
+    SuggestionRule(
+        type="imports",
+        severity="medium",
+        table="files",
+        columns=(("import_count", "imports_threshold", 15),),
+        message=(
+            "High number of imports ({import_count}). "
+            "Consider modularizing or using composition."
+        ),
+    ),
+    SuggestionRule(
+        type="dependencies",
+        severity="medium",
+        table="files",
+        columns=(("imported_by_count", "imported_by_threshold", 10),),
+        message=(
+            "Module is imported by {imported_by_count} files. "
+            "Consider if it should be split into smaller, more focused modules."
+        ),
+    ),
+    SuggestionRule(
+        type="complexity",
+        severity="medium",
+        table="callables",
+        columns=(
+            ("cognitive", "function_cognitive_threshold", 15),
+            ("cyclomatic", "function_cyclomatic_threshold", 10),
+        ),
+        message=(
+            "{name} has cognitive complexity {cognitive} and cyclomatic complexity {cyclomatic}. "
+            "Consider extracting helper functions."
+        ),
+    ),
+    SuggestionRule(
+        type="length",
+        severity="low",
+        table="callables",
+        columns=(("lines", "function_lines_threshold", 60),),
+        message="{name} spans {lines} lines. Consider splitting it up.",
+    ),
+    SuggestionRule(
+        type="documentation",
+        severity="low",
+        table="callables",
+        columns=(("missing_doc", "", 0),),
+        message="Function {name} lacks a docstring.",
+        kind=FUNCTION,
+    ),
+    SuggestionRule(
+        type="documentation",
+        severity="low",
+        table="classes",
+        columns=(("missing_doc", "", 0),),
+        message="Class {name} lacks a docstring.",
+    ),
+    SuggestionRule(
+        type="documentation",
+        severity="low",
+        table="callables",
+        columns=(("missing_doc", "", 0),),
+        message="Method {name} lacks a docstring.",
+        kind=METHOD,
+    ),
+)
+
+
+def _missing_doc(doc: Optional[str]) -> int:
+    return 1 if doc in ("No docstring", None, "") else 0
+
+
+class AnalysisColumns:
+    """Columnar view of a workspace analysis: parallel arrays per table."""
+
+    def __init__(self):
+        # files table
+        self.paths: List[str] = []
+        self.cognitive_load = array("d")
+        self.import_count = array("i")
+        self.imported_by_count = array("i")
+        # callables table (functions and methods)
+        self.callable_file = array("i")
+        self.callable_kind = bytearray()
+        self.callable_name: List[str] = []
+        self.callable_line = array("i")
+        self.cognitive = array("i")
+        self.cyclomatic = array("i")
+        self.lines = array("i")
+        self.callable_missing_doc = bytearray()
+        # classes table
+        self.class_file = array("i")
+        self.class_name: List[str] = []
+        self.class_line = array("i")
+        self.class_missing_doc = bytearray()
+
+    @classmethod
+    def from_workspace_analysis(
+        cls, workspace_analysis: Dict[str, Any], project_root: Optional[str] = None
+    ) -> "AnalysisColumns":
+        """Flatten ``analyze_workspace`` output (dict or compact per-file analyses)."""
+        columns = cls()
+        dependencies = workspace_analysis.get("dependencies") or {}
+        root_prefix = os.path.join(str(project_root), "") if project_root else None
+
+        for file_path, analysis in workspace_analysis.get("files", {}).items():
+            if "error" in analysis:
+                continue
+            file_index = len(columns.paths)
+            columns.paths.append(file_path)
+
+            # Dependencies are keyed by project-relative path
+            entry = dependencies.get(file_path)
+            if entry is None and root_prefix and file_path.startswith(root_prefix):
+                entry = dependencies.get(file_path[len(root_prefix) :])
+            columns.imported_by_count.append(len(entry.get("imported_by", [])) if entry else 0)
+
+            if isinstance(analysis, CompactFileAnalysis):
+                columns._add_compact(file_index, analysis)
+                continue
+
+            columns.cognitive_load.append(analysis.get("complexity", {}).get("cognitive_load", 0))
+            raw_imports = analysis.get("_raw_imports")
+            if raw_imports is None:
+                raw_imports = analysis.get("imports", [])
+            columns.import_count.append(len(raw_imports))
+            for func in analysis.get("functions", []):
+                columns._add_callable(file_index, FUNCTION, func["name"], func)
+            for class_entry in analysis.get("classes", []):
+                columns.class_file.append(file_index)
+                columns.class_name.append(class_entry["name"])
+                columns.class_line.append(class_entry.get("line") or 0)
+                columns.class_missing_doc.append(_missing_doc(class_entry.get("doc")))
+                for method in class_entry.get("methods", []):
+                    columns._add_callable(
+                        file_index, METHOD, f"{class_entry['name']}.{method['name']}", method
+                    )
+        return columns
+
+    def _add_callable(self, file_index: int, kind: int, name: str, func: Dict[str, Any]) -> None:
+        complexity = func.get("complexity", {})
+        self.callable_file.append(file_index)
+        self.callable_kind.append(kind)
+        self.callable_name.append(name)
+        self.callable_line.append(func.get("line") or 0)
+        self.cognitive.append(complexity.get("cognitive", 0))
+        self.cyclomatic.append(complexity.get("cyclomatic", 1))
+        self.lines.append(func.get("lines", 0))
+        self.callable_missing_doc.append(_missing_doc(func.get("doc")))
+
+    def _add_compact(self, file_index: int, analysis: CompactFileAnalysis) -> None:
+        """Copy columns straight out of compact storage without building dicts."""
+        self.cognitive_load.append(analysis.cognitive_load)
+        self.import_count.append(len(analysis.imports))
+        table = analysis.functions
+        for i in range(analysis.function_count):
+            self._add_compact_callable(file_index, FUNCTION, table.names[i], table, i)
+        for record in analysis.classes:
+            self.class_file.append(file_index)
+            self.class_name.append(record.name)
+            self.class_line.append(record.line)
+            self.class_missing_doc.append(1 if record.doc_offset < 0 else 0)
+            for i in range(record.method_start, record.method_start + record.method_count):
+                self._add_compact_callable(
+                    file_index, METHOD, f"{record.name}.{table.names[i]}", table, i
+                )
+
+    def _add_compact_callable(self, file_index, kind, name, table, i) -> None:
+        self.callable_file.append(file_index)
+        self.callable_kind.append(kind)
+        self.callable_name.append(name)
+        self.callable_line.append(table.lines[i])
+        self.cognitive.append(table.cognitive[i])
+        self.cyclomatic.append(table.cyclomatic[i])
+        self.lines.append(table.end_lines[i] - table.lines[i] + 1)
+        self.callable_missing_doc.append(1 if table.doc_offsets[i] < 0 else 0)
+
+    def column(self, table: str, name: str):
+        if table == "files":
+            return getattr(self, name)
+        if table == "callables":
+            return self.callable_missing_doc if name == "missing_doc" else getattr(self, name)
+        return self.class_missing_doc  # classes only carry the docstring flag
+
+    def row_count(self, table: str) -> int:
+        if table == "files":
+            return len(self.paths)
+        if table == "callables":
+            return len(self.callable_name)
+        return len(self.class_name)
+
+    def row(self, table: str, index: int) -> Tuple[str, Optional[str], Optional[int], Dict]:
+        """(file, name, line, format values) for one row of a table."""
+        if table == "files":
+            values = {
+                "cognitive_load": self.cognitive_load[index],
+                "import_count": self.import_count[index],
+                "imported_by_count": self.imported_by_count[index],
+            }
+            return self.paths[index], None, None, values
+        if table == "callables":
+            name = self.callable_name[index]
+            values = {
+                "name": name,
+                "cognitive": self.cognitive[index],
+                "cyclomatic": self.cyclomatic[index],
+                "lines": self.lines[index],
+            }
+            return (
+                self.paths[self.callable_file[index]],
+                name,
+                self.callable_line[index],
+                values,
+            )
+        name = self.class_name[index]
+        return self.paths[self.class_file[index]], name, self.class_line[index], {"name": name}
+
+
+def _matching_rows(
+    columns: AnalysisColumns, rule: SuggestionRule, thresholds: Dict[str, Any]
+) -> Iterable[int]:
+    tests = [
+        (columns.column(rule.table, column), thresholds.get(key, default) if key else default)
+        for column, key, default in rule.columns
+    ]
+    if len(tests) == 1:
+        values, limit = tests[0]
+        hits = [i for i, value in enumerate(values) if value > limit]
+    else:
+        hits = [
+            i
+            for i in range(columns.row_count(rule.table))
+            if any(values[i] > limit for values, limit in tests)
+        ]
+    if rule.kind is not None:
+        kinds = columns.callable_kind
+        hits = [i for i in hits if kinds[i] == rule.kind]
+    return hits
+
+
+def evaluate_rules(
+    columns: AnalysisColumns,
+    thresholds: Dict[str, Any],
+    rules: Iterable[SuggestionRule] = SUGGESTION_RULES,
+) -> List[Dict[str, Any]]:
+    """Apply a rule table; returns suggestions sorted by severity, file and line."""
+    suggestions = []
+    for rule in rules:
+        for index in _matching_rows(columns, rule, thresholds):
+            file_path, name, line, values = columns.row(rule.table, index)
+            suggestion = {"type": rule.type, "file": file_path, "severity": rule.severity}
+            if rule.table == "callables":
+                suggestion["function"] = name
+                suggestion["line"] = line
+            elif rule.table == "classes":
+                suggestion["class"] = name
+                suggestion["line"] = line
+            suggestion["message"] = rule.message.format(**values)
+            suggestions.append(suggestion)
+    unknown_rank = len(SEVERITY_ORDER)
+    suggestions.sort(
+        key=lambda s: (
+            _SEVERITY_RANK.get(s["severity"], unknown_rank),
+            s["file"],
+            s.get("line") or 0,
+        )
+    )
+    return suggestions
+
+
+class SuggestionReport:
+    """Evaluated suggestions for one analysis, with grouping and paging."""
+
+    def __init__(self, fingerprint: str, suggestions: List[Dict[str, Any]]):
+        self.fingerprint = fingerprint
+        self.suggestions = suggestions  # Sorted by severity
+        self.counts = {severity: 0 for severity in SEVERITY_ORDER}
+        for suggestion in suggestions:
+            self.counts[suggestion["severity"]] = self.counts.get(suggestion["severity"], 0) + 1
+
+    def __len__(self) -> int:
+        return len(self.suggestions)
+
+    def filtered(
+        self, severity: Optional[str] = None, type: Optional[str] = None
+    ) -> List[Dict[str, Any]]:
+        if severity is None and type is None:
+            return self.suggestions
+        return [
+            s
+            for s in self.suggestions
+            if (severity is None or s["severity"] == severity)
+            and (type is None or s["type"] == type)
+        ]
+
+    def top(self, n: int) -> List[Dict[str, Any]]:
+        """The ``n`` most severe suggestions."""
+        return self.suggestions[:n]
+
+    def page(
+        self,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        severity: Optional[str] = None,
+        type: Optional[str] = None,
+        group_by_severity: bool = False,
+    ) -> Dict[str, Any]:
+        """One page of (optionally filtered) suggestions plus totals."""
+        selected = self.filtered(severity, type)
+        end = len(selected) if limit is None else offset + limit
+        items = selected[offset:end]
+        result = {
+            "fingerprint": self.fingerprint,
+            "total": len(selected),
+            "counts": dict(self.counts),
+            "offset": offset,
+            "limit": limit,
+        }
+        if group_by_severity:
+            groups = {severity_name: [] for severity_name in SEVERITY_ORDER}
+            for item in items:
+                groups.setdefault(item["severity"], []).append(item)
+            result["groups"] = groups
+        else:
+            result["suggestions"] = items
+        return result
+
+
+def analysis_fingerprint(workspace_analysis: Dict[str, Any], thresholds: Dict[str, Any]) -> str:
+    """Stable key for a workspace analysis and the thresholds it is judged by.
+
+    Files carrying a 'content_hash' contribute only that hash and the names of
+    their analysis keys, which differ between field projections of the same
+    content; others are serialized in full. Dependency fan-in is part of the
+    key as well.
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps(thresholds, sort_keys=True, default=str).encode())
+    for file_path, analysis in sorted(workspace_analysis.get("files", {}).items()):
+        digest.update(file_path.encode())
+        content_hash = analysis.get("content_hash") if "error" not in analysis else None
+        if content_hash:
+            digest.update(content_hash.encode())
+            digest.update(",".join(sorted(analysis)).encode())
+        else:
+            digest.update(json.dumps(dict(analysis), sort_keys=True, default=str).encode())
+    for file_path, entry in sorted((workspace_analysis.get("dependencies") or {}).items()):
+        digest.update(f"{file_path}:{len(entry.get('imported_by', []))}".encode())
+    return digest.hexdigest()
@@ -0,0 +1,198 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Workspace Watcher
+=======================================
+
+Monitors a project root for Python file changes and delivers debounced
+batches of changed paths to an async callback.
+
+Uses ``watchdog`` (inotify on Linux) when it is installed and falls back to
+mtime/size polling otherwise.
+
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional, Set, Tuple
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+
+    WATCHDOG_AVAILABLE = True
+except ImportError:  # Optional dependency (see requirements.txt)
+    FileSystemEventHandler = object
+    Observer = None
+    WATCHDOG_AVAILABLE = False
+
+DEFAULT_IGNORED_DIRS = (".venv", "__pycache__", ".git", "node_modules")
+
+ChangeCallback = Callable[[Set[str]], Awaitable[None]]
+
+
+class _ChangeHandler(FileSystemEventHandler):
+    """Forwards watchdog events for .py files into the watcher's event loop."""
+
+    def __init__(self, watcher: "WorkspaceWatcher"):
+        super().__init__()
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.is_directory:
+            return
+        paths = {event.src_path, getattr(event, "dest_path", "") or ""}
+        changed = {p for p in paths if p and self.watcher.is_watched(p)}
+        if changed:
+            self.watcher.loop.call_soon_threadsafe(self.watcher.add_changes, changed)
+
+
+class WorkspaceWatcher:
+    """Debounced change detection for the Python files under a project root."""
+
+    def __init__(
+        self,
+        root: Path,
+        callback: ChangeCallback,
+        logger: logging.Logger,
+        debounce_seconds: float = 0.5,
+        poll_interval: float = 1.0,
+        backend: str = "auto",
+        ignored_dirs: Iterable[str] = DEFAULT_IGNORED_DIRS,
+    ):
+        """Initialize the watcher.
+
+        Args:
+            root: Directory to monitor recursively.
+            callback: Coroutine called with the set of changed absolute paths
+                      once no new change has arrived for ``debounce_seconds``.
+            logger: Logger instance.
+            debounce_seconds: Quiet period that closes a batch of changes.
+            poll_interval: Seconds between scans when polling.
+            backend: 'auto', 'watchdog' or 'poll'. 'auto' picks watchdog if installed.
+            ignored_dirs: Directory names that are never descended into.
+        """
+        self.root = Path(root)
+        self.callback = callback
+        self.logger = logger
+        self.debounce_seconds = debounce_seconds
+        self.poll_interval = poll_interval
+        self.ignored_dirs = set(ignored_dirs)
+        if backend == "auto":
+            backend = "watchdog" if WATCHDOG_AVAILABLE else "poll"
+        elif backend == "watchdog" and not WATCHDOG_AVAILABLE:
+            self.logger.warning("watchdog not installed; falling back to mtime polling.")
+            backend = "poll"
+        self.backend = backend
+
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.running = False
+        self._pending: Set[str] = set()
+        self._changed = asyncio.Event()
+        self._snapshot: Dict[str, Tuple[int, int]] = {}
+        self._observer = None
+        self._tasks = []
+
+    def is_watched(self, path: str) -> bool:
+        """True for .py files outside ignored directories."""
+        if not path.endswith(".py"):
+            return False
+        return not any(part in self.ignored_dirs for part in Path(path).parts)
+
+    def add_changes(self, paths: Iterable[str]) -> None:
+        """Queue changed paths for the next debounced batch (event-loop thread only)."""
+        self._pending.update(paths)
+        self._changed.set()
+
+    async def start(self) -> None:
+        """Begin monitoring. Returns once the backend is active."""
+        if self.running:
+            return
+        self.loop = asyncio.get_running_loop()
+        self._changed = asyncio.Event()
+        self.running = True
+
+        if self.backend == "watchdog":
+            self._observer = Observer()
+            self._observer.schedule(_ChangeHandler(self), str(self.root), recursive=True)
+            self._observer.start()
+        else:
+            self._snapshot = await self.loop.run_in_executor(None, self._scan)
+            self._tasks.append(asyncio.create_task(self._poll_loop()))
+        self._tasks.append(asyncio.create_task(self._debounce_loop()))
+        self.logger.info(f"Watching {self.root} for changes (backend: {self.backend})")
+
+    async def stop(self) -> None:
+        """Stop monitoring and drop any pending, undelivered changes."""
+        if not self.running:
+            return
+        self.running = False
+        if self._observer is not None:
+            self._observer.stop()
+            await self.loop.run_in_executor(None, self._observer.join)
+            self._observer = None
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._pending.clear()
+        self.logger.info(f"Stopped watching {self.root}")
+
+    # --- Polling backend --- #
+
+    def _scan(self) -> Dict[str, Tuple[int, int]]:
+        """Stat every watched file once; returns path -> (mtime_ns, size)."""
+        snapshot = {}
+        stack = [str(self.root)]
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name not in self.ignored_dirs:
+                                stack.append(entry.path)
+                        elif entry.name.endswith(".py"):
+                            try:
+                                stat = entry.stat()
+                            except OSError:
+                                continue
+                            snapshot[entry.path] = (stat.st_mtime_ns, stat.st_size)
+            except OSError:
+                continue
+        return snapshot
+
+    async def _poll_loop(self) -> None:
+        while self.running:
+            await asyncio.sleep(self.poll_interval)
+            current = await self.loop.run_in_executor(None, self._scan)
+            previous = self._snapshot
+            changed = {p for p, sig in current.items() if previous.get(p) != sig}
+            changed.update(p for p in previous if p not in current)
+            self._snapshot = current
+            if changed:
+                self.add_changes(changed)
+
+    # --- Debouncing --- #
+
+    async def _debounce_loop(self) -> None:
+        while self.running:
+            await self._changed.wait()
+            # Wait for a quiet period so bursts (e.g. a branch switch) become one batch
+            while True:
+                self._changed.clear()
+                try:
+                    await asyncio.wait_for(self._changed.wait(), timeout=self.debounce_seconds)
+                except asyncio.TimeoutError:
+                    break
+            batch, self._pending = self._pending, set()
+            if not batch:
+                continue
+            try:
+                await self.callback(batch)
+            except Exception as e:
+                self.logger.error(f"Error processing change batch: {e}", exc_info=True)
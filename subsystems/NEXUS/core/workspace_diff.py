@@ -0,0 +1,268 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Workspace Diff
+====================================
+
+Structural diff between two ``analyze_workspace`` results.
+
+Every per-file analysis carries the ``content_hash`` of the file it was
+built from. Files whose hash did not change cost one comparison, and
+function-level work is proportional to the changed files. The
+``imported_by`` lists are compared only when files were added or removed or
+a changed file imports differently; an edit that keeps the imports costs
+nothing there. Cycles are recomputed only for the strongly connected
+components around changed edges, walking the files that import them.
+
+Version: 1.0.0
+"""
+
+from typing import Any, Dict, FrozenSet, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+ComplexityMap = Dict[str, Tuple[int, int]]
+
+
+def _functions(file_analysis: Mapping[str, Any]) -> Iterator[Tuple[str, Mapping[str, Any]]]:
+    """(qualified name, entry) for every function and method of one file."""
+    for func in file_analysis.get("functions") or []:
+        yield func["name"], func
+    for cls in file_analysis.get("classes") or []:
+        for method in cls.get("methods") or []:
+            yield f"{cls['name']}.{method['name']}", method
+
+
+def _complexity(file_analysis: Mapping[str, Any]) -> ComplexityMap:
+    """Qualified name -> (cognitive, cyclomatic) for one file."""
+    result = {}
+    for name, func in _functions(file_analysis):
+        complexity = func.get("complexity") or {}
+        result[name] = (complexity.get("cognitive", 0), complexity.get("cyclomatic", 1))
+    return result
+
+
+def _diff_file(
+    path: str, old: Mapping[str, Any], new: Mapping[str, Any]
+) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Function-level changes of one file whose content changed, and its grown functions."""
+    before = _complexity(old)
+    after = _complexity(new)
+    grown = []
+    for name in sorted(before.keys() & after.keys()):
+        if after[name][0] > before[name][0] or after[name][1] > before[name][1]:
+            grown.append(
+                {
+                    "file": path,
+                    "function": name,
+                    "before": {"cognitive": before[name][0], "cyclomatic": before[name][1]},
+                    "after": {"cognitive": after[name][0], "cyclomatic": after[name][1]},
+                }
+            )
+    entry = {
+        "path": path,
+        "lines_delta": new.get("lines", 0) - old.get("lines", 0),
+        "functions_added": sorted(after.keys() - before.keys()),
+        "functions_removed": sorted(before.keys() - after.keys()),
+    }
+    return entry, grown
+
+
+# Import lists of a dependency entry; edges only change if one of them does
+_IMPORT_KEYS = ("internal_imports", "external_imports", "unresolved_imports")
+
+
+def _dependency_key(path: str, dependencies: Mapping[str, Any]) -> Optional[str]:
+    """Key of ``path`` (an absolute file path) in a dependency map of relative paths."""
+    separator = "\\" if "\\" in path else "/"
+    parts = path.split(separator)
+    for start in range(len(parts)):
+        key = separator.join(parts[start:])
+        if key in dependencies:
+            return key
+    return None
+
+
+def _imports_changed(
+    paths: Iterable[str],
+    old_dependencies: Mapping[str, Mapping[str, Any]],
+    new_dependencies: Mapping[str, Mapping[str, Any]],
+) -> bool:
+    """Whether any of the changed files ``paths`` imports differently (True if unknown)."""
+    for path in paths:
+        key = _dependency_key(path, new_dependencies)
+        if key is None or key not in old_dependencies:
+            return True
+        old_entry, new_entry = old_dependencies[key], new_dependencies[key]
+        if any(old_entry.get(name) != new_entry.get(name) for name in _IMPORT_KEYS):
+            return True
+    return False
+
+
+def _changed_edges(
+    old_dependencies: Mapping[str, Mapping[str, Any]],
+    new_dependencies: Mapping[str, Mapping[str, Any]],
+) -> Tuple[Set[Tuple[str, str]], Set[Tuple[str, str]]]:
+    """Added and removed (importer, imported) edges, from entries whose importers changed."""
+    added: Set[Tuple[str, str]] = set()
+    removed: Set[Tuple[str, str]] = set()
+    for path in old_dependencies.keys() | new_dependencies.keys():
+        old_importers = (old_dependencies.get(path) or {}).get("imported_by") or []
+        new_importers = (new_dependencies.get(path) or {}).get("imported_by") or []
+        if old_importers == new_importers:
+            continue
+        old_set, new_set = set(old_importers), set(new_importers)
+        added.update((importer, path) for importer in new_set - old_set)
+        removed.update((importer, path) for importer in old_set - new_set)
+    return added, removed
+
+
+def _importers(dependencies: Mapping[str, Mapping[str, Any]], path: str) -> List[str]:
+    return (dependencies.get(path) or {}).get("imported_by") or []
+
+
+def _component(dependencies: Mapping[str, Mapping[str, Any]], path: str) -> FrozenSet[str]:
+    """The strongly connected component of ``path``.
+
+    Only ``imported_by`` lists are read: the files that (transitively) import
+    ``path`` are collected first, and the component is the part of them that
+    ``path`` itself reaches. Files outside that import closure are never visited.
+    """
+    upstream = {path}
+    stack = [path]
+    while stack:
+        for importer in _importers(dependencies, stack.pop()):
+            if importer not in upstream:
+                upstream.add(importer)
+                stack.append(importer)
+    targets: Dict[str, List[str]] = {}
+    for target in upstream:
+        for importer in _importers(dependencies, target):
+            if importer in upstream:
+                targets.setdefault(importer, []).append(target)
+    component = {path}
+    stack = [path]
+    while stack:
+        for target in targets.get(stack.pop(), ()):
+            if target not in component:
+                component.add(target)
+                stack.append(target)
+    return frozenset(component)
+
+
+def _components(
+    dependencies: Mapping[str, Mapping[str, Any]], paths: Iterable[str]
+) -> Set[FrozenSet[str]]:
+    """The strongly connected components containing ``paths``."""
+    components: Set[FrozenSet[str]] = set()
+    covered: Set[str] = set()
+    for path in paths:
+        if path not in covered:
+            component = _component(dependencies, path)
+            components.add(component)
+            covered.update(component)
+    return components
+
+
+def _cycles(
+    dependencies: Mapping[str, Mapping[str, Any]], components: Iterable[FrozenSet[str]]
+) -> Set[Tuple[str, ...]]:
+    """Components that are import cycles (see ``DependencyGraph.find_cycles``)."""
+    cycles = set()
+    for component in components:
+        path = next(iter(component))
+        if len(component) > 1 or path in _importers(dependencies, path):
+            cycles.add(tuple(sorted(component)))
+    return cycles
+
+
+def _cycle_changes(
+    old_dependencies: Mapping[str, Mapping[str, Any]],
+    new_dependencies: Mapping[str, Mapping[str, Any]],
+    changed_edges: Iterable[Tuple[str, str]],
+) -> Tuple[Set[Tuple[str, ...]], Set[Tuple[str, ...]]]:
+    """New and resolved cycles, recomputed only around the changed edges.
+
+    A component that differs between the runs contains an endpoint of a changed
+    edge or shares a file with a component that does, in one run or the other;
+    the components of those files are compared and the rest of the graph is not.
+    """
+    endpoints = {path for edge in changed_edges for path in edge}
+    affected = set(endpoints)
+    for dependencies in (old_dependencies, new_dependencies):
+        for component in _components(dependencies, endpoints):
+            affected.update(component)
+    old_cycles = _cycles(old_dependencies, _components(old_dependencies, affected))
+    new_cycles = _cycles(new_dependencies, _components(new_dependencies, affected))
+    return new_cycles - old_cycles, old_cycles - new_cycles
+
+
+def diff_workspace_analyses(old: Mapping[str, Any], new: Mapping[str, Any]) -> Dict[str, Any]:
+    """Compare two ``analyze_workspace`` results.
+
+    Args:
+        old: The earlier analysis.
+        new: The later analysis.
+
+    Returns:
+        Dict[str, Any]: 'files' ('added', 'removed', 'changed' paths),
+                        'unchanged_files' count, 'changed' (per changed file:
+                        'lines_delta', 'functions_added', 'functions_removed'),
+                        'complexity_increased' (functions whose cognitive or
+                        cyclomatic complexity grew), 'dependencies' ('added' and
+                        'removed' [importer, imported] edges), 'new_cycles' and
+                        'resolved_cycles'.
+    """
+    old_files: Mapping[str, Any] = old.get("files") or {}
+    new_files: Mapping[str, Any] = new.get("files") or {}
+
+    added = sorted(new_files.keys() - old_files.keys())
+    removed = sorted(old_files.keys() - new_files.keys())
+    changed: List[Dict[str, Any]] = []
+    # Functions of added files have no earlier complexity to compare against
+    complexity_increased: List[Dict[str, Any]] = []
+    unchanged = 0
+    for path in old_files.keys() & new_files.keys():
+        old_file, new_file = old_files[path], new_files[path]
+        old_hash: Optional[str] = old_file.get("content_hash")
+        if old_file is new_file or (old_hash and old_hash == new_file.get("content_hash")):
+            unchanged += 1
+            continue
+        entry, grown = _diff_file(path, old_file, new_file)
+        changed.append(entry)
+        complexity_increased.extend(grown)
+    changed.sort(key=lambda entry: entry["path"])
+    complexity_increased.sort(key=lambda grown: (grown["file"], grown["function"]))
+
+    old_dependencies = old.get("dependencies") or {}
+    new_dependencies = new.get("dependencies") or {}
+    edges_added: Set[Tuple[str, str]] = set()
+    edges_removed: Set[Tuple[str, str]] = set()
+    # Import resolution depends on the set of files, so added or removed files
+    # may change edges of unchanged importers
+    if added or removed or old_dependencies.keys() != new_dependencies.keys():
+        edges_added, edges_removed = _changed_edges(old_dependencies, new_dependencies)
+    elif old_dependencies is not new_dependencies and _imports_changed(
+        (entry["path"] for entry in changed), old_dependencies, new_dependencies
+    ):
+        edges_added, edges_removed = _changed_edges(old_dependencies, new_dependencies)
+    new_cycles: List[List[str]] = []
+    resolved_cycles: List[List[str]] = []
+    if edges_added or edges_removed:
+        appeared, disappeared = _cycle_changes(
+            old_dependencies, new_dependencies, edges_added | edges_removed
+        )
+        new_cycles = sorted(list(c) for c in appeared)
+        resolved_cycles = sorted(list(c) for c in disappeared)
+
+    return {
+        "files": {"added": added, "removed": removed, "changed": [e["path"] for e in changed]},
+        "unchanged_files": unchanged,
+        "changed": changed,
+        "complexity_increased": complexity_increased,
+        "dependencies": {
+            "added": sorted([list(edge) for edge in edges_added]),
+            "removed": sorted([list(edge) for edge in edges_removed]),
+        },
+        "new_cycles": new_cycles,
+        "resolved_cycles": resolved_cycles,
+    }
@@ -13,8 +13,11 @@ Version: 1.0.0
 
 import asyncio
 import logging
+import threading
+import uuid
+from collections import OrderedDict
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Callable, Dict, Optional, Set
 
 # Import Koios Logger utility
 from subsystems.KOIOS.core.logging import get_koios_logger
@@ -23,7 +26,9 @@ from subsystems.KOIOS.core.logging import get_koios_logger
 from subsystems.MYCELIUM.core.interface import MyceliumInterface
 
 # Import core component
+from .core.jobs import AnalysisJob
 from .core.nexus_core import NEXUSCore
+from .core.watcher import WorkspaceWatcher
 
 # Configure logging for the service - Use Koios Logger
 # logger = logging.getLogger("nexus_service")
@@ -80,6 +85,19 @@ class NexusService:
             project_root=self.project_root,  # Pass project root to core
         )
         # -----------------------------
+        # Jobs, watch mode and request handlers share the core, whose dependency
+        # graph and caches are not thread-safe; see _call_core
+        self._core_lock = threading.Lock()
+
+        # Watch mode (see start_watch)
+        self.watcher: Optional[WorkspaceWatcher] = None
+
+        # Background analysis jobs (see handle_analyze_workspace_request)
+        jobs_config = self.config.get("jobs", {})
+        self.progress_interval = jobs_config.get("progress_interval", 0.5)
+        self.max_finished_jobs = jobs_config.get("max_finished_jobs", 20)
+        self.jobs: "OrderedDict[str, AnalysisJob]" = OrderedDict()
+        self._job_tasks: Dict[str, asyncio.Task] = {}
 
         self.logger.info("NEXUS Service initialized with KoiosLogger.")
 
@@ -102,6 +120,12 @@ class NexusService:
                 f"request.{self.node_id}.suggest_improvements",
                 self.handle_suggest_improvements_request,
             )
+            await self.interface.subscribe(
+                f"request.{self.node_id}.job_status", self.handle_job_status_request
+            )
+            await self.interface.subscribe(
+                f"request.{self.node_id}.cancel_job", self.handle_cancel_job_request
+            )
             # Add other subscriptions as needed
             self.logger.info("Subscribed to Mycelium request topics.")  # Use self.logger
         except Exception as e:
@@ -113,6 +137,9 @@ class NexusService:
         self.running = True
         self.logger.info("NEXUS Service started successfully.")  # Use self.logger
 
+        if self.config.get("watch", {}).get("enabled", False):
+            await self.start_watch()
+
     async def stop(self):
         """Stop the NEXUS service."""
         if not self.running:
@@ -120,12 +147,73 @@ class NexusService:
             return
 
         self.logger.info("Stopping NEXUS Service...")  # Use self.logger
+        await self.stop_watch()
+        for job in self.jobs.values():
+            job.cancel()
+        if self._job_tasks:
+            await asyncio.gather(*self._job_tasks.values(), return_exceptions=True)
+        self.nexus_core.close()
         # Unsubscribe from topics if necessary
         # await self.interface.unsubscribe(...)
 
         self.running = False
         self.logger.info("NEXUS Service stopped.")  # Use self.logger
 
+    # --- Watch Mode --- #
+
+    async def start_watch(self):
+        """Monitor the project root and publish incremental analysis deltas.
+
+        Changed files are re-analyzed together with their direct dependents and
+        the result is published as ``event.nexus.analysis_delta``. If the
+        dependency graph is still empty, a baseline is built first.
+        """
+        if self.watcher is not None:
+            self.logger.warning("NEXUS watch mode is already active.")
+            return
+
+        if len(self.nexus_core.dependency_graph) == 0:
+            self.logger.info("Building baseline dependency graph for watch mode...")
+            python_files = await self._call_core(self.nexus_core.discover_python_files)
+            await self._call_core(self.nexus_core.analyze_dependencies, python_files)
+
+        watch_config = self.config.get("watch", {})
+        self.watcher = WorkspaceWatcher(
+            root=self.project_root,
+            callback=self._handle_file_changes,
+            logger=self.logger,
+            debounce_seconds=watch_config.get("debounce_seconds", 0.5),
+            poll_interval=watch_config.get("poll_interval", 1.0),
+            backend=watch_config.get("backend", "auto"),
+        )
+        await self.watcher.start()
+
+    async def stop_watch(self):
+        """Stop watch mode if it is active."""
+        if self.watcher is None:
+            return
+        await self.watcher.stop()
+        self.watcher = None
+
+    async def _handle_file_changes(self, changed_paths: Set[str]):
+        """Re-analyze a debounced batch of changed files and publish the delta."""
+        delta = await self._call_core(self.nexus_core.analyze_changed_files, sorted(changed_paths))
+        await self.interface.publish_event(topic="event.nexus.analysis_delta", payload=delta)
+        self.logger.info(f"Published analysis delta for {len(delta['files'])} changed files.")
+
+    async def _call_core(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run ``func`` in the default executor while holding the core lock.
+
+        Calls are serialized with each other and with the per-file steps of a running
+        workspace job, so they never mutate the core under it.
+        """
+
+        def locked() -> Any:
+            with self._core_lock:
+                return func(*args, **kwargs)
+
+        return await asyncio.get_running_loop().run_in_executor(None, locked)
+
     # --- Mycelium Request Handlers --- #
 
     async def handle_analyze_file_request(self, message: Dict[str, Any]):
@@ -146,7 +234,10 @@ class NexusService:
             # file_path = (self.project_root / file_path_str).resolve()
 
             # Execute the analysis
-            analysis_result = self.nexus_core.analyze_code(file_path_str)
+            # Optional projection, e.g. ["imports", "counts"]
+            analysis_result = await self._call_core(
+                self.nexus_core.analyze_code, file_path_str, fields=payload.get("fields")
+            )
 
             response_payload = {
                 "success": analysis_result is not None and "error" not in analysis_result,
@@ -171,26 +262,33 @@ class NexusService:
             )
 
     async def handle_analyze_workspace_request(self, message: Dict[str, Any]):
-        """Handles requests to analyze the entire workspace."""
+        """Handles requests to analyze the entire workspace.
+
+        The analysis runs as a background job. The reply is sent right away with
+        the job id; progress is published as ``event.nexus.job_progress`` and the
+        full result follows on the same response topic once the job finishes.
+        """
         request_id = message.get("id", "unknown")
         self.logger.info(f"Received analyze_workspace request: {request_id}")  # Use self.logger
         response_topic = f"response.{self.node_id}.{request_id}"
 
         try:
-            # Execute the analysis
-            analysis_result = self.nexus_core.analyze_workspace()
-
-            response_payload = {
-                "success": analysis_result is not None and "error" not in analysis_result,
-                "analysis": analysis_result or {},
-            }
+            job = AnalysisJob(uuid.uuid4().hex)
+            self.jobs[job.job_id] = job
+            self._prune_finished_jobs()
+            self._job_tasks[job.job_id] = asyncio.create_task(
+                self._run_workspace_job(job, response_topic)
+            )
 
             await self.interface.publish(
-                response_topic, {"type": "analyze_workspace_response", "payload": response_payload}
+                response_topic,
+                {
+                    "type": "analyze_workspace_accepted",
+                    "payload": {"success": True, "job_id": job.job_id, "status": job.status},
+                },
             )
             self.logger.info(
-                f"Processed analyze_workspace request {request_id}. "
-                f"Success: {response_payload['success']}"
+                f"Started analyze_workspace job {job.job_id} for request {request_id}."
             )
 
         except Exception as e:
@@ -201,8 +299,109 @@ class NexusService:
                 response_topic, {"type": "error", "payload": {"message": str(e)}}
             )
 
+    async def handle_job_status_request(self, message: Dict[str, Any]):
+        """Handles requests for a job's progress and, optionally, its (partial) results."""
+        request_id = message.get("id", "unknown")
+        response_topic = f"response.{self.node_id}.{request_id}"
+
+        try:
+            payload = message.get("payload", {})
+            job = self._get_job(payload.get("job_id"))
+            response_payload = {
+                "success": True,
+                **job.snapshot(include_results=payload.get("include_results", False)),
+            }
+            await self.interface.publish(
+                response_topic, {"type": "job_status_response", "payload": response_payload}
+            )
+
+        except Exception as e:
+            self.logger.error(f"Error handling job_status request {request_id}: {e}")
+            await self.interface.publish(
+                response_topic, {"type": "error", "payload": {"message": str(e)}}
+            )
+
+    async def handle_cancel_job_request(self, message: Dict[str, Any]):
+        """Handles requests to cancel a running job. Results collected so far are kept."""
+        request_id = message.get("id", "unknown")
+        response_topic = f"response.{self.node_id}.{request_id}"
+
+        try:
+            payload = message.get("payload", {})
+            job = self._get_job(payload.get("job_id"))
+            cancelled = job.cancel()
+            await self.interface.publish(
+                response_topic,
+                {
+                    "type": "cancel_job_response",
+                    "payload": {"success": cancelled, "job_id": job.job_id, "status": job.status},
+                },
+            )
+            self.logger.info(f"Cancel requested for job {job.job_id}. Accepted: {cancelled}")
+
+        except Exception as e:
+            self.logger.error(f"Error handling cancel_job request {request_id}: {e}")
+            await self.interface.publish(
+                response_topic, {"type": "error", "payload": {"message": str(e)}}
+            )
+
+    def _get_job(self, job_id: Optional[str]) -> AnalysisJob:
+        if not job_id:
+            raise ValueError("Missing 'job_id' in payload.")
+        job = self.jobs.get(job_id)
+        if job is None:
+            raise ValueError(f"Unknown job_id '{job_id}'.")
+        return job
+
+    def _prune_finished_jobs(self):
+        """Forget the oldest finished jobs beyond ``max_finished_jobs``."""
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[: max(len(finished) - self.max_finished_jobs, 0)]:
+            del self.jobs[job_id]
+
+    async def _run_workspace_job(self, job: AnalysisJob, response_topic: str):
+        """Run a job in the executor, publishing progress at most every ``progress_interval``."""
+        # The job takes the core lock per file, so other requests interleave with it
+        future = asyncio.get_running_loop().run_in_executor(
+            None, job.run, self.nexus_core, self._core_lock
+        )
+        last_reported = None
+        try:
+            while not future.done():
+                await asyncio.wait({future}, timeout=self.progress_interval)
+                progress = job.snapshot()
+                marker = (progress["files_done"], progress["phase"])
+                if not future.done() and marker != last_reported:
+                    last_reported = marker
+                    await self.interface.publish_event(
+                        topic="event.nexus.job_progress", payload=progress
+                    )
+            await future
+
+            final = job.snapshot(include_results=True)
+            await self.interface.publish_event(
+                topic="event.nexus.job_progress",
+                payload={k: v for k, v in final.items() if k not in ("analysis", "partial")},
+            )
+            await self.interface.publish(
+                response_topic,
+                {
+                    "type": "analyze_workspace_response",
+                    "payload": {"success": job.status == "completed", **final},
+                },
+            )
+            self.logger.info(f"Workspace analysis job {job.job_id} finished: {job.status}")
+        except Exception as e:
+            self.logger.error(f"Error running workspace job {job.job_id}: {e}", exc_info=True)
+        finally:
+            self._job_tasks.pop(job.job_id, None)
+
     async def handle_suggest_improvements_request(self, message: Dict[str, Any]):
-        """Handles requests to suggest improvements based on analysis data."""
+        """Handles requests to suggest improvements based on analysis data.
+
+        Optional payload keys 'offset', 'limit', 'top', 'severity', 'type' and
+        'group_by_severity' select a page of the severity-sorted suggestions.
+        """
         request_id = message.get("id", "unknown")
         self.logger.info(f"Received suggest_improvements request: {request_id}")  # Use self.logger
         response_topic = f"response.{self.node_id}.{request_id}"
@@ -214,10 +413,17 @@ class NexusService:
             if not analysis_data or not isinstance(analysis_data, dict):
                 raise ValueError("Missing or invalid 'analysis_data' in payload.")
 
-            # Execute the suggestion generation
-            suggestions = self.nexus_core.suggest_improvements(analysis_data)
+            # Execute the suggestion generation (cached by analysis fingerprint)
+            query = {
+                key: payload[key]
+                for key in ("offset", "limit", "top", "severity", "type", "group_by_severity")
+                if key in payload
+            }
+            result = await self._call_core(
+                self.nexus_core.query_suggestions, analysis_data, **query
+            )
 
-            response_payload = {"success": True, "suggestions": suggestions}
+            response_payload = {"success": True, **result}
 
             await self.interface.publish(
                 response_topic,
@@ -225,7 +431,7 @@ class NexusService:
             )
             self.logger.info(
                 f"Processed suggest_improvements request {request_id}. "
-                f"Found {len(suggestions)} suggestions."
+                f"Found {result['total']} suggestions."
             )
 
         except Exception as e:
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS AST Visitor Tests
+======================================
+
+Test suite for the per-function complexity metrics of the CodeVisitor.
+
+Version: 1.0.0
+"""
+
+import ast
+import logging
+
+import pytest
+
+from subsystems.NEXUS.core.ast_visitor import visit_source
+
+SOURCE = """
+def flat(a):
+    return a
+
+
+def nested(items, flag):
+    total = 0
+    for item in items:          # +1
+        if item and flag:       # +2 (nesting 1), +1 for 'and'
+            total += 1
+        elif item is None:      # +3 (elif is scored as an if nested in the if)
+            continue            # +1
+    try:                        # +1
+        return [x for x in items if x]
+    except ValueError:          # +2 (handler is nested in the try)
+        return total if flag else 0
+
+
+class Widget:
+    def render(self):
+        if self:                # +1
+            def inner():
+                while True:     # +1 for inner only
+                    break       # +1 for inner only
+            return inner
+"""
+
+
+@pytest.fixture
+def visitor():
+    return visit_source(SOURCE, logging.getLogger("TestVisitor"))
+
+
+def test_per_function_cognitive_complexity(visitor):
+    """Cognitive complexity is nesting-aware and relative to each function body."""
+    functions = {f.name: f for f in visitor.functions}
+    assert functions["flat"].complexity == 0
+    assert functions["nested"].complexity == 11
+
+    render = visitor.classes[0].methods[0]
+    assert render.name == "render"
+    assert render.complexity == 1
+    inner = next(f for f in visitor.classes[0].methods if f.name == "inner")
+    assert inner.complexity == 2
+
+
+def test_per_function_cyclomatic_complexity(visitor):
+    """Cyclomatic complexity counts decision points in the same pass."""
+    functions = {f.name: f for f in visitor.functions}
+    assert functions["flat"].cyclomatic_complexity == 1
+    # 1 + for, if, and, elif, except, comprehension (loop + filter), conditional expression
+    assert functions["nested"].cyclomatic_complexity == 9
+
+
+def test_line_and_statement_counts(visitor):
+    """Line spans and statement counts are recorded per function."""
+    functions = {f.name: f for f in visitor.functions}
+    assert functions["flat"].line_count == 2
+    assert functions["flat"].statement_count == 1
+    assert functions["nested"].line_count == 11
+    assert functions["nested"].statement_count == 9
+    # File-wide cognitive load is unchanged by per-function tracking
+    assert visitor.cognitive_load > sum(f.complexity for f in visitor.functions)
+
+
+def test_projection_skips_unrequested_fields(visitor, monkeypatch):
+    """Imports and counts only: no records, docstrings or per-function metrics."""
+
+    def fail(*args, **kwargs):
+        raise AssertionError("docstring extracted for a projection without docstrings")
+
+    monkeypatch.setattr(ast, "get_docstring", fail)
+    source = "import os\nfrom typing import List\n" + SOURCE
+    projected = visit_source(source, logging.getLogger("TestVisitor"), {"imports", "counts"})
+
+    assert [imp.module for imp in projected.imports] == ["os", "typing"]
+    assert projected.functions == [] and projected.classes == []
+    assert projected.function_count == len(visitor.functions) == 2
+    assert projected.class_count == 1
+    # File-level cognitive load does not depend on the projection
+    assert projected.cognitive_load == visitor.cognitive_load
+
+
+def test_projection_without_classes_keeps_methods_out_of_functions():
+    """Methods are not mistaken for functions when classes are not recorded."""
+    projected = visit_source(SOURCE, logging.getLogger("TestVisitor"), {"functions"})
+    assert [f.name for f in projected.functions] == ["flat", "nested"]
+    assert projected.functions[1].complexity == 0  # "complexity" was not requested
+    assert projected.functions[1].docstring is None
+
+
+def test_unknown_projection_field_is_rejected():
+    with pytest.raises(ValueError, match="Unknown analysis fields"):
+        visit_source(SOURCE, logging.getLogger("TestVisitor"), {"imports", "everything"})
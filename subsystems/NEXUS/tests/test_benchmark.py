@@ -0,0 +1,70 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Benchmark Tests
+=====================================
+
+Test suite for the NEXUS benchmark harness.
+
+Version: 1.0.0
+"""
+
+import json
+
+from subsystems.NEXUS.core.benchmark import (
+    PHASES,
+    compare_results,
+    generate_workspace,
+    main,
+    run_benchmark,
+)
+
+
+def test_generate_workspace_is_deterministic(tmp_path):
+    """The same parameters and seed produce byte-identical trees."""
+    params = generate_workspace(tmp_path / "a", files=12, packages=3, seed=7)
+    generate_workspace(tmp_path / "b", files=12, packages=3, seed=7)
+    a_files = sorted(p.relative_to(tmp_path / "a") for p in (tmp_path / "a").rglob("*.py"))
+    assert params["files"] == len(a_files) == 15
+    for rel in a_files:
+        assert (tmp_path / "a" / rel).read_text() == (tmp_path / "b" / rel).read_text()
+    compile((tmp_path / "a" / "pkg2" / "mod11.py").read_text(), "mod11.py", "exec")
+
+
+def test_run_benchmark_times_every_phase(tmp_path):
+    """Results carry per-phase timings, throughput and counts and are JSON-serializable."""
+    workspace = generate_workspace(tmp_path, files=20, functions_per_file=4, packages=2)
+    result = run_benchmark(tmp_path, repeat=2, workspace=workspace)
+
+    assert set(result["phases"]) == set(PHASES)
+    assert all(seconds >= 0 for seconds in result["phases"].values())
+    assert result["counts"]["files"] == 22
+    assert result["counts"]["dependency_edges"] > 0
+    assert result["counts"]["export_records"] > result["counts"]["files"]
+    assert result["files_per_second"] > 0
+    assert result["workspace"]["functions_per_file"] == 4
+    json.dumps(result)
+
+
+def test_compare_results_flags_regressions():
+    """Phases slower than the threshold are reported as regressions."""
+    baseline = {"phases": {phase: 1.0 for phase in PHASES}, "total_seconds": 5.0}
+    current = {"phases": dict(baseline["phases"], parse_visit=1.5), "total_seconds": 5.5}
+    comparison = compare_results(baseline, current, threshold=0.2)
+    assert comparison["ratios"]["parse_visit"] == 1.5
+    assert comparison["regressions"] == ["parse_visit"]
+
+
+def test_main_writes_json_and_fails_on_regression(tmp_path, capsys):
+    """The CLI stores results and exits non-zero when a baseline comparison regresses."""
+    output = tmp_path / "result.json"
+    args = ["--synthetic", "--files", "10", "--repeat", "1", "-o", str(output)]
+    assert main(args) == 0
+    result = json.loads(output.read_text())
+    assert result["workspace"]["synthetic"] is True
+
+    baseline = tmp_path / "baseline.json"
+    baseline.write_text(json.dumps(dict(result, phases={p: 1e-9 for p in PHASES})))
+    assert main(args + ["--compare", str(baseline)]) == 1
+    assert "Regressions:" in capsys.readouterr().out
@@ -0,0 +1,120 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Compact Analysis Tests
+===========================================
+
+Test suite for the compact, interned per-file analysis storage.
+
+Version: 1.0.0
+"""
+
+import json
+import logging
+
+import pytest
+
+from subsystems.NEXUS.core.ast_visitor import visit_source
+from subsystems.NEXUS.core.compact import CompactFileAnalysis
+
+SOURCE = '''
+import os
+from .models import User as U, Group
+
+
+def helper(a, b=1):
+    """Help out."""
+    return a
+
+
+@decorator
+async def fetch(session):
+    return None
+
+
+class Service(Base, Mixin):
+    """A service."""
+
+    def __init__(self):
+        pass
+
+    @property
+    def name(self):
+        """The name."""
+        return "svc"
+
+
+class Empty:
+    pass
+'''
+
+
+@pytest.fixture
+def logger():
+    return logging.getLogger("TestCompact")
+
+
+@pytest.fixture
+def compact(logger) -> CompactFileAnalysis:
+    visitor = visit_source(SOURCE, logger)
+    return CompactFileAnalysis.from_visitor(visitor, len(SOURCE.splitlines()), len(SOURCE), "abc")
+
+
+def test_dict_view_has_analyze_code_shape(compact):
+    """The Mapping view yields the dict structures NEXUSCore.analyze_code returns."""
+    assert list(compact) == [
+        "lines",
+        "chars",
+        "content_hash",
+        "complexity",
+        "_raw_imports",
+        "functions",
+        "classes",
+    ]
+    assert compact["content_hash"] == "abc"
+    assert compact["complexity"] == {"cognitive_load": compact.cognitive_load}
+    assert [imp["module"] for imp in compact["_raw_imports"]] == ["os", "models"]
+    assert compact["_raw_imports"][1]["names"] == ["User", "Group"]
+    assert compact["_raw_imports"][1]["level"] == 1
+    assert compact["functions"][1] == {
+        "name": "fetch",
+        "params": ["session"],
+        "doc": "No docstring",
+        "line": 12,
+        "end_line": 13,
+        "is_async": True,
+        "decorators": ["decorator"],
+        "complexity": {"cognitive": 0, "cyclomatic": 1},
+        "lines": 2,
+        "statements": 1,
+    }
+    service = compact["classes"][0]
+    assert service["inheritance"] == "Base, Mixin"
+    assert [m["name"] for m in service["methods"]] == ["__init__", "name"]
+    assert service["methods"][1]["decorators"] == ["property"]
+    assert json.loads(json.dumps(compact.to_dict())) == compact.to_dict()
+
+
+def test_counts_and_docstrings_read_compact_storage(compact):
+    """Counts and docstrings come straight from the arrays and shared buffer."""
+    assert compact.function_count == 2
+    assert compact.class_count == 2
+    assert len(compact.functions) == 4  # 2 functions + 2 methods
+    assert compact.docstring(0) == "Help out."
+    assert compact.docstring(1) is None
+    assert compact.class_docstring(0) == "A service."
+    assert compact.class_docstring(1) is None
+    assert compact["classes"][1]["doc"] == "No docstring"
+    assert compact.docs == "Help out.A service.The name."
+
+
+def test_names_and_parameter_tuples_are_shared(logger):
+    """Identifiers are interned so repeated names cost one string."""
+    first = CompactFileAnalysis.from_visitor(visit_source(SOURCE, logger), 0, 0)
+    second = CompactFileAnalysis.from_visitor(visit_source(SOURCE, logger), 0, 0)
+    assert first.functions.names[2] is second.functions.names[2]
+    assert first.functions.params[2] is second.functions.params[2]  # ("self",)
+    assert "content_hash" not in first
+    with pytest.raises(KeyError):
+        first["imports"]
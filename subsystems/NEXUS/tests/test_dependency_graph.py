@@ -0,0 +1,139 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Dependency Graph Tests
+===========================================
+
+Test suite for the incremental dependency graph store.
+
+Version: 1.0.0
+"""
+
+import pytest
+
+from subsystems.NEXUS.core.dependency_graph import DependencyGraph
+
+
+@pytest.fixture
+def graph() -> DependencyGraph:
+    # app -> service -> model, cli -> service, model -> util
+    g = DependencyGraph()
+    g.set_imports("app.py", ["service.py"])
+    g.set_imports("cli.py", ["service.py"])
+    g.set_imports("service.py", ["model.py"])
+    g.set_imports("model.py", ["util.py"])
+    return g
+
+
+def test_nodes_get_stable_integer_ids(graph):
+    """Files are interned to integer ids that survive updates."""
+    service_id = graph.node_id("service.py")
+    assert isinstance(service_id, int)
+    graph.set_imports("service.py", ["model.py", "util.py"])
+    assert graph.node_id("service.py") == service_id
+    assert graph.path(service_id) == "service.py"
+    assert len(graph) == 5
+
+
+def test_impact_set_and_transitive_dependencies(graph):
+    """Reverse and forward reachability are answered from the adjacency arrays."""
+    assert graph.impact_set("util.py") == {"model.py", "service.py", "app.py", "cli.py"}
+    assert graph.impact_set("app.py") == set()
+    assert graph.transitive_dependencies("app.py") == {"service.py", "model.py", "util.py"}
+    assert graph.importers_of("service.py") == {"app.py", "cli.py"}
+    assert graph.impact_set("missing.py") == set()
+
+
+def test_set_imports_applies_only_the_difference(graph):
+    """Per-file updates report added/removed edges and keep reverse edges in sync."""
+    edges_before = graph.edge_count
+    added, removed = graph.set_imports("service.py", ["util.py"])
+    assert added == {"util.py"}
+    assert removed == {"model.py"}
+    assert graph.edge_count == edges_before
+    assert "service.py" not in graph.importers_of("model.py")
+    assert graph.impact_set("model.py") == set()
+
+
+def test_remove_file_drops_edges_and_recycles_id(graph):
+    """Removing a file removes every edge touching it."""
+    removed_id = graph.node_id("service.py")
+    assert graph.remove_file("service.py")
+    assert "service.py" not in graph
+    assert graph.imports_of("app.py") == set()
+    assert graph.edge_count == 1  # model -> util
+    assert graph.add_file("new.py") == removed_id
+    assert not graph.remove_file("service.py")
+
+
+def test_remove_file_with_self_import_counts_edges_once():
+    """A self-import is removed as one edge, not two or zero."""
+    g = DependencyGraph()
+    g.set_imports("a.py", ["a.py", "b.py"])
+    g.set_imports("c.py", ["a.py"])
+    assert g.edge_count == 3
+    assert g.remove_file("a.py")
+    assert g.edge_count == 0
+    assert list(g.edges()) == []
+
+
+def test_find_cycles_uses_tarjan_scc(graph):
+    """Cycles and self-imports are reported; acyclic parts are not."""
+    assert graph.find_cycles() == []
+    graph.set_imports("util.py", ["service.py"])
+    graph.set_imports("app.py", ["app.py", "service.py"])
+    cycles = graph.find_cycles()
+    assert ["model.py", "service.py", "util.py"] in cycles
+    assert ["app.py"] in cycles
+    assert len(cycles) == 2
+
+
+def test_scc_handles_long_chains_without_recursion():
+    """Deep import chains do not hit the recursion limit."""
+    g = DependencyGraph()
+    for i in range(5000):
+        g.set_imports(f"m{i}.py", [f"m{i + 1}.py"])
+    g.set_imports("m5000.py", ["m0.py"])
+    cycles = g.find_cycles()
+    assert len(cycles) == 1
+    assert len(cycles[0]) == 5001
+    assert len(g.impact_set("m0.py")) == 5000
+
+
+def test_from_dependency_map_uses_imported_by():
+    """The graph can be rebuilt from an analyze_dependencies result."""
+    dependencies = {
+        "a.py": {"internal_imports": [], "imported_by": ["b.py"]},
+        "b.py": {"internal_imports": ["from .a import x"], "imported_by": []},
+    }
+    g = DependencyGraph.from_dependency_map(dependencies)
+    assert g.imports_of("b.py") == {"a.py"}
+    assert g.impact_set("a.py") == {"b.py"}
+
+
+def test_condensation_collapses_cycles_into_a_dag(graph):
+    """Each SCC becomes one node and DAG edges point dependencies-first."""
+    graph.set_imports("util.py", ["model.py"])  # model <-> util
+    components, component_of, dag = graph.condensation()
+    assert len(components) == 4
+    cycle = component_of[graph.node_id("model.py")]
+    assert component_of[graph.node_id("util.py")] == cycle
+    service = component_of[graph.node_id("service.py")]
+    assert dag[service] == {cycle}
+    assert all(target < index for index, targets in enumerate(dag) for target in targets)
+
+
+def test_topological_layers(graph):
+    """Files sit one layer above the highest layer they import."""
+    assert graph.topological_layers() == [
+        ["util.py"],
+        ["model.py"],
+        ["service.py"],
+        ["app.py", "cli.py"],
+    ]
+    graph.set_imports("util.py", ["service.py"])
+    assert graph.topological_layers() == [
+        ["model.py", "service.py", "util.py"],
+        ["app.py", "cli.py"],
+    ]
@@ -0,0 +1,116 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Layering Tests
+====================================
+
+Test suite for import cycle and layering rule analysis.
+
+Version: 1.0.0
+"""
+
+import time
+
+import pytest
+
+from subsystems.NEXUS.core.dependency_graph import DependencyGraph
+from subsystems.NEXUS.core.layering import (
+    LayeringRule,
+    analyze_structure,
+    find_violations,
+    rules_from_config,
+    subsystem_of,
+)
+
+KOIOS_LOGGER = "subsystems/KOIOS/logger.py"
+NEXUS_CORE = "subsystems/NEXUS/core/nexus_core.py"
+ATLAS_CORE = "subsystems/ATLAS/core/atlas_core.py"
+
+
+@pytest.fixture
+def graph() -> DependencyGraph:
+    g = DependencyGraph()
+    g.set_imports(NEXUS_CORE, [KOIOS_LOGGER])
+    g.set_imports(ATLAS_CORE, [KOIOS_LOGGER, NEXUS_CORE])
+    g.set_imports(KOIOS_LOGGER, [NEXUS_CORE])  # Forbidden back-edge, also a cycle
+    g.set_imports("scripts/run.py", [ATLAS_CORE])
+    return g
+
+
+def test_subsystem_of():
+    assert subsystem_of(NEXUS_CORE) == "NEXUS"
+    assert subsystem_of("subsystems\\ETHIK\\core\\x.py") == "ETHIK"
+    assert subsystem_of("scripts/run.py") is None
+
+
+def test_rules_from_config_expands_layers():
+    """Forbidden rules are kept and layers forbid imports from lower to higher."""
+    rules = rules_from_config(
+        {
+            "forbidden": [{"source": "KOIOS", "target": "NEXUS", "reason": "shared base"}],
+            "layers": ["KOIOS", "NEXUS", "ATLAS"],
+        }
+    )
+    assert rules[0] == LayeringRule("KOIOS", "NEXUS", "shared base")
+    assert {(r.source, r.target) for r in rules[1:]} == {
+        ("KOIOS", "NEXUS"),
+        ("KOIOS", "ATLAS"),
+        ("NEXUS", "ATLAS"),
+    }
+    assert rules_from_config({}) == []
+
+
+def test_find_violations_by_subsystem_and_glob(graph):
+    """Rules match subsystems by name and paths by glob."""
+    rules = [
+        LayeringRule("KOIOS", "NEXUS", "shared base"),
+        LayeringRule("scripts/*", "subsystems/ATLAS/*"),
+    ]
+    violations = find_violations(graph, rules)
+    assert violations == [
+        {
+            "source": "scripts/run.py",
+            "target": ATLAS_CORE,
+            "rule": "scripts/* must not import subsystems/ATLAS/*",
+            "reason": "",
+        },
+        {
+            "source": KOIOS_LOGGER,
+            "target": NEXUS_CORE,
+            "rule": "KOIOS must not import NEXUS",
+            "reason": "shared base",
+        },
+    ]
+    assert find_violations(graph, []) == []
+
+
+def test_analyze_structure_reports_cycles_dag_and_layers(graph):
+    """One pass yields cycles, the condensed DAG, layers and violations."""
+    structure = analyze_structure(graph, rules_from_config({"layers": ["KOIOS", "NEXUS"]}))
+    assert structure["files"] == 4
+    assert structure["edges"] == 5
+    assert structure["cycles"] == [[KOIOS_LOGGER, NEXUS_CORE]]
+    assert structure["condensed_dag"]["components"] == [
+        [KOIOS_LOGGER, NEXUS_CORE],
+        [ATLAS_CORE],
+        ["scripts/run.py"],
+    ]
+    assert structure["condensed_dag"]["edges"] == [[1, 0], [2, 1]]
+    assert structure["layers"] == [[KOIOS_LOGGER, NEXUS_CORE], [ATLAS_CORE], ["scripts/run.py"]]
+    assert [v["source"] for v in structure["violations"]] == [KOIOS_LOGGER]
+
+
+def test_large_graph_is_analyzed_in_linear_time():
+    """Fifty thousand files with a layered import fan-out stay well under a few seconds."""
+    g = DependencyGraph()
+    subsystems = ["KOIOS", "NEXUS", "ATLAS", "ETHIK", "CRONOS"]
+    for i in range(50000):
+        path = f"subsystems/{subsystems[i % 5]}/m{i}.py"
+        g.set_imports(path, [f"subsystems/{subsystems[j % 5]}/m{j}.py" for j in (i // 2, i // 3)])
+    start = time.perf_counter()
+    structure = analyze_structure(g, rules_from_config({"layers": subsystems}))
+    elapsed = time.perf_counter() - start
+    assert structure["files"] == 50000
+    assert structure["violations"]
+    assert elapsed < 5.0
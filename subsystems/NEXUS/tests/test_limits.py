@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS File Budget Tests
+=======================================
+
+Test suite for per-file size and time budgets.
+
+Version: 1.0.0
+"""
+
+import hashlib
+
+import pytest
+
+from subsystems.NEXUS.core import limits
+from subsystems.NEXUS.core.limits import (
+    FileBudget,
+    ParseTimeout,
+    ParseWorkerPool,
+    count_lines,
+    parse_import_line,
+    stream_file_summary,
+)
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [b"", b"x = 1", b"x = 1\n", b"a\r\nb\rc\n\n", b"\r\n\n", "s = '\xe9'\r\n".encode() * 3],
+)
+def test_stream_summary_matches_full_read(tmp_path, monkeypatch, raw):
+    """Streaming counts and hashes equal those of the fully read, normalized text."""
+    path = tmp_path / "f.py"
+    path.write_bytes(raw)
+    content = raw.decode("utf-8").replace("\r\n", "\n").replace("\r", "\n")
+    for chunk_size in (1, 2, 3, 1 << 16):
+        monkeypatch.setattr(limits, "STREAM_CHUNK_SIZE", chunk_size)
+        summary = stream_file_summary(str(path))
+        assert summary["lines"] == count_lines(content) == len(content.splitlines())
+        assert summary["chars"] == len(content)
+        assert summary["bytes"] == len(raw)
+        assert summary["content_hash"] == hashlib.blake2b(raw, digest_size=16).hexdigest()
+
+
+def test_stream_summary_scans_top_level_imports(tmp_path, monkeypatch):
+    """Imports are found line by line, also across chunk boundaries."""
+    monkeypatch.setattr(limits, "STREAM_CHUNK_SIZE", 7)
+    path = tmp_path / "generated.py"
+    path.write_text(
+        "import os, sys as system\nfrom ..pkg.mod import (a as b, c,\n    d)\n"
+        "DATA = [\n" + "    1,\n" * 1000 + "]\n    import nested\n"
+    )
+    imports = stream_file_summary(str(path))["_raw_imports"]
+    assert [(i["module"], i["alias"], i["level"], i["lineno"]) for i in imports] == [
+        ("os", None, 0, 1),
+        ("sys", "system", 0, 1),
+        ("pkg.mod", None, 2, 2),
+    ]
+    assert imports[2]["names"] == ["a", "c"]
+    assert imports[2]["is_from_import"] is True
+
+
+def test_parse_import_line_ignores_other_statements():
+    assert parse_import_line("important = 1", 1) == []
+    assert parse_import_line("from . import x  # comment", 3)[0]["names"] == ["x"]
+
+
+def test_budget_from_config():
+    budget = FileBudget.from_config({"max_file_bytes": 10, "oversize_policy": "skip"})
+    assert budget.exceeds_size(11) and not budget.exceeds_size(10)
+    assert budget.use_worker(budget.worker_min_bytes)
+    assert not FileBudget(parse_timeout=None).use_worker(10**9)
+    assert not FileBudget(max_file_bytes=None).exceeds_size(10**12)
+    with pytest.raises(ValueError):
+        FileBudget.from_config({"oversize_policy": "truncate"})
+
+
+def test_worker_pool_parses_and_enforces_timeout():
+    """Workers return visitor results; a parse over the budget kills the worker."""
+    pool = ParseWorkerPool()
+    try:
+        result = pool.run("import os\n\ndef f():\n    return os\n", None, False, timeout=60)
+        assert result["imports"][0]["module"] == "os"
+        assert result["functions"][0]["name"] == "f"
+        visitor = pool.run("class A:\n    pass\n", None, True, timeout=60)
+        assert visitor.classes[0].name == "A"
+
+        huge = "x = (" + " + ".join(["1"] * 200000) + ")\n"
+        with pytest.raises(ParseTimeout):
+            pool.run(huge, None, False, timeout=0.01)
+        # A fresh worker is started after a timeout
+        assert pool.run("y = 1\n", None, False, timeout=60)["imports"] == []
+    finally:
+        pool.close()
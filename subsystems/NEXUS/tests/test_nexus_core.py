@@ -10,6 +10,7 @@ Test suite for the NEXUS Core logic.
 Version: 1.0.0
 """
 
+import io
 import json
 import logging
 from pathlib import Path
@@ -18,6 +19,7 @@ from typing import Dict
 import pytest
 
 # Use absolute import now that project is installed editably
+from subsystems.NEXUS.core.limits import FileBudget
 from subsystems.NEXUS.core.nexus_core import NEXUSCore
 
 
@@ -318,3 +320,370 @@ def test_export_analysis_markdown(nexus, project_root):
 # - Files outside the main project structure (if analyze_dependencies is ever used that way)
 # - Handling of SyntaxErrors during parsing more gracefully in dependency analysis
 # - Test the known_external_modules heuristic more thoroughly
+
+
+def test_dependency_graph_populated_by_analysis(nexus, project_root):
+    """analyze_dependencies loads resolved internal edges into the graph store."""
+    nexus.analyze_workspace()
+
+    assert nexus.get_impact_set("src/module_a.py") == ["src/module_b.py", "tests/test_a.py"]
+    assert nexus.get_transitive_dependencies(str(project_root / "src" / "module_b.py")) == [
+        "src/module_a.py"
+    ]
+    assert nexus.find_import_cycles() == []
+
+
+def test_update_file_dependencies_applies_single_file_change(nexus, project_root):
+    """A single changed file is re-resolved without re-scanning the workspace."""
+    nexus.analyze_workspace()
+
+    # module_a now imports module_b, closing a cycle
+    module_a = project_root / "src" / "module_a.py"
+    module_a.write_text(module_a.read_text() + "\nfrom .module_b import B\n")
+    entry = nexus.update_file_dependencies(str(module_a))
+
+    assert any("from .module_b import B" in imp for imp in entry["internal_imports"])
+    assert nexus.find_import_cycles() == [["src/module_a.py", "src/module_b.py"]]
+    assert "src/module_a.py" in nexus.get_impact_set("src/module_b.py")
+
+    # Deleting a file removes it from the graph
+    (project_root / "tests" / "test_a.py").unlink()
+    assert nexus.update_file_dependencies("tests/test_a.py") is None
+    assert nexus.get_impact_set("src/module_a.py") == ["src/module_b.py"]
+
+
+def test_analyze_changed_files_returns_compact_delta(nexus, project_root):
+    """Watch-mode analysis touches only changed files and their direct dependents."""
+    nexus.analyze_workspace()
+
+    module_a = project_root / "src" / "module_a.py"
+    module_a.write_text(module_a.read_text() + "\ndef func_new():\n    pass\n")
+    (project_root / "src" / "module_c.py").write_text("from .module_b import B\n")
+
+    delta = nexus.analyze_changed_files([str(module_a), str(project_root / "src" / "module_c.py")])
+
+    assert delta["files"]["src/module_a.py"]["status"] == "modified"
+    assert "func_new" in delta["files"]["src/module_a.py"]["summary"]["functions"]
+    assert delta["files"]["src/module_c.py"]["status"] == "added"
+    # Direct dependents of module_a are re-resolved, unrelated files are not
+    assert set(delta["dependencies"]) == {
+        "src/module_a.py",
+        "src/module_c.py",
+        "src/module_b.py",
+        "tests/test_a.py",
+    }
+    assert delta["edges"]["added"] == [["src/module_c.py", "src/module_b.py"]]
+    assert delta["edges"]["removed"] == []
+
+    module_a.unlink()
+    delta = nexus.analyze_changed_files([str(module_a)])
+    assert delta["files"]["src/module_a.py"] == {"status": "removed", "summary": None}
+    assert ["src/module_b.py", "src/module_a.py"] in delta["edges"]["removed"]
+
+
+def test_iter_workspace_analysis_yields_aggregates_last(nexus, project_root):
+    """Per-file records are streamed first and workspace metrics come last."""
+    records = list(nexus.iter_workspace_analysis())
+
+    types = [r["type"] for r in records]
+    assert types.count("file") == 5
+    assert types.count("dependencies") == 5
+    assert types[-1] == "metrics"
+    assert types.index("dependencies") > max(i for i, t in enumerate(types) if t == "file")
+    assert records[-1]["metrics"] == nexus.analyze_workspace()["metrics"]
+
+
+def test_export_analysis_stream_ndjson(nexus, project_root, tmp_path):
+    """NDJSON export writes one record per line, ending with the aggregates."""
+    output = tmp_path / "analysis.ndjson"
+    written = nexus.export_analysis_stream(output, format="ndjson")
+
+    lines = output.read_text(encoding="utf-8").splitlines()
+    assert written == len(lines) == 11
+    records = [json.loads(line) for line in lines]
+    assert records[0]["type"] == "file"
+    assert records[-1]["type"] == "metrics"
+    assert records[-1]["metrics"]["total_files"] == 5
+
+
+def test_export_analysis_stream_markdown_to_text_stream(nexus, project_root):
+    """Markdown can be streamed to any text stream (file, socket.makefile, ...)."""
+    stream = io.StringIO()
+    nexus.export_analysis_stream(stream, format="md")
+    md_output = stream.getvalue()
+
+    assert md_output.startswith("# NEXUS Analysis Report")
+    assert md_output.index("## File Analysis") < md_output.index("## Dependencies")
+    assert md_output.index("## Dependencies") < md_output.index("## Overall Metrics")
+    assert nexus.export_analysis_stream(stream, format="xml") is None
+
+
+def test_workspace_analysis_dedupes_identical_files(nexus, project_root):
+    """Identical file contents are analyzed once and mapped back to every path."""
+    backup_dir = project_root / "backups" / "src"
+    backup_dir.mkdir(parents=True)
+    (backup_dir / "module_a.py").write_bytes((project_root / "src" / "module_a.py").read_bytes())
+
+    analyzed = []
+    original = nexus._build_analysis
+
+    def counting_analyze(file_path, content, content_hash, compact, fields):
+        analyzed.append(file_path)
+        return original(file_path, content, content_hash, compact, fields)
+
+    nexus._build_analysis = counting_analyze
+    workspace_analysis = nexus.analyze_workspace()
+
+    metrics = workspace_analysis["metrics"]
+    # src/__init__.py and tests/__init__.py are both empty, plus the backup copy
+    assert metrics["total_files"] == 6
+    assert metrics["unique_files"] == 4
+    assert metrics["duplicate_files"] == 2
+    assert len(analyzed) == 4
+
+    original_path = str(project_root / "src" / "module_a.py")
+    copy_path = str(backup_dir / "module_a.py")
+    files = workspace_analysis["files"]
+    assert files[copy_path] is files[original_path]
+    groups = [{canonical, *paths} for canonical, paths in workspace_analysis["duplicates"].items()]
+    assert {original_path, copy_path} in groups
+    # Per-path totals still count every path
+    assert metrics["total_classes"] == 3
+
+
+def test_iter_workspace_analysis_reports_progress(nexus, project_root):
+    """The progress callback sees every file and a final done == total call."""
+    calls = []
+    records = list(
+        nexus.iter_workspace_analysis(progress=lambda done, total: calls.append((done, total)))
+    )
+    assert records[-1]["type"] == "metrics"
+    assert calls == [(i, 5) for i in range(6)]
+
+
+def test_compact_analysis_matches_dict_analysis(nexus, project_root):
+    """compact=True yields the same data through the Mapping view."""
+    file_path = str(project_root / "src" / "module_a.py")
+    compact = nexus.analyze_code(file_path, compact=True)
+    assert compact.to_dict() == nexus.analyze_code(file_path)
+
+    workspace_analysis = nexus.analyze_workspace(compact=True)
+    assert workspace_analysis["metrics"] == nexus.analyze_workspace()["metrics"]
+    exported = json.loads(nexus.export_analysis(workspace_analysis, format="json"))
+    assert exported["files"][file_path]["classes"][0]["name"] == "ClassA"
+
+
+def test_suggest_improvements_flags_complex_functions(nexus, project_root):
+    """Per-function complexity from the visitor drives hotspot suggestions."""
+    branches = "".join(f"    if x == {i}:\n        return {i}\n" for i in range(12))
+    hot_file = project_root / "src" / "hot.py"
+    hot_file.write_text(f"def dispatch(x):\n{branches}    return None\n")
+
+    analysis = nexus.analyze_code(str(hot_file))
+    func = analysis["functions"][0]
+    assert func["complexity"] == {"cognitive": 12, "cyclomatic": 13}
+    assert func["lines"] == 26
+
+    suggestions = nexus.suggest_improvements({"files": {str(hot_file): analysis}})
+    hotspots = [s for s in suggestions if s["type"] == "complexity"]
+    assert len(hotspots) == 1
+    assert hotspots[0]["function"] == "dispatch"
+    assert hotspots[0]["line"] == 1
+
+
+def test_query_suggestions_pages_and_caches_by_fingerprint(nexus, project_root, monkeypatch):
+    """Paging through one analysis evaluates the rule table only once."""
+    import subsystems.NEXUS.core.nexus_core as nexus_core_module
+
+    nexus.config["analysis"]["suggestions"]["imports_threshold"] = 1
+    workspace_analysis = nexus.analyze_workspace()
+
+    calls = []
+    original = nexus_core_module.evaluate_rules
+    monkeypatch.setattr(
+        nexus_core_module,
+        "evaluate_rules",
+        lambda columns, thresholds: calls.append(1) or original(columns, thresholds),
+    )
+
+    everything = nexus.query_suggestions(workspace_analysis)
+    page = nexus.query_suggestions(workspace_analysis, offset=1, limit=2)
+    top = nexus.query_suggestions(workspace_analysis, top=1)
+
+    assert len(calls) == 1
+    assert page["fingerprint"] == everything["fingerprint"]
+    assert page["suggestions"] == everything["suggestions"][1:3]
+    assert top["suggestions"] == everything["suggestions"][:1]
+    assert any(s["type"] == "imports" for s in everything["suggestions"])
+    assert nexus.suggest_improvements(workspace_analysis) == everything["suggestions"]
+
+
+def test_export_to_sqlite_and_query(nexus, project_root, tmp_path):
+    """Workspace analyses can be stored in SQLite and queried without re-analysis."""
+    db_path = tmp_path / "nexus.db"
+    run_id = nexus.export_to_sqlite(db_path, nexus.analyze_workspace())
+    assert run_id == 1
+
+    functions = nexus.query_functions(db_path, path_prefix="src/")
+    assert {f["qualified_name"] for f in functions} == {"func_a", "B.run"}
+    assert nexus.query_functions(db_path, has_docstring=False, is_method=True)[0]["name"] == "run"
+    assert nexus.query_dependency_edges(db_path, source="src/module_b.py") == [
+        ("src/module_b.py", "src/module_a.py")
+    ]
+    counts = nexus.query_analysis_store(
+        db_path, "SELECT COUNT(*) AS n FROM files WHERE duplicate_of IS NOT NULL"
+    )
+    assert counts == [{"n": 1}]
+
+    # Streaming export appends a second run straight from the analysis records
+    assert nexus.export_analysis_stream(db_path, format="sqlite") > 0
+    assert nexus.query_functions(db_path, run_id=2, name="func_a")[0]["path"].endswith(
+        "module_a.py"
+    )
+
+
+def test_analyze_structure_checks_layering_and_caches(nexus, project_root):
+    """Layering rules from config are checked against the live dependency graph."""
+    nexus.config["analysis"]["layering"] = {
+        "forbidden": [{"source": "src/*", "target": "tests/*", "reason": "no test imports"}]
+    }
+    nexus.analyze_dependencies(nexus.discover_python_files())
+    structure = nexus.analyze_structure()
+
+    assert structure["cycles"] == []
+    assert structure["violations"] == []
+    assert structure["layers"][0] == sorted(structure["layers"][0])
+    assert nexus.analyze_structure() is structure  # Unchanged graph -> cached
+
+    nexus.dependency_graph.set_imports("src/module_a.py", ["tests/test_a.py"])
+    updated = nexus.analyze_structure()
+    assert updated["fingerprint"] != structure["fingerprint"]
+    assert updated["violations"][0]["source"] == "src/module_a.py"
+    assert updated["violations"][0]["reason"] == "no test imports"
+
+
+def test_analyze_code_field_projection(nexus, project_root):
+    """Callers can request only the fields they need; caches are kept per projection."""
+    file_path = str(project_root / "src" / "module_a.py")
+    full = nexus.analyze_code(file_path)
+
+    slim = nexus.analyze_code(file_path, fields={"imports", "counts"})
+    assert set(slim) == {
+        "lines",
+        "chars",
+        "content_hash",
+        "function_count",
+        "class_count",
+        "_raw_imports",
+    }
+    assert slim["_raw_imports"] == full["_raw_imports"]
+    assert (slim["function_count"], slim["class_count"]) == (1, 1)
+
+    outline = nexus.analyze_code(
+        str(project_root / "src" / "module_b.py"), fields=["functions", "classes"]
+    )
+    assert set(outline["classes"][0]) == {"name", "inheritance", "line", "end_line", "methods"}
+    assert outline["classes"][0]["methods"][0]["name"] == "run"
+    assert "doc" not in outline["classes"][0]["methods"][0]
+
+    # Same content and projection -> cached object; other projections are separate
+    assert nexus.analyze_code(file_path, fields={"counts", "imports"}) is slim
+    assert nexus.analyze_code(file_path) is full
+
+    with pytest.raises(ValueError):
+        nexus.analyze_code(file_path, fields={"bogus"})
+    with pytest.raises(ValueError):
+        nexus.analyze_code(file_path, compact=True, fields={"imports"})
+
+
+def test_workspace_metrics_with_projection(nexus, project_root):
+    """Workspace totals are identical when only imports and counts are extracted."""
+    full = nexus.analyze_workspace()
+    slim = nexus.analyze_workspace(fields={"imports"})
+    assert slim["metrics"] == full["metrics"]
+    assert all("functions" not in analysis for analysis in slim["files"].values())
+
+
+def test_projected_suggestions_are_not_reused_for_full_analysis(nexus, project_root):
+    """A report cached for a projected analysis is not returned for the full one."""
+    full_suggestions = nexus.query_suggestions(nexus.analyze_workspace())["suggestions"]
+    nexus._suggestion_cache.clear()
+
+    slim = nexus.query_suggestions(nexus.analyze_workspace(fields={"imports"}))
+    full = nexus.query_suggestions(nexus.analyze_workspace())
+    assert full["fingerprint"] != slim["fingerprint"]
+    assert full["suggestions"] == full_suggestions
+    assert len(full["suggestions"]) > len(slim["suggestions"])
+
+
+def test_oversized_files_are_summarized_or_skipped(nexus, project_root):
+    """Files above the size budget are streamed, not parsed, and listed in the metrics."""
+    generated = project_root / "src" / "generated_table.py"
+    generated.write_text(
+        "from .module_a import func_a\nTABLE = [\n" + "    (1, 2),\n" * 5000 + "]\n"
+    )
+    nexus.config["analysis"]["limits"] = {"max_file_bytes": 10000}
+    nexus.file_budget = FileBudget.from_config(nexus.config["analysis"]["limits"])
+
+    analysis = nexus.analyze_code(str(generated))
+    assert analysis["status"] == "degraded"
+    assert analysis["lines"] == 5003
+    assert analysis["functions"] == []
+    assert analysis["_raw_imports"][0]["module"] == "module_a"
+
+    workspace_analysis = nexus.analyze_workspace()
+    metrics = workspace_analysis["metrics"]
+    assert metrics["degraded_files"] == 1 and metrics["skipped_files"] == 0
+    assert metrics["degraded"][0]["path"] == str(generated)
+    assert metrics["degraded"][0]["bytes"] == generated.stat().st_size
+    # Imports found by the streaming scan still reach the dependency graph
+    generated_key = str(Path("src") / "generated_table.py")
+    assert workspace_analysis["dependencies"][generated_key]["internal_imports"]
+
+    nexus.file_budget = FileBudget.from_config({"max_file_bytes": 10000, "oversize_policy": "skip"})
+    workspace_analysis = nexus.analyze_workspace()
+    assert str(generated) not in workspace_analysis["files"]
+    assert workspace_analysis["metrics"]["skipped"][0]["reason"] == "file exceeds 10000 bytes"
+    assert workspace_analysis["dependencies"][generated_key]["error"].startswith("Skipped")
+
+
+def test_parse_timeout_degrades_the_file(nexus, project_root):
+    """A file whose parse exceeds the time budget in a worker is reported as degraded."""
+    slow = project_root / "src" / "slow.py"
+    slow.write_text("import os\nx = (" + " + ".join(["1"] * 200000) + ")\n")
+    nexus.file_budget = FileBudget(parse_timeout=0.01, worker_min_bytes=100000)
+    try:
+        analysis = nexus.analyze_code(str(slow))
+        metrics = nexus.analyze_workspace(fields={"imports"})["metrics"]
+    finally:
+        nexus.close()
+
+    assert analysis["status"] == "degraded"
+    assert analysis["reason"] == "parse exceeded 0.01s"
+    assert analysis["_raw_imports"][0]["module"] == "os"
+    assert [entry["path"] for entry in metrics["degraded"]] == [str(slow)]
+    assert metrics["total_files"] == 6
+
+
+def test_diff_workspace_reports_structural_changes(nexus, project_root):
+    """Changed functions, grown complexity, new edges and a new cycle between two runs."""
+    before = json.loads(json.dumps(nexus.analyze_workspace()))  # As if loaded from an export
+    module_a = project_root / "src" / "module_a.py"
+    module_a.write_text(
+        module_a.read_text()
+        .replace("import os\n", "import os\nfrom .module_b import B\n")
+        .replace(
+            "    if x > 0:\n", "    if x > 0 and y:\n        for _ in range(x):\n            pass\n"
+        )
+        + "\ndef func_new():\n    return B\n"
+    )
+
+    diff = nexus.diff_workspace(before)
+    module_a_key = str(Path("src") / "module_a.py")
+    module_b_key = str(Path("src") / "module_b.py")
+    assert diff["files"]["changed"] == [str(module_a)]
+    assert diff["unchanged_files"] == 4
+    assert diff["changed"][0]["functions_added"] == ["func_new"]
+    assert [grown["function"] for grown in diff["complexity_increased"]] == ["func_a"]
+    assert [module_a_key, module_b_key] in diff["dependencies"]["added"]
+    assert diff["new_cycles"] == [sorted([module_a_key, module_b_key])]
@@ -11,12 +11,15 @@ Ensures proper initialization, lifecycle, and Mycelium handling.
 Version: 1.0.0
 """
 
+import asyncio
+import threading
 from pathlib import Path
 from typing import Dict  # Added
 from unittest.mock import MagicMock, patch
 
 import pytest
 
+from subsystems.NEXUS.core import jobs
 from subsystems.NEXUS.core.nexus_core import NEXUSCore
 
 # Import the service and components to potentially mock
@@ -34,6 +37,9 @@ class MockMyceliumInterface:
     async def publish(self, topic, message):
         self.published_messages.append({"topic": topic, "message": message})
 
+    async def publish_event(self, topic, payload):
+        self.published_messages.append({"topic": topic, "message": {"payload": payload}})
+
     async def subscribe(self, topic, handler):
         if topic not in self.subscribed_topics:
             self.subscribed_topics[topic] = []
@@ -77,7 +83,25 @@ def mock_nexus_core():
         "files": {},
         "dependencies": {},
     }
+    core.discover_python_files.return_value = ["a.py", "b.py"]
+
+    def iter_workspace_analysis(python_files, progress=None):
+        for index, path in enumerate(python_files):
+            progress(index, len(python_files))
+            yield {"type": "file", "path": path, "analysis": {"lines": 1}}
+        progress(len(python_files), len(python_files))
+        yield {"type": "metrics", "metrics": {"total_files": len(python_files)}}
+
+    core.iter_workspace_analysis.side_effect = iter_workspace_analysis
     core.suggest_improvements.return_value = [{"type": "complexity", "message": "Too complex"}]
+    core.query_suggestions.return_value = {
+        "fingerprint": "abc",
+        "total": 1,
+        "counts": {"high": 1, "medium": 0, "low": 0},
+        "offset": 0,
+        "limit": None,
+        "suggestions": [{"type": "complexity", "severity": "high", "message": "Too complex"}],
+    }
     return core
 
 
@@ -122,6 +146,8 @@ async def test_service_start_and_subscribe(
         f"request.{service.node_id}.analyze_file",
         f"request.{service.node_id}.analyze_workspace",
         f"request.{service.node_id}.suggest_improvements",
+        f"request.{service.node_id}.job_status",
+        f"request.{service.node_id}.cancel_job",
     ]
     assert set(mock_mycelium.subscribed_topics.keys()) == set(expected_topics)
     assert (
@@ -166,7 +192,7 @@ async def test_handle_analyze_file_request(
 
     await service.handle_analyze_file_request(request_message)
 
-    mock_nexus_core.analyze_code.assert_called_once_with(file_path)
+    mock_nexus_core.analyze_code.assert_called_once_with(file_path, fields=None)
     assert len(mock_mycelium.published_messages) == 1
     response = mock_mycelium.published_messages[0]
     assert response["topic"] == f"response.{service.node_id}.file-req-1"
@@ -181,7 +207,7 @@ async def test_handle_analyze_file_request(
 async def test_handle_analyze_workspace_request(
     mock_nexus_core_cls, test_config, mock_mycelium, project_root, mock_nexus_core
 ):
-    """Test the Mycelium handler for analyze_workspace requests."""
+    """Workspace analysis is accepted as a job and its result follows on the same topic."""
     mock_nexus_core_cls.return_value = mock_nexus_core
     service = NexusService(test_config, mock_mycelium, project_root)
 
@@ -189,13 +215,88 @@ async def test_handle_analyze_workspace_request(
 
     await service.handle_analyze_workspace_request(request_message)
 
-    mock_nexus_core.analyze_workspace.assert_called_once()
-    assert len(mock_mycelium.published_messages) == 1
-    response = mock_mycelium.published_messages[0]
+    accepted = mock_mycelium.published_messages[0]
+    assert accepted["topic"] == f"response.{service.node_id}.ws-req-1"
+    assert accepted["message"]["type"] == "analyze_workspace_accepted"
+    job_id = accepted["message"]["payload"]["job_id"]
+    assert job_id in service.jobs
+
+    await asyncio.gather(*service._job_tasks.values())
+
+    response = mock_mycelium.published_messages[-1]
     assert response["topic"] == f"response.{service.node_id}.ws-req-1"
     assert response["message"]["type"] == "analyze_workspace_response"
-    assert response["message"]["payload"]["success"] is True
-    assert "analysis" in response["message"]["payload"]
+    payload = response["message"]["payload"]
+    assert payload["success"] is True
+    assert payload["job_id"] == job_id
+    assert payload["partial"] is False
+    assert set(payload["analysis"]["files"]) == {"a.py", "b.py"}
+    assert payload["analysis"]["metrics"] == {"total_files": 2}
+
+    progress_events = [
+        m["message"]["payload"]
+        for m in mock_mycelium.published_messages
+        if m["topic"] == "event.nexus.job_progress"
+    ]
+    assert progress_events[-1]["status"] == "completed"
+    assert progress_events[-1]["files_done"] == progress_events[-1]["files_total"] == 2
+
+
+@pytest.mark.asyncio
+@patch("subsystems.NEXUS.service.NEXUSCore")
+async def test_cancel_job_keeps_partial_results(
+    mock_nexus_core_cls, test_config, mock_mycelium, project_root, mock_nexus_core
+):
+    """A cancelled job stops at the next file and its partial results stay queryable."""
+    release = threading.Event()
+    first_file_done = threading.Event()
+
+    def slow_analysis(python_files, progress=None):
+        for index, path in enumerate(python_files):
+            progress(index, len(python_files))
+            yield {"type": "file", "path": path, "analysis": {"lines": 1}}
+            first_file_done.set()
+            release.wait(timeout=5)
+
+    mock_nexus_core.iter_workspace_analysis.side_effect = slow_analysis
+    mock_nexus_core_cls.return_value = mock_nexus_core
+    test_config["jobs"] = {"progress_interval": 0.01}
+    service = NexusService(test_config, mock_mycelium, project_root)
+
+    await service.handle_analyze_workspace_request({"id": "ws-req-2", "payload": {}})
+    job_id = mock_mycelium.published_messages[0]["message"]["payload"]["job_id"]
+    await asyncio.get_running_loop().run_in_executor(None, first_file_done.wait, 5)
+
+    await service.handle_cancel_job_request({"id": "cancel-1", "payload": {"job_id": job_id}})
+    release.set()
+    await asyncio.gather(*service._job_tasks.values())
+
+    cancel_reply = next(
+        m for m in mock_mycelium.published_messages if m["topic"].endswith("cancel-1")
+    )
+    assert cancel_reply["message"]["payload"]["success"] is True
+
+    await service.handle_job_status_request(
+        {"id": "status-1", "payload": {"job_id": job_id, "include_results": True}}
+    )
+    status = mock_mycelium.published_messages[-1]["message"]["payload"]
+    assert status["status"] == "cancelled"
+    assert status["partial"] is True
+    assert list(status["analysis"]["files"]) == ["a.py"]
+
+
+@pytest.mark.asyncio
+@patch("subsystems.NEXUS.service.NEXUSCore")
+async def test_job_status_unknown_job_returns_error(
+    mock_nexus_core_cls, test_config, mock_mycelium, project_root
+):
+    """Status requests for unknown job ids are answered with an error."""
+    mock_nexus_core_cls.return_value = MagicMock(spec=NEXUSCore)
+    service = NexusService(test_config, mock_mycelium, project_root)
+
+    await service.handle_job_status_request({"id": "status-2", "payload": {"job_id": "nope"}})
+
+    assert mock_mycelium.published_messages[-1]["message"]["type"] == "error"
 
 
 @pytest.mark.asyncio
@@ -208,11 +309,14 @@ async def test_handle_suggest_improvements_request(
     service = NexusService(test_config, mock_mycelium, project_root)
 
     analysis_data = {"metrics": {}, "files": {}, "dependencies": {}}
-    request_message = {"id": "sug-req-1", "payload": {"analysis_data": analysis_data}}
+    request_message = {
+        "id": "sug-req-1",
+        "payload": {"analysis_data": analysis_data, "offset": 0, "limit": 10},
+    }
 
     await service.handle_suggest_improvements_request(request_message)
 
-    mock_nexus_core.suggest_improvements.assert_called_once_with(analysis_data)
+    mock_nexus_core.query_suggestions.assert_called_once_with(analysis_data, offset=0, limit=10)
     assert len(mock_mycelium.published_messages) == 1
     response = mock_mycelium.published_messages[0]
     assert response["topic"] == f"response.{service.node_id}.sug-req-1"
@@ -220,3 +324,83 @@ async def test_handle_suggest_improvements_request(
     assert response["message"]["payload"]["success"] is True
     assert "suggestions" in response["message"]["payload"]
     assert len(response["message"]["payload"]["suggestions"]) == 1  # Based on mock
+    assert response["message"]["payload"]["counts"]["high"] == 1
+
+
+@pytest.mark.asyncio
+@patch("subsystems.NEXUS.service.NEXUSCore")
+async def test_file_changes_publish_analysis_delta(
+    mock_nexus_core_cls, test_config, mock_mycelium, project_root, mock_nexus_core
+):
+    """Watch-mode batches are analyzed incrementally and published as a delta event."""
+    delta = {
+        "files": {"src/a.py": {"status": "modified", "summary": {"lines": 3}}},
+        "dependencies": {},
+        "edges": {"added": [], "removed": []},
+    }
+    mock_nexus_core.analyze_changed_files.return_value = delta
+    mock_nexus_core_cls.return_value = mock_nexus_core
+    service = NexusService(test_config, mock_mycelium, project_root)
+
+    await service._handle_file_changes({str(project_root / "src" / "a.py")})
+
+    mock_nexus_core.analyze_changed_files.assert_called_once_with(
+        [str(project_root / "src" / "a.py")]
+    )
+    mock_nexus_core.analyze_workspace.assert_not_called()
+    assert mock_mycelium.published_messages == [
+        {"topic": "event.nexus.analysis_delta", "message": {"payload": delta}}
+    ]
+
+
+@pytest.mark.asyncio
+@patch("subsystems.NEXUS.service.NEXUSCore")
+async def test_file_request_completes_while_job_runs(
+    mock_nexus_core_cls, test_config, mock_mycelium, project_root, mock_nexus_core
+):
+    """The core lock is held per file, so a single-file request runs between job files."""
+    job_paused = threading.Event()
+    resume_job = threading.Event()
+    calls = []
+
+    def analysis(python_files, progress=None):
+        for path in ("a.py", "b.py"):
+            calls.append(path)
+            yield {"type": "file", "path": path, "analysis": {"lines": 1}}
+
+    def analyze_code(file_path, fields=None):
+        # The core is never used by two callers at once
+        assert not service._core_lock.acquire(blocking=False)
+        calls.append("analyze")
+        return {"lines": 1}
+
+    collect = jobs.collect_workspace_record
+
+    def paused_collect(analysis, record):
+        collect(analysis, record)
+        if record["path"] == "a.py":
+            job_paused.set()
+            resume_job.wait(timeout=5)
+
+    mock_nexus_core.discover_python_files.return_value = ["a.py", "b.py"]
+    mock_nexus_core.iter_workspace_analysis.side_effect = analysis
+    mock_nexus_core.analyze_code.side_effect = analyze_code
+    mock_nexus_core_cls.return_value = mock_nexus_core
+    test_config["jobs"] = {"progress_interval": 0.01}
+    service = NexusService(test_config, mock_mycelium, project_root)
+
+    with patch.object(jobs, "collect_workspace_record", side_effect=paused_collect):
+        await service.handle_analyze_workspace_request({"id": "ws-req-3", "payload": {}})
+        await asyncio.get_running_loop().run_in_executor(None, job_paused.wait, 5)
+        request = {"id": "file-req-3", "payload": {"file_path": "c.py"}}
+        await asyncio.wait_for(service.handle_analyze_file_request(request), timeout=2)
+        job = next(iter(service.jobs.values()))
+        assert job.status == "running"
+
+        resume_job.set()
+        await asyncio.gather(*service._job_tasks.values())
+
+    assert calls == ["a.py", "analyze", "b.py"]
+    assert job.status == "completed"
+    responses = [m for m in mock_mycelium.published_messages if m["topic"].endswith("file-req-3")]
+    assert responses[0]["message"]["payload"]["success"] is True
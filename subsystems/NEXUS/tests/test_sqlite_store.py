@@ -0,0 +1,173 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS SQLite Store Tests
+=======================================
+
+Test suite for the SQLite analysis store.
+
+Version: 1.0.0
+"""
+
+import pytest
+
+from subsystems.NEXUS.core.sqlite_store import AnalysisStore
+
+
+def _function(name, is_async=False, doc="Docs.", cognitive=0, line=1):
+    return {
+        "name": name,
+        "params": ["x"],
+        "doc": doc,
+        "line": line,
+        "end_line": line + 2,
+        "is_async": is_async,
+        "decorators": [],
+        "complexity": {"cognitive": cognitive, "cyclomatic": 1},
+        "lines": 3,
+        "statements": 1,
+    }
+
+
+def _records(root):
+    ethik = {
+        "lines": 20,
+        "chars": 400,
+        "content_hash": "h1",
+        "complexity": {"cognitive_load": 7},
+        "_raw_imports": [
+            {"module": "asyncio", "names": [], "alias": None, "is_from_import": False, "level": 0},
+            {"module": "core.util", "names": ["x"], "level": 1, "lineno": 2},
+        ],
+        "functions": [
+            _function("validate", is_async=True, doc="No docstring", cognitive=9),
+            _function("check", is_async=True, line=10),
+        ],
+        "classes": [
+            {
+                "name": "Validator",
+                "inheritance": "",
+                "doc": "No docstring",
+                "line": 12,
+                "end_line": 20,
+                "decorators": [],
+                "methods": [_function("run", is_async=True, doc="No docstring", line=13)],
+            }
+        ],
+    }
+    util = {
+        "lines": 5,
+        "chars": 50,
+        "content_hash": "h2",
+        "complexity": {"cognitive_load": 0},
+        "_raw_imports": [],
+        "functions": [_function("helper", doc="No docstring")],
+        "classes": [],
+    }
+    return [
+        {"type": "file", "path": f"{root}/subsystems/ETHIK/core/validator.py", "analysis": ethik},
+        {"type": "file", "path": f"{root}/subsystems/ETHIK/core/util.py", "analysis": util},
+        {
+            "type": "file",
+            "path": f"{root}/subsystems/KOIOS/util_copy.py",
+            "duplicate_of": f"{root}/subsystems/ETHIK/core/util.py",
+            "content_hash": "h2",
+        },
+        {
+            "type": "dependencies",
+            "path": "subsystems/ETHIK/core/util.py",
+            "entry": {"imported_by": ["subsystems/ETHIK/core/validator.py"]},
+        },
+        {"type": "metrics", "metrics": {"total_files": 3}},
+    ]
+
+
+@pytest.fixture
+def store(tmp_path):
+    with AnalysisStore(tmp_path / "analysis.db") as store:
+        yield store
+
+
+def test_write_records_fills_every_table(store, tmp_path):
+    """One run stores files, functions, classes, imports and edges."""
+    run_id, count = store.write_records(_records("/proj"), "/proj")
+    assert count == 5
+    assert store.runs()[0]["metrics"] == {"total_files": 3}
+
+    files = store.query("SELECT rel_path, subsystem, duplicate_of FROM files ORDER BY rel_path")
+    assert [f["subsystem"] for f in files] == ["ETHIK", "ETHIK", "KOIOS"]
+    assert files[2]["duplicate_of"] == "/proj/subsystems/ETHIK/core/util.py"
+    assert store.query("SELECT COUNT(*) AS n FROM functions")[0]["n"] == 4
+    assert store.query("SELECT name, has_docstring FROM classes") == [
+        {"name": "Validator", "has_docstring": 0}
+    ]
+    assert store.files_importing("core") == ["subsystems/ETHIK/core/validator.py"]
+    assert store.dependency_edges(target="subsystems/ETHIK/core/util.py") == [
+        ("subsystems/ETHIK/core/validator.py", "subsystems/ETHIK/core/util.py")
+    ]
+
+
+def test_find_functions_filters(store):
+    """Async functions without docstrings in one subsystem, methods included."""
+    store.write_records(_records("/proj"), "/proj")
+
+    rows = store.find_functions(subsystem="ETHIK", is_async=True, has_docstring=False)
+    assert [r["qualified_name"] for r in rows] == ["validate", "Validator.run"]
+    assert [
+        r["qualified_name"] for r in store.find_functions(is_method=False, min_cognitive=5)
+    ] == ["validate"]
+    assert store.find_functions(path_prefix="subsystems/ETHIK/core/u")[0]["name"] == "helper"
+
+
+def test_runs_are_kept_separately(store):
+    """Later runs do not overwrite earlier ones; queries default to the latest run."""
+    first, _ = store.write_records(_records("/proj"), "/proj")
+    records = _records("/proj")[1:]  # validator.py removed
+    second, _ = store.write_records(records, "/proj")
+
+    assert second > first
+    assert store.find_functions(is_async=True) == []
+    assert len(store.find_functions(run_id=first, is_async=True)) == 3
+
+
+def test_query_rejects_writes(store):
+    """The generic query entry point is read-only."""
+    store.write_records(_records("/proj"), "/proj")
+    with pytest.raises(ValueError):
+        store.query("DELETE FROM files")
+    with pytest.raises(ValueError):
+        store.query("WITH doomed AS (SELECT 1) DELETE FROM files")
+    assert store.query("SELECT COUNT(*) AS n FROM files")[0]["n"] == 3
+    # Writes through the store itself still work after a rejected query
+    store.write_records(_records("/proj"), "/proj")
+    assert len(store.runs()) == 2
+
+
+def test_projected_analyses_are_stored(store):
+    """Analyses projected to a few fields have no function or class lists."""
+    analysis = {"lines": 3, "chars": 30, "content_hash": "h", "_raw_imports": []}
+    store.write_records([{"type": "file", "path": "/proj/a.py", "analysis": analysis}], "/proj")
+    assert store.query("SELECT rel_path, lines FROM files") == [{"rel_path": "a.py", "lines": 3}]
+    assert store.query("SELECT COUNT(*) AS n FROM functions")[0]["n"] == 0
+
+
+def test_files_importing_treats_wildcards_literally(store):
+    """Underscores in module names are not LIKE wildcards."""
+
+    def importer(path, module):
+        analysis = {
+            "lines": 1,
+            "chars": 9,
+            "content_hash": path,
+            "_raw_imports": [{"module": module}],
+        }
+        return {"type": "file", "path": f"/proj/{path}", "analysis": analysis}
+
+    records = [
+        importer("a.py", "nexus_core.sub"),
+        importer("b.py", "nexusXcore.sub"),
+        importer("c.py", "nexus_core"),
+    ]
+    store.write_records(records, "/proj")
+    assert store.files_importing("nexus_core") == ["a.py", "c.py"]
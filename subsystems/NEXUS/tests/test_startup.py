@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Startup Tests
+===================================
+
+Test suite for the import-time budget and lazy initialization of NEXUS Core.
+
+Version: 1.0.0
+"""
+
+import json
+import logging
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+from subsystems.NEXUS.core.nexus_core import NEXUSCore
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+
+# Seconds allowed for ``import subsystems.NEXUS.core.nexus_core`` in a fresh interpreter
+IMPORT_TIME_BUDGET = 1.0
+# Modules that must only be imported once an operation needs them
+LAZY_MODULES = ("koios", "sqlite3", "multiprocessing")
+
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import subsystems.NEXUS.core.nexus_core
+elapsed = time.perf_counter() - start
+print(json.dumps({"seconds": elapsed, "loaded": [m for m in %r if m in sys.modules]}))
+"""
+
+
+def _import_probe() -> dict:
+    env = dict(os.environ)
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [str(PROJECT_ROOT), env.get("PYTHONPATH")]))
+    output = subprocess.run(
+        [sys.executable, "-c", _PROBE % (LAZY_MODULES,)],
+        cwd=PROJECT_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    ).stdout
+    return json.loads(output)
+
+
+def test_import_stays_within_budget():
+    """Importing nexus_core is fast and defers KOIOS, SQLite and multiprocessing."""
+    # Best of three runs, so a busy machine does not fail the budget on noise
+    probes = [_import_probe() for _ in range(3)]
+    assert min(probe["seconds"] for probe in probes) < IMPORT_TIME_BUDGET
+    assert probes[0]["loaded"] == []
+
+
+def test_components_are_created_on_first_use(tmp_path):
+    """Construction does not build the dependency graph, caches or worker pool."""
+    nexus = NEXUSCore({}, logging.getLogger("TestNEXUSStartup"), tmp_path)
+    assert nexus._dependency_graph is None
+    assert nexus._parse_worker_pool is None
+    assert nexus._caches == {}
+
+    (tmp_path / "a.py").write_text("def f():\n    return 1\n")
+    nexus.analyze_code(str(tmp_path / "a.py"))
+    assert list(nexus._caches) == ["analysis"]
+    assert len(nexus.dependency_graph) == 0
+    assert nexus._dependency_graph is nexus.dependency_graph
+    nexus.close()  # Nothing was started
+    assert nexus._parse_worker_pool is None
@@ -0,0 +1,193 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Suggestion Engine Tests
+============================================
+
+Test suite for the rule-table-driven suggestion engine.
+
+Version: 1.0.0
+"""
+
+import logging
+import time
+
+import pytest
+
+from subsystems.NEXUS.core.ast_visitor import visit_source
+from subsystems.NEXUS.core.compact import CompactFileAnalysis
+from subsystems.NEXUS.core.suggestions import (
+    AnalysisColumns,
+    SuggestionReport,
+    analysis_fingerprint,
+    evaluate_rules,
+)
+
+SOURCE = '''
+import os
+import sys
+
+
+def documented():
+    """Has a docstring."""
+    return 1
+
+
+def undocumented(x):
+    return x and os or sys
+
+
+class Plain:
+    def method(self):
+        return None
+'''
+
+
+def _file_entry(cognitive_load=5, imports=2, functions=None, classes=None, content_hash="h"):
+    return {
+        "lines": 10,
+        "content_hash": content_hash,
+        "complexity": {"cognitive_load": cognitive_load},
+        "_raw_imports": [{"module": f"m{i}"} for i in range(imports)],
+        "functions": functions or [],
+        "classes": classes or [],
+    }
+
+
+def _function(name, cognitive=0, cyclomatic=1, lines=3, doc="Docs."):
+    return {
+        "name": name,
+        "doc": doc,
+        "line": 1,
+        "complexity": {"cognitive": cognitive, "cyclomatic": cyclomatic},
+        "lines": lines,
+    }
+
+
+@pytest.fixture
+def workspace_analysis():
+    return {
+        "files": {
+            "/proj/a.py": _file_entry(
+                cognitive_load=80,
+                imports=20,
+                functions=[_function("hot", cognitive=30), _function("bare", doc="No docstring")],
+            ),
+            "/proj/b.py": _file_entry(
+                classes=[
+                    {
+                        "name": "Thing",
+                        "doc": "No docstring",
+                        "line": 4,
+                        "methods": [_function("run", lines=90)],
+                    }
+                ]
+            ),
+            "/proj/broken.py": {"error": "Syntax error"},
+        },
+        "dependencies": {"a.py": {"imported_by": [f"x{i}.py" for i in range(12)]}},
+    }
+
+
+def test_rules_cover_file_function_and_class_checks(workspace_analysis):
+    """Every rule of the table fires on the row that violates it."""
+    columns = AnalysisColumns.from_workspace_analysis(workspace_analysis, "/proj")
+    suggestions = evaluate_rules(columns, {})
+
+    kinds = {(s["type"], s["severity"], s.get("function") or s.get("class")) for s in suggestions}
+    assert kinds == {
+        ("complexity", "high", None),
+        ("imports", "medium", None),
+        ("dependencies", "medium", None),
+        ("complexity", "medium", "hot"),
+        ("documentation", "low", "bare"),
+        ("documentation", "low", "Thing"),
+        ("length", "low", "Thing.run"),
+    }
+    # Sorted by severity first
+    ranks = [("high", "medium", "low").index(s["severity"]) for s in suggestions]
+    assert ranks == sorted(ranks)
+
+
+def test_thresholds_come_from_config(workspace_analysis):
+    """Raising thresholds silences the corresponding rules."""
+    columns = AnalysisColumns.from_workspace_analysis(workspace_analysis, "/proj")
+    suggestions = evaluate_rules(
+        columns, {"cognitive_load_threshold_high": 100, "imports_threshold": 50}
+    )
+    assert not any(s["type"] in ("imports",) for s in suggestions)
+    assert not any(s["severity"] == "high" for s in suggestions)
+
+
+def test_compact_and_dict_analyses_produce_the_same_suggestions():
+    """The columnar view reads compact storage directly with identical results."""
+    logger = logging.getLogger("TestSuggestions")
+    compact = CompactFileAnalysis.from_visitor(visit_source(SOURCE, logger), 17, len(SOURCE), "h")
+    thresholds = {"imports_threshold": 1, "function_cyclomatic_threshold": 2}
+
+    from_compact = evaluate_rules(
+        AnalysisColumns.from_workspace_analysis({"files": {"f.py": compact}}), thresholds
+    )
+    from_dict = evaluate_rules(
+        AnalysisColumns.from_workspace_analysis({"files": {"f.py": compact.to_dict()}}),
+        thresholds,
+    )
+    assert from_compact == from_dict
+    documentation = [s for s in from_compact if s["type"] == "documentation"]
+    assert {s.get("function") or s.get("class") for s in documentation} == {
+        "undocumented",
+        "Plain",
+        "Plain.method",
+    }
+    assert any(s["type"] == "complexity" and s["function"] == "undocumented" for s in from_compact)
+
+
+def test_report_pages_groups_and_top(workspace_analysis):
+    """Reports support paging, filtering, grouping and top-N."""
+    columns = AnalysisColumns.from_workspace_analysis(workspace_analysis, "/proj")
+    report = SuggestionReport("fp", evaluate_rules(columns, {}))
+
+    first = report.page(offset=0, limit=2)
+    assert first["total"] == 7
+    assert first["counts"] == {"high": 1, "medium": 3, "low": 3}
+    assert len(first["suggestions"]) == 2
+    assert report.page(offset=6, limit=2)["suggestions"] == report.suggestions[6:]
+    assert report.top(1)[0]["severity"] == "high"
+
+    low_docs = report.page(severity="low", type="documentation")
+    assert low_docs["total"] == 2
+
+    grouped = report.page(group_by_severity=True)
+    assert [len(grouped["groups"][s]) for s in ("high", "medium", "low")] == [1, 3, 3]
+
+
+def test_fingerprint_tracks_content_and_thresholds(workspace_analysis):
+    """Fingerprints change with file content, fan-in or thresholds, not otherwise."""
+    base = analysis_fingerprint(workspace_analysis, {})
+    assert analysis_fingerprint(workspace_analysis, {}) == base
+    assert analysis_fingerprint(workspace_analysis, {"imports_threshold": 3}) != base
+
+    workspace_analysis["files"]["/proj/b.py"]["content_hash"] = "changed"
+    assert analysis_fingerprint(workspace_analysis, {}) != base
+
+
+def test_ten_thousand_files_evaluate_quickly():
+    """A 10k-file analysis is flattened and evaluated well under a second."""
+    files = {
+        f"/proj/pkg{i // 100}/mod{i}.py": _file_entry(
+            cognitive_load=i % 70,
+            imports=i % 20,
+            functions=[_function(f"f{j}", cognitive=(i + j) % 20, doc="") for j in range(5)],
+            content_hash=str(i),
+        )
+        for i in range(10000)
+    }
+    start = time.perf_counter()
+    columns = AnalysisColumns.from_workspace_analysis({"files": files}, "/proj")
+    suggestions = evaluate_rules(columns, {})
+    elapsed = time.perf_counter() - start
+
+    assert len(columns.paths) == 10000
+    assert len(suggestions) > 50000
+    assert elapsed < 1.0
@@ -0,0 +1,102 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Watcher Tests
+==================================
+
+Test suite for the debounced workspace watcher (polling backend).
+
+Version: 1.0.0
+"""
+
+import asyncio
+import logging
+from pathlib import Path
+
+import pytest
+
+from subsystems.NEXUS.core.watcher import WorkspaceWatcher
+
+
+@pytest.fixture
+def workspace(tmp_path: Path) -> Path:
+    (tmp_path / "pkg").mkdir()
+    (tmp_path / "pkg" / "a.py").write_text("x = 1\n")
+    (tmp_path / "__pycache__").mkdir()
+    return tmp_path
+
+
+async def _wait_for(batches, count, timeout=3.0):
+    deadline = asyncio.get_running_loop().time() + timeout
+    while len(batches) < count and asyncio.get_running_loop().time() < deadline:
+        await asyncio.sleep(0.02)
+
+
+@pytest.mark.asyncio
+async def test_poll_backend_debounces_burst_into_one_batch(workspace):
+    """Several quick edits arrive as a single batch of changed paths."""
+    batches = []
+
+    async def on_change(paths):
+        batches.append(paths)
+
+    watcher = WorkspaceWatcher(
+        workspace,
+        on_change,
+        logging.getLogger("TestWatcher"),
+        debounce_seconds=0.2,
+        poll_interval=0.05,
+        backend="poll",
+    )
+    await watcher.start()
+    try:
+        (workspace / "pkg" / "a.py").write_text("x = 2  # modified\n")
+        (workspace / "pkg" / "b.py").write_text("import a\n")
+        (workspace / "__pycache__" / "ignored.py").write_text("")
+        (workspace / "notes.txt").write_text("not python")
+        await _wait_for(batches, 1)
+        await asyncio.sleep(0.3)
+    finally:
+        await watcher.stop()
+
+    assert len(batches) == 1
+    assert batches[0] == {str(workspace / "pkg" / "a.py"), str(workspace / "pkg" / "b.py")}
+
+
+@pytest.mark.asyncio
+async def test_poll_backend_reports_deleted_files(workspace):
+    """Removed files are reported so their analysis can be dropped."""
+    batches = []
+
+    async def on_change(paths):
+        batches.append(paths)
+
+    watcher = WorkspaceWatcher(
+        workspace,
+        on_change,
+        logging.getLogger("TestWatcher"),
+        debounce_seconds=0.05,
+        poll_interval=0.05,
+        backend="poll",
+    )
+    await watcher.start()
+    try:
+        (workspace / "pkg" / "a.py").unlink()
+        await _wait_for(batches, 1)
+    finally:
+        await watcher.stop()
+
+    assert batches == [{str(workspace / "pkg" / "a.py")}]
+
+
+def test_is_watched_filters_ignored_dirs(workspace):
+    """Only .py files outside ignored directories are watched."""
+
+    async def noop(paths):
+        pass
+
+    watcher = WorkspaceWatcher(workspace, noop, logging.getLogger("TestWatcher"), backend="poll")
+    assert watcher.is_watched(str(workspace / "pkg" / "a.py"))
+    assert not watcher.is_watched(str(workspace / ".venv" / "lib" / "x.py"))
+    assert not watcher.is_watched(str(workspace / "pkg" / "data.json"))
@@ -0,0 +1,179 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+EVA & GUARANI - NEXUS Workspace Diff Tests
+==========================================
+
+Test suite for structural diffs between workspace analyses.
+
+Version: 1.0.0
+"""
+
+import random
+
+import pytest
+
+from subsystems.NEXUS.core.dependency_graph import DependencyGraph
+from subsystems.NEXUS.core.workspace_diff import diff_workspace_analyses
+
+
+def _file(content_hash, functions=(), methods=(), lines=10):
+    return {
+        "content_hash": content_hash,
+        "lines": lines,
+        "functions": [
+            {"name": name, "complexity": {"cognitive": cog, "cyclomatic": cyc}}
+            for name, cog, cyc in functions
+        ],
+        "classes": [
+            {
+                "name": "Service",
+                "methods": [
+                    {"name": name, "complexity": {"cognitive": cog, "cyclomatic": cyc}}
+                    for name, cog, cyc in methods
+                ],
+            }
+        ],
+    }
+
+
+def _deps(imported_by):
+    return {path: {"imported_by": importers} for path, importers in imported_by.items()}
+
+
+@pytest.fixture
+def old_analysis():
+    return {
+        "files": {
+            "/p/a.py": _file("a1", functions=[("load", 2, 2), ("gone", 1, 1)]),
+            "/p/b.py": _file("b1", methods=[("run", 3, 2)]),
+            "/p/c.py": _file("c1"),
+        },
+        "dependencies": _deps({"a.py": ["b.py"], "b.py": [], "c.py": []}),
+    }
+
+
+@pytest.fixture
+def new_analysis():
+    return {
+        "files": {
+            "/p/a.py": _file("a2", functions=[("load", 5, 2), ("fresh", 9, 9)], lines=14),
+            "/p/b.py": _file("b2", methods=[("run", 3, 4)]),
+            "/p/d.py": _file("d1", functions=[("huge", 50, 40)]),
+        },
+        "dependencies": _deps({"a.py": ["b.py"], "b.py": ["a.py"], "d.py": ["a.py"]}),
+    }
+
+
+def test_files_and_functions(old_analysis, new_analysis):
+    """Added, removed and changed files and per-function changes are reported."""
+    diff = diff_workspace_analyses(old_analysis, new_analysis)
+    assert diff["files"] == {
+        "added": ["/p/d.py"],
+        "removed": ["/p/c.py"],
+        "changed": ["/p/a.py", "/p/b.py"],
+    }
+    assert diff["changed"][0] == {
+        "path": "/p/a.py",
+        "lines_delta": 4,
+        "functions_added": ["fresh"],
+        "functions_removed": ["gone"],
+    }
+    grown = {
+        (g["file"], g["function"]): (g["before"], g["after"]) for g in diff["complexity_increased"]
+    }
+    assert grown == {
+        ("/p/a.py", "load"): ({"cognitive": 2, "cyclomatic": 2}, {"cognitive": 5, "cyclomatic": 2}),
+        ("/p/b.py", "Service.run"): (
+            {"cognitive": 3, "cyclomatic": 2},
+            {"cognitive": 3, "cyclomatic": 4},
+        ),
+    }
+
+
+def test_edges_and_cycles(old_analysis, new_analysis):
+    """Edge changes come from imported_by lists; a new a <-> b cycle is detected."""
+    diff = diff_workspace_analyses(old_analysis, new_analysis)
+    assert diff["dependencies"] == {"added": [["a.py", "b.py"], ["a.py", "d.py"]], "removed": []}
+    assert diff["new_cycles"] == [["a.py", "b.py"]]
+    assert diff["resolved_cycles"] == []
+
+    reverse = diff_workspace_analyses(new_analysis, old_analysis)
+    assert reverse["resolved_cycles"] == [["a.py", "b.py"]]
+
+
+def test_unchanged_files_are_skipped_by_fingerprint(old_analysis):
+    """Files with equal hashes are never inspected, even if their bodies differ."""
+    new = {
+        "files": {
+            path: dict(entry, functions=None) for path, entry in old_analysis["files"].items()
+        },
+        "dependencies": old_analysis["dependencies"],
+    }
+    diff = diff_workspace_analyses(old_analysis, new)
+    assert diff["unchanged_files"] == 3
+    assert diff["changed"] == [] and diff["complexity_increased"] == []
+    assert diff["dependencies"] == {"added": [], "removed": []}
+
+
+def test_edges_skipped_when_imports_unchanged(old_analysis):
+    """Edits that keep a file's imports do not compare the imported_by lists."""
+    imports = {"internal_imports": ["from .a import load"]}
+    old = {
+        "files": old_analysis["files"],
+        "dependencies": {
+            "a.py": {"imported_by": ["b.py"]},
+            "b.py": dict(imports, imported_by=[]),
+            "c.py": {"imported_by": []},
+        },
+    }
+    new = {
+        "files": dict(old["files"], **{"/p/b.py": _file("b2")}),
+        # Not reachable from an unchanged import list; proves the lists are not scanned
+        "dependencies": dict(old["dependencies"], **{"a.py": {"imported_by": []}}),
+    }
+    diff = diff_workspace_analyses(old, new)
+    assert diff["files"]["changed"] == ["/p/b.py"]
+    assert diff["dependencies"] == {"added": [], "removed": []}
+
+    new["dependencies"]["b.py"] = {"internal_imports": [], "imported_by": []}
+    diff = diff_workspace_analyses(old, new)
+    assert diff["dependencies"] == {"added": [], "removed": [["b.py", "a.py"]]}
+
+
+def test_local_cycle_recomputation_matches_full_graph():
+    """Cycles recomputed around changed edges equal a full recomputation."""
+    rng = random.Random(7)
+    paths = [f"m{i}.py" for i in range(12)]
+
+    def analysis(edges):
+        dependencies = {path: {"imported_by": []} for path in paths}
+        for importer, target in sorted(edges):
+            dependencies[target]["imported_by"].append(importer)
+        files = {f"/p/{path}": {"content_hash": path} for path in paths}
+        return {"files": files, "dependencies": dependencies}
+
+    def full_cycles(result):
+        graph = DependencyGraph.from_dependency_map(result["dependencies"])
+        return {tuple(cycle) for cycle in graph.find_cycles()}
+
+    # A removed edge that splits a cycle away from both of its endpoints
+    edges = {("p", "q"), ("q", "p"), ("q", "u"), ("u", "v"), ("v", "p")}
+    paths.extend(["p", "q", "u", "v"])
+    changes = [edges - {("u", "v")}]
+    edges_now = changes[0]
+    for _ in range(100):
+        edges_now = edges_now ^ {(rng.choice(paths), rng.choice(paths)) for _ in range(3)}
+        changes.append(edges_now)
+    for changed in changes:
+        old, new = analysis(edges), analysis(changed)
+        # Give the importers new content so their import changes are compared
+        for importer, _ in edges ^ changed:
+            new["files"][f"/p/{importer}"] = {"content_hash": "edited"}
+            new["dependencies"][importer]["internal_imports"] = ["edited"]
+        diff = diff_workspace_analyses(old, new)
+        before, after = full_cycles(old), full_cycles(new)
+        assert {tuple(c) for c in diff["new_cycles"]} == after - before
+        assert {tuple(c) for c in diff["resolved_cycles"]} == before - after
+        edges = changed